@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抽出ロジックのベンチマークスクリプト
+合成ページ（utils/synthetic_pages.py）の品目数を増やしながら
+Category2Scraperの各抽出メソッドの処理時間を計測し、計算量の増え方を確認します
+
+使い方:
+    python benchmark_extractors.py
+    python benchmark_extractors.py --layouts dl box4 --sizes 50 100 200 400 --depth 10
+    python benchmark_extractors.py --output bench_output.txt
+"""
+
+import argparse
+import math
+import time
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from scrapers import Category2Scraper
+from utils.synthetic_pages import LAYOUTS, LAYOUT_EXTRACTORS, build_page
+
+# 計算量の指数（log-logの傾き）がこの値を超えたら警告
+QUADRATIC_THRESHOLD = 1.5
+
+DEFAULT_SIZES = [50, 100, 200, 400]
+
+
+def time_extractor(method_name: str, html: str, repeat: int = 3) -> Dict:
+    """
+    1つの抽出メソッドの処理時間を計測（パース時間は含めない）
+
+    Returns:
+        {'seconds': 最短時間, 'count': 抽出件数}
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    scraper = Category2Scraper({'name': 'benchmark', 'extractor_type': 'auto'}, delay=0)
+    method = getattr(scraper, method_name)
+
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prices = method(soup)
+        elapsed = time.perf_counter() - start
+        count = len(prices)
+        if best is None or elapsed < best:
+            best = elapsed
+    return {'seconds': best, 'count': count}
+
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> float:
+    """最小サイズと最大サイズの間のlog-logの傾き（1.0=線形、2.0=二次）"""
+    if len(sizes) < 2 or seconds[0] <= 0 or seconds[-1] <= 0:
+        return 0.0
+    return math.log(seconds[-1] / seconds[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def run_benchmark(layouts: List[str], sizes: List[int], depth: int, repeat: int) -> List[Dict]:
+    """各レイアウト・抽出メソッド・品目数の組み合わせを計測"""
+    rows = []
+    for layout in layouts:
+        pages = {size: build_page(layout, size, depth) for size in sizes}
+        for method_name in LAYOUT_EXTRACTORS[layout]:
+            timings = [time_extractor(method_name, pages[size], repeat) for size in sizes]
+            seconds = [t['seconds'] for t in timings]
+            rows.append({
+                'layout': layout,
+                'method': method_name,
+                'sizes': sizes,
+                'seconds': seconds,
+                'counts': [t['count'] for t in timings],
+                'exponent': scaling_exponent(sizes, seconds),
+            })
+    return rows
+
+
+def render_report(rows: List[Dict], depth: int, width: int = 40) -> str:
+    """計測結果を棒グラフ付きのテキストに整形"""
+    lines = [
+        '=' * 80,
+        f"抽出メソッドのスケーリング（DOMの深さ: {depth}）",
+        '=' * 80,
+    ]
+    for row in rows:
+        slowest = max(row['seconds']) or 1e-9
+        flag = '  ⚠ 二次以上の増加' if row['exponent'] > QUADRATIC_THRESHOLD else ''
+        lines.append(f"\n[{row['layout']}] {row['method']}  傾き={row['exponent']:.2f}{flag}")
+        for size, seconds, count in zip(row['sizes'], row['seconds'], row['counts']):
+            bar = '#' * max(1, int(width * seconds / slowest))
+            lines.append(f"  {size:>6}件 {seconds * 1000:>10.2f}ms  抽出{count:>6}件  {bar}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Category2Scraperの抽出メソッドのベンチマーク')
+    parser.add_argument('--layouts', nargs='+', default=list(LAYOUTS), choices=list(LAYOUTS),
+                        help='計測するレイアウト')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='品目数のリスト')
+    parser.add_argument('--depth', type=int, default=5, help='DOMのネストの深さ')
+    parser.add_argument('--repeat', type=int, default=3, help='各計測の繰り返し回数（最短値を採用）')
+    parser.add_argument('--output', help='結果を書き出すファイル（例: bench_output.txt）')
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.layouts, sorted(args.sizes), args.depth, args.repeat)
+    report = render_report(rows, args.depth)
+    print(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+        print(f"\n結果を {args.output} に保存しました")
+
+    slow = [row for row in rows if row['exponent'] > QUADRATIC_THRESHOLD]
+    if slow:
+        print(f"\n⚠ {len(slow)} 件の抽出メソッドで二次以上の増加が見られます")
+        for row in slow:
+            print(f"  - [{row['layout']}] {row['method']} (傾き={row['exponent']:.2f})")
+
+
+if __name__ == '__main__':
+    main()
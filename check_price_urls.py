@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sites.yamlのすべての価格ページURLの死活確認（scrapers/healthcheck.py）
+ステータス・応答時間・リダイレクト先・本文のサイズを runs/url_health.json に保存する
+
+使い方:
+    python check_price_urls.py
+    python check_price_urls.py --per-host 2 --timeout 5 --only 東北キング
+    python -m scrapers full --skip-unhealthy   # 応答しないサイトを除いて取得
+"""
+
+import argparse
+import logging
+import sys
+
+from scrapers.async_backend import AIOHTTP_AVAILABLE
+from scrapers.config import config_path, load_sites
+from scrapers.healthcheck import DEFAULT_REPORT_PATH, DEFAULT_TIMEOUT, check_sites, format_report, save_report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='価格ページURLの死活確認')
+    parser.add_argument('--report', default=str(DEFAULT_REPORT_PATH), help='確認結果の保存先（JSON）')
+    parser.add_argument('--per-host', type=int, default=2, help='1ホストあたりの同時接続数')
+    parser.add_argument('--max-in-flight', type=int, default=50, help='全体の同時接続数')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='1リクエストのタイムアウト（秒）')
+    parser.add_argument('--only', nargs='+', metavar='NAME', default=None,
+                        help='企業名にいずれかの文字列を含むサイトだけを確認')
+    parser.add_argument('--config-dir', default=None, help='設定ファイルのディレクトリ（既定: config/）')
+    args = parser.parse_args(argv)
+
+    if not AIOHTTP_AVAILABLE:
+        print("❌ エラー: aiohttpがインストールされていません。pip install aiohttp を実行してください")
+        return 1
+
+    sites = list(load_sites(config_path('sites.yaml', args.config_dir)))
+    if args.only:
+        sites = [site for site in sites if any(name in site.get('name', '') for name in args.only)]
+    print(f"{len(sites)}社の価格ページURLを確認します（同時接続: ホストごと{args.per_host}、"
+          f"全体{args.max_in_flight}、タイムアウト: {args.timeout}秒）")
+
+    report = check_sites(sites, per_host_limit=args.per_host, max_in_flight=args.max_in_flight,
+                         timeout=args.timeout)
+    for line in format_report(report):
+        print(line)
+    path = save_report(report, args.report)
+    print(f"✓ 確認結果を保存しました: {path}")
+    return 0 if not report['summary']['failed'] else 2
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
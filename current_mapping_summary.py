@@ -5,8 +5,9 @@
 （ネットワークアクセス不要）
 """
 
-import yaml
-from scrape_and_fill_standard_table import IMPLEMENTED_COMPANIES
+from scrapers.config import load_config
+# 実装済み企業（scrapers/mappings.pyの定義、python -m scrapers と共通）
+from scrapers.mappings import IMPLEMENTED_COMPANIES
 
 # 標準アイテム名（出力先の列名）
 STANDARD_ITEMS = [
@@ -18,8 +19,7 @@ STANDARD_ITEMS = [
 ]
 
 def load_yaml(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return load_config(path)
 
 def main():
     # 設定ファイルを読み込む
@@ -2,31 +2,29 @@
 # -*- coding: utf-8 -*-
 """実装済みと未実装の企業をリストアップ"""
 
-import yaml
-from openpyxl import load_workbook
+from scrapers.config import load_sites
+from scrapers.runs import DEFAULT_RUNS_DIR, latest_run
+from scrapers.workbooks import latest_companies
+
+
+def load_implemented_companies(excel_path, runs_dir=DEFAULT_RUNS_DIR):
+    """
+    最新の価格情報から実装済み企業を取得
+    実行インデックス（runs/index.json）に記録がある場合はその企業名、ない場合は
+    Excelファイルの最新の価格情報シートのA列を読む（読み取り専用）
+    """
+    run = latest_run('価格情報', runs_dir)
+    if run:
+        return set(run['companies'])
+    return set(latest_companies(excel_path, '価格情報_'))
+
 
 # sites.yamlから企業リストを取得
-with open('config/sites.yaml', 'r', encoding='utf-8') as f:
-    config = yaml.safe_load(f)
-    sites = config.get('sites', [])
+sites = load_sites('config/sites.yaml')
 
 # Excelファイルから実装済み企業を取得
 excel_path = 'price_results_v2_20251104_220253.xlsx'
-wb = load_workbook(excel_path)
-
-# 最新のシートを探す
-target_sheet = None
-for sheet_name in reversed(wb.sheetnames):
-    if sheet_name.startswith('価格情報_'):
-        target_sheet = wb[sheet_name]
-        break
-
-implemented_companies = set()
-if target_sheet:
-    for row_idx in range(2, target_sheet.max_row + 1):
-        company_name = target_sheet.cell(row=row_idx, column=1).value
-        if company_name:
-            implemented_companies.add(str(company_name))
+implemented_companies = load_implemented_companies(excel_path)
 
 # 企業を分類
 all_companies = {}
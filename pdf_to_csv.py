@@ -2,69 +2,86 @@
 # -*- coding: utf-8 -*-
 """PDFファイルから企業情報をCSV形式で抽出"""
 
-import pdfplumber
 import csv
+import os
 
-def extract_companies_from_pdf(pdf_path, output_csv_path):
-    """PDFから企業情報を抽出してCSVに保存"""
+from scrapers.pdf_tables import DEFAULT_CACHE_DIR, iter_pages
+
+CSV_FIELDS = ['名称', '地域', 'URL', '価格ページURL数', '価格ページURLs']
+
+
+def parse_company_rows(tables):
+    """1ページ分の表（page.extract_tables()の結果）から企業情報を抽出"""
     companies = []
+    for table_idx, table in enumerate(tables):
+        if not table:
+            continue
+        
+        # データ行を処理（1行目はヘッダー行、2行目以降）
+        for row_idx, row in enumerate(table[1:], 2):
+            if not row or len(row) < 3:
+                continue
+            
+            # 企業情報を抽出
+            name = row[0].strip() if row[0] else ''
+            region = row[1].strip() if len(row) > 1 and row[1] else ''
+            url = row[2].strip() if len(row) > 2 and row[2] else ''
+            
+            # 価格ページURLを収集（4列目以降）
+            price_urls = []
+            for col_idx in range(3, len(row)):
+                price_url = row[col_idx].strip() if row[col_idx] else ''
+                if price_url and price_url.startswith('http'):
+                    # 重複チェック
+                    if price_url not in price_urls:
+                        price_urls.append(price_url)
+            
+            # 有効な企業情報のみ追加
+            if name:
+                companies.append({
+                    '名称': name,
+                    '地域': region,
+                    'URL': url,
+                    '価格ページURL数': len(price_urls),
+                    '価格ページURLs': price_urls
+                })
+    return companies
+
+
+def extract_companies_from_pdf(pdf_path, output_csv_path, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    PDFから企業情報を抽出してCSVに保存
+    ページはプロセスプールで並列に抽出し、ページごとの結果はPDFのハッシュごとにキャッシュする
+    （内容が変わっていないPDFはpdfplumberを使わずにキャッシュから読む）
+    CSVにはページの抽出が終わった順（ページ番号の順）に書き込み、最後にファイルを置き換える
+    
+    Args:
+        pdf_path: PDFファイルのパス
+        output_csv_path: 出力するCSVファイルのパス
+        workers: 並列に抽出するプロセス数（Noneの場合はCPU数、1の場合は並列にしない）
+        cache_dir: ページごとの抽出結果のキャッシュの保存先（Noneの場合はキャッシュを使わない）
+    """
+    companies = []
+    tmp_path = f"{output_csv_path}.tmp"
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # 全ページからテーブルを抽出
-            for page_num, page in enumerate(pdf.pages, 1):
-                print(f"ページ {page_num} を処理中...")
-                tables = page.extract_tables()
-                
-                for table_idx, table in enumerate(tables):
-                    if not table:
-                        continue
-                    
-                    # ヘッダー行を取得（最初の行）
-                    if len(table) == 0:
-                        continue
-                    
-                    # データ行を処理（2行目以降）
-                    for row_idx, row in enumerate(table[1:], 2):
-                        if not row or len(row) < 3:
-                            continue
-                        
-                        # 企業情報を抽出
-                        name = row[0].strip() if row[0] else ''
-                        region = row[1].strip() if len(row) > 1 and row[1] else ''
-                        url = row[2].strip() if len(row) > 2 and row[2] else ''
-                        
-                        # 価格ページURLを収集（4列目以降）
-                        price_urls = []
-                        for col_idx in range(3, len(row)):
-                            price_url = row[col_idx].strip() if row[col_idx] else ''
-                            if price_url and price_url.startswith('http'):
-                                # 重複チェック
-                                if price_url not in price_urls:
-                                    price_urls.append(price_url)
-                        
-                        # 有効な企業情報のみ追加
-                        if name:
-                            companies.append({
-                                '名称': name,
-                                '地域': region,
-                                'URL': url,
-                                '価格ページURL数': len(price_urls),
-                                '価格ページURLs': price_urls
-                            })
-                            
-                            print(f"  - {name} ({region}): {len(price_urls)} URL")
-        
-        # CSVに保存
-        with open(output_csv_path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['名称', '地域', 'URL', '価格ページURL数', '価格ページURLs'])
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
             
-            for company in companies:
-                # URLsを文字列として保存（改行区切り）
-                row = company.copy()
-                row['価格ページURLs'] = '\n'.join(company['価格ページURLs'])
-                writer.writerow(row)
+            # 全ページからテーブルを抽出
+            for page_num, tables in iter_pages(pdf_path, 'tables', workers=workers, cache_dir=cache_dir):
+                print(f"ページ {page_num} を処理中...")
+                page_companies = parse_company_rows(tables)
+                for company in page_companies:
+                    print(f"  - {company['名称']} ({company['地域']}): {company['価格ページURL数']} URL")
+                    # URLsを文字列として保存（改行区切り）
+                    row = company.copy()
+                    row['価格ページURLs'] = '\n'.join(company['価格ページURLs'])
+                    writer.writerow(row)
+                f.flush()
+                companies.extend(page_companies)
+        os.replace(tmp_path, output_csv_path)
         
         print(f"\n✓ {len(companies)} 社の情報を抽出しました")
         print(f"✓ CSVファイルに保存しました: {output_csv_path}")
@@ -72,6 +89,8 @@ def extract_companies_from_pdf(pdf_path, output_csv_path):
         return companies
         
     except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         print(f"エラー: {str(e)}")
         import traceback
         traceback.print_exc()
@@ -96,13 +115,3 @@ if __name__ == '__main__':
         print(f"  - {company['名称']}: {company['価格ページURL数']} URL")
     if len(multi_url_companies) > 10:
         print(f"  ... 他 {len(multi_url_companies) - 10} 社")
-
-
-
-
-
-
-
-
-
-
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格履歴の検索スクリプト
+scrape_prices_v2.py が蓄積した価格履歴（price_history.db）を企業・標準材料名・期間で検索します
+
+使い方:
+    python query_price_history.py --material ピカ銅 --company 東北キング --since 2025-06-01
+    python query_price_history.py --latest
+    python query_price_history.py --report --since 2025-01-01
+    python query_price_history.py --export-parquet price_history_parquet --since 2025-01-01
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+from scrapers.history import HistoryStore, DEFAULT_HISTORY_PATH, COLUMNS
+
+
+def print_report(store: HistoryStore, since=None, until=None):
+    """対象アイテム（target_items.yaml）の材料ごとの価格レポートを表示"""
+    from scrapers.analytics import PriceFrame, material_stats, daily_deltas, regional_spreads, outlier_flags
+    from scrapers.config import load_target_items
+    from scrapers.mappings import resolve_material_name
+
+    try:
+        target_items = load_target_items()
+    except Exception as e:
+        print(f"対象アイテム設定ファイルの読み込みエラー: {e}", file=sys.stderr)
+        target_items = []
+
+    # 対象アイテム名を標準材料名に変換（MATERIAL_MAPPINGにない場合はそのまま）
+    materials = []
+    for item in target_items:
+        name = item.get('name', '')
+        canonical = resolve_material_name(name) or name
+        if canonical not in materials:
+            materials.append(canonical)
+
+    start = time.perf_counter()
+    frame = PriceFrame.from_history(store, start=since, end=until, materials=materials or None)
+    latest = frame.latest()
+    stats = material_stats(latest)
+    spreads = {row['material']: row for row in regional_spreads(latest)}
+    flags, scores = outlier_flags(latest)
+    deltas = daily_deltas(frame)
+    elapsed = time.perf_counter() - start
+
+    print(f"価格レポート（{len(frame):,}件、集計 {elapsed:.3f}秒）")
+    print(f"{'材料':<12} {'件数':>4} {'最高値':>8} {'中央値':>8} {'最安値':>8}  最高値の企業 / 地域間の価格差")
+    for row in stats:
+        spread = spreads.get(row['material'])
+        spread_text = f"{spread['spread']:,.0f}円（{spread['high_region']}〜{spread['low_region']}）" if spread else '-'
+        print(f"{row['material']:<12} {row['count']:>4} {row['max']:>8,.0f} {row['median']:>8,.0f} "
+              f"{row['min']:>8,.0f}  {row['max_company']} / {spread_text}")
+
+    outliers = [i for i, flagged in enumerate(flags) if flagged]
+    if outliers:
+        print("\n外れ値の可能性がある価格:")
+        for i in outliers:
+            print(f"  {latest.companies[latest.company_codes[i]]} {latest.materials[latest.material_codes[i]]}: "
+                  f"{latest.values[i]:,.0f}円（修正Zスコア {scores[i]:.1f}）")
+
+    if deltas:
+        print(f"\n価格変動（直近{min(len(deltas), 20)}件）:")
+        for row in sorted(deltas, key=lambda r: r['date'])[-20:]:
+            print(f"  {row['date']} {row['company']} {row['material']}: "
+                  f"{row['previous']:,.0f} → {row['price']:,.0f}円（{row['delta']:+,.0f}）")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='価格履歴の検索')
+    parser.add_argument('--db', default=str(DEFAULT_HISTORY_PATH), help='価格履歴データベースのパス')
+    parser.add_argument('--company', help='企業名')
+    parser.add_argument('--material', help='標準材料名（例: ピカ銅）')
+    parser.add_argument('--since', help='開始日（例: 2025-06-01）')
+    parser.add_argument('--until', help='終了日（この日を含まない）')
+    parser.add_argument('--latest', action='store_true', help='企業ごとの最新の価格のみ表示')
+    parser.add_argument('--report', action='store_true',
+                        help='対象アイテムの材料ごとの統計・地域間の価格差・外れ値・価格変動を表示')
+    parser.add_argument('--csv', metavar='FILE', help='検索結果をCSVに保存')
+    parser.add_argument('--export-parquet', metavar='DIR', help='月ごとのParquetファイルに書き出す')
+    args = parser.parse_args(argv)
+
+    with HistoryStore(args.db) as store:
+        if args.report:
+            print_report(store, args.since, args.until)
+            return
+
+        if args.export_parquet:
+            files = store.export_parquet(args.export_parquet, start=args.since, end=args.until)
+            print(f"{len(files)} ファイルを {args.export_parquet} に書き出しました")
+            return
+
+        if args.latest:
+            rows = store.latest(args.company)
+            if args.material:
+                rows = [row for row in rows if row['canonical_material'] == args.material]
+        else:
+            rows = store.query(company=args.company, material=args.material, start=args.since, end=args.until)
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"{len(rows)} 件を {args.csv} に保存しました")
+        return
+
+    if not rows:
+        print("該当する価格がありません")
+        return
+    for row in rows:
+        value = '' if row['price_value'] is None else f"{row['price_value']:,.0f}円"
+        print(f"{row['scraped_at'][:16]}  {row['company']:<20} {row['canonical_material']:<12} "
+              f"{value:>10}  ({row['material']}: {row['price_text']})")
+    print(f"\n{len(rows)} 件", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,46 +2,44 @@
 # -*- coding: utf-8 -*-
 """PDFファイルを読み込んで内容を表示"""
 
-import pdfplumber
 import sys
 
-def read_pdf(pdf_path):
-    """PDFファイルを読み込んで内容を表示"""
+from scrapers.pdf_tables import DEFAULT_CACHE_DIR, iter_pages, page_count
+
+def read_pdf(pdf_path, cache_dir=DEFAULT_CACHE_DIR):
+    """PDFファイルを読み込んで内容を表示（ページの抽出結果はpdf_to_csv.pyと共通のキャッシュを使用）"""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            print(f"総ページ数: {len(pdf.pages)}\n")
-            print("=" * 80)
-            
-            # 最初の5ページを読み込む
-            for i, page in enumerate(pdf.pages[:5], 1):
-                print(f"\n--- ページ {i} ---\n")
-                text = page.extract_text()
-                if text:
-                    # 最初の2000文字を表示
-                    print(text[:2000])
-                    if len(text) > 2000:
-                        print(f"\n... (残り {len(text) - 2000} 文字) ...")
-                else:
-                    print("(テキストが抽出できませんでした)")
-                print("\n" + "=" * 80)
-            
-            # 全体のページ数が5ページより多い場合
-            if len(pdf.pages) > 5:
-                print(f"\n... (残り {len(pdf.pages) - 5} ページがあります) ...")
-            
-            # テーブル構造があるか確認
-            print("\n\n=== テーブル構造の確認 ===")
-            for i, page in enumerate(pdf.pages[:3], 1):
-                tables = page.extract_tables()
-                if tables:
-                    print(f"\nページ {i}: {len(tables)} 個のテーブルが見つかりました")
-                    if tables:
-                        # 最初のテーブルの最初の5行を表示
-                        first_table = tables[0]
-                        print(f"  最初のテーブル: {len(first_table)} 行")
-                        print("  最初の5行:")
-                        for row_idx, row in enumerate(first_table[:5], 1):
-                            print(f"    {row_idx}: {row}")
+        total_pages = page_count(pdf_path, cache_dir)
+        print(f"総ページ数: {total_pages}\n")
+        print("=" * 80)
+        
+        # 最初の5ページを読み込む
+        for i, text in iter_pages(pdf_path, 'text', pages=range(1, 6), cache_dir=cache_dir):
+            print(f"\n--- ページ {i} ---\n")
+            if text:
+                # 最初の2000文字を表示
+                print(text[:2000])
+                if len(text) > 2000:
+                    print(f"\n... (残り {len(text) - 2000} 文字) ...")
+            else:
+                print("(テキストが抽出できませんでした)")
+            print("\n" + "=" * 80)
+        
+        # 全体のページ数が5ページより多い場合
+        if total_pages > 5:
+            print(f"\n... (残り {total_pages - 5} ページがあります) ...")
+        
+        # テーブル構造があるか確認
+        print("\n\n=== テーブル構造の確認 ===")
+        for i, tables in iter_pages(pdf_path, 'tables', pages=range(1, 4), cache_dir=cache_dir):
+            if tables:
+                print(f"\nページ {i}: {len(tables)} 個のテーブルが見つかりました")
+                # 最初のテーブルの最初の5行を表示
+                first_table = tables[0]
+                print(f"  最初のテーブル: {len(first_table)} 行")
+                print("  最初の5行:")
+                for row_idx, row in enumerate(first_table[:5], 1):
+                    print(f"    {row_idx}: {row}")
                             
     except Exception as e:
         print(f"エラー: {str(e)}")
@@ -11,7 +11,6 @@ WordPressの相場情報ページから表データを抽出してExcelに出力
     python save_market_prices_to_excel.py --url "https://hitetsunavi.jp/target-page/"
 """
 
-import requests
 from bs4 import BeautifulSoup
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -20,15 +19,14 @@ import os
 import argparse
 import sys
 
+from scrapers.session_pool import get_session
+
 def fetch_and_export(target_url):
     print(f"アクセス中: {target_url} ...")
     
     try:
-        # ヘッダーを設定してブラウザからのアクセスに見せる
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(target_url, headers=headers)
+        # 共有セッション（ブラウザのUser-Agent設定済み）でアクセス
+        response = get_session(target_url).get(target_url, timeout=30)
         response.raise_for_status()
         response.encoding = response.apparent_encoding
     except Exception as e:
@@ -1,23 +1,30 @@
 """
 スクレイパーモジュール
-"""
-
-from .base_scraper import BaseScraper
-from .category1_scraper import Category1Scraper
-from .category2_scraper import Category2Scraper
-
-__all__ = ['BaseScraper', 'Category1Scraper', 'Category2Scraper']
-
-
-
-
-
-
 
+スクレイパーのクラスは初めて参照したときにインポートする（requests・BeautifulSoupの読み込みを遅延）
+scrapers.config・scrapers.priceなどのサブモジュールだけを使う場合は読み込まれない
+"""
 
+import importlib
 
+# クラス名 → 定義しているサブモジュール
+_LAZY_CLASSES = {
+    'BaseScraper': '.base_scraper',
+    'Category1Scraper': '.category1_scraper',
+    'Category2Scraper': '.category2_scraper',
+}
 
+__all__ = ['BaseScraper', 'Category1Scraper', 'Category2Scraper']
 
 
+def __getattr__(name):
+    module_name = _LAZY_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
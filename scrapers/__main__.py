@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+python -m scrapers: スクレイピングの統合コマンド（scrapers/cli.py）
+"""
+
+import logging
+import sys
+
+from .cli import main
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('scrape_log_v2.txt', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格分析モジュール（NumPy）
+価格履歴を列指向の配列（PriceFrame）に読み込み、材料ごとの最高値・最安値・中央値、
+前日比、地域間の価格差、外れ値の判定をまとめて計算する
+
+企業名・地域・材料名は整数コードに変換し、グループ集計はソートと区間集計（reduceat）で行う
+
+使い方:
+    from scrapers.history import HistoryStore
+    from scrapers.analytics import PriceFrame, material_stats
+
+    with HistoryStore() as store:
+        frame = PriceFrame.from_history(store, start='2025-06-01')
+    stats = material_stats(frame.latest())
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 修正Zスコアで外れ値とみなす閾値
+OUTLIER_THRESHOLD = 3.5
+
+
+def _encode(values: Iterable) -> tuple:
+    """文字列の列を (ラベルの配列, 整数コードの配列) に変換"""
+    labels, codes = np.unique(np.asarray([value or '' for value in values], dtype=object), return_inverse=True)
+    return labels, codes.astype(np.int32)
+
+
+def _group_bounds(sorted_keys: List[np.ndarray]) -> tuple:
+    """ソート済みのキー列からグループの (開始位置, 終了位置) を求める"""
+    n = len(sorted_keys[0])
+    change = np.zeros(n, dtype=bool)
+    if n:
+        change[0] = True
+    for keys in sorted_keys:
+        change[1:] |= keys[1:] != keys[:-1]
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], n)
+    return starts, ends
+
+
+def _group_median(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """コードごとの中央値（該当なしのグループはNaN）"""
+    medians = np.full(n_groups, np.nan)
+    if not len(values):
+        return medians
+    order = np.lexsort((values, codes))
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+    starts, ends = _group_bounds([sorted_codes])
+    counts = ends - starts
+    lower = sorted_values[starts + (counts - 1) // 2]
+    upper = sorted_values[starts + counts // 2]
+    medians[sorted_codes[starts]] = (lower + upper) / 2
+    return medians
+
+
+class PriceFrame:
+    """列指向の価格データ（1行 = 1企業・1材料・1取得）"""
+
+    def __init__(self, timestamps: np.ndarray, company_codes: np.ndarray, companies: np.ndarray,
+                 region_codes: np.ndarray, regions: np.ndarray, material_codes: np.ndarray,
+                 materials: np.ndarray, values: np.ndarray, price_texts: np.ndarray):
+        self.timestamps = timestamps
+        self.company_codes = company_codes
+        self.companies = companies
+        self.region_codes = region_codes
+        self.regions = regions
+        self.material_codes = material_codes
+        self.materials = materials
+        self.values = values
+        self.price_texts = price_texts
+
+    @classmethod
+    def from_columns(cls, scraped_at: Iterable[str], company: Iterable[str], region: Iterable[str],
+                     material: Iterable[str], value: Iterable[Optional[float]],
+                     price_text: Optional[Iterable[str]] = None) -> 'PriceFrame':
+        """
+        列ごとのリストから作成（価格が数値でない行は除外）
+
+        Args:
+            scraped_at: 取得日時（ISO形式の文字列）
+            company: 企業名
+            region: 地域
+            material: 材料名（標準材料名）
+            value: 価格の数値
+            price_text: 価格の元の文字列
+        """
+        values = np.array([np.nan if v is None else v for v in value], dtype=np.float64)
+        keep = ~np.isnan(values)
+        scraped_at = np.asarray(list(scraped_at), dtype=object)[keep]
+        price_texts = np.asarray(list(price_text) if price_text is not None else values.astype(str),
+                                 dtype=object)[keep]
+
+        timestamps = np.array([str(t) for t in scraped_at], dtype='datetime64[us]')
+        companies, company_codes = _encode(np.asarray(list(company), dtype=object)[keep])
+        regions, region_codes = _encode(np.asarray(list(region), dtype=object)[keep])
+        materials, material_codes = _encode(np.asarray(list(material), dtype=object)[keep])
+        return cls(timestamps, company_codes, companies, region_codes, regions,
+                   material_codes, materials, values[keep], price_texts)
+
+    @classmethod
+    def from_records(cls, records: List[Dict], material_key: str = 'canonical_material') -> 'PriceFrame':
+        """辞書のリスト（HistoryStore.query()の結果など）から作成"""
+        return cls.from_columns(
+            [r['scraped_at'] for r in records],
+            [r['company'] for r in records],
+            [r.get('region', '') for r in records],
+            [r[material_key] for r in records],
+            [r['price_value'] for r in records],
+            [r.get('price_text', '') for r in records],
+        )
+
+    @classmethod
+    def from_history(cls, store, start=None, end=None, materials: Optional[Iterable[str]] = None) -> 'PriceFrame':
+        """
+        価格履歴ストアから期間を指定して読み込む
+
+        Args:
+            store: HistoryStore
+            start: 開始日時
+            end: 終了日時
+            materials: 対象の標準材料名（Noneの場合はすべて）
+        """
+        from .history import COLUMNS
+        rows = store.query_rows(start=start, end=end)
+        if materials is not None:
+            wanted = set(materials)
+            material_index = COLUMNS.index('canonical_material')
+            rows = [row for row in rows if row[material_index] in wanted]
+        columns = dict(zip(COLUMNS, zip(*rows))) if rows else {column: () for column in COLUMNS}
+        return cls.from_columns(columns['scraped_at'], columns['company'], columns['region'],
+                                columns['canonical_material'], columns['price_value'], columns['price_text'])
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def take(self, index: np.ndarray) -> 'PriceFrame':
+        """指定した行だけのPriceFrame（ラベルは共有）"""
+        return PriceFrame(self.timestamps[index], self.company_codes[index], self.companies,
+                          self.region_codes[index], self.regions, self.material_codes[index],
+                          self.materials, self.values[index], self.price_texts[index])
+
+    def latest(self) -> 'PriceFrame':
+        """企業・材料ごとに最新の取得結果のみを残す"""
+        if not len(self):
+            return self
+        order = np.lexsort((self.timestamps, self.material_codes, self.company_codes))
+        _, ends = _group_bounds([self.company_codes[order], self.material_codes[order]])
+        return self.take(order[ends - 1])
+
+
+def material_stats(frame: PriceFrame) -> List[Dict]:
+    """
+    材料ごとの企業間の価格統計（最高値・最安値・中央値・平均・件数、最高値の企業）
+
+    同じ企業の複数回の取得を含む場合は、先にframe.latest()で最新のみにすること
+
+    Returns:
+        材料名順の辞書のリスト
+    """
+    n = len(frame)
+    if not n:
+        return []
+    # 材料 → 価格 → 元の順序（同値の場合は先の行を最高値とする）の順にソート
+    order = np.lexsort((-np.arange(n), frame.values, frame.material_codes))
+    codes = frame.material_codes[order]
+    values = frame.values[order]
+    starts, ends = _group_bounds([codes])
+    counts = ends - starts
+    top = order[ends - 1]
+    medians = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    means = np.add.reduceat(values, starts) / counts
+
+    return [
+        {
+            'material': frame.materials[codes[start]],
+            'count': int(count),
+            'max': float(values[end - 1]),
+            'min': float(values[start]),
+            'median': float(median),
+            'mean': float(mean),
+            'max_company': frame.companies[frame.company_codes[top_index]],
+            'max_region': frame.regions[frame.region_codes[top_index]],
+            'max_price_text': frame.price_texts[top_index],
+        }
+        for start, end, count, median, mean, top_index in zip(starts, ends, counts, medians, means, top)
+    ]
+
+
+def daily_deltas(frame: PriceFrame) -> List[Dict]:
+    """
+    企業・材料ごとの前回取得日からの価格変化（1日の最後の取得値で比較）
+
+    Returns:
+        価格が変化した行の辞書のリスト（企業・材料・日付順）
+    """
+    if not len(frame):
+        return []
+    days = frame.timestamps.astype('datetime64[D]')
+    order = np.lexsort((frame.timestamps, days, frame.material_codes, frame.company_codes))
+    companies = frame.company_codes[order]
+    materials = frame.material_codes[order]
+    days_sorted = days[order]
+    _, ends = _group_bounds([companies, materials, days_sorted])
+    last = ends - 1
+
+    companies = companies[last]
+    materials = materials[last]
+    days_sorted = days_sorted[last]
+    values = frame.values[order][last]
+
+    same_series = np.zeros(len(values), dtype=bool)
+    same_series[1:] = (companies[1:] == companies[:-1]) & (materials[1:] == materials[:-1])
+    previous = np.full(len(values), np.nan)
+    previous[1:] = values[:-1]
+    previous[~same_series] = np.nan
+    deltas = values - previous
+    changed = np.flatnonzero(same_series & (deltas != 0))
+
+    return [
+        {
+            'company': frame.companies[companies[i]],
+            'material': frame.materials[materials[i]],
+            'date': str(days_sorted[i]),
+            'price': float(values[i]),
+            'previous': float(previous[i]),
+            'delta': float(deltas[i]),
+            'pct': float(deltas[i] / previous[i] * 100) if previous[i] else None,
+        }
+        for i in changed
+    ]
+
+
+def regional_spreads(frame: PriceFrame) -> List[Dict]:
+    """
+    材料ごとの地域間の価格差（地域ごとの平均価格の最大 - 最小）
+
+    Returns:
+        材料名順の辞書のリスト（地域が1つだけの材料は除外）
+    """
+    if not len(frame):
+        return []
+    order = np.lexsort((frame.region_codes, frame.material_codes))
+    materials = frame.material_codes[order]
+    regions = frame.region_codes[order]
+    values = frame.values[order]
+    starts, ends = _group_bounds([materials, regions])
+    region_means = np.add.reduceat(values, starts) / (ends - starts)
+    group_materials = materials[starts]
+    group_regions = regions[starts]
+
+    # 材料ごとに地域平均の最大・最小を求める
+    m_order = np.lexsort((region_means, group_materials))
+    m_starts, m_ends = _group_bounds([group_materials[m_order]])
+    spreads = []
+    for start, end in zip(m_starts, m_ends):
+        if end - start < 2:
+            continue
+        low, high = m_order[start], m_order[end - 1]
+        spreads.append({
+            'material': frame.materials[group_materials[low]],
+            'spread': float(region_means[high] - region_means[low]),
+            'high_region': frame.regions[group_regions[high]],
+            'high_mean': float(region_means[high]),
+            'low_region': frame.regions[group_regions[low]],
+            'low_mean': float(region_means[low]),
+            'region_count': int(end - start),
+        })
+    return spreads
+
+
+def outlier_flags(frame: PriceFrame, threshold: float = OUTLIER_THRESHOLD) -> tuple:
+    """
+    材料ごとの中央値からの修正Zスコア（0.6745 × 偏差 / MAD）で外れ値を判定
+
+    Returns:
+        (外れ値フラグの配列, 修正Zスコアの配列) いずれもframeの行順
+    """
+    n_materials = len(frame.materials)
+    medians = _group_median(frame.material_codes, frame.values, n_materials)
+    deviations = np.abs(frame.values - medians[frame.material_codes])
+    mads = _group_median(frame.material_codes, deviations, n_materials)[frame.material_codes]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(mads > 0, 0.6745 * deviations / mads, np.where(deviations > 0, np.inf, 0.0))
+    return scores > threshold, scores
+
+
+def max_prices_table(frame: PriceFrame) -> List[Dict]:
+    """材料ごとの最高価格（Webアプリの最高価格一覧の形式）"""
+    return [
+        {
+            'material': stats['material'],
+            'max_price': stats['max_price_text'],
+            'max_price_value': stats['max'],
+            'company': stats['max_company'],
+            'region': stats['max_region'],
+        }
+        for stats in material_stats(frame)
+    ]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+非同期HTTPバックエンド（aiohttp）
+1スレッドで多数のサイトを同時に取得する。結果の形式はBaseScraper.scrape()と同じ
+
+- ホストごとの同時接続数の上限（同じホストへの連続アクセスはdelay秒ずつ間隔を空ける）
+- 全体の同時接続数の上限
+- リクエストごとのタイムアウトと、全体のタイムアウト（超過したサイトはエラー結果になる）
+
+使い方:
+    from scrapers.async_backend import run_scrapers_async
+
+    results = run_scrapers_async(scrapers, per_host_limit=2, total_timeout=600)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .resilience import is_transient_status
+from .session_pool import DEFAULT_USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+# aiohttpは非同期バックエンドを使う場合のみインポートする（起動時間の短縮）
+AIOHTTP_AVAILABLE = importlib.util.find_spec('aiohttp') is not None
+
+
+class AsyncFetcher:
+    """aiohttpのセッションと、ホストごとの同時接続数の制御をまとめたもの"""
+
+    def __init__(self, per_host_limit: int = 2, max_in_flight: int = 100,
+                 request_timeout: float = 30.0, user_agent: str = DEFAULT_USER_AGENT):
+        """
+        Args:
+            per_host_limit: 1ホストあたりの同時リクエスト数
+            max_in_flight: 全体の同時リクエスト数
+            request_timeout: 1リクエストのタイムアウト（秒）
+            user_agent: User-Agentヘッダー
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttpがインストールされていません。pip install aiohttp を実行してください")
+        self.per_host_limit = per_host_limit
+        self.max_in_flight = max_in_flight
+        self.request_timeout = request_timeout
+        self.user_agent = user_agent
+        self.session: Optional['aiohttp.ClientSession'] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=300,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            headers={'User-Agent': self.user_agent},
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """URLのホストの同時リクエスト数を制限するセマフォ"""
+        host = urlparse(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def fetch(self, url: str, timer=None, delay: float = 0.0,
+                    timeout: Optional[float] = None) -> Tuple[bytes, Dict]:
+        """
+        URLの本文とレスポンスヘッダーを取得
+
+        Args:
+            url: 取得するURL
+            timer: 処理時間を記録するPhaseTimer
+            delay: 同じホストへの次のリクエストまでの待機時間（秒）
+            timeout: このリクエストのタイムアウト（秒、Noneの場合はrequest_timeout）
+
+        Returns:
+            (本文のバイト列, レスポンスヘッダー)
+        """
+        async with self.host_semaphore(url):
+            start = time.perf_counter()
+            options = {}
+            if timeout is not None:
+                import aiohttp
+                options['timeout'] = aiohttp.ClientTimeout(total=timeout)
+            async with self.session.get(url, **options) as response:
+                connected = time.perf_counter()
+                response.raise_for_status()
+                content = await response.read()
+                headers = response.headers
+            if timer is not None:
+                timer.add('connect', connected - start, start=start, url=url)
+                timer.add('download', time.perf_counter() - connected, start=connected, url=url)
+
+            # サーバー負荷軽減のため、ホストの枠を確保したまま待機
+            if delay:
+                wait_start = time.perf_counter()
+                await asyncio.sleep(delay)
+                if timer is not None:
+                    timer.add('wait', time.perf_counter() - wait_start, start=wait_start, url=url)
+        return content, headers
+
+
+def is_transient_error(error: Exception) -> bool:
+    """aiohttpの例外のうちリトライすべきもの（接続エラー・タイムアウト・一時的なHTTPエラー）"""
+    import aiohttp
+
+    if isinstance(error, aiohttp.ClientResponseError):
+        return is_transient_status(error.status)
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+async def scrape_all_async(scrapers: List, filter_target_items: bool = False,
+                           target_items_config: List[Dict] = None, per_host_limit: int = 2,
+                           max_in_flight: int = 100, request_timeout: float = 30.0,
+                           total_timeout: Optional[float] = None) -> List[Dict]:
+    """
+    複数のスクレイパーを同時に実行
+
+    Args:
+        scrapers: BaseScraperのリスト
+        filter_target_items: 対象アイテムのみを抽出するか
+        target_items_config: 対象アイテムの設定リスト
+        per_host_limit: 1ホストあたりの同時リクエスト数
+        max_in_flight: 全体の同時リクエスト数
+        request_timeout: 1リクエストのタイムアウト（秒）
+        total_timeout: 全体のタイムアウト（秒、Noneなら無制限）
+
+    Returns:
+        スクレイピング結果のリスト（scrapersと同じ順序）
+    """
+    async with AsyncFetcher(per_host_limit, max_in_flight, request_timeout) as fetcher:
+        tasks = [
+            asyncio.ensure_future(scraper.scrape_async(fetcher, filter_target_items, target_items_config))
+            for scraper in scrapers
+        ]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, timeout=total_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"全体のタイムアウト（{total_timeout}秒）: {len(pending)} 社の取得を中断しました")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for scraper, task in zip(scrapers, tasks):
+        if task in pending:
+            results.append(scraper.error_result('タイムアウト', url=', '.join(scraper.get_price_urls())))
+        elif task.exception() is not None:
+            error = task.exception()
+            logger.error(f"エラー: {scraper.site_config.get('name', '')} - {str(error)}")
+            results.append(scraper.error_result(str(error)))
+        else:
+            results.append(task.result())
+    return results
+
+
+def run_scrapers_async(scrapers: List, **options) -> List[Dict]:
+    """scrape_all_asyncを同期的に実行（引数はscrape_all_asyncと同じ）"""
+    return asyncio.run(scrape_all_async(scrapers, **options))
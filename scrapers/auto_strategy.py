@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自動抽出（extractor_type: auto）の抽出方法の学習
+自動抽出はMP-value → テーブル → div → リスト → すべての要素 の順にページ全体を走査するため、
+ページのURLごとに価格を取得できた方法と、その方法を適用する範囲（CSSセレクタ）を
+キャッシュ（config/strategy_cache.json）に記録し、次回以降はその方法だけを範囲内に適用する
+
+範囲は価格を取得した要素の共通の祖先から上にたどり、ページ内で一意に選択できて
+（id・class）、ページ全体に適用した場合と同じ価格が得られる最初の要素にする
+（見つからない場合はページ全体）
+
+判定の手がかりは utils/html_analyzer.py の analyze_html_structure と同じ
+（MP-value・テーブル・価格関連のdiv・リスト・価格パターン）
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 自動抽出の方法（試す順序）→ Category2Scraper._auto_<方法>
+AUTO_STRATEGIES = ('mp_value', 'table', 'div', 'list', 'generic')
+
+# 学習した抽出方法の保存先（文字コードのキャッシュと同じconfigディレクトリ）
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / 'config' / 'strategy_cache.json'
+
+# 範囲の候補として確認する祖先の数の上限（学習時のみ）
+MAX_SCOPE_CANDIDATES = 8
+
+
+def _ancestors(element) -> List:
+    """要素自身とその祖先（近い順、BeautifulSoupオブジェクト自体は含まない）"""
+    chain = [element]
+    chain.extend(parent for parent in element.parents if parent.name != '[document]')
+    return chain
+
+
+def common_ancestor(elements: List):
+    """要素の共通の祖先のうち最も近いもの（要素がない場合はNone）"""
+    if not elements:
+        return None
+    common = _ancestors(elements[0])
+    for element in elements[1:]:
+        ids = {id(ancestor) for ancestor in _ancestors(element)}
+        common = [ancestor for ancestor in common if id(ancestor) in ids]
+    return common[0] if common else None
+
+
+def element_selector(element) -> Optional[str]:
+    """要素のCSSセレクタ（idまたはclassがない場合はNone）"""
+    if element.get('id'):
+        return f'{element.name}[id="{element["id"]}"]'
+    classes = [name for name in element.get('class') or [] if '"' not in name]
+    if classes:
+        return element.name + ''.join(f'[class~="{name}"]' for name in classes)
+    return None
+
+
+def select_scope(soup, selector: Optional[str]):
+    """学習した範囲（セレクタがない場合はページ全体、見つからない場合はNone）"""
+    if not selector:
+        return soup
+    try:
+        return soup.select_one(selector)
+    except Exception as e:
+        logger.debug(f"範囲のセレクタが不正です: {selector} - {e}")
+        return None
+
+
+def learn_scope(soup, elements: List, prices: Dict[str, str],
+                extract: Callable[[object], Dict[str, str]]) -> Optional[str]:
+    """
+    抽出方法を適用する範囲のセレクタを求める
+
+    Args:
+        soup: ページ全体
+        elements: 価格を取得した要素
+        prices: ページ全体から取得した価格
+        extract: 範囲を受け取り、同じ方法で価格を抽出する関数
+
+    Returns:
+        セレクタ（ページ全体に適用する必要がある場合はNone）
+    """
+    ancestor = common_ancestor(elements)
+    if ancestor is None:
+        return None
+    candidates = 0
+    for element in _ancestors(ancestor):
+        if element.name in ('html', 'body') or candidates >= MAX_SCOPE_CANDIDATES:
+            break
+        selector = element_selector(element)
+        if selector is None:
+            continue
+        candidates += 1
+        try:
+            matches = soup.select(selector, limit=2)
+        except Exception:
+            continue
+        if len(matches) == 1 and matches[0] is element and extract(element) == prices:
+            return selector
+    return None
+
+
+class StrategyCache:
+    """ページ（URL）ごとに学習した自動抽出の方法のキャッシュ"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"抽出方法のキャッシュの読み込みエラー: {self.path} - {str(e)}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, url: str) -> Optional[Dict]:
+        """学習した方法（{'strategy', 'selector', 'learned_at'}、未学習・不明な方法の場合はNone）"""
+        entry = self._load().get(url)
+        if not entry or entry.get('strategy') not in AUTO_STRATEGIES:
+            return None
+        return entry
+
+    def set(self, url: str, strategy: str, selector: Optional[str]):
+        """方法を記録（変更があった場合のみファイルに保存）"""
+        entries = self._load()
+        entry = entries.get(url)
+        if entry and entry.get('strategy') == strategy and entry.get('selector') == selector:
+            return
+        logger.info(f"自動抽出の方法を学習: {strategy}（範囲: {selector or 'ページ全体'}）: {url}")
+        entries[url] = {'strategy': strategy, 'selector': selector, 'learned_at': datetime.now().isoformat()}
+        self._save()
+
+    def discard(self, url: str):
+        """学習した方法を削除"""
+        if self._load().pop(url, None) is not None:
+            self._save()
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"抽出方法のキャッシュの保存エラー: {self.path} - {str(e)}")
+
+
+_default_cache: Optional[StrategyCache] = None
+
+
+def get_strategy_cache() -> StrategyCache:
+    """プロセス共通の抽出方法のキャッシュを取得"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StrategyCache()
+    return _default_cache
@@ -6,55 +6,141 @@
 """
 
 import time
+import asyncio
 import logging
 from typing import Dict, Optional, List
 from datetime import datetime
+from urllib.parse import urlparse
 import requests
 from bs4 import BeautifulSoup
 
+from .auto_strategy import get_strategy_cache
+from .encoding import resolve_encoding, get_encoding_cache
+from .price import as_price
+from .resilience import (
+    DEFAULT_MAX_ATTEMPTS, DEFAULT_REQUEST_TIMEOUT, DEFAULT_SITE_BUDGET, MODE_PROBE, MODE_SKIP,
+    Deadline, DeadlineExceeded, call_with_retries, call_with_retries_async, is_transient_status, site_budget,
+)
+from .session_pool import get_session
+from .timing import PhaseTimer
+
 logger = logging.getLogger(__name__)
 
 
+def is_transient_request_error(error: Exception) -> bool:
+    """requestsの例外のうちリトライすべきもの（接続エラー・タイムアウト・一時的なHTTPエラー）"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        return is_transient_status(getattr(error.response, 'status_code', None))
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
 class BaseScraper:
     """すべてのスクレイパーの基底クラス"""
     
-    def __init__(self, site_config: Dict, delay: float = 2.0):
+    def __init__(self, site_config: Dict, delay: float = 2.0, breaker=None,
+                 budget: float = DEFAULT_SITE_BUDGET):
         """
         Args:
             site_config: サイト設定辞書
             delay: リクエスト間の待機時間（秒）
+            breaker: ホストごとのCircuitBreaker（scrapers/resilience.py、Noneの場合は使わない）
+            budget: サイトの取得期限（秒、sites.yamlのfetch_budgetが優先）
         """
         self.site_config = site_config
         self.delay = delay
-        self.session = requests.Session()
-        self.setup_headers()
+        self.breaker = breaker
+        self.budget = budget
+        self.timer = PhaseTimer(site_config.get('name', ''))
+        self.encoding_cache = get_encoding_cache()
+        self.strategy_cache = get_strategy_cache()
+        # 抽出中のページのURL（自動抽出の方法の学習のキー）
+        self.page_url = ''
+    
+    def new_deadline(self) -> Deadline:
+        """このサイトの取得期限（すべての価格ページで共有）"""
+        return Deadline(site_budget(self.site_config, self.budget))
+    
+    def _fetch_options(self, url: str) -> Optional[Dict]:
+        """
+        サーキットブレーカーの状態に応じたリクエスト回数とタイムアウト
+        （この実行で確認に失敗したホストの場合はNone）
+        """
+        mode = self.breaker.mode(url) if self.breaker else None
+        if mode == MODE_SKIP:
+            logger.warning(f"  サーキットブレーカー: 応答のないホストのため省略: {url}")
+            return None
+        if mode == MODE_PROBE:
+            logger.info(f"  サーキットブレーカー: 連続{self.breaker.failures(url)}回失敗したホストを簡易確認: {url}")
+            return {'max_attempts': 1, 'request_timeout': self.breaker.probe_timeout}
+        return {'max_attempts': DEFAULT_MAX_ATTEMPTS, 'request_timeout': DEFAULT_REQUEST_TIMEOUT}
     
-    def setup_headers(self):
-        """HTTPヘッダーを設定"""
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def _record_outcome(self, url: str, error: Optional[Exception], is_transient):
+        """
+        ホストの応答をサーキットブレーカーに記録
+        （一時的でないHTTPエラーはホストが応答したとみなし、リクエスト前に期限を超えた場合は記録しない）
+        """
+        if self.breaker is None or isinstance(error, DeadlineExceeded):
+            return
+        if error is None or not is_transient(error):
+            self.breaker.record_success(url)
+        else:
+            self.breaker.record_failure(url, f"{type(error).__name__}: {error}")
     
-    def fetch_html(self, url: str) -> Optional[BeautifulSoup]:
+    def fetch_html(self, url: str, deadline: Optional[Deadline] = None) -> Optional[BeautifulSoup]:
         """
         URLからHTMLを取得してBeautifulSoupオブジェクトを返す
+        一時的なエラーは取得期限内でリトライする（リトライ間隔はジッター付きの指数バックオフ）
         
         Args:
             url: 取得するURL
+            deadline: サイトの取得期限（Noneの場合はこのURLだけの期限）
             
         Returns:
             BeautifulSoupオブジェクト、エラー時はNone
         """
+        deadline = deadline or self.new_deadline()
+        options = self._fetch_options(url)
+        if options is None:
+            return None
+        
+        def request(timeout):
+            response = get_session(url).get(url, timeout=timeout, stream=True)
+            try:
+                response.raise_for_status()
+            except Exception:
+                # リトライする場合も本文を読まない応答は閉じて接続をプールに戻す
+                response.close()
+                raise
+            return response
+        
         try:
             logger.info(f"アクセス中: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            response.encoding = response.apparent_encoding or 'utf-8'
+            # 接続〜レスポンスヘッダー受信（DNS・TLSハンドシェイク・リトライを含む）
+            try:
+                with self.timer.phase('connect', url=url):
+                    response = call_with_retries(request, deadline, is_transient_request_error, **options)
+            except Exception as e:
+                self._record_outcome(url, e, is_transient_request_error)
+                raise
+            self._record_outcome(url, None, is_transient_request_error)
+            
+            # 本文のダウンロード
+            with self.timer.phase('download', url=url):
+                try:
+                    content = response.content
+                finally:
+                    response.close()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            time.sleep(self.delay)  # サーバー負荷軽減のため待機
+            soup = self.parse_html(url, content, response.headers)
+            
+            with self.timer.phase('wait', url=url):
+                time.sleep(self.delay)  # サーバー負荷軽減のため待機
             return soup
             
+        except DeadlineExceeded as e:
+            logger.error(f"エラー: {url} - {str(e)}")
+            return None
         except requests.exceptions.RequestException as e:
             logger.error(f"エラー: {url} - {str(e)}")
             return None
@@ -62,6 +148,71 @@ class BaseScraper:
             logger.error(f"予期しないエラー: {url} - {str(e)}")
             return None
     
+    async def fetch_html_async(self, url: str, fetcher, deadline: Optional[Deadline] = None) -> Optional[BeautifulSoup]:
+        """
+        非同期バックエンドでURLからHTMLを取得してBeautifulSoupオブジェクトを返す
+        （期限・リトライ・サーキットブレーカーはfetch_htmlと同じ）
+        
+        Args:
+            url: 取得するURL
+            fetcher: AsyncFetcher（scrapers/async_backend.py）
+            deadline: サイトの取得期限（Noneの場合はこのURLだけの期限）
+            
+        Returns:
+            BeautifulSoupオブジェクト、エラー時はNone
+        """
+        from .async_backend import is_transient_error
+        
+        deadline = deadline or self.new_deadline()
+        options = self._fetch_options(url)
+        if options is None:
+            return None
+        
+        async def request(timeout):
+            return await fetcher.fetch(url, timer=self.timer, delay=self.delay, timeout=timeout)
+        
+        try:
+            logger.info(f"アクセス中: {url}")
+            try:
+                content, headers = await call_with_retries_async(request, deadline, is_transient_error, **options)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._record_outcome(url, e, is_transient_error)
+                raise
+            self._record_outcome(url, None, is_transient_error)
+            return self.parse_html(url, content, headers)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"エラー: {url} - {type(e).__name__}: {str(e)}")
+            return None
+    
+    def parse_html(self, url: str, content: bytes, headers=None) -> BeautifulSoup:
+        """
+        取得したバイト列の文字コードを判定してパース（同期・非同期バックエンド共通）
+        
+        Args:
+            url: 取得元のURL（文字コードキャッシュのキー）
+            content: レスポンス本文
+            headers: HTTPレスポンスヘッダー
+            
+        Returns:
+            BeautifulSoupオブジェクト
+        """
+        # ヘッダー → <meta charset> → 学習済みの文字コード → 自動判定 の順に判定
+        with self.timer.phase('encoding', url=url):
+            encoding, source = resolve_encoding(
+                content, headers,
+                cache=self.encoding_cache, cache_key=urlparse(url).netloc
+            )
+        logger.debug(f"文字コード: {encoding}（{source}）: {url}")
+        
+        # デコードせずにバイト列のままlxmlに渡す（html.parserより高速）
+        # 抽出結果がhtml.parserと同じであることはtest_encoding.pyでhtml_samplesを使って確認している
+        with self.timer.phase('parse', url=url):
+            return BeautifulSoup(content, 'lxml', from_encoding=encoding)
+    
     def extract_prices(self, soup: BeautifulSoup) -> Dict[str, any]:
         """
         価格情報を抽出する（サブクラスで実装）
@@ -74,6 +225,22 @@ class BaseScraper:
         """
         raise NotImplementedError("サブクラスで実装してください")
     
+    def frame_url(self, url: str, soup: BeautifulSoup) -> Optional[str]:
+        """
+        価格が別のページ（iframeなど）に表示されている場合、そのページのURL（サブクラスで実装）
+        
+        価格のページは取得元のページと同じ取得期限・リトライ・待機時間で取得する
+        （非同期バックエンドではイベントループを止めないようにAsyncFetcherで取得）
+        
+        Args:
+            url: 取得元のページのURL
+            soup: 取得元のページ
+            
+        Returns:
+            価格のページのURL（取得元のページから抽出する場合はNone）
+        """
+        return None
+    
     def clean_price(self, price_text: str) -> str:
         """
         価格テキストをクリーンアップ
@@ -220,6 +387,27 @@ class BaseScraper:
         
         return filtered_prices
     
+    def get_price_urls(self) -> List[str]:
+        """価格ページのURLリスト（price_urls、なければprice_url/url）"""
+        price_urls = self.site_config.get('price_urls', [])
+        if not price_urls:
+            # price_urlsが設定されていない場合は、price_urlを使用
+            price_url = self.site_config.get('price_url', self.site_config.get('url', ''))
+            if price_url:
+                price_urls = [price_url]
+        return price_urls
+    
+    def error_result(self, error: str, url: str = '') -> Dict[str, any]:
+        """取得に失敗した場合の結果の辞書"""
+        return {
+            'scraped_at': datetime.now().isoformat(),
+            'url': url,
+            'company_name': self.site_config.get('name', ''),
+            'region': self.site_config.get('region', ''),
+            'error': error,
+            'prices': {}
+        }
+    
     def scrape(self, filter_target_items: bool = False, target_items_config: List[Dict] = None) -> Dict[str, any]:
         """
         スクレイピングを実行
@@ -231,42 +419,105 @@ class BaseScraper:
         Returns:
             スクレイピング結果の辞書
         """
+        self.timer.reset()
+        
         # 複数URL対応
-        price_urls = self.site_config.get('price_urls', [])
+        price_urls = self.get_price_urls()
         if not price_urls:
-            # price_urlsが設定されていない場合は、price_urlを使用
-            price_url = self.site_config.get('price_url', self.site_config.get('url', ''))
-            if price_url:
-                price_urls = [price_url]
+            return self.error_result('URLが設定されていません')
+        
+        pages = []
+        deadline = self.new_deadline()
+        for url in price_urls:
+            soup = self.fetch_html(url, deadline)
+            if soup is None:
+                logger.warning(f"HTML取得失敗: {url}")
+                continue
+            frame_url = self.frame_url(url, soup)
+            if frame_url:
+                soup = self._frame_or_page(frame_url, self.fetch_html(frame_url, deadline), soup)
+            pages.append((url, self.extract_page(url, soup)))
         
+        return self.build_result(price_urls, pages, filter_target_items, target_items_config)
+    
+    async def scrape_async(self, fetcher, filter_target_items: bool = False,
+                           target_items_config: List[Dict] = None) -> Dict[str, any]:
+        """
+        非同期バックエンドでスクレイピングを実行（結果の形式はscrape()と同じ）
+        
+        Args:
+            fetcher: AsyncFetcher（scrapers/async_backend.py）
+            filter_target_items: 対象アイテムのみを抽出するか
+            target_items_config: 対象アイテムの設定リスト
+            
+        Returns:
+            スクレイピング結果の辞書
+        """
+        self.timer.reset()
+        
+        price_urls = self.get_price_urls()
         if not price_urls:
-            return {
-                'scraped_at': datetime.now().isoformat(),
-                'url': '',
-                'error': 'URLが設定されていません',
-                'prices': {}
-            }
-        
-        # すべてのURLから価格情報を取得して統合
-        all_prices = {}
-        urls_used = []
+            return self.error_result('URLが設定されていません')
         
+        pages = []
+        deadline = self.new_deadline()
         for url in price_urls:
-            soup = self.fetch_html(url)
+            soup = await self.fetch_html_async(url, fetcher, deadline)
             if soup is None:
                 logger.warning(f"HTML取得失敗: {url}")
                 continue
+            frame_url = self.frame_url(url, soup)
+            if frame_url:
+                soup = self._frame_or_page(frame_url, await self.fetch_html_async(frame_url, fetcher, deadline), soup)
+            pages.append((url, self.extract_page(url, soup)))
+        
+        return self.build_result(price_urls, pages, filter_target_items, target_items_config)
+    
+    @staticmethod
+    def _frame_or_page(frame_url: str, frame_soup: Optional[BeautifulSoup], soup: BeautifulSoup) -> BeautifulSoup:
+        """価格のページを取得できなかった場合は取得元のページから抽出する"""
+        if frame_soup is None:
+            logger.warning(f"価格のページの取得失敗（取得元のページから抽出します）: {frame_url}")
+            return soup
+        return frame_soup
+    
+    def extract_page(self, url: str, soup: BeautifulSoup) -> Dict[str, str]:
+        """1ページ分の価格情報を抽出（処理時間を計測）"""
+        self.page_url = url
+        try:
+            with self.timer.phase('extract', url=url):
+                return self.extract_prices(soup)
+        finally:
+            self.page_url = ''
+    
+    def build_result(self, price_urls: List[str], pages: List, filter_target_items: bool = False,
+                     target_items_config: List[Dict] = None) -> Dict[str, any]:
+        """
+        ページごとの価格情報を統合して結果の辞書を作成
+        
+        Args:
+            price_urls: 設定上のURLリスト
+            pages: 取得できたページの (URL, 価格情報の辞書) のリスト
+            filter_target_items: 対象アイテムのみを抽出するか
+            target_items_config: 対象アイテムの設定リスト
             
+        Returns:
+            スクレイピング結果の辞書
+        """
+        # すべてのURLの価格情報を統合
+        all_prices = {}
+        urls_used = []
+        
+        for url, page_prices in pages:
             urls_used.append(url)
-            page_prices = self.extract_prices(soup)
-            
-            # 既存の価格と統合（重複する場合は上書き）
+            # 既存の価格と統合（重複する場合は上書き）、価格文字列はここで1回だけ解析する
             for material, price in page_prices.items():
-                all_prices[material] = price
+                all_prices[material] = as_price(price)
         
         # 対象アイテムのみをフィルタリング
         if filter_target_items and target_items_config:
-            all_prices = self.filter_target_items(all_prices, target_items_config)
+            with self.timer.phase('filter'):
+                all_prices = self.filter_target_items(all_prices, target_items_config)
         
         # メインURLを決定（最初のURL）
         main_url = urls_used[0] if urls_used else price_urls[0]
@@ -277,6 +528,6 @@ class BaseScraper:
             'urls': urls_used,  # 実際に取得したURLのリスト
             'company_name': self.site_config.get('name', ''),
             'region': self.site_config.get('region', ''),
-            'prices': all_prices
+            'prices': all_prices,
+            'timings': self.timer.summary()  # フェーズごとの処理時間（秒）
         }
-
@@ -5,14 +5,29 @@
 リスト形式またはdiv構造で価格情報が表示されているサイト用
 """
 
-from typing import Dict
+import logging
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
+from .auto_strategy import AUTO_STRATEGIES, learn_scope, select_scope
 from .base_scraper import BaseScraper
+from .selector_extractor import BUILTIN_SPECS, extract_with_spec
 import re
 
+logger = logging.getLogger(__name__)
+
 
 class Category2Scraper(BaseScraper):
     """リスト形式またはdiv構造の価格情報を抽出するスクレイパー"""
+
+    # extractor_type → 抽出メソッド（BUILTIN_SPECSで表せないレイアウト）
+    EXTRACTORS = {
+        'yagi_table': 'extract_from_yagi_table',
+        'kaneda_figcaption': 'extract_from_kaneda_figcaption',
+        'div_list': 'extract_from_div_list',
+        'takahashi_kaitori': 'extract_from_takahashi_kaitori',
+        'dokin_div': 'extract_from_dokin_div',
+    }
     
     def extract_prices(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
@@ -24,36 +39,19 @@ class Category2Scraper(BaseScraper):
         Returns:
             価格情報の辞書 {材料名: 価格}
         """
-        prices = {}
-        
-        # 抽出方法を確認
+        # sites.yamlに抽出方法（extractor）がある場合はその方法で抽出
+        spec = self.site_config.get('extractor')
+        if spec:
+            return extract_with_spec(soup, spec)
+
         extractor_type = self.site_config.get('extractor_type', 'auto')
-        
-        if extractor_type == 'yagi_table':
-            prices = self.extract_from_yagi_table(soup)
-        elif extractor_type == 'kaneda_figcaption':
-            prices = self.extract_from_kaneda_figcaption(soup)
-        elif extractor_type == 'div_list':
-            prices = self.extract_from_div_list(soup)
-        elif extractor_type == 'touki_dl':
-            prices = self.extract_from_touki_dl(soup)
-        elif extractor_type == 'kousyo_box':
-            prices = self.extract_from_kousyo_box(soup)
-        elif extractor_type == 'houyama_dl':
-            prices = self.extract_from_houyama_dl(soup)
-        elif extractor_type == 'haruhi_table':
-            prices = self.extract_from_haruhi_table(soup)
-        elif extractor_type == 'touhoku_div':
-            prices = self.extract_from_touhoku_div(soup)
-        elif extractor_type == 'takahashi_kaitori':
-            prices = self.extract_from_takahashi_kaitori(soup)
-        elif extractor_type == 'dokin_div':
-            prices = self.extract_from_dokin_div(soup)
-        else:
-            # デフォルトは自動抽出
-            prices = self.extract_auto(soup)
-        
-        return prices
+        if extractor_type in BUILTIN_SPECS:
+            return extract_with_spec(soup, BUILTIN_SPECS[extractor_type])
+        method = self.EXTRACTORS.get(extractor_type)
+        if method:
+            return getattr(self, method)(soup)
+        # デフォルトは自動抽出
+        return self.extract_auto(soup)
     
     def extract_from_yagi_table(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
@@ -217,423 +215,255 @@ class Category2Scraper(BaseScraper):
         """
         東起産業（株）用のdl抽出
         <dl class="item_list">構造で、<dt>に材料名、<dd>に価格が含まれる
+        （BUILTIN_SPECS['touki_dl']の抽出方法）
         """
-        prices = {}
-        
-        # dl.item_listを探す
-        dl_lists = soup.find_all('dl', class_='item_list')
-        
-        for dl in dl_lists:
-            # dtから材料名を取得
-            dt = dl.find('dt')
-            if dt:
-                material_p = dt.find('p')
-                if material_p:
-                    material = material_p.get_text(strip=True)
-                else:
-                    material = dt.get_text(strip=True)
-            else:
-                continue
-            
-            # ddから価格を取得
-            dds = dl.find_all('dd')
-            for dd in dds:
-                price_p = dd.find('p', class_='price')
-                if price_p:
-                    price_span = price_p.find('span')
-                    if price_span:
-                        price_text = price_span.get_text(strip=True)
-                        # 単位（/kgなど）も含めて取得
-                        price_full_text = price_p.get_text(strip=True)
-                        # 「買取価格：」などのプレフィックスを除去
-                        price_full_text = re.sub(r'買取価格[：:]?\s*', '', price_full_text)
-                        # 価格の数値部分と単位を抽出
-                        price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*([円¥]/?[a-zA-Z]*)', price_full_text)
-                        if price_match:
-                            price_value = price_match.group(1)
-                            unit = price_match.group(2) if price_match.group(2) else '円'
-                            price = price_value + unit
-                        else:
-                            price_text = price_span.get_text(strip=True)
-                            price = self.clean_price(price_text)
-                    else:
-                        price_text = price_p.get_text(strip=True)
-                        # 「買取価格：」などのプレフィックスを除去
-                        price_text = re.sub(r'買取価格[：:]?\s*', '', price_text)
-                        price = self.clean_price(price_text)
-                    
-                    if self.is_price(price) or re.search(r'\d+', price):
-                        if material and price:
-                            prices[material] = price
-                        break
-        
-        return prices
+        return extract_with_spec(soup, BUILTIN_SPECS['touki_dl'])
     
     def extract_from_kousyo_box(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
         鴻祥貿易株式会社用のbox抽出
         <div class="box">構造で、<p class="item">に材料名、<p class="price">に価格が含まれる
+        （BUILTIN_SPECS['kousyo_box']の抽出方法）
         """
-        prices = {}
-        
-        # div.boxを探す
-        boxes = soup.find_all('div', class_='box')
-        
-        for box in boxes:
-            # 材料名を取得
-            item_p = box.find('p', class_='item')
-            if item_p:
-                # <br>を除去して材料名を取得（smallタグは含める）
-                material = item_p.get_text(separator='', strip=True)
-            else:
-                continue
-            
-            # 価格を取得
-            price_p = box.find('p', class_='price')
-            if price_p:
-                # <small>タグ内の単位を取得
-                small = price_p.find('small')
-                unit = ''
-                if small:
-                    unit = small.get_text(strip=True)
-                    # smallタグを一時的に除去して価格数値を取得
-                    small_text = str(small)
-                    price_text_without_unit = str(price_p).replace(small_text, '')
-                    price_soup = BeautifulSoup(price_text_without_unit, 'html.parser')
-                    price_value = price_soup.get_text(strip=True)
-                else:
-                    price_value = price_p.get_text(strip=True)
-                
-                # 価格の数値部分を抽出
-                price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', price_value)
-                if price_match:
-                    price_num = price_match.group(1)
-                    price = price_num + unit if unit else price_num + '円'
-                    
-                    if material and price:
-                        prices[material] = price
-        
-        return prices
+        return extract_with_spec(soup, BUILTIN_SPECS['kousyo_box'])
     
     def extract_from_houyama_dl(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
         株式会社鳳山用の抽出
         <ul class="release priceList">構造で、<li>内の<h4>に材料名、<p class="price">内の<strong>に価格が含まれる
         税込価格を優先的に取得する（<span>タグ内の税込価格）
+        （BUILTIN_SPECS['houyama_dl']の抽出方法）
         """
-        prices = {}
-        
-        # ul.priceListを探す
-        price_lists = soup.find_all('ul', class_=lambda x: x and 'priceList' in str(x))
-        
-        for ul in price_lists:
-            items = ul.find_all('li')
-            for item in items:
-                # h4から材料名を取得
-                h4 = item.find('h4')
-                if not h4:
-                    continue
-                material = h4.get_text(strip=True)
-                
-                # p.priceから価格を取得
-                price_p = item.find('p', class_='price')
-                if price_p:
-                    # まず税込価格を探す（<span>タグ内）
-                    tax_included_span = price_p.find('span')
-                    if tax_included_span:
-                        tax_included_text = tax_included_span.get_text(strip=True)
-                        # 税込価格の数値部分を抽出
-                        tax_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', tax_included_text)
-                        if tax_match:
-                            price = tax_match.group(1) + '円'
-                            if material and price:
-                                prices[material] = price
-                                continue
-                    
-                    # 税込価格が見つからない場合は、strongタグ内の価格を取得
-                    strong = price_p.find('strong')
-                    if strong:
-                        price_value = strong.get_text(strip=True)
-                        # 価格の数値部分を抽出
-                        price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', price_value)
-                        if price_match:
-                            price = price_match.group(1) + '円'
-                            if material and price:
-                                prices[material] = price
-        
-        return prices
+        return extract_with_spec(soup, BUILTIN_SPECS['houyama_dl'])
     
     def extract_from_haruhi_table(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
         株式会社 春日商会 一宮本社用の抽出
         <div class="box4">構造で、<h4>に材料名、<p class="price">内の<span class="num">に価格が含まれる
+        （BUILTIN_SPECS['haruhi_table']の抽出方法）
         """
-        prices = {}
-        
-        # div.box4を探す
-        boxes = soup.find_all('div', class_=lambda x: x and 'box4' in str(x))
-        
-        for box in boxes:
-            # h4から材料名を取得
-            h4 = box.find('h4')
-            if not h4:
-                continue
-            material = h4.get_text(strip=True)
-            
-            # p.priceから価格を取得
-            price_ps = box.find_all('p', class_='price')
-            for price_p in price_ps:
-                # span.numから価格を取得
-                num_span = price_p.find('span', class_='num')
-                if num_span:
-                    price_text = num_span.get_text(strip=True)
-                    # 価格範囲（〜）の場合は最高価格を取得
-                    if '～' in price_text or '〜' in price_text or '-' in price_text:
-                        price_matches = re.findall(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', price_text)
-                        if price_matches:
-                            # 最高価格を取得
-                            max_price = max([float(p.replace(',', '').replace('，', '')) for p in price_matches])
-                            price = f"{int(max_price)}円/kg"
-                        else:
-                            continue
-                    else:
-                        # 単一価格の場合
-                        price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', price_text)
-                        if price_match:
-                            price = price_match.group(1) + '円/kg'
-                        else:
-                            continue
-                    
-                    if material and price:
-                        # 価格の数値を抽出して比較
-                        price_num_match = re.search(r'(\d+)', price)
-                        if price_num_match:
-                            price_num = int(price_num_match.group(1))
-                            
-                            # 同じ材料名が既に存在する場合、より高い価格を選択
-                            if material in prices:
-                                existing_price_match = re.search(r'(\d+)', prices[material])
-                                if existing_price_match:
-                                    existing_price_num = int(existing_price_match.group(1))
-                                    if price_num > existing_price_num:
-                                        prices[material] = price
-                            else:
-                                prices[material] = price
-                    # break  # 同じボックス内に複数の価格がある場合（例：アルミ缶とプレス）、全てチェックする
-
-        
-        return prices
+        return extract_with_spec(soup, BUILTIN_SPECS['haruhi_table'])
     
     def extract_from_touhoku_div(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
         東北キング用のdiv抽出
         <div class="box">構造で、<h4>に材料名、<p class="price">に価格が含まれる
+        （BUILTIN_SPECS['touhoku_div']の抽出方法）
         """
-        prices = {}
-        
-        # div.boxを探す
-        boxes = soup.find_all('div', class_='box')
-        
-        for box in boxes:
-            # h4から材料名を取得
-            h4 = box.find('h4')
-            if not h4:
-                continue
-            
-            # smallタグ内の補足情報も含める
-            material = h4.get_text(strip=True)
-            small = h4.find('small')
-            if small:
-                small_text = small.get_text(strip=True)
-                if small_text:
-                    material = f"{material} ({small_text})"
-            
-            # p.priceから価格を取得
-            price_p = box.find('p', class_='price')
-            if price_p:
-                price_text = price_p.get_text(strip=True)
-                # <small>タグ内の単位を取得
-                small_unit = price_p.find('small')
-                unit = ''
-                if small_unit:
-                    unit = small_unit.get_text(strip=True)
-                    # smallタグを除去して価格数値を取得
-                    small_unit_text = str(small_unit)
-                    price_text_without_unit = str(price_p).replace(small_unit_text, '')
-                    price_soup = BeautifulSoup(price_text_without_unit, 'html.parser')
-                    price_text = price_soup.get_text(strip=True)
-                
-                # 価格範囲（〜）の場合は最高価格を取得
-                if '～' in price_text or '〜' in price_text or '-' in price_text:
-                    price_matches = re.findall(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', price_text)
-                    if price_matches:
-                        # 最高価格を取得
-                        max_price = max([float(p.replace(',', '').replace('，', '')) for p in price_matches])
-                        price = f"{int(max_price)}{unit}" if unit else f"{int(max_price)}円"
-                    else:
-                        continue
-                else:
-                    # 単一価格の場合
-                    price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', price_text)
-                    if price_match:
-                        price = price_match.group(1) + (unit if unit else '円')
-                    else:
-                        continue
-                
-                if material and price:
-                    prices[material] = price
-        
-        return prices
+        return extract_with_spec(soup, BUILTIN_SPECS['touhoku_div'])
     
     def extract_auto(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
         自動抽出モード
         様々な構造から価格情報を自動的に抽出
+        
+        ページのURLごとに価格を取得できた抽出方法（AUTO_STRATEGIES）と対象範囲のセレクタを
+        学習し（scrapers/auto_strategy.py）、次回以降はその方法だけを対象範囲に適用する。
+        学習済みの方法で価格を取得できなくなった場合はすべての方法を試して学習し直す
         """
+        url = getattr(self, 'page_url', '')
+        entry = self.strategy_cache.get(url) if url else None
+        if entry:
+            root = select_scope(soup, entry.get('selector'))
+            if root is not None:
+                prices, _ = self.run_auto_strategy(entry['strategy'], root)
+                if prices:
+                    return prices
+            logger.info(f"学習済みの抽出方法（{entry['strategy']}）で価格を取得できないため学習し直します: {url}")
+        
         prices = {}
+        for strategy in AUTO_STRATEGIES:
+            prices, elements = self.run_auto_strategy(strategy, soup)
+            if prices:
+                break
+        
+        if url:
+            if prices:
+                selector = learn_scope(soup, elements, prices, lambda root: self.run_auto_strategy(strategy, root)[0])
+                self.strategy_cache.set(url, strategy, selector)
+            elif entry:
+                self.strategy_cache.discard(url)
+        return prices
+    
+    def run_auto_strategy(self, strategy: str, root) -> Tuple[Dict[str, str], List]:
+        """
+        自動抽出の1つの方法をroot以下に適用
         
-        # 0. MP-valueクラス（木村金属など）を優先的に抽出
-        mp_values = soup.find_all('span', class_='MP-value')
-        if mp_values:
-            for mp_value in mp_values:
-                # 親要素から材料名を取得
-                parent = mp_value.find_parent(['td', 'div', 'p'])
-                if parent:
-                    # 材料名を探す（pタグや画像のalt属性など）
-                    material_p = parent.find('p')
-                    if material_p:
-                        material = material_p.get_text(strip=True)
+        Returns:
+            (価格情報の辞書, 価格を取得した要素のリスト)
+        """
+        return getattr(self, f'_auto_{strategy}')(root)
+    
+    def _auto_mp_value(self, root) -> Tuple[Dict[str, str], List]:
+        """MP-valueクラス（木村金属など）を優先的に抽出"""
+        prices = {}
+        elements = []
+        mp_values = root.find_all('span', class_='MP-value')
+        for mp_value in mp_values:
+            # 親要素から材料名を取得
+            parent = mp_value.find_parent(['td', 'div', 'p'])
+            if parent:
+                # 材料名を探す（pタグや画像のalt属性など）
+                material_p = parent.find('p')
+                if material_p:
+                    material = material_p.get_text(strip=True)
+                else:
+                    # 画像のalt属性から取得
+                    img = parent.find('img')
+                    if img and img.get('alt'):
+                        material = img.get('alt')
                     else:
-                        # 画像のalt属性から取得
-                        img = parent.find('img')
-                        if img and img.get('alt'):
-                            material = img.get('alt')
+                        # テキストから材料名を抽出
+                        text = parent.get_text(strip=True)
+                        material_match = re.search(r'([^\d]+)', text)
+                        if material_match:
+                            material = material_match.group(1).strip()
                         else:
-                            # テキストから材料名を抽出
-                            text = parent.get_text(strip=True)
-                            material_match = re.search(r'([^\d]+)', text)
-                            if material_match:
-                                material = material_match.group(1).strip()
-                            else:
-                                continue
+                            continue
+                
+                price_value = mp_value.get_text(strip=True)
+                if price_value and re.search(r'\d+', price_value):
+                    price = price_value + '円'
+                    if material and len(material) > 0:
+                        prices[material] = price
+                        elements.append(parent)
+        return prices, elements
+    
+    def _auto_table(self, root) -> Tuple[Dict[str, str], List]:
+        """テーブルから抽出を試す"""
+        prices = {}
+        elements = []
+        tables = root.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    material = cells[0].get_text(strip=True)
+                    price_text = cells[1].get_text(strip=True)
                     
-                    price_value = mp_value.get_text(strip=True)
-                    if price_value and re.search(r'\d+', price_value):
-                        price = price_value + '円'
+                    if self.is_price(price_text):
+                        price = self.clean_price(price_text)
                         if material and len(material) > 0:
                             prices[material] = price
+                            elements.append(row)
+        return prices, elements
+    
+    def _auto_div(self, root) -> Tuple[Dict[str, str], List]:
+        """div構造から抽出を試す（複数価格対応）"""
+        prices = {}
+        elements = []
+        # すべてのdivを確認（価格関連のクラスに限定しない）
+        divs = root.find_all('div')
         
-        # 1. テーブルから抽出を試す
-        if not prices:
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        material = cells[0].get_text(strip=True)
-                        price_text = cells[1].get_text(strip=True)
-                        
-                        if self.is_price(price_text):
-                            price = self.clean_price(price_text)
-                            if material and len(material) > 0:
-                                prices[material] = price
-        
-        # 2. div構造から抽出を試す（複数価格対応）
-        if not prices:
-            # すべてのdivを確認（価格関連のクラスに限定しない）
-            divs = soup.find_all('div')
+        for div in divs:
+            # 改行コードはHTMLの仕様どおりLFに統一（CRLFを残すhtml.parserでもlxmlと同じ材料名の範囲にする）
+            text = div.get_text(strip=True).replace('\r\n', '\n')
             
-            for div in divs:
-                text = div.get_text(strip=True)
-                
-                # 複数の価格パターンを探す（材料名+価格の繰り返し）
-                # 「材料名1価格1円/kg材料名2価格2円/kg」のような形式に対応
-                # 価格パターン: 数字 + 円 + オプションで/kgなど
-                price_pattern = r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*[円¥](?:/[a-zA-Z]+)?'
-                price_matches = list(re.finditer(price_pattern, text))
+            # 複数の価格パターンを探す（材料名+価格の繰り返し）
+            # 「材料名1価格1円/kg材料名2価格2円/kg」のような形式に対応
+            # 価格パターン: 数字 + 円 + オプションで/kgなど
+            price_pattern = r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*[円¥](?:/[a-zA-Z]+)?'
+            price_matches = list(re.finditer(price_pattern, text))
+            
+            if price_matches:
+                # 各価格の前のテキストを材料名として抽出
+                for i, match in enumerate(price_matches):
+                    price_value = match.group(1)
+                    # 価格テキスト全体を取得（円/kgなども含む）
+                    price_full = match.group(0)
+                    # 価格の数値部分と単位を整理
+                    if '/kg' in price_full or '/Kg' in price_full:
+                        price = price_value + '円/kg'
+                    else:
+                        price = price_value + '円'
+                    
+                    # 前の価格マッチの終了位置から現在の価格マッチの開始位置までが材料名
+                    if i == 0:
+                        # 最初の価格の場合、テキストの先頭から
+                        material = text[:match.start()].strip()
+                    else:
+                        # 2つ目以降の価格の場合、前の価格の後から
+                        prev_match = price_matches[i-1]
+                        # 前の価格の単位部分（/kgなど）をスキップ
+                        prev_end = prev_match.end()
+                        # 単位部分をスキップして次の材料名を探す
+                        material = text[prev_end:match.start()].strip()
+                    
+                    # 材料名が長すぎる場合は、価格の直前に限定
+                    if len(material) > 50:
+                        # 価格の直前の20文字程度を材料名とする
+                        start_pos = max(0, match.start() - 20)
+                        material = text[start_pos:match.start()].strip()
+                    
+                    # 材料名のクリーンアップ
+                    # 電話番号やURLなどの不要な文字列を除外
+                    material = re.sub(r'TEL\d+[-ー]\d+[-ー]\d+', '', material)
+                    material = re.sub(r'http[s]?://[^\s]+', '', material)
+                    material = re.sub(r'[^\w\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]+', '', material)  # 記号を削除
+                    material = material.strip()
+                    
+                    # 材料名が取得できた場合のみ追加
+                    if material and len(material) > 0 and len(material) < 50:
+                        prices[material] = price
+                        elements.append(div)
+        return prices, elements
+    
+    def _auto_list(self, root) -> Tuple[Dict[str, str], List]:
+        """リスト構造から抽出を試す"""
+        prices = {}
+        elements = []
+        lists = root.find_all(['ul', 'ol', 'dl'])
+        for list_elem in lists:
+            items = list_elem.find_all(['li', 'dt', 'dd'])
+            for item in items:
+                text = item.get_text(strip=True)
                 
-                if price_matches:
-                    # 各価格の前のテキストを材料名として抽出
-                    for i, match in enumerate(price_matches):
-                        price_value = match.group(1)
-                        # 価格テキスト全体を取得（円/kgなども含む）
-                        price_full = match.group(0)
-                        # 価格の数値部分と単位を整理
-                        if '/kg' in price_full or '/Kg' in price_full:
-                            price = price_value + '円/kg'
-                        else:
-                            price = price_value + '円'
-                        
-                        # 前の価格マッチの終了位置から現在の価格マッチの開始位置までが材料名
-                        if i == 0:
-                            # 最初の価格の場合、テキストの先頭から
-                            material = text[:match.start()].strip()
-                        else:
-                            # 2つ目以降の価格の場合、前の価格の後から
-                            prev_match = price_matches[i-1]
-                            # 前の価格の単位部分（/kgなど）をスキップ
-                            prev_end = prev_match.end()
-                            # 単位部分をスキップして次の材料名を探す
-                            material = text[prev_end:match.start()].strip()
-                        
-                        # 材料名が長すぎる場合は、価格の直前に限定
-                        if len(material) > 50:
-                            # 価格の直前の20文字程度を材料名とする
-                            start_pos = max(0, match.start() - 20)
-                            material = text[start_pos:match.start()].strip()
-                        
+                price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*[円¥]', text)
+                if price_match:
+                    material = text[:price_match.start()].strip()
+                    price = price_match.group(1) + '円'
+                    
+                    if material and len(material) > 0 and len(material) < 50:
+                        prices[material] = price
+                        elements.append(item)
+        return prices, elements
+    
+    def _auto_generic(self, root) -> Tuple[Dict[str, str], List]:
+        """すべての要素から価格を探す（最後の手段）"""
+        prices = {}
+        elements = []
+        for elem in root.find_all(['p', 'span', 'div', 'td', 'li']):
+            text = elem.get_text(strip=True)
+            # 短いテキストのみを対象（長すぎるテキストは除外）
+            if len(text) > 5 and len(text) < 100:
+                price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*[円¥]', text)
+                if price_match:
+                    material = text[:price_match.start()].strip()
+                    price = price_match.group(1) + '円'
+                    
+                    if material and len(material) > 0 and len(material) < 50:
                         # 材料名のクリーンアップ
-                        # 電話番号やURLなどの不要な文字列を除外
-                        material = re.sub(r'TEL\d+[-ー]\d+[-ー]\d+', '', material)
-                        material = re.sub(r'http[s]?://[^\s]+', '', material)
-                        material = re.sub(r'[^\w\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]+', '', material)  # 記号を削除
+                        material = re.sub(r'\s+', '', material)
                         material = material.strip()
-                        
-                        # 材料名が取得できた場合のみ追加
-                        if material and len(material) > 0 and len(material) < 50:
+                        if material:
                             prices[material] = price
-        
-        # 3. リスト構造から抽出を試す
-        if not prices:
-            lists = soup.find_all(['ul', 'ol', 'dl'])
-            for list_elem in lists:
-                items = list_elem.find_all(['li', 'dt', 'dd'])
-                for item in items:
-                    text = item.get_text(strip=True)
-                    
-                    price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*[円¥]', text)
-                    if price_match:
-                        material = text[:price_match.start()].strip()
-                        price = price_match.group(1) + '円'
-                        
-                        if material and len(material) > 0 and len(material) < 50:
-                            prices[material] = price
-        
-        # 4. すべての要素から価格を探す（最後の手段）
-        if not prices:
-            for elem in soup.find_all(['p', 'span', 'div', 'td', 'li']):
-                text = elem.get_text(strip=True)
-                # 短いテキストのみを対象（長すぎるテキストは除外）
-                if len(text) > 5 and len(text) < 100:
-                    price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)\s*[円¥]', text)
-                    if price_match:
-                        material = text[:price_match.start()].strip()
-                        price = price_match.group(1) + '円'
-                        
-                        if material and len(material) > 0 and len(material) < 50:
-                            # 材料名のクリーンアップ
-                            material = re.sub(r'\s+', '', material)
-                            material = material.strip()
-                            if material:
-                                prices[material] = price
-        
-        return prices
+                            elements.append(elem)
+        return prices, elements
+    
+    def frame_url(self, url: str, soup: BeautifulSoup) -> Optional[str]:
+        """高橋商事株式会社はトップページのiframe（class="kaitori_if"）に価格のページを表示"""
+        if self.site_config.get('extractor') or self.site_config.get('extractor_type') != 'takahashi_kaitori':
+            return None
+        iframe = soup.find('iframe', class_='kaitori_if')
+        if iframe is None or not iframe.get('src'):
+            return None
+        return urljoin(url, iframe['src'])
     
     def extract_from_takahashi_kaitori(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
         高橋商事株式会社用の抽出ロジック
-        トップページのiframeから価格ページのURLを取得し、そこから価格を抽出
+        価格のページ（トップページのiframe、frame_urlで取得）から価格を抽出
         
         HTML構造:
         <div class="kaitori_box">
@@ -643,40 +473,7 @@ class Category2Scraper(BaseScraper):
             </div>
         </div>
         """
-        import requests
-        
-        prices = {}
-        
-        try:
-            # iframeのsrc属性から価格ページのURLを取得
-            iframe = soup.find('iframe', class_='kaitori_if')
-            if iframe and iframe.get('src'):
-                iframe_src = iframe.get('src')
-                # 相対URLを絶対URLに変換
-                base_url = self.site_config.get('price_url', '')
-                if base_url:
-                    # base_urlから親ディレクトリを取得
-                    base_dir = base_url.rsplit('/', 1)[0]
-                    price_page_url = f"{base_dir}/{iframe_src}"
-                else:
-                    price_page_url = f"http://www.takahashisyouji.co.jp/{iframe_src}"
-                
-                # 価格ページを取得
-                response = requests.get(price_page_url, timeout=30)
-                response.encoding = 'utf-8'
-                price_soup = BeautifulSoup(response.text, 'lxml')
-                
-                # 価格を抽出
-                prices = self._extract_takahashi_prices(price_soup)
-            else:
-                # iframeが見つからない場合、直接抽出を試みる
-                prices = self._extract_takahashi_prices(soup)
-        
-        except Exception as e:
-            # エラーが発生した場合、直接抽出を試みる
-            prices = self._extract_takahashi_prices(soup)
-        
-        return prices
+        return self._extract_takahashi_prices(soup)
     
     def extract_from_dokin_div(self, soup: BeautifulSoup) -> Dict[str, str]:
         """
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+スクレイピングの統合コマンド（python -m scrapers）
+実行プロファイルごとに対象サイトの選択・材料名の正規化・出力先を切り替え、
+取得はすべて共通のパイプライン（scrapers/pipeline.py）で行う
+
+プロファイル:
+    full         sites.yamlの全サイトを取得（scrape_prices_v2.py と同じ）
+    implemented  実装済み企業を取得してExcelに新規シートとして出力（scrape_18_companies_to_excel.py と同じ）
+    fill-tables  実装済み企業を取得して表形式シートに記入（fill_table_formats.py と同じ、
+                 scrape_and_fill_standard_table.py は --special-rules 付き）
+
+使い方:
+    python -m scrapers full --backend async --per-host 2
+    python -m scrapers fill-tables --incremental
+    python -m scrapers implemented --format json sheet
+    python -m scrapers full --dry-run          # 対象サイトと出力先を表示するだけ（取得・出力なし）
+"""
+
+import argparse
+import logging
+from typing import Dict, List, Optional
+
+from .config import (
+    config_path, load_correction_plan, load_corrections, load_output_tables, load_sites, load_target_items,
+)
+from .freshness import DEFAULT_REFRESH_INTERVAL, DEFAULT_STATE_PATH, FreshnessStore, parse_interval
+from .healthcheck import DEFAULT_REPORT_PATH, load_unhealthy_sites
+from .history import DEFAULT_HISTORY_PATH
+from .mappings import filter_implemented_companies, normalize_material_name
+from .pipeline import BACKENDS, log_summary, scrape_sites
+from .resilience import DEFAULT_BREAKER_PATH, DEFAULT_FAILURE_THRESHOLD, DEFAULT_SITE_BUDGET, CircuitBreaker
+from .runs import DEFAULT_RUNS_DIR
+
+logger = logging.getLogger(__name__)
+
+# 出力形式 → 説明
+OUTPUT_FORMATS = {
+    'json': 'JSONファイル（price_results_v2_*.json）',
+    'csv': 'CSVファイル（price_results_v2_*.csv）',
+    'excel': '実行ごとのExcelファイル（runs/価格情報_*.xlsx、--runs-dir）',
+    'history': '価格履歴データベース（--history-db）',
+    'sheet': 'テストシート形式のExcel（runs/テスト_*.xlsx、--sheet-fileで既存ファイルに追加）',
+    'tables': 'output_tables.yamlの表形式シート',
+}
+
+# プロファイル → 設定
+#   implemented_only: 実装済み企業だけを対象にする（企業名は正規化後の名前で記録）
+#   normalize_materials: 価格修正マッピングの照合前に材料名の接頭辞を除去する
+#   special_rules: 価格修正の後に特殊計算ルール（金田商事の税込計算など）を適用する
+#   formats: 既定の出力形式
+#   show_prices: 1社ごとにログに表示する価格の件数
+PROFILES: Dict[str, Dict] = {
+    'full': {
+        'description': 'sites.yamlの全サイトを取得',
+        'implemented_only': False,
+        'normalize_materials': False,
+        'special_rules': False,
+        'formats': ('json', 'csv', 'excel', 'history'),
+        'show_prices': 0,
+    },
+    'implemented': {
+        'description': '実装済み企業を取得してExcelに新規シートとして出力',
+        'implemented_only': True,
+        'normalize_materials': True,
+        'special_rules': True,
+        'formats': ('sheet',),
+        'show_prices': 0,
+    },
+    'fill-tables': {
+        'description': '実装済み企業を取得して表形式シートに記入',
+        'implemented_only': True,
+        'normalize_materials': True,
+        'special_rules': False,
+        'formats': ('tables',),
+        'show_prices': 5,
+    },
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m scrapers',
+        description='非鉄金属スクラップ価格の取得（プロファイルごとに対象サイトと出力先を切り替え）',
+    )
+    parser.add_argument('profile', nargs='?', default='full', choices=list(PROFILES),
+                        help='実行プロファイル（既定: full）')
+    parser.add_argument('--format', dest='formats', nargs='+', choices=list(OUTPUT_FORMATS), default=None,
+                        help='出力形式（既定はプロファイルごと）')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='対象サイトと出力先を表示するだけで、取得・出力は行わない')
+    parser.add_argument('--only', nargs='+', metavar='NAME', default=None,
+                        help='企業名にいずれかの文字列を含むサイトだけを対象にする')
+    parser.add_argument('--config-dir', default=None, help='設定ファイルのディレクトリ（既定: config/）')
+    parser.add_argument('--skip-unhealthy', nargs='?', const=str(DEFAULT_REPORT_PATH), default=None,
+                        metavar='REPORT',
+                        help='URLの確認結果（check_price_urls.py）ですべての価格ページが応答しないサイトを除外')
+    parser.add_argument('--special-rules', action='store_true',
+                        help='プロファイルの設定によらず特殊計算ルール（金田商事の税込計算など）を適用')
+
+    fetch = parser.add_argument_group('取得')
+    fetch.add_argument('--backend', choices=BACKENDS, default='requests',
+                       help='HTTPバックエンド（async: aiohttpで全サイトを同時に取得）')
+    fetch.add_argument('--delay', type=float, default=2.0,
+                       help='同じホストへのリクエストの間隔（秒）')
+    fetch.add_argument('--per-host', type=int, default=2,
+                       help='asyncバックエンドでの1ホストあたりの同時接続数')
+    fetch.add_argument('--max-in-flight', type=int, default=100,
+                       help='asyncバックエンドでの全体の同時接続数')
+    fetch.add_argument('--timeout', type=float, default=None,
+                       help='asyncバックエンドでの全体のタイムアウト（秒）')
+    fetch.add_argument('--site-budget', type=float, default=DEFAULT_SITE_BUDGET,
+                       help='1サイトの取得期限（秒、リトライを含む。sites.yamlのfetch_budgetが優先）')
+    fetch.add_argument('--breaker-state', default=str(DEFAULT_BREAKER_PATH),
+                       help='サーキットブレーカーのホストごとの連続失敗回数の保存先')
+    fetch.add_argument('--breaker-threshold', type=int, default=DEFAULT_FAILURE_THRESHOLD,
+                       help='この回数の実行で続けて失敗したホストは短いタイムアウトで1回だけ確認する')
+    fetch.add_argument('--no-breaker', action='store_true',
+                       help='サーキットブレーカーを使わない（すべてのホストを通常どおり取得）')
+    fetch.add_argument('--pool-maxsize', type=int, default=None,
+                       help='requestsバックエンドでの1ホストあたりの接続プールの大きさ（既定: 10）')
+    fetch.add_argument('--http-retries', type=int, default=None,
+                       help='requestsバックエンドでの接続アダプタのリトライ回数（既定: 0、取得期限内のリトライとは別）')
+
+    cache = parser.add_argument_group('差分取得')
+    cache.add_argument('--incremental', action='store_true',
+                       help='更新間隔（refresh_interval）内に取得済みのサイトは前回の結果を再利用')
+    cache.add_argument('--state', default=str(DEFAULT_STATE_PATH),
+                       help='差分取得用の前回の取得結果ファイル')
+    cache.add_argument('--max-age', default=None,
+                       help='refresh_intervalが未設定のサイトの更新間隔（例: 30m, 6h, 1d）')
+
+    output = parser.add_argument_group('出力')
+    output.add_argument('--history-db', default=str(DEFAULT_HISTORY_PATH),
+                        help='価格履歴データベース（SQLite）のパス')
+    output.add_argument('--runs-dir', default=str(DEFAULT_RUNS_DIR),
+                        help='excel・sheet形式で実行ごとのExcelファイルと実行インデックス（index.json）を保存するディレクトリ')
+    output.add_argument('--sheet-file', default=None,
+                        help='sheet形式の結果を新規シートとして追加するExcelファイル（既定: --runs-dirに実行ごとのファイル）')
+    output.add_argument('--changes', metavar='FILE',
+                        help='tables形式で表形式シートの価格の変更（企業・材料・旧値 → 新値）をCSVに保存')
+    output.add_argument('--trace', metavar='FILE',
+                        help='フェーズごとの処理時間をChromeトレース形式（chrome://tracing）で保存')
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
+
+
+def select_sites(profile: Dict, sites, only: Optional[List[str]] = None) -> List[Dict]:
+    """プロファイルの対象サイト（実装済み企業のみの場合は normalized_name を設定したコピー）"""
+    if profile['implemented_only']:
+        sites = filter_implemented_companies(sites)
+    sites = list(sites)
+    if only:
+        sites = [site for site in sites
+                 if any(name in site.get('name', '') or name in site.get('normalized_name', '') for name in only)]
+    return sites
+
+
+def skip_unhealthy_sites(sites: List[Dict], report_path) -> List[Dict]:
+    """URLの確認結果で応答しなかったサイトを除く（確認結果がない場合はそのまま）"""
+    unhealthy = load_unhealthy_sites(report_path)
+    if unhealthy is None:
+        logger.warning(f"URLの確認結果がないため、すべてのサイトを対象にします: {report_path}")
+        return sites
+    skipped = [site.get('name', '') for site in sites if site.get('name', '') in unhealthy]
+    if skipped:
+        logger.info(f"応答しないサイトを除外: {', '.join(skipped)}")
+    return [site for site in sites if site.get('name', '') not in unhealthy]
+
+
+def load_plan(profile: Dict, config_dir=None, special_rules: bool = False):
+    """プロファイルの価格修正マッピング（読み込めない場合は修正なし、special_rulesで特殊計算ルールを追加）"""
+    from .corrections import compile_corrections
+
+    normalizer = None
+    if profile['normalize_materials']:
+        normalizer = normalize_material_name
+    special_rules = special_rules or profile['special_rules']
+    try:
+        return load_correction_plan(config_path('price_corrections.yaml', config_dir), normalizer, special_rules)
+    except Exception as e:
+        logger.warning(f"価格修正マッピングファイルの読み込みエラー: {str(e)}")
+        return compile_corrections({}, normalizer, special_rules=special_rules)
+
+
+def write_output(output_format: str, table, args: argparse.Namespace):
+    """1つの出力形式で結果を保存（tableはResultTable）"""
+    if output_format in ('json', 'csv', 'excel', 'history'):
+        from .writers import save_results
+
+        save_results(table, output_format=output_format, history_path=args.history_db, runs_dir=args.runs_dir)
+    elif output_format == 'sheet':
+        from .writers import save_to_excel_new_sheet
+
+        try:
+            corrections = load_corrections(config_path('price_corrections.yaml', args.config_dir))
+        except Exception:
+            corrections = {}
+        save_to_excel_new_sheet(table, excel_file=args.sheet_file, price_corrections=corrections,
+                                runs_dir=args.runs_dir)
+    elif output_format == 'tables':
+        try:
+            output_tables = list(load_output_tables(config_path('output_tables.yaml', args.config_dir)))
+        except FileNotFoundError:
+            output_tables = []
+        from .sheet_diff import format_changes, write_changes_csv
+        from .standard_table import fill_output_tables
+
+        changes = []
+        fill_output_tables(table, output_tables, changes)
+        logger.info(f"価格の変更: {len(changes)}件")
+        for line in format_changes(changes):
+            logger.info(line)
+        if args.changes:
+            write_changes_csv(changes, args.changes)
+            logger.info(f"価格の変更を {args.changes} に保存しました")
+    else:
+        raise ValueError(f"不明な出力形式: {output_format}")
+
+
+def _log_plan(args, profile, sites, target_items, corrections, formats):
+    logger.info(f"プロファイル: {args.profile}（{profile['description']}）")
+    logger.info(f"  対象サイト: {len(sites)}社（バックエンド: {args.backend}）")
+    for i, site in enumerate(sites, 1):
+        name = site.get('name', '不明')
+        if site.get('normalized_name') and site['normalized_name'] != name:
+            name = f"{name} → {site['normalized_name']}"
+        logger.info(f"    {i}. {name}（カテゴリ{site.get('category', 0)}）")
+    if target_items:
+        logger.info(f"  対象アイテムフィルタリング: 有効 ({len(target_items)}種類)")
+    else:
+        logger.info("  対象アイテムフィルタリング: 無効（全アイテムを抽出）")
+    logger.info(f"  価格修正マッピング: {len(corrections)} 社（特殊計算ルール: {'有効' if corrections.special_rules else '無効'}）")
+    logger.info(f"  差分取得: {'有効（' + args.state + '）' if args.incremental else '無効'}")
+    logger.info(f"  出力: {', '.join(f'{fmt}（{OUTPUT_FORMATS[fmt]}）' for fmt in formats)}")
+
+
+def run(args: argparse.Namespace) -> int:
+    """プロファイルを実行（終了コードを返す）"""
+    from .async_backend import AIOHTTP_AVAILABLE
+
+    profile = PROFILES[args.profile]
+    formats = list(dict.fromkeys(args.formats or profile['formats']))
+
+    if args.backend == 'async' and not AIOHTTP_AVAILABLE:
+        logger.error("aiohttpがインストールされていません。pip install aiohttp を実行してください")
+        return 1
+
+    try:
+        sites = load_sites(config_path('sites.yaml', args.config_dir))
+    except Exception as e:
+        logger.error(f"サイト設定の読み込みに失敗しました: {str(e)}")
+        return 1
+    sites = select_sites(profile, sites, args.only)
+    if args.skip_unhealthy:
+        sites = skip_unhealthy_sites(sites, args.skip_unhealthy)
+    if not sites:
+        logger.error("対象サイトがありません")
+        return 1
+
+    try:
+        target_items = list(load_target_items(config_path('target_items.yaml', args.config_dir)))
+    except Exception as e:
+        logger.warning(f"対象アイテム設定ファイルの読み込みエラー: {str(e)}")
+        target_items = []
+    corrections = load_plan(profile, args.config_dir, args.special_rules)
+    if args.pool_maxsize is not None or args.http_retries is not None:
+        from .session_pool import configure_pool
+
+        pool = configure_pool(pool_maxsize=args.pool_maxsize, retries=args.http_retries)
+        logger.info(f"  接続プール: 1ホストあたり{pool['pool_maxsize']}接続、アダプタのリトライ{pool['retries']}回")
+
+    _log_plan(args, profile, sites, target_items, corrections, formats)
+    if args.dry_run:
+        logger.info("ドライラン: 取得・出力は行いません")
+        return 0
+
+    store = None
+    if args.incremental:
+        store = FreshnessStore(args.state, parse_interval(args.max_age) or DEFAULT_REFRESH_INTERVAL)
+
+    breaker = None
+    if not args.no_breaker:
+        breaker = CircuitBreaker(args.breaker_state, args.breaker_threshold)
+
+    from .results import ResultTable
+    from .timing import aggregate_timings, export_chrome_trace, format_timing_summary
+
+    results, timers = scrape_sites(
+        sites, target_items,
+        backend=args.backend, delay=args.delay,
+        per_host_limit=args.per_host, max_in_flight=args.max_in_flight, total_timeout=args.timeout,
+        store=store, corrections=corrections, show_prices=profile['show_prices'],
+        breaker=breaker, site_budget=args.site_budget,
+    )
+
+    # 結果は列指向の表に1回だけ変換し、すべての出力形式で共有する（変換後は元の辞書のリストを保持しない）
+    aggregated_timings = aggregate_timings(results)
+    table = ResultTable.from_results(results)
+    del results
+    log_summary(table, len(sites))
+    if aggregated_timings:
+        logger.info("  フェーズ別処理時間:")
+        for line in format_timing_summary(aggregated_timings):
+            logger.info(line)
+    logger.info(f"{'='*60}")
+
+    for output_format in formats:
+        write_output(output_format, table, args)
+
+    if args.trace:
+        event_count = export_chrome_trace(timers, args.trace)
+        logger.info(f"トレース（{event_count} イベント）を {args.trace} に保存しました")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return run(parse_args(argv))
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+設定ファイル（config/*.yaml）の読み込み
+YAMLは1回だけ解析し（libyamlのCSafeLoaderが使える場合は使用）、ファイルの更新時刻で
+キャッシュする。ファイルを編集すると次の読み込みで自動的に再解析されるため、
+Webアプリ（gunicorn）を再起動せずに設定の変更が反映される
+解析結果はバイナリスナップショット（scrapers/snapshot.py）にも保存し、内容が変わっていなければ
+次のプロセスではYAMLを解析せずにスナップショットから読み込む
+
+読み込んだ設定は検証したうえで変更できないオブジェクト（FrozenDict・タプル）として返す
+変更が必要な場合は thaw() でコピーするか、dict(site, key=value) のように新しい辞書を作ること
+
+使い方:
+    from scrapers.config import load_sites, load_target_items, load_correction_plan
+
+    sites = load_sites()                 # sites.yamlの sites（タプル）
+    target_items = load_target_items()   # target_items.yamlの target_items
+    plan = load_correction_plan()        # コンパイル済みの価格修正マッピング
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 設定ファイルの既定のディレクトリ
+DEFAULT_CONFIG_DIR = Path(__file__).resolve().parent.parent / 'config'
+
+PathLike = Union[str, Path]
+
+
+class ConfigError(ValueError):
+    """設定ファイルの構文・構造の誤り"""
+
+
+class FrozenDict(dict):
+    """変更できない辞書（JSON出力・pickleは通常の辞書と同様に可能）"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("設定は変更できません（thaw()でコピーしてから変更してください）")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value):
+    """辞書・リストを変更できないFrozenDict・タプルに変換（入れ子も含む）"""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """freeze()した設定を変更可能な辞書・リストに戻す（コピー）"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _validate_sites(sites) -> List[str]:
+    errors = []
+    for i, site in enumerate(sites, 1):
+        if not isinstance(site, dict):
+            errors.append(f"sites[{i}]: 辞書ではありません")
+            continue
+        name = site.get('name') or f'sites[{i}]'
+        if not site.get('name'):
+            errors.append(f"{name}: nameがありません")
+        if not (site.get('price_url') or site.get('url') or site.get('price_urls')):
+            errors.append(f"{name}: price_url / url / price_urls のいずれかが必要です")
+        if site.get('category', 2) not in (1, 2):
+            errors.append(f"{name}: categoryは1または2です: {site.get('category')!r}")
+        if not isinstance(site.get('price_urls', []), list):
+            errors.append(f"{name}: price_urlsはリストで指定してください")
+        if site.get('extractor') is not None:
+            from .selector_extractor import validate_spec
+            errors.extend(f"{name}: {error}" for error in validate_spec(site['extractor']))
+    return errors
+
+
+def _validate_target_items(items) -> List[str]:
+    errors = []
+    for i, item in enumerate(items, 1):
+        if not isinstance(item, dict) or not item.get('name'):
+            errors.append(f"target_items[{i}]: nameがありません")
+        elif not isinstance(item.get('keywords', []), list):
+            errors.append(f"{item['name']}: keywordsはリストで指定してください")
+    return errors
+
+
+def _validate_corrections(corrections) -> List[str]:
+    from .corrections import validate_corrections
+    return validate_corrections(corrections)
+
+
+def _validate_output_tables(tables) -> List[str]:
+    errors = []
+    for i, table in enumerate(tables, 1):
+        if not isinstance(table, dict) or not table.get('excel_file') or not table.get('sheet_name'):
+            errors.append(f"output_tables[{i}]: excel_fileとsheet_nameが必要です")
+    return errors
+
+
+# ファイル名 → (最上位のキー, 値の型, 検証関数)
+SCHEMAS: Dict[str, Tuple[str, type, Callable]] = {
+    'sites.yaml': ('sites', list, _validate_sites),
+    'target_items.yaml': ('target_items', list, _validate_target_items),
+    'price_corrections.yaml': ('corrections', dict, _validate_corrections),
+    'output_tables.yaml': ('output_tables', list, _validate_output_tables),
+}
+
+
+class _Entry:
+    __slots__ = ('signature', 'data', 'errors', 'derived')
+
+    def __init__(self, signature, data, errors):
+        self.signature = signature
+        self.data = data
+        self.errors = errors
+        # 設定から作成したオブジェクト（コンパイル済みの価格修正マッピングなど）
+        self.derived: Dict = {}
+
+
+_cache: Dict[str, _Entry] = {}
+_lock = threading.Lock()
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _parse(path: str) -> Tuple[FrozenDict, List[str]]:
+    """YAMLを解析・検証してFrozenDictに変換（内容が同じならスナップショットの結果を使用）"""
+    from . import snapshot
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = snapshot.source_digest(raw)
+    cached = snapshot.lookup_config(path, digest)
+    if cached is not None:
+        data, errors = cached
+    else:
+        data, errors = _parse_raw(path, raw)
+        snapshot.store_config(path, digest, data, errors)
+    for error in errors:
+        logger.warning(f"設定の検証: {os.path.basename(path)}: {error}")
+    return data, errors
+
+
+def _parse_raw(path: str, raw: bytes) -> Tuple[FrozenDict, List[str]]:
+    # YAMLはスナップショットにない場合のみ解析するため、ここでインポートする
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    try:
+        data = yaml.load(raw.decode('utf-8'), Loader=SafeLoader)
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        raise ConfigError(f"YAMLの構文エラー: {path} - {e}") from e
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"設定ファイルの最上位が辞書ではありません: {path}")
+
+    errors = []
+    schema = SCHEMAS.get(os.path.basename(path))
+    if schema:
+        key, expected_type, validate = schema
+        value = data.get(key)
+        if value is None:
+            data[key] = expected_type()
+        elif not isinstance(value, expected_type):
+            raise ConfigError(f"{path}: {key}は{expected_type.__name__}で指定してください")
+        else:
+            errors = validate(value)
+    return freeze(data), errors
+
+
+def _load_entry(path: PathLike) -> _Entry:
+    path = os.path.abspath(str(path))
+    signature = _signature(path)
+    entry = _cache.get(path)
+    if entry is not None and entry.signature == signature:
+        return entry
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry.signature == signature:
+            return entry
+        try:
+            data, errors = _parse(path)
+        except ConfigError as e:
+            if entry is None:
+                raise
+            # 編集途中などで壊れている場合は前回の設定を使い続ける
+            logger.error(f"{e}（前回読み込んだ設定を使用します）")
+            return entry
+        if entry is not None:
+            logger.info(f"設定ファイルの変更を検出して再読み込みしました: {path}")
+        entry = _cache[path] = _Entry(signature, data, errors)
+        return entry
+
+
+def config_path(filename: str, config_dir: Optional[PathLike] = None) -> Path:
+    """設定ファイルのパス（config_dir省略時はリポジトリのconfig/）"""
+    return Path(config_dir or DEFAULT_CONFIG_DIR) / filename
+
+
+def load_config(path: PathLike) -> FrozenDict:
+    """
+    設定ファイル全体を読み込む（更新時刻が変わっていなければキャッシュを返す）
+
+    Raises:
+        FileNotFoundError: ファイルがない場合
+        ConfigError: 構文・構造の誤り（前回読み込めている場合はその設定を返す）
+    """
+    return _load_entry(path).data
+
+
+def config_errors(path: PathLike) -> List[str]:
+    """設定ファイルの検証で見つかった誤り"""
+    return list(_load_entry(path).errors)
+
+
+def load_sites(path: Optional[PathLike] = None) -> Tuple[FrozenDict, ...]:
+    """sites.yamlの企業設定"""
+    return load_config(path or config_path('sites.yaml'))['sites']
+
+
+def load_target_items(path: Optional[PathLike] = None) -> Tuple[FrozenDict, ...]:
+    """target_items.yamlの対象アイテム"""
+    return load_config(path or config_path('target_items.yaml'))['target_items']
+
+
+def load_corrections(path: Optional[PathLike] = None) -> FrozenDict:
+    """price_corrections.yamlの価格修正マッピング"""
+    return load_config(path or config_path('price_corrections.yaml'))['corrections']
+
+
+def load_output_tables(path: Optional[PathLike] = None) -> Tuple[FrozenDict, ...]:
+    """output_tables.yamlの出力先テーブル"""
+    return load_config(path or config_path('output_tables.yaml'))['output_tables']
+
+
+def load_correction_plan(path: Optional[PathLike] = None,
+                         material_normalizer: Optional[Callable[[str], str]] = None,
+                         special_rules: bool = False):
+    """コンパイル済みの価格修正マッピング（ファイルが変わるまで同じオブジェクトを返す）"""
+    from .corrections import CorrectionPlan, _compile
+    entry = _load_entry(path or config_path('price_corrections.yaml'))
+    key = ('correction_plan', material_normalizer, special_rules)
+    plan = entry.derived.get(key)
+    if plan is None:
+        # 設定の誤りは読み込み時に警告済み
+        companies, errors = _compile(entry.data['corrections'], material_normalizer)
+        plan = entry.derived[key] = CorrectionPlan(companies, material_normalizer, errors, special_rules)
+    return plan
+
+
+def clear_config_cache():
+    """キャッシュを破棄（テスト用）"""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格修正マッピング（config/price_corrections.yaml）のコンパイル
+読み込み時に1回だけ設定を検証し、企業ごとの削除・名前変換・固定価格のテーブルに変換する
+結果への適用は1件につき1回の走査で行う
+
+処理順序（すべての呼び出し元で共通）:
+    1. 材料名の正規化（material_normalizerを指定した場合）
+    2. remove: 不要な材料を削除
+    3. modify: 材料名の変換（priceを指定した場合は価格も置き換え）
+    4. add: 固定価格の追加
+    5. 特殊計算ルール（金田商事の税込計算など、special_rules=Trueの場合のみ）
+
+特殊計算ルールは従来それを適用していた処理（scrape_and_fill_standard_table.pyと
+implementedプロファイル）だけが有効にする。fullプロファイル（scrape_prices_v2.py）と
+fill_table_formats.pyは表記価格のまま出力する
+
+材料名は完全一致（元の名前 → 正規化後の名前）のみで照合する（部分一致はしない）。
+変換後の材料名が他の材料と重複した場合は、元のスクリプトと同じく変換した材料
+（modifyが複数ある場合は設定の後の方）を優先し、破棄した価格は警告としてログに出力する。
+企業名は完全一致 → 空白の違いを無視 → 部分一致の順に照合し、照合結果は企業名ごとに記憶する
+
+使い方:
+    from scrapers.corrections import compile_corrections
+
+    plan = compile_corrections(load_price_corrections(), special_rules=True)
+    results = plan.apply_all(results)
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .price import Price, as_price
+
+logger = logging.getLogger(__name__)
+
+# 企業ごとの設定で使えるキー
+CORRECTION_KEYS = ('remove', 'modify', 'add')
+
+_REMOVE = object()
+
+
+def _strip_spaces(text: str) -> str:
+    return str(text).replace(' ', '').replace('　', '')
+
+
+def apply_special_price_rules(company_name: str, prices: Dict) -> Dict:
+    """特殊な価格計算ルールを適用
+
+    金田商事: 表記価格は税別なので×1.1、アルミ缶は(表記価格+5)×1.1
+    """
+    if '金田商事' not in company_name:
+        return prices
+
+    logger.info(f"    特殊ルール適用: 金田商事（税込計算）")
+    new_prices = {}
+    for material, price_str in prices.items():
+        price = as_price(price_str)
+        price_value = price.value
+        if price_value is None:
+            new_prices[material] = price_str
+            continue
+
+        # アルミ缶は (表記価格+5) × 1.1
+        if 'アルミ缶' in material:
+            new_price = int((price_value + 5) * 1.1)
+            logger.info(f"      {material}: {price_value} → ({price_value}+5)×1.1 = {new_price}")
+        else:
+            # その他は × 1.1（税込）
+            new_price = int(price_value * 1.1)
+            logger.info(f"      {material}: {price_value} → ×1.1 = {new_price}")
+        # 単位は元の価格の表記のまま（円/t・円/本などを円/kgにしない）
+        new_prices[material] = Price.from_value(new_price, unit=price.unit, tax_included=True)
+    return new_prices
+
+
+class CompanyCorrection:
+    """1社分のコンパイル済みの修正テーブル"""
+
+    __slots__ = ('key', 'actions', 'additions')
+
+    def __init__(self, key: str, actions: Dict[str, object], additions: Dict[str, Price]):
+        """
+        Args:
+            key: 設定上の企業名
+            actions: 材料名 → 変換後の (材料名, 価格またはNone, modifyの順序)、削除の場合は_REMOVE
+            additions: 固定価格（材料名 → 価格）
+        """
+        self.key = key
+        self.actions = actions
+        self.additions = additions
+
+    def action_for(self, material: str, normalized: str):
+        """材料に対する処理（元の名前 → 正規化後の名前の完全一致、該当なしの場合None）"""
+        action = self.actions.get(material)
+        if action is None:
+            action = self.actions.get(normalized)
+        return action
+
+
+class CorrectionPlan:
+    """コンパイル済みの価格修正マッピング"""
+
+    def __init__(self, companies: Dict[str, CompanyCorrection],
+                 material_normalizer: Optional[Callable[[str], str]] = None,
+                 errors: Optional[List[str]] = None, special_rules: bool = False):
+        """
+        Args:
+            companies: 設定上の企業名 → CompanyCorrection
+            material_normalizer: 材料名の正規化関数（接頭辞の除去など）
+            errors: 検証で見つかった設定の誤り
+            special_rules: 特殊計算ルール（apply_special_price_rules）を適用するか
+        """
+        self.companies = companies
+        self.material_normalizer = material_normalizer
+        self.errors = errors or []
+        self.special_rules = special_rules
+        self._by_spaceless = {}
+        for key in companies:
+            self._by_spaceless.setdefault(_strip_spaces(key), key)
+        self._matched: Dict[str, Optional[CompanyCorrection]] = {}
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def match(self, company_name: str) -> Optional[CompanyCorrection]:
+        """企業名に対応する修正テーブル（完全一致 → 空白の違いを無視 → 部分一致）"""
+        if company_name in self._matched:
+            return self._matched[company_name]
+
+        correction = self.companies.get(company_name)
+        if correction is None and company_name:
+            key = self._by_spaceless.get(_strip_spaces(company_name))
+            if key is None:
+                key = next((key for key in self.companies if key in company_name or company_name in key), None)
+            correction = self.companies.get(key) if key else None
+        self._matched[company_name] = correction
+        return correction
+
+    def apply_prices(self, company_name: str, prices: Dict) -> Dict:
+        """1社分の価格に修正を適用（新しい辞書を返す）"""
+        correction = self.match(company_name)
+        normalize = self.material_normalizer
+        corrected = {}
+
+        if correction is None:
+            logger.debug(f"  価格修正なし（マッチする設定が見つからない）: {company_name}")
+            for material, price in prices.items():
+                corrected[normalize(material) if normalize else material] = price
+        else:
+            # 材料名 → 優先度（変換なしは-1、modifyは設定の順序）
+            ranks: Dict[str, int] = {}
+            for material, price in prices.items():
+                normalized = normalize(material) if normalize else material
+                action = correction.action_for(material, normalized)
+                if action is _REMOVE:
+                    logger.debug(f"    remove: {material}")
+                    continue
+                if action is None:
+                    new_material, new_price, rank = normalized, None, -1
+                else:
+                    new_material, new_price, rank = action
+                    if new_material != normalized:
+                        logger.debug(f"    modify: {material} → {new_material}")
+                if new_price is None:
+                    new_price = price
+                if new_material in corrected:
+                    kept = rank >= ranks[new_material]
+                    if str(corrected[new_material]) != str(new_price):
+                        dropped = corrected[new_material] if kept else new_price
+                        logger.warning(f"    材料名の重複: {company_name} {new_material}（元: {material}、{dropped} は破棄）")
+                    if not kept:
+                        continue
+                corrected[new_material] = new_price
+                ranks[new_material] = rank
+            corrected.update(correction.additions)
+
+        if self.special_rules:
+            return apply_special_price_rules(company_name, corrected)
+        return corrected
+
+    def apply(self, result: Dict) -> Dict:
+        """1件の結果に修正を適用（元の結果は変更せずコピーを返す）"""
+        prices = result.get('prices')
+        corrected = result.copy()
+        corrected['prices'] = self.apply_prices(result.get('company_name', ''),
+                                                prices if isinstance(prices, dict) else {})
+        return corrected
+
+    def apply_all(self, results: Iterable[Dict]) -> List[Dict]:
+        """結果のリストに修正を適用"""
+        return [self.apply(result) for result in results]
+
+
+def validate_corrections(corrections) -> List[str]:
+    """価格修正マッピングの設定の誤り（ログは出力しない）"""
+    return _compile(corrections, None)[1]
+
+
+def compile_corrections(corrections: Optional[Dict],
+                        material_normalizer: Optional[Callable[[str], str]] = None,
+                        strict: bool = False, special_rules: bool = False) -> CorrectionPlan:
+    """
+    価格修正マッピングを検証してコンパイル
+
+    Args:
+        corrections: price_corrections.yamlの corrections の辞書
+        material_normalizer: 材料名の正規化関数（設定の材料名にも適用する）
+        strict: Trueの場合、設定の誤りがあればValueErrorを送出（Falseの場合は警告して該当項目を無視）
+        special_rules: Trueの場合、修正の後に特殊計算ルール（金田商事の税込計算など）を適用
+
+    Returns:
+        CorrectionPlan
+    """
+    companies, errors = _compile(corrections, material_normalizer)
+    if errors:
+        if strict:
+            raise ValueError("価格修正マッピングの設定エラー:\n" + '\n'.join(errors))
+        for error in errors:
+            logger.warning(f"価格修正マッピング: {error}")
+
+    return CorrectionPlan(companies, material_normalizer, errors, special_rules)
+
+
+def _compile(corrections, material_normalizer) -> Tuple[Dict[str, CompanyCorrection], List[str]]:
+    """設定を企業ごとのCompanyCorrectionに変換し、(企業名 → CompanyCorrection, 設定の誤り) を返す"""
+    errors: List[str] = []
+    companies: Dict[str, CompanyCorrection] = {}
+
+    if corrections is None:
+        corrections = {}
+    if not isinstance(corrections, dict):
+        errors.append(f"correctionsが辞書ではありません: {type(corrections).__name__}")
+        corrections = {}
+
+    def normalized(material):
+        return material_normalizer(material) if material_normalizer else material
+
+    for company, correction in corrections.items():
+        if not isinstance(correction, dict):
+            errors.append(f"{company}: 設定が辞書ではありません")
+            continue
+        for key in correction:
+            if key not in CORRECTION_KEYS:
+                errors.append(f"{company}: 不明なキー '{key}'")
+
+        actions: Dict[str, object] = {}
+        for material in correction.get('remove') or []:
+            if not isinstance(material, str) or not material:
+                errors.append(f"{company}: removeの材料名が不正です: {material!r}")
+                continue
+            actions[material] = _REMOVE
+            actions.setdefault(normalized(material), _REMOVE)
+
+        for order, item in enumerate(correction.get('modify') or []):
+            if not isinstance(item, dict) or not isinstance(item.get('material'), str):
+                errors.append(f"{company}: modifyの項目にmaterialがありません: {item!r}")
+                continue
+            material = item['material']
+            if material in actions and actions[material] is _REMOVE:
+                errors.append(f"{company}: '{material}' がremoveとmodifyの両方にあります（removeを優先）")
+                continue
+            if material in actions:
+                errors.append(f"{company}: modifyの '{material}' が重複しています（後の設定を使用）")
+            new_price = item.get('price')
+            # 価格に材料名を書いた古い設定は価格の置き換えなしとみなす
+            if new_price in (None, '', material, item.get('material_new')):
+                new_price = None
+            else:
+                new_price = as_price(new_price)
+            action = (normalized(item.get('material_new') or material), new_price, order)
+            actions[material] = action
+            actions.setdefault(normalized(material), action)
+
+        additions = {}
+        for item in correction.get('add') or []:
+            if not isinstance(item, dict) or 'material' not in item or 'price' not in item:
+                errors.append(f"{company}: addの項目にはmaterialとpriceが必要です: {item!r}")
+                continue
+            additions[item['material']] = as_price(item['price'])
+
+        companies[company] = CompanyCorrection(company, actions, additions)
+
+    return companies, errors
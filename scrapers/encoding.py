@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字コード判定モジュール
+レスポンス本文全体に対する文字コード自動判定（apparent_encoding）は
+Shift_JIS/EUC-JPのページで特に遅いため、安価な手がかりから順に判定する
+
+判定順序:
+    1. HTTPヘッダー（Content-Typeのcharset）
+    2. 先頭数KB内の<meta charset>
+    3. 過去の実行で学習したサイトごとの文字コード（config/encoding_cache.json）
+    4. 本文全体の自動判定（最後の手段、結果はキャッシュに保存）
+
+CSVなどのテキストファイルは sniff_file_encoding で先頭のバイト列（BOM、候補の文字コードで
+エラーなくデコードできるか）から1回だけ判定する
+"""
+
+import codecs
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# <meta charset>を探す範囲（バイト数）
+SNIFF_BYTES = 4096
+
+# テキストファイルの文字コードを判定する範囲（バイト数）
+FILE_SNIFF_BYTES = 64 * 1024
+
+# BOM → 文字コード
+_FILE_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# BOMがない場合に順に試す文字コード（日本語のCSV）
+FILE_ENCODINGS = ('utf-8', 'cp932', 'euc_jp')
+
+# 不正なバイト列を数える上限（これ以上は同じとみなす）
+_MAX_DECODE_ERRORS = 100
+
+# 学習した文字コードの保存先（sites.yamlと同じconfigディレクトリ）
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / 'config' / 'encoding_cache.json'
+
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?\s*([^\s;"\']+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([A-Za-z0-9_\-:.]+)', re.IGNORECASE)
+
+# Pythonが認識しない文字コード名の読み替え
+_NAME_ALIASES = {
+    'windows-31j': 'cp932',
+    'x-sjis': 'cp932',
+    'x-euc-jp': 'euc_jp',
+}
+
+# 上位互換の文字コードに読み替える（機種依存文字を含むページ対策）
+_ENCODING_ALIASES = {
+    'shift_jis': 'cp932',
+}
+
+# サーバーの既定値として付与されがちで、信頼できないヘッダーのcharset
+_UNTRUSTED_HEADER_CHARSETS = {'iso8859-1'}
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """
+    文字コード名を正規化（Pythonで扱えない名前の場合はNone）
+
+    Args:
+        name: 文字コード名（例: 'Shift_JIS', 'Windows-31J', 'UTF-8'）
+
+    Returns:
+        正規化された文字コード名
+    """
+    if not name:
+        return None
+    name = name.strip().strip('"\'').lower()
+    name = _NAME_ALIASES.get(name, name)
+    try:
+        canonical = codecs.lookup(name).name
+    except LookupError:
+        return None
+    return _ENCODING_ALIASES.get(canonical, canonical)
+
+
+def charset_from_headers(headers) -> Optional[str]:
+    """HTTPヘッダーのContent-Typeからcharsetを取得（明示されている場合のみ）"""
+    content_type = headers.get('Content-Type', '') if headers else ''
+    match = _HEADER_CHARSET.search(content_type)
+    if not match:
+        return None
+    encoding = normalize_encoding(match.group(1))
+    return None if encoding in _UNTRUSTED_HEADER_CHARSETS else encoding
+
+
+def charset_from_meta(content: bytes, limit: int = SNIFF_BYTES) -> Optional[str]:
+    """本文の先頭から<meta charset>/<meta http-equiv>のcharsetを取得"""
+    match = _META_CHARSET.search(content[:limit])
+    if not match:
+        return None
+    return normalize_encoding(match.group(1).decode('ascii', errors='ignore'))
+
+
+def detect_encoding(content: bytes) -> str:
+    """本文全体から文字コードを自動判定（低速）"""
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(content).best()
+        if best and best.encoding:
+            return normalize_encoding(best.encoding) or 'utf-8'
+    except ImportError:
+        try:
+            import chardet
+            detected = chardet.detect(content).get('encoding')
+            if detected:
+                return normalize_encoding(detected) or 'utf-8'
+        except ImportError:
+            pass
+    return 'utf-8'
+
+
+def _decodes_cleanly(content: bytes, encoding: str) -> bool:
+    """指定の文字コードで本文をエラーなくデコードできるか"""
+    try:
+        content.decode(encoding)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+class EncodingCache:
+    """サイト（ホスト）ごとに学習した文字コードのキャッシュ"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"文字コードキャッシュの読み込みエラー: {self.path} - {str(e)}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        return self._load().get(key)
+
+    def set(self, key: str, encoding: str):
+        """文字コードを記録（変更があった場合のみファイルに保存）"""
+        entries = self._load()
+        if entries.get(key) == encoding:
+            return
+        entries[key] = encoding
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"文字コードキャッシュの保存エラー: {self.path} - {str(e)}")
+
+
+_default_cache: Optional[EncodingCache] = None
+
+
+def get_encoding_cache() -> EncodingCache:
+    """プロセス共通の文字コードキャッシュを取得"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = EncodingCache()
+    return _default_cache
+
+
+def resolve_encoding(content: bytes, headers=None, cache: Optional[EncodingCache] = None,
+                     cache_key: str = '') -> Tuple[str, str]:
+    """
+    レスポンスの文字コードを判定
+
+    Args:
+        content: レスポンス本文（バイト列）
+        headers: HTTPレスポンスヘッダー
+        cache: 学習済み文字コードのキャッシュ
+        cache_key: キャッシュのキー（ホスト名など）
+
+    Returns:
+        (文字コード, 判定元) 判定元は 'header' / 'meta' / 'cache' / 'detect'
+    """
+    encoding = charset_from_headers(headers)
+    source = 'header'
+
+    if not encoding:
+        encoding = charset_from_meta(content)
+        source = 'meta'
+
+    if not encoding and cache is not None and cache_key:
+        cached = cache.get(cache_key)
+        # 学習済みの文字コードはサイト改修で変わりうるため、デコードできる場合のみ採用
+        if cached and _decodes_cleanly(content, cached):
+            encoding = cached
+            source = 'cache'
+
+    if not encoding:
+        encoding = detect_encoding(content)
+        source = 'detect'
+
+    if cache is not None and cache_key and source == 'detect':
+        cache.set(cache_key, encoding)
+
+    return encoding, source
+
+
+def count_decode_errors(sample: bytes, encoding: str, final: bool = True) -> int:
+    """
+    指定の文字コードでデコードしたときの不正なバイト列の数
+
+    Args:
+        sample: バイト列
+        encoding: 文字コード
+        final: Falseの場合、末尾で途切れた文字はエラーとしない（ファイルの先頭だけを読んだ場合）
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    errors = 0
+    while errors < _MAX_DECODE_ERRORS:
+        try:
+            decoder.decode(sample, final=final)
+            return errors
+        except UnicodeDecodeError as e:
+            errors += 1
+            sample = sample[e.end:]
+            decoder.reset()
+    return errors
+
+
+def sniff_file_encoding(path, candidates=FILE_ENCODINGS, sample_size: int = FILE_SNIFF_BYTES) -> Tuple[str, bool]:
+    """
+    テキストファイルの文字コードを先頭のバイト列から判定（ファイル全体は読まない）
+
+    Args:
+        path: ファイルのパス
+        candidates: BOMがない場合に順に試す文字コード
+        sample_size: 判定に使う先頭のバイト数
+
+    Returns:
+        (文字コード, 先頭をエラーなくデコードできたか)
+        どの候補でもエラーになる場合は文字化けの少ない文字コード（_mojibake_score）
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+        final = not f.read(1)
+
+    for bom, encoding in _FILE_BOMS:
+        if sample.startswith(bom):
+            return encoding, True
+
+    best = None
+    for encoding in candidates:
+        errors = count_decode_errors(sample, encoding, final)
+        if errors == 0:
+            return encoding, True
+        score = _mojibake_score(sample, encoding, errors)
+        if best is None or score < best[1]:
+            best = (encoding, score)
+    return best[0], False
+
+
+def _mojibake_score(sample: bytes, encoding: str, errors: int) -> int:
+    """
+    文字化けの程度（不正なバイト列の数 + 半角カナの数）
+    cp932は大半のバイト列をデコードできてしまうため、UTF-8のテキストをcp932で読んだ場合に
+    多数現れる半角カナ（ｧｰｼなど）を文字化けとして数える
+    """
+    text = sample.decode(encoding, errors='replace')
+    return errors + sum(1 for char in text if '\uff61' <= char <= '\uff9f')
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+差分スクレイピング（鮮度判定）モジュール
+サイトごとの更新間隔（sites.yamlの refresh_interval）と前回の取得成功時刻から、
+再取得が必要なサイトだけをスクレイピングし、それ以外は前回の結果を再利用する
+
+sites.yamlの設定例:
+    - name: 東北キング
+      price_url: https://...
+      refresh_interval: 24h    # 30m / 6h / 1d など（数値のみは時間単位）
+"""
+
+import copy
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# refresh_intervalが未設定のサイトの更新間隔
+DEFAULT_REFRESH_INTERVAL = timedelta(hours=6)
+
+# 前回の取得結果の保存先
+DEFAULT_STATE_PATH = Path(__file__).resolve().parent.parent / 'last_results.json'
+
+_INTERVAL_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$', re.IGNORECASE)
+_INTERVAL_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days', '': 'hours'}
+
+
+def parse_interval(value: Union[str, int, float, timedelta, None]) -> Optional[timedelta]:
+    """
+    更新間隔の設定値をtimedeltaに変換
+
+    Args:
+        value: '30m', '6h', '1d' などの文字列、または数値（時間単位）
+
+    Returns:
+        timedelta（未設定・不正な値の場合はNone）
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, (int, float)):
+        return timedelta(hours=value)
+    match = _INTERVAL_PATTERN.match(str(value))
+    if not match:
+        logger.warning(f"refresh_intervalの形式が不正です: {value}")
+        return None
+    amount, unit = match.groups()
+    return timedelta(**{_INTERVAL_UNITS[unit.lower()]: float(amount)})
+
+
+def refresh_interval(site_config: Dict, default: timedelta = DEFAULT_REFRESH_INTERVAL) -> timedelta:
+    """サイトの更新間隔（未設定の場合はdefault）"""
+    interval = parse_interval(site_config.get('refresh_interval'))
+    return default if interval is None else interval
+
+
+def needs_refresh(site_config: Dict, last_success: Optional[datetime], now: Optional[datetime] = None,
+                  default: timedelta = DEFAULT_REFRESH_INTERVAL) -> bool:
+    """
+    サイトの再取得が必要か判定
+
+    Args:
+        site_config: サイト設定
+        last_success: 前回の取得成功時刻（失敗・未取得の場合はNone）
+        now: 現在時刻
+        default: refresh_intervalが未設定の場合の更新間隔
+
+    Returns:
+        再取得が必要な場合True
+    """
+    if last_success is None:
+        return True
+    now = now or datetime.now()
+    return now - last_success >= refresh_interval(site_config, default)
+
+
+def site_key(site_config: Dict) -> str:
+    """状態ファイルのキー（sites.yamlのnameとURL）"""
+    url = site_config.get('price_url') or site_config.get('url', '')
+    return f"{site_config.get('name', '')}|{url}"
+
+
+class FreshnessStore:
+    """サイトごとの前回の取得結果と取得成功時刻を保持するファイル"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STATE_PATH,
+                 default_interval: timedelta = DEFAULT_REFRESH_INTERVAL):
+        """
+        Args:
+            path: 状態ファイル（JSON）のパス
+            default_interval: refresh_intervalが未設定のサイトの更新間隔
+        """
+        self.path = Path(path)
+        self.default_interval = default_interval
+        self.entries: Dict[str, Dict] = self._load()
+        self.reused_count = 0
+        self.scraped_count = 0
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"前回の取得結果の読み込みエラー: {self.path} - {str(e)}（全サイトを取得します）")
+            return {}
+
+    def last_success(self, site_config: Dict) -> Optional[datetime]:
+        """前回の取得成功時刻"""
+        entry = self.entries.get(site_key(site_config))
+        if not entry or not entry.get('last_success'):
+            return None
+        return datetime.fromisoformat(entry['last_success'])
+
+    def is_fresh(self, site_config: Dict, now: Optional[datetime] = None) -> bool:
+        """前回の結果をそのまま使えるか（更新間隔内に取得に成功している）"""
+        return not needs_refresh(site_config, self.last_success(site_config), now, self.default_interval)
+
+    def cached_result(self, site_config: Dict) -> Dict:
+        """前回の取得結果（'reused': True を付加したコピー）"""
+        result = copy.deepcopy(self.entries[site_key(site_config)]['result'])
+        result['reused'] = True
+        self.reused_count += 1
+        return result
+
+    def record(self, site_config: Dict, result: Dict):
+        """取得結果を記録（価格を取得できた場合のみ取得成功時刻と結果を更新）"""
+        self.scraped_count += 1
+        entry = self.entries.setdefault(site_key(site_config), {})
+        entry['last_attempt'] = result.get('scraped_at') or datetime.now().isoformat()
+        if result.get('prices'):
+            entry['last_success'] = entry['last_attempt']
+            entry['result'] = {key: value for key, value in copy.deepcopy(result).items()
+                               if key not in ('reused', 'timings')}
+            entry.pop('last_error', None)
+        else:
+            entry['last_error'] = result.get('error', '価格情報なし')
+
+    def save(self):
+        """状態ファイルに保存"""
+        try:
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"前回の取得結果の保存エラー: {self.path} - {str(e)}")
+
+    def summary(self) -> str:
+        """ログ出力用のサマリー"""
+        return f"差分取得: {self.scraped_count} 社を取得、{self.reused_count} 社は前回の結果を再利用"
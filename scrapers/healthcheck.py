@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格ページURLの死活確認
+sites.yamlのすべてのprice_url/price_urlsを同時に確認し、ステータス・応答時間・リダイレクト先・
+本文のサイズをレポート（JSON）に記録する。本番の取得の前に、応答しないサイトを
+`--skip-unhealthy`で対象から除外できる
+
+- まずHEADで確認し、HEADに対応していない・エラーを返すサーバーはGETで確認し直す
+- ホストごとの同時接続数・全体の同時接続数の上限（非同期バックエンドと同じAsyncFetcher）
+- 短いタイムアウト（既定10秒、通常の取得は30秒）
+- 複数のサイトで同じURLは1回だけ確認する
+
+使い方:
+    from scrapers.healthcheck import check_sites, save_report
+
+    report = check_sites(sites, per_host_limit=2, timeout=10)
+    save_report(report)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .runs import DEFAULT_RUNS_DIR
+
+logger = logging.getLogger(__name__)
+
+# レポートの既定の保存先（実行ごとのExcelファイルと同じディレクトリ）
+DEFAULT_REPORT_PATH = DEFAULT_RUNS_DIR / 'url_health.json'
+
+# レポートの形式のバージョン
+REPORT_VERSION = 1
+
+# 1リクエストのタイムアウト（秒）
+DEFAULT_TIMEOUT = 10.0
+
+
+def site_urls(site: Dict) -> List[str]:
+    """サイト設定の価格ページのURL（BaseScraper.get_price_urlsと同じ）"""
+    price_urls = list(site.get('price_urls') or [])
+    if not price_urls:
+        price_url = site.get('price_url', site.get('url', ''))
+        if price_url:
+            price_urls = [price_url]
+    return price_urls
+
+
+def collect_urls(sites: Iterable[Dict]) -> Dict[str, List[str]]:
+    """URL → そのURLを使うサイト名のリスト（設定の順序）"""
+    urls: Dict[str, List[str]] = {}
+    for site in sites:
+        for url in site_urls(site):
+            names = urls.setdefault(url, [])
+            if site.get('name', '') not in names:
+                names.append(site.get('name', ''))
+    return urls
+
+
+async def _request(fetcher, method: str, url: str) -> Dict:
+    """1回のリクエストの結果（ステータス・リダイレクト・本文のサイズ）"""
+    start = time.perf_counter()
+    async with fetcher.session.request(method, url, allow_redirects=True) as response:
+        content_length = response.content_length
+        if method == 'GET':
+            # Content-Lengthがない（チャンク転送の）ページは読み捨てて数える
+            size = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                size += len(chunk)
+            content_length = size
+        return {
+            'method': method,
+            'status': response.status,
+            'ok': response.status < 400,
+            'latency': round(time.perf_counter() - start, 3),
+            'final_url': str(response.url),
+            # リダイレクト先（順に、最後は最終的なURL）
+            'redirects': [str(item.url) for item in response.history[1:]] + [str(response.url)]
+                         if response.history else [],
+            'content_length': content_length,
+            'content_type': response.headers.get('Content-Type', ''),
+            'error': None if response.status < 400 else f"HTTP {response.status}",
+        }
+
+
+def _error_entry(method: str, start: float, error: str) -> Dict:
+    return {
+        'method': method, 'status': None, 'ok': False,
+        'latency': round(time.perf_counter() - start, 3),
+        'final_url': None, 'redirects': [], 'content_length': None, 'content_type': '',
+        'error': error,
+    }
+
+
+async def check_url(fetcher, url: str) -> Dict:
+    """
+    HEADで確認し、失敗した場合はGETで確認し直す
+    （HEADに対応していない・HEADだけ拒否するサーバーがあるため。タイムアウトはGETでも同じため確認し直さない）
+    """
+    async with fetcher.host_semaphore(url):
+        result = None
+        for method in ('HEAD', 'GET'):
+            start = time.perf_counter()
+            try:
+                result = await _request(fetcher, method, url)
+            except asyncio.TimeoutError:
+                result = _error_entry(method, start, 'タイムアウト')
+                break
+            except Exception as e:
+                result = _error_entry(method, start, f"{type(e).__name__}: {e}")
+            if result['ok']:
+                break
+    result['url'] = url
+    return result
+
+
+async def check_urls_async(urls: List[str], per_host_limit: int = 2, max_in_flight: int = 50,
+                           timeout: float = DEFAULT_TIMEOUT) -> List[Dict]:
+    """URLを同時に確認（結果はurlsと同じ順序）"""
+    from .async_backend import AsyncFetcher
+
+    async with AsyncFetcher(per_host_limit, max_in_flight, timeout) as fetcher:
+        return list(await asyncio.gather(*(check_url(fetcher, url) for url in urls)))
+
+
+def check_sites(sites: Iterable[Dict], per_host_limit: int = 2, max_in_flight: int = 50,
+                timeout: float = DEFAULT_TIMEOUT) -> Dict:
+    """
+    サイト設定のすべての価格ページURLを確認してレポートを作成
+
+    Args:
+        sites: サイト設定のリスト
+        per_host_limit: 1ホストあたりの同時リクエスト数
+        max_in_flight: 全体の同時リクエスト数
+        timeout: 1リクエストのタイムアウト（秒）
+
+    Returns:
+        {'version', 'checked_at', 'summary': {'total', 'ok', 'failed', 'redirected'},
+         'urls': [{'url', 'sites', 'ok', 'status', 'method', 'latency', 'final_url', 'redirects',
+                   'content_length', 'content_type', 'error'}, ...],
+         'unhealthy_sites': [すべてのURLが応答しないサイト名]}
+    """
+    url_sites = collect_urls(sites)
+    checked_at = datetime.now().isoformat()
+    start = time.perf_counter()
+    entries = asyncio.run(check_urls_async(list(url_sites), per_host_limit, max_in_flight, timeout))
+    for entry in entries:
+        entry['sites'] = url_sites[entry['url']]
+    logger.info(f"{len(entries)} URLを確認しました（{time.perf_counter() - start:.1f}秒）")
+
+    return {
+        'version': REPORT_VERSION,
+        'checked_at': checked_at,
+        'summary': {
+            'total': len(entries),
+            'ok': sum(1 for entry in entries if entry['ok']),
+            'failed': sum(1 for entry in entries if not entry['ok']),
+            'redirected': sum(1 for entry in entries if entry['redirects']),
+        },
+        'urls': entries,
+        'unhealthy_sites': sorted(_unhealthy_sites(entries)),
+    }
+
+
+def _unhealthy_sites(entries: List[Dict]) -> Set[str]:
+    """すべての価格ページURLが応答しないサイト（一部のURLだけ応答しないサイトは含めない）"""
+    healthy = {name for entry in entries if entry['ok'] for name in entry['sites']}
+    return {name for entry in entries if not entry['ok'] for name in entry['sites']} - healthy
+
+
+def save_report(report: Dict, path=DEFAULT_REPORT_PATH) -> Path:
+    """レポートを保存（一時ファイルに書いてから置き換える）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def load_unhealthy_sites(path=DEFAULT_REPORT_PATH) -> Optional[Set[str]]:
+    """レポートの応答しないサイト名（レポートがない・読めない場合はNone）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"URLの確認結果を読み込めません: {path} - {e}")
+        return None
+    if not isinstance(report, dict) or report.get('version') != REPORT_VERSION:
+        return None
+    return set(report.get('unhealthy_sites', []))
+
+
+def format_report(report: Dict) -> List[str]:
+    """レポートの表示用の行（応答しないURL → リダイレクトされたURL の順）"""
+    summary = report['summary']
+    lines = [f"URL: {summary['total']}件（正常: {summary['ok']}件、異常: {summary['failed']}件、"
+             f"リダイレクト: {summary['redirected']}件）"]
+    for entry in report['urls']:
+        if not entry['ok']:
+            lines.append(f"  ✗ {', '.join(entry['sites'])}: {entry['url']} - {entry['error']}"
+                         f"（{entry['method']}、{entry['latency']:.2f}秒）")
+    for entry in report['urls']:
+        if entry['ok'] and entry['redirects']:
+            lines.append(f"  → {', '.join(entry['sites'])}: {entry['url']} → {entry['final_url']}")
+    if report['unhealthy_sites']:
+        lines.append(f"応答しないサイト: {', '.join(report['unhealthy_sites'])}")
+    return lines
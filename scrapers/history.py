@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格履歴ストア
+スクレイピング結果をSQLiteに蓄積し、企業別・標準材料名別に期間を指定して検索する
+月ごとに分割したParquetファイルへの書き出しにも対応（pyarrowが必要）
+
+テーブル:
+    fetches: 企業ごとの取得結果（1回の取得につき1行、エラーも記録）
+    prices:  材料ごとの価格（企業名・取得日時・標準材料名にインデックス）
+
+使い方:
+    from scrapers.history import HistoryStore
+
+    store = HistoryStore()
+    store.append(results)          # 結果の辞書のリスト
+    store.append_table(table)      # ResultTable（scrapers/results.py）
+    rows = store.query(material='ピカ銅', company='東北キング', start='2025-06-01')
+"""
+
+import importlib.util
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from .price import as_price
+
+logger = logging.getLogger(__name__)
+
+# pyarrowはParquet出力の場合のみインポートする（起動時間の短縮）
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# 履歴データベースの既定の保存先
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parent.parent / 'price_history.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY,
+    scraped_at TEXT NOT NULL,
+    company TEXT NOT NULL,
+    region TEXT,
+    url TEXT,
+    price_count INTEGER NOT NULL,
+    error TEXT,
+    UNIQUE (company, scraped_at)
+);
+CREATE TABLE IF NOT EXISTS prices (
+    id INTEGER PRIMARY KEY,
+    fetch_id INTEGER NOT NULL REFERENCES fetches(id),
+    scraped_at TEXT NOT NULL,
+    company TEXT NOT NULL,
+    material TEXT NOT NULL,
+    canonical_material TEXT,
+    price_text TEXT,
+    price_value REAL
+);
+CREATE INDEX IF NOT EXISTS idx_prices_company_time ON prices (company, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_prices_material_time ON prices (canonical_material, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_prices_time ON prices (scraped_at);
+CREATE INDEX IF NOT EXISTS idx_fetches_time ON fetches (scraped_at);
+"""
+
+# 取得結果の登録に使う結果の辞書のキー（ResultTableの企業の列）
+_FETCH_COLUMNS = ('company_name', 'scraped_at', 'region', 'url', 'error')
+
+# 検索結果の列
+COLUMNS = ['scraped_at', 'company', 'region', 'material', 'canonical_material', 'price_text', 'price_value']
+
+# 検索結果の列に対応するSQLの式（地域はfetchesから取得）
+_SELECT = ', '.join('f.region' if column == 'region' else f'p.{column}' for column in COLUMNS)
+
+
+def parse_price_value(price_text) -> Optional[float]:
+    """価格文字列の最初の数値（範囲表記の場合は下限）"""
+    if price_text is None:
+        return None
+    value = as_price(price_text).value
+    return None if value is None else float(value)
+
+
+def _as_timestamp(value: Union[str, datetime, None]) -> Optional[str]:
+    """検索条件の日時をISO形式の文字列に変換（日付のみも可）"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class HistoryStore:
+    """SQLiteによる価格履歴ストア"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_HISTORY_PATH,
+                 material_resolver: Optional[Callable[[str], Optional[str]]] = None,
+                 company_resolver: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            path: データベースファイルのパス（':memory:'も可）
+            material_resolver: 材料名 → 標準材料名（マッチしない場合None）の変換関数
+            company_resolver: 企業名の正規化関数
+        """
+        self.path = str(path)
+        self.material_resolver = material_resolver
+        self.company_resolver = company_resolver
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, results: Iterable[Dict]) -> int:
+        """
+        スクレイピング結果を追記（同じ企業・取得日時の結果は重複して登録しない）
+
+        Args:
+            results: スクレイピング結果のリスト
+
+        Returns:
+            追記した価格の件数
+        """
+        inserted = 0
+        with self.conn:
+            for result in results:
+                # 差分取得で再利用した結果は登録済み
+                if result.get('reused'):
+                    continue
+                prices = result.get('prices') or {}
+                inserted += self._insert(
+                    result, len(prices),
+                    ((material, self.material_resolver(material) if self.material_resolver else None,
+                      str(price_text), parse_price_value(price_text)) for material, price_text in prices.items()),
+                )
+        return inserted
+
+    def append_table(self, table) -> int:
+        """
+        ResultTable（scrapers/results.py）を追記（結果の辞書に戻さず、価格は数値の列から登録）
+
+        Returns:
+            追記した価格の件数
+        """
+        resolved = table.resolve_materials(self.material_resolver) if self.material_resolver else None
+        inserted = 0
+        with self.conn:
+            for i in range(len(table)):
+                if table.extra(i, 'reused'):
+                    continue
+                rows = table.price_range(i)
+                fetch = {column: getattr(table, column)[i] for column in _FETCH_COLUMNS}
+                inserted += self._insert(
+                    fetch, len(rows),
+                    ((table.material(row), resolved[table.material_codes[row]] if resolved else None,
+                      table.price_text(row), table.price_value(row)) for row in rows),
+                )
+        return inserted
+
+    def _insert(self, fetch: Dict, price_count: int, prices: Iterable) -> int:
+        """
+        1社分の取得結果を登録（登録済みの場合は0）
+
+        Args:
+            fetch: 企業名・取得日時・地域・URL・エラーの辞書（結果の辞書と同じキー）
+            price_count: 価格の件数
+            prices: (材料名, 標準材料名, 価格の文字列, 価格) のイテラブル
+        """
+        company = fetch.get('company_name') or ''
+        if self.company_resolver:
+            company = self.company_resolver(company)
+        scraped_at = fetch.get('scraped_at') or datetime.now().isoformat()
+
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO fetches (scraped_at, company, region, url, price_count, error) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (scraped_at, company, fetch.get('region') or '', fetch.get('url') or '', price_count, fetch.get('error')),
+        )
+        if cursor.rowcount == 0:
+            return 0
+        fetch_id = cursor.lastrowid
+
+        rows = [(fetch_id, scraped_at, company, material, canonical or material, price_text, price_value)
+                for material, canonical, price_text, price_value in prices]
+        self.conn.executemany(
+            "INSERT INTO prices (fetch_id, scraped_at, company, material, canonical_material, "
+            "price_text, price_value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def query(self, company: Optional[str] = None, material: Optional[str] = None,
+              start: Union[str, datetime, None] = None, end: Union[str, datetime, None] = None) -> List[Dict]:
+        """
+        価格履歴を検索（取得日時の昇順）
+
+        Args:
+            company: 企業名
+            material: 標準材料名（例: 'ピカ銅'）
+            start: 開始日時（この日時を含む、'2025-06-01'のような日付のみも可）
+            end: 終了日時（この日時を含まない）
+
+        Returns:
+            COLUMNS（取得日時・企業名・地域・材料名・標準材料名・価格文字列・価格）をキーとする辞書のリスト
+        """
+        return [dict(zip(COLUMNS, row)) for row in self.query_rows(company, material, start, end)]
+
+    def query_rows(self, company: Optional[str] = None, material: Optional[str] = None,
+                   start: Union[str, datetime, None] = None, end: Union[str, datetime, None] = None) -> List[tuple]:
+        """query()と同じ条件で、COLUMNSの順のタプルのリストを返す（大量の行を読み込む場合用）"""
+        conditions = []
+        params = []
+        if company is not None:
+            conditions.append('p.company = ?')
+            params.append(company)
+        if material is not None:
+            conditions.append('p.canonical_material = ?')
+            params.append(material)
+        if start is not None:
+            conditions.append('p.scraped_at >= ?')
+            params.append(_as_timestamp(start))
+        if end is not None:
+            conditions.append('p.scraped_at < ?')
+            params.append(_as_timestamp(end))
+
+        sql = f"SELECT {_SELECT} FROM prices p JOIN fetches f ON p.fetch_id = f.id"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY p.scraped_at, p.company, p.material'
+        return [tuple(row) for row in self.conn.execute(sql, params)]
+
+    def latest(self, company: Optional[str] = None) -> List[Dict]:
+        """企業ごとの最新の取得結果の価格"""
+        sql = (
+            f"SELECT {_SELECT} FROM prices p JOIN fetches f ON p.fetch_id = f.id "
+            "JOIN (SELECT company, MAX(scraped_at) AS scraped_at FROM fetches "
+            "      WHERE price_count > 0 GROUP BY company) latest "
+            "ON f.company = latest.company AND f.scraped_at = latest.scraped_at"
+        )
+        params = []
+        if company is not None:
+            sql += ' WHERE p.company = ?'
+            params.append(company)
+        sql += ' ORDER BY p.company, p.material'
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def companies(self) -> List[str]:
+        """登録されている企業名の一覧"""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT company FROM fetches ORDER BY company")]
+
+    def export_parquet(self, output_dir: Union[str, Path], start=None, end=None) -> List[Path]:
+        """
+        価格履歴を月ごとのParquetファイルに書き出す（output_dir/month=YYYY-MM/prices.parquet）
+
+        Args:
+            output_dir: 出力先ディレクトリ
+            start: 開始日時
+            end: 終了日時
+
+        Returns:
+            書き出したファイルのリスト
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet出力にはpyarrowが必要です。pip install pyarrow を実行してください")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        by_month: Dict[str, List[Dict]] = {}
+        for row in self.query(start=start, end=end):
+            by_month.setdefault(row['scraped_at'][:7], []).append(row)
+
+        schema = pa.schema([
+            ('scraped_at', pa.string()),
+            ('company', pa.string()),
+            ('region', pa.string()),
+            ('material', pa.string()),
+            ('canonical_material', pa.string()),
+            ('price_text', pa.string()),
+            ('price_value', pa.float64()),
+        ])
+        written = []
+        for month, rows in sorted(by_month.items()):
+            partition_dir = Path(output_dir) / f'month={month}'
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pylist(rows, schema=schema)
+            output_file = partition_dir / 'prices.parquet'
+            pq.write_table(table, output_file)
+            written.append(output_file)
+            logger.info(f"  {output_file}: {len(rows)} 件")
+        return written
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+企業名・材料名のマッピングテーブルと正規化
+実装済み企業の一覧（IMPLEMENTED_COMPANIES）、取得した材料名 → 正規の表の列名（MATERIAL_MAPPING）、
+sites.yamlの表記名・文字化け名 → 正規化後の企業名（COMPANY_NAME_MAPPING）の定義元
+
+python -m scrapers の実装済み企業の選択・出力と、各スクリプトはすべてこのモジュールの
+テーブルを使う（テーブルを追加・変更する場合はこのモジュールだけを編集する）
+
+使い方:
+    from scrapers.mappings import resolve_material_name, filter_implemented_companies
+
+    resolve_material_name('UPピカ線')   # 'ピカ銅'
+    sites = filter_implemented_companies(load_sites())
+"""
+
+import logging
+import re
+
+from .price import as_price
+
+logger = logging.getLogger(__name__)
+
+# 実装済み会社のリスト（正規化された企業名）
+IMPLEMENTED_COMPANIES = {
+    '眞田鋼業株式会社',
+    '有限会社金田商事',
+    '木村金属（大阪）',
+    '明鑫貿易株式会社',
+    '東起産業（株）',
+    '土金（大阪）',
+    '大畑商事（千葉・大阪）',
+    '千福商会（大阪）',
+    '鴻祥貿易株式会社',
+    '株式会社鳳山',
+    '株式会社 春日商会　富山支店',
+    '株式会社 春日商会　滋賀支店',
+    '株式会社 春日商会　一宮本社',
+    '安城貿易（愛知）',
+    '東北キング',
+    '株式会社八木',
+    '有限会社　八尾アルミセンター',
+    '株式会社 ヒラノヤ',
+    '鴻陽産業株式会社 岐阜工場',
+    '株式会社 大垣金属',
+    '高橋商事株式会社',
+}
+
+# 材料名のマッピング（取得した材料名 → 正規の表の列名）
+# 注意: スクレイピング結果に「UP」「税込」などの接頭辞が付くことがあるため、
+#       normalize_material_name関数で事前にクリーンアップする
+MATERIAL_MAPPING = {
+    'ピカ銅': 'ピカ銅',
+    'ピカ線': 'ピカ銅',
+    'ピカドウ': 'ピカ銅',
+    '1号銅': 'ピカ銅',
+    '1号銅線': 'ピカ銅',
+    '1号銅線(ピカ線)': 'ピカ銅',
+    '1号銅線（ピカ線）': 'ピカ銅',
+    '一号銅': 'ピカ銅',
+    '特一号銅': 'ピカ銅',
+    '特1号銅': 'ピカ銅',
+    '一号銅線（ピカ線）': 'ピカ銅',
+    'ピカ線一号': 'ピカ銅',
+    '上銅': 'ピカ銅',
+    '上故銅': 'ピカ銅',
+    'ピカ線(1号銅線)': 'ピカ銅',
+    
+    '並銅': '並銅',
+    '波銅': '並銅',
+    '波道': '並銅',
+    'なみどう': '並銅',
+    '込銅': '並銅',
+    '込銅（真鍮なし）': '並銅',
+    '込銅(真鍮なし)': '並銅',
+    '銅（並）銅管': '並銅',
+    '銅(並)銅管': '並銅',
+    
+    '砲金': '砲金',
+    '砲金コロ': '砲金',
+    '砲金（水道ﾒｰﾀｰ・異物無）': '砲金',
+    '砲金(水道メーター・異物無)': '砲金',
+    'ほうきん': '砲金',
+    'gunmetal': '砲金',
+    '青銅': '砲金',
+    
+    '真鍮': '真鍮',
+    '真鍮/黄銅': '真鍮',
+    '真鍮(上)': '真鍮',
+    '真鍮（上）': '真鍮',
+    '真鍮(上)A': '真鍮',
+    '真鍮（上）A': '真鍮',
+    '真鍮(上)A(他金属 無)': '真鍮',
+    '真鍮（上）A（他金属 無）': '真鍮',
+    '真鍮（異物なし）': '真鍮',
+    '真鍮(異物なし)': '真鍮',
+    'しんちゅう': '真鍮',
+    '黄銅': '真鍮',
+    'brass': '真鍮',
+    '真鍮A': '真鍮',
+    '込真鍮': '真鍮',
+    '込真鍮（黄銅）': '真鍮',
+    '込真鍮(A)': '真鍮',
+    '込真鍮（A）': '真鍮',
+    '真鍮・込真鍮': '真鍮',
+    
+    '雑線80%': '雑線80%',
+    '雑電線80%': '雑線80%',
+    '雑電線(銅率80%)': '雑線80%',
+    '雑電線（銅率80%）': '雑線80%',
+    '電線80%': '雑線80%',
+    '電線80％': '雑線80%',
+    '電線A・80％': '雑線80%',
+    '電線A・80%': '雑線80%',
+    '電線A（８０％以上）': '雑線80%',
+    '電線A（80％以上）': '雑線80%',
+    '電線A（80%以上）': '雑線80%',
+    '銅率80%': '雑線80%',
+    '銅80%': '雑線80%',
+    '80%線': '雑線80%',
+    '一本線80%': '雑線80%',
+    '一本線(A)': '雑線80%',
+    '一本線 A': '雑線80%',
+    '一本線A': '雑線80%',
+    '上線（80％）': '雑線80%',
+    '上線(80%)': '雑線80%',
+    '上線(80％)': '雑線80%',
+    '上線 銅率80%': '雑線80%',
+    '上線銅率80%': '雑線80%',
+    '雑線S': '雑線80%',
+    '雑線S（80%）': '雑線80%',
+    '銅線（80%以上）': '雑線80%',
+    '銅線(80%以上)': '雑線80%',
+    '電線A・80': '雑線80%',  # 鴻陽産業
+    
+    '雑線60%': '雑線60%-65%',
+    '雑線65%': '雑線60%-65%',
+    '雑電線60%': '雑線60%-65%',
+    '雑電線65%': '雑線60%-65%',
+    '雑電線(銅率65%)': '雑線60%-65%',
+    '雑電線（銅率65%）': '雑線60%-65%',
+    '電線60%': '雑線60%-65%',
+    '電線60％': '雑線60%-65%',
+    '電線C・60％': '雑線60%-65%',
+    '電線C・60%': '雑線60%-65%',
+    '電線C・60': '雑線60%-65%',  # 鴻陽産業
+    '電線65%': '雑線60%-65%',
+    '銅率60%': '雑線60%-65%',
+    '銅率65%': '雑線60%-65%',
+    '銅60%': '雑線60%-65%',
+    '銅65%': '雑線60%-65%',
+    '60%線': '雑線60%-65%',
+    '雑線60-65%': '雑線60%-65%',
+    '銅線（60%以上）': '雑線60%-65%',
+    '銅線(60%以上)': '雑線60%-65%',
+    '三本線65%': '雑線60%-65%',
+    '三本線60～65%': '雑線60%-65%',
+    '三本線60~65%': '雑線60%-65%',
+    '三本線(A)': '雑線60%-65%',
+    '三本線(B)': '雑線60%-65%',
+    '三本線 A': '雑線60%-65%',
+    '三本線A': '雑線60%-65%',
+    '三本線A（60％）': '雑線60%-65%',
+    '三本線A（60%）': '雑線60%-65%',
+    '三本線（銅率65%）': '雑線60%-65%',
+    '三本線（銅率65％）': '雑線60%-65%',
+    '三本線(銅率65%)': '雑線60%-65%',
+    '上線（60％）': '雑線60%-65%',
+    '上線（60％）SV': '雑線60%-65%',
+    '上線（60%）SV': '雑線60%-65%',
+    '上線(60%)': '雑線60%-65%',
+    '上線(60％)': '雑線60%-65%',
+    '中線(65%)': '雑線60%-65%',
+    '中線（65%）': '雑線60%-65%',
+    '中線(65％)': '雑線60%-65%',
+    '中線（65％）': '雑線60%-65%',
+    '雑線A': '雑線60%-65%',
+    '雑線A（60%）': '雑線60%-65%',
+    '雑線A（60％）': '雑線60%-65%',
+    '上線 銅率60%': '雑線60%-65%',
+    '上線銅率60%': '雑線60%-65%',
+    
+    'VA線': 'VA線',
+    'VVF': 'VA線',
+    'VVFケーブル': 'VA線',
+    'VA線・巻物': 'VA線',
+    'VA線(巻物)': 'VA線',
+    'VA線（巻物）': 'VA線',
+    'VA線（巻き）': 'VA線',
+    'VA線(巻き)': 'VA線',
+    'VA線(VVF・Fｹｰﾌﾞﾙ)': 'VA線',
+    'VA線（VVF・Fケーブル）': 'VA線',
+    'ねずみ線': 'VA線',
+    
+    'アルミホイール': 'アルミホイール',
+    'アルミホイールA': 'アルミホイール',
+    'ホイール': 'アルミホイール',
+    'アルミホイル': 'アルミホイール',
+    'アルミホイル（異物無／有）': 'アルミホイール',
+    'アルミホイル(異物無/有)': 'アルミホイール',
+    'ｱﾙﾐﾎｲｰﾙ': 'アルミホイール',
+    'ｱﾙﾐﾎｲｰﾙ付きなし': 'アルミホイール',
+    
+    'アルミサッシ': 'アルミサッシ',
+    'アルミサッシA': 'アルミサッシ',
+    'アルミサッシ上': 'アルミサッシ',
+    'サッシ': 'アルミサッシ',
+    'ｱﾙﾐｻｯｼ': 'アルミサッシ',
+    'ｱﾙﾐｻｯｼ(63S)': 'アルミサッシ',
+    'サッシ新': 'アルミサッシ',
+    'サッシA': 'アルミサッシ',
+    'サッシB': 'アルミサッシ',
+    'アルミサッシA': 'アルミサッシ',
+    'アルミサッシ(ビス付き)': 'アルミサッシ',
+    'アルミサッシ（ビスなし）': 'アルミサッシ',
+    'アルミサッシ(ビスなし)': 'アルミサッシ',
+    'アルミ（上）': 'アルミサッシ',
+    'アルミ(上)': 'アルミサッシ',
+    'アルミ（63S）': 'アルミサッシ',
+    'アルミ(63S)': 'アルミサッシ',
+    'アルミサッシビス付': 'アルミサッシ',
+    
+    # アルミ缶（バラ・プレス統合）
+    'アルミ缶': 'アルミ缶',
+    'アルミ缶バラ': 'アルミ缶',
+    'アルミ缶(バラ)': 'アルミ缶',
+    'アルミ缶（バラ）': 'アルミ缶',
+    'アルミ缶（飲料缶）': 'アルミ缶',
+    'アルミ缶（飲料缶・UBC）': 'アルミ缶',
+    'アルミ缶(飲料缶)': 'アルミ缶',
+    '缶バラ': 'アルミ缶',
+    'バラ缶': 'アルミ缶',
+    'バラアルミ缶': 'アルミ缶',
+    'アルミ缶プレス': 'アルミ缶',
+    'アルミ缶(プレス)': 'アルミ缶',
+    'アルミ缶（プレス）': 'アルミ缶',
+    '缶プレス': 'アルミ缶',
+    'アルミプレス': 'アルミ缶',
+    'プレス缶': 'アルミ缶',
+    'アルミ缶(飲料缶・UBC) プレス物': 'アルミ缶',
+    'アルミ缶（飲料缶・UBC）プレス物': 'アルミ缶',
+    
+    'SUS304': 'ステンレス304',
+    'ステンレス304': 'ステンレス304',
+    '304': 'ステンレス304',
+    'ステンレス': 'ステンレス304',
+    'ステンレス（304）': 'ステンレス304',
+    'ステンレス(304)': 'ステンレス304',
+    'ステンレス（304系）': 'ステンレス304',
+    'ステンレス(304系)': 'ステンレス304',
+    'ステンレス18-8A': 'ステンレス304',
+    'ステンレス18-8A(SUS304屑)': 'ステンレス304',
+    'ステンレス18-8A（SUS304屑）': 'ステンレス304',
+    'ステン304': 'ステンレス304',
+    'ステンレス（上）': 'ステンレス304',
+    'ステンレス(上)': 'ステンレス304',
+    
+    '鉛バッテリー': '鉛バッテリー',
+    'バッテリー': '鉛バッテリー',
+    'バッテリーA': '鉛バッテリー',
+    '車バッテリー': '鉛バッテリー',
+    '自動車バッテリー': '鉛バッテリー',
+    'カーバッテリー': '鉛バッテリー',
+    'バッテリー（上）': '鉛バッテリー',
+    'バッテリー(上)': '鉛バッテリー',
+    '鉛': '鉛バッテリー',
+}
+
+# 企業名のマッピング（文字化け対応・正規化）
+# キー: sites.yamlでの表記名または文字化け名
+# 値: 正規化後の名前（IMPLEMENTED_COMPANIESと一致させる）
+COMPANY_NAME_MAPPING = {
+    # 眞田鋼業
+    '眞田鋼業株式会社': '眞田鋼業株式会社',
+    # 金田商事
+    '有限会社金田商事': '有限会社金田商事',
+    # 木村金属
+    '木村金属（大阪）': '木村金属（大阪）',
+    '木村��属（大阪�': '木村金属（大阪）',
+    # 明鑫貿易
+    '明鑫貿易株式会社': '明鑫貿易株式会社',
+    '明鑫貿易�式会社': '明鑫貿易株式会社',
+    # 東起産業
+    '東起産業（株）': '東起産業（株）',
+    '東起産業（株）': '東起産業（株）',
+    '東起産業��檼': '東起産業（株）',
+    # 土金
+    '土金（大阪）': '土金（大阪）',
+    '土金（大阪）': '土金（大阪）',
+    '土�߼�大阪�': '土金（大阪）',
+    # 大畑商事
+    '大畑商事（千葉・大阪）': '大畑商事（千葉・大阪）',
+    '大畑商事（千葉�大阪�': '大畑商事（千葉・大阪）',
+    # 千福商会
+    '千福商会（大阪）': '千福商会（大阪）',
+    '卦�商会（大阪�': '千福商会（大阪）',
+    # 鴻祥貿易
+    '鴻祥貿易株式会社': '鴻祥貿易株式会社',
+    '鴻祥貿易�式会社': '鴻祥貿易株式会社',
+    # 株式会社鳳山
+    '株式会社鳳山': '株式会社鳳山',
+    # 春日商会
+    '株式会社 春日商会　富山支店': '株式会社 春日商会　富山支店',
+    '株式会社 春日啼 富山支�': '株式会社 春日商会　富山支店',
+    '株式会社 春日商会　滋賀支店': '株式会社 春日商会　滋賀支店',
+    '株式会社 春日啼 滋�支�': '株式会社 春日商会　滋賀支店',
+    '株式会社 春日商会　一宮本社': '株式会社 春日商会　一宮本社',
+    '株式会社 春日啼 �宮本社': '株式会社 春日商会　一宮本社',
+    # 安城貿易
+    '安城貿易（愛知）': '安城貿易（愛知）',
+    '安城貿易（�知�': '安城貿易（愛知）',
+    # 東北キング
+    '東北キング': '東北キング',
+    # 株式会社八木
+    '株式会社八木': '株式会社八木',
+    # 八尾アルミセンター
+    '有限会社　八尾アルミセンター': '有限会社　八尾アルミセンター',
+    # ヒラノヤ
+    '株式会社 ヒラノヤ': '株式会社 ヒラノヤ',
+    # 鴻陽産業
+    '鴻陽産業株式会社 岐阜工場': '鴻陽産業株式会社 岐阜工場',
+    '鴻陽産業株式会社　岐阜工場': '鴻陽産業株式会社 岐阜工場',
+    # 大垣金属
+    '株式会社 大垣金属': '株式会社 大垣金属',
+    '株式会社　大垣金属': '株式会社 大垣金属',
+    # 高橋商事
+    '高橋商事株式会社': '高橋商事株式会社',
+}
+
+def normalize_company_name(name):
+    """企業名を正規化（文字化け対応、重複を避ける）"""
+    if not name:
+        return ''
+    
+    name = str(name).strip()
+    
+    # マッピングを確認
+    if name in COMPANY_NAME_MAPPING:
+        return COMPANY_NAME_MAPPING[name]
+    
+    # 部分一致でマッピングを探す
+    for key, value in COMPANY_NAME_MAPPING.items():
+        if key in name or name in key:
+            return value
+    
+    # 実装済み18社のリストと照合
+    for implemented_name in IMPLEMENTED_COMPANIES:
+        # 部分一致で確認
+        if implemented_name in name or name in implemented_name:
+            return implemented_name
+    
+    return name
+
+def normalize_price(price_str):
+    """価格文字列を正規化（数値のみを抽出、範囲表記の場合は下限）"""
+    if not price_str:
+        return ''
+    return as_price(price_str).number_text()
+
+def normalize_material_name(material_name):
+    """材料名を正規化（不要な接頭辞を削除）
+    
+    スクレイピング結果に含まれる「UP」「税込」「鉄くず系PC基板系」などの
+    ゴミ文字を削除して、正しい材料名を抽出する
+    """
+    if not material_name:
+        return ''
+    
+    name = str(material_name).strip()
+    
+    # 不要な接頭辞パターンを削除
+    # 例: "UPピカ銅" → "ピカ銅"
+    # 例: "税込UP上銅" → "上銅"
+    # 例: "鉄くず系PC基板系UP砲金" → "砲金"
+    prefixes_to_remove = [
+        r'^.*?鉄くず系PC基板系',
+        r'^.*?くず系PC基板系',
+        r'^.*?系PC基板系',
+        r'^.*?PC基板系',
+        r'^.*?トランス系',
+        r'^.*?ランス系',
+        r'^.*?ンス系',
+        r'^.*?ス系',
+        r'^.*?タートランス系',
+        r'^税込UP',
+        r'^本税込UP',
+        r'^税込',
+        r'^UP',
+    ]
+    
+    for pattern in prefixes_to_remove:
+        name = re.sub(pattern, '', name)
+    
+    # 再度トリム
+    name = name.strip()
+    
+    return name if name else material_name
+
+def resolve_material_name(material_name):
+    """材料名をMATERIAL_MAPPINGの標準名に変換（マッチしない場合はNone）
+    
+    完全一致（接頭辞除去後 → 元の名前）を優先し、なければ接頭辞除去後の名前で部分一致
+    """
+    clean_material = normalize_material_name(material_name)
+    
+    if clean_material in MATERIAL_MAPPING:
+        return MATERIAL_MAPPING[clean_material]
+    if material_name in MATERIAL_MAPPING:
+        return MATERIAL_MAPPING[material_name]
+    for key, value in MATERIAL_MAPPING.items():
+        if key in clean_material or clean_material in key:
+            return value
+    return None
+
+def filter_implemented_companies(sites):
+    """実装済み企業のみをフィルタリング"""
+    filtered = []
+    seen_companies = set()  # 重複チェック用
+    
+    for site in sites:
+        company_name = site.get('name', '')
+        normalized_name = normalize_company_name(company_name)
+        
+        # 実装済みリストに含まれているか確認
+        is_implemented = False
+        matched_impl_name = None
+        
+        # 完全一致を優先
+        if normalized_name in IMPLEMENTED_COMPANIES:
+            is_implemented = True
+            matched_impl_name = normalized_name
+        else:
+            # 部分一致で確認
+            for impl_name in IMPLEMENTED_COMPANIES:
+                # 括弧の種類を統一して比較
+                norm1 = normalized_name.replace('（', '(').replace('）', ')').replace('　', ' ')
+                norm2 = impl_name.replace('（', '(').replace('）', ')').replace('　', ' ')
+                if norm1 == norm2 or impl_name in normalized_name or normalized_name in impl_name:
+                    is_implemented = True
+                    matched_impl_name = impl_name
+                    break
+        
+        if not is_implemented:
+            logger.debug(f"未実装企業をスキップ: {company_name} (正規化後: {normalized_name})")
+            continue
+        
+        # 重複チェック（正規化後の名前で）
+        if matched_impl_name in seen_companies:
+            logger.warning(f"重複をスキップ: {company_name} (正規化後: {matched_impl_name})")
+            continue
+        
+        seen_companies.add(matched_impl_name)
+        # サイト設定に正規化後の名前を設定（読み込んだ設定は変更できないためコピーに追加）
+        filtered.append(dict(site, normalized_name=matched_impl_name))
+    
+    logger.info(f"フィルタリング結果: {len(filtered)}社が実装済み")
+    for impl_name in IMPLEMENTED_COMPANIES:
+        if impl_name not in seen_companies:
+            logger.warning(f"  未マッチ実装企業: {impl_name}")
+    
+    return filtered
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDFのページごとの表・テキストの抽出（pdfplumber）
+ページをプロセスプールで並列に抽出し、結果をPDFの内容のハッシュとページ番号ごとに
+キャッシュする（.pdf_cache/<SHA-256>/）。内容が変わっていないPDFを再度処理する場合は
+pdfplumberを使わずにキャッシュから読む
+
+結果はページ番号の順に、前のページまでの抽出が終わり次第返すため、
+呼び出し側はすべてのページの完了を待たずに書き出せる
+
+pdf_to_csv.py（表）と read_pdf.py（テキスト・表）で使用
+
+使い方:
+    from scrapers.pdf_tables import iter_pages
+
+    for page_num, tables in iter_pages('一覧.pdf', kind='tables'):
+        ...
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# pdfplumberはキャッシュにないページを抽出する場合のみインポートする
+PDFPLUMBER_AVAILABLE = importlib.util.find_spec('pdfplumber') is not None
+
+# ページごとの抽出結果の既定の保存先
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / '.pdf_cache'
+
+# キャッシュの形式のバージョン（抽出方法を変えたら上げる）
+CACHE_VERSION = 1
+
+# 抽出する内容 → pdfplumberのページのメソッド
+KINDS = {
+    'tables': 'extract_tables',
+    'text': 'extract_text',
+}
+
+# プロセスごとに開いたPDF（ワーカーの初期化時に設定）
+_worker_pdf = None
+
+
+def pdf_digest(pdf_path: PathLike) -> str:
+    """PDFの内容のハッシュ（キャッシュのキー）"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(cache_dir: PathLike, digest: str, page_num: int, kind: str) -> Path:
+    """ページの抽出結果のキャッシュファイル"""
+    return Path(cache_dir) / digest / f"page_{page_num:04d}.{kind}.json"
+
+
+def _meta_path(cache_dir: PathLike, digest: str) -> Path:
+    return Path(cache_dir) / digest / 'meta.json'
+
+
+def _read_json(path: Path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"PDFキャッシュを読み込めないため抽出し直します: {path} - {e}")
+        return None
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+        return None
+    return data
+
+
+def _write_json(path: Path, data: Dict):
+    """キャッシュを保存（一時ファイルに書いてから置き換える）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(dict(data, version=CACHE_VERSION), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _open_pdf(pdf_path: PathLike):
+    if not PDFPLUMBER_AVAILABLE:
+        raise ImportError("PDFの読み込みにはpdfplumberが必要です。'pip install pdfplumber'を実行してください。")
+    import pdfplumber
+    return pdfplumber.open(pdf_path)
+
+
+def page_count(pdf_path: PathLike, cache_dir: Optional[PathLike] = DEFAULT_CACHE_DIR,
+               digest: Optional[str] = None) -> int:
+    """PDFのページ数（キャッシュにある場合はPDFを開かない）"""
+    digest = digest or pdf_digest(pdf_path)
+    if cache_dir is not None:
+        meta = _read_json(_meta_path(cache_dir, digest))
+        if meta:
+            return meta['pages']
+    with _open_pdf(pdf_path) as pdf:
+        count = len(pdf.pages)
+    if cache_dir is not None:
+        _write_json(_meta_path(cache_dir, digest), {'pages': count})
+    return count
+
+
+def _extract(pdf, page_num: int, kind: str):
+    return getattr(pdf.pages[page_num - 1], KINDS[kind])()
+
+
+def _init_worker(pdf_path: str):
+    """ワーカープロセスの初期化（PDFはプロセスごとに1回だけ開く）"""
+    global _worker_pdf
+    _worker_pdf = _open_pdf(pdf_path)
+
+
+def _extract_in_worker(task: Tuple[int, str]):
+    page_num, kind = task
+    return _extract(_worker_pdf, page_num, kind)
+
+
+def _extract_pages(pdf_path: PathLike, page_nums: List[int], kind: str,
+                   workers: Optional[int]) -> Iterator:
+    """ページを抽出してページ番号の順に結果を返す（2ページ以上かつworkers>1の場合はプロセスプール）"""
+    workers = min(workers or os.cpu_count() or 1, len(page_nums))
+    if workers <= 1:
+        with _open_pdf(pdf_path) as pdf:
+            for page_num in page_nums:
+                yield _extract(pdf, page_num, kind)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(pdf_path),)) as executor:
+        yield from executor.map(_extract_in_worker, [(page_num, kind) for page_num in page_nums])
+
+
+def iter_pages(pdf_path: PathLike, kind: str = 'tables', pages: Optional[Iterable[int]] = None,
+               workers: Optional[int] = None,
+               cache_dir: Optional[PathLike] = DEFAULT_CACHE_DIR) -> Iterator[Tuple[int, object]]:
+    """
+    ページごとの抽出結果を順に返す
+
+    Args:
+        pdf_path: PDFファイルのパス
+        kind: 'tables'（page.extract_tables()）または 'text'（page.extract_text()）
+        pages: 抽出するページ番号（1始まり、Noneの場合はすべてのページ）
+        workers: 並列に抽出するプロセス数（Noneの場合はCPU数、1の場合は並列にしない）
+        cache_dir: キャッシュの保存先（Noneの場合はキャッシュを使わない）
+
+    Yields:
+        (ページ番号, 抽出結果)
+
+    Raises:
+        ImportError: キャッシュにないページがあり、pdfplumberがインストールされていない場合
+    """
+    if kind not in KINDS:
+        raise ValueError(f"不明な抽出内容: {kind}")
+
+    digest = pdf_digest(pdf_path)
+    count = page_count(pdf_path, cache_dir, digest)
+    page_nums = list(dict.fromkeys(page_num for page_num in (range(1, count + 1) if pages is None else pages)
+                                   if 1 <= page_num <= count))
+
+    cached = {}
+    if cache_dir is not None:
+        for page_num in page_nums:
+            entry = _read_json(cache_path(cache_dir, digest, page_num, kind))
+            if entry is not None:
+                cached[page_num] = entry['data']
+    missing = [page_num for page_num in page_nums if page_num not in cached]
+    if missing:
+        logger.info(f"PDFの{len(missing)}/{len(page_nums)}ページを抽出します（キャッシュ: {len(cached)}ページ）")
+
+    extracted = zip(missing, _extract_pages(pdf_path, missing, kind, workers)) if missing else iter(())
+    for page_num in page_nums:
+        if page_num in cached:
+            yield page_num, cached[page_num]
+            continue
+        # missingはpage_numsと同じ順序なので、次に返される抽出結果はこのページ
+        _, data = next(extracted)
+        if cache_dir is not None:
+            _write_json(cache_path(cache_dir, digest, page_num, kind), {'data': data})
+        yield page_num, data
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+スクレイピングの共通パイプライン
+サイト設定のリストを取得し（requestsで1社ずつ、またはaiohttpで同時に）、差分取得・
+企業名の正規化・価格修正マッピングを適用した結果を返す
+
+scrape_prices_v2.py・scrape_and_fill_standard_table.py・fill_table_formats.py・
+scrape_18_companies_to_excel.py と python -m scrapers はすべてこのパイプラインで取得する
+
+サイト設定に normalized_name がある場合（filter_implemented_companiesで選択した場合）は、
+結果の company_name をその名前に置き換える
+
+使い方:
+    from scrapers.pipeline import scrape_sites
+
+    results, timers = scrape_sites(sites, target_items, backend='async', corrections=plan)
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .resilience import DEFAULT_SITE_BUDGET
+from .timing import PhaseTimer
+
+logger = logging.getLogger(__name__)
+
+# HTTPバックエンド
+BACKENDS = ('requests', 'async')
+
+
+def create_scraper(site_config: Dict, delay: float = 2.0, breaker=None, budget: float = DEFAULT_SITE_BUDGET):
+    """
+    カテゴリに応じてスクレイパーを作成（breaker・budgetはBaseScraperと同じ）
+
+    Returns:
+        スクレイパー、不明なカテゴリの場合はNone
+    """
+    from . import Category1Scraper, Category2Scraper
+
+    category = site_config.get('category', 0)
+    if category == 1:
+        return Category1Scraper(site_config, delay=delay, breaker=breaker, budget=budget)
+    if category == 2:
+        return Category2Scraper(site_config, delay=delay, breaker=breaker, budget=budget)
+    logger.warning(f"  不明なカテゴリ: {category}（{site_config.get('name', '不明')}）")
+    return None
+
+
+def company_name(site_config: Dict) -> str:
+    """結果に記録する企業名（正規化後の名前があればその名前）"""
+    return site_config.get('normalized_name') or site_config.get('name', '')
+
+
+def error_result(site_config: Dict, error: str) -> Dict:
+    """スクレイパーが例外を送出した場合の結果（価格修正マッピングのaddは適用される）"""
+    return {
+        'scraped_at': datetime.now().isoformat(),
+        'url': site_config.get('price_url', ''),
+        'company_name': company_name(site_config),
+        'region': site_config.get('region', ''),
+        'error': error,
+        'prices': {}
+    }
+
+
+def log_result(result: Dict, show_prices: int = 0):
+    """
+    1社分の取得結果をログ出力
+
+    Args:
+        result: 取得結果
+        show_prices: 表示する価格の件数（先頭から）
+    """
+    prices = result.get('prices', {})
+    if result.get('reused'):
+        logger.info(f"  ↻ {result.get('company_name', '')}: 更新間隔内のため前回の結果（{len(prices)} 件）を再利用")
+    elif prices:
+        logger.info(f"  ✓ {result.get('company_name', '')}: {len(prices)} 件の価格情報を取得")
+        for material, price in list(prices.items())[:show_prices]:
+            logger.info(f"    - {material}: {price}")
+    else:
+        error = result.get('error', '')
+        logger.warning(f"  ✗ {result.get('company_name', '')}: 価格情報を取得できませんでした: {error}")
+
+
+def _scrape_sequential(sites, target_items, delay, store, show_prices, breaker,
+                       site_budget) -> Tuple[List[Dict], List[PhaseTimer]]:
+    results = []
+    timers = []
+    for i, site_config in enumerate(sites, 1):
+        name = site_config.get('name', '不明')
+        normalized = site_config.get('normalized_name')
+        label = f"{name} (正規化後: {normalized})" if normalized else f"{name} (カテゴリ{site_config.get('category', 0)})"
+        logger.info(f"[{i}/{len(sites)}] 処理中: {label}")
+
+        if store and store.is_fresh(site_config):
+            results.append(store.cached_result(site_config))
+            logger.info(f"  ↻ 更新間隔内のため前回の結果を再利用（{store.last_success(site_config):%Y-%m-%d %H:%M}取得）")
+            continue
+
+        try:
+            scraper = create_scraper(site_config, delay=delay, breaker=breaker, budget=site_budget)
+            if scraper is None:
+                continue
+            result = scraper.scrape(
+                filter_target_items=bool(target_items),
+                target_items_config=target_items or None
+            )
+            result['company_name'] = company_name(site_config)
+            timers.append(scraper.timer)
+            if store:
+                store.record(site_config, result)
+        except Exception as e:
+            logger.error(f"  エラー: {name} - {str(e)}")
+            result = error_result(site_config, str(e))
+
+        results.append(result)
+        log_result(result, show_prices)
+    return results, timers
+
+
+def _scrape_async(sites, target_items, delay, store, per_host_limit, max_in_flight,
+                  total_timeout, breaker, site_budget) -> Tuple[List[Dict], List[PhaseTimer]]:
+    from .async_backend import run_scrapers_async
+
+    # 全サイトを1スレッドで同時に取得（同じホストへのアクセスはdelay秒ずつ間隔を空ける）
+    slots = []
+    scrapers = []
+    for site_config in sites:
+        if store and store.is_fresh(site_config):
+            slots.append(store.cached_result(site_config))
+            continue
+        scraper = create_scraper(site_config, delay=delay, breaker=breaker, budget=site_budget)
+        if scraper:
+            slots.append(scraper)
+            scrapers.append(scraper)
+
+    scraped = iter(run_scrapers_async(
+        scrapers,
+        filter_target_items=bool(target_items),
+        target_items_config=target_items or None,
+        per_host_limit=per_host_limit,
+        max_in_flight=max_in_flight,
+        total_timeout=total_timeout,
+    ))
+    results = []
+    for slot in slots:
+        if isinstance(slot, dict):
+            results.append(slot)
+            continue
+        result = next(scraped)
+        result['company_name'] = company_name(slot.site_config)
+        if store:
+            store.record(slot.site_config, result)
+        results.append(result)
+    for result in results:
+        log_result(result)
+    return results, [scraper.timer for scraper in scrapers]
+
+
+def scrape_sites(sites: Sequence[Dict], target_items: Optional[Sequence[Dict]] = None,
+                 backend: str = 'requests', delay: float = 2.0, per_host_limit: int = 2,
+                 max_in_flight: int = 100, total_timeout: Optional[float] = None,
+                 store=None, corrections=None, show_prices: int = 0, breaker=None,
+                 site_budget: float = DEFAULT_SITE_BUDGET) -> Tuple[List[Dict], List[PhaseTimer]]:
+    """
+    サイトを取得して結果のリストを返す
+
+    Args:
+        sites: サイト設定のリスト
+        target_items: 対象アイテムの設定（空の場合はすべての材料）
+        backend: 'requests'（1社ずつ）または 'async'（aiohttpで同時に取得）
+        delay: 同じホストへのリクエストの間隔（秒）
+        per_host_limit: asyncバックエンドでの1ホストあたりの同時接続数
+        max_in_flight: asyncバックエンドでの全体の同時接続数
+        total_timeout: asyncバックエンドでの全体のタイムアウト（秒）
+        store: 差分取得用のFreshnessStore（Noneの場合はすべて取得）
+        corrections: 価格修正マッピング（CorrectionPlan、Noneの場合は適用しない）
+        show_prices: 1社ごとにログに表示する価格の件数
+        breaker: ホストごとのCircuitBreaker（Noneの場合は使わない）
+        site_budget: 1サイトの取得期限（秒、sites.yamlのfetch_budgetが優先）
+
+    Returns:
+        (結果のリスト、スクレイパーごとのPhaseTimerのリスト)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"不明なバックエンド: {backend}")
+
+    if backend == 'async':
+        results, timers = _scrape_async(sites, target_items, delay, store, per_host_limit,
+                                        max_in_flight, total_timeout, breaker, site_budget)
+    else:
+        results, timers = _scrape_sequential(sites, target_items, delay, store, show_prices,
+                                             breaker, site_budget)
+
+    if store:
+        store.save()
+        logger.info(store.summary())
+    if breaker:
+        breaker.save()
+        logger.info(breaker.summary())
+
+    if corrections:
+        logger.info("価格修正マッピングを適用中...")
+        results = corrections.apply_all(results)
+    return results, timers
+
+
+def log_summary(results, total: Optional[int] = None):
+    """取得結果のサマリーをログ出力（resultsはResultTable）"""
+    total = len(results) if total is None else total
+    success_count = results.success_count
+    logger.info(f"\n{'='*60}")
+    logger.info(f"スクレイピング完了:")
+    logger.info(f"  成功: {success_count}/{total} 社")
+    logger.info(f"  失敗: {total - success_count}/{total} 社")
+    logger.info(f"  取得価格情報総数: {results.price_count} 件")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格モデル
+「1,750円/kg」「780円」「890～1080円」などの価格文字列を抽出時に1回だけ解析し、
+数値（円）・単位・税込区分・範囲の下限/上限を保持する
+
+Priceはstrのサブクラスなので、これまでどおり文字列として比較・JSON出力・Excel出力でき、
+修正処理や保存処理では正規表現で再解析せずに数値を参照できる
+
+使い方:
+    from scrapers.price import Price, as_price
+
+    price = as_price('890～1,080円/kg（税込）')
+    price.value         # 890（範囲表記の場合は下限）
+    price.high          # 1080
+    price.unit          # 'kg'
+    price.tax_included  # True
+"""
+
+import re
+from typing import Optional, Union
+
+# 価格の数値（カンマ区切り・小数に対応）
+_NUMBER = r'\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?'
+_PRICE_NUMBER = re.compile(f'({_NUMBER})')
+# 範囲表記（890～1080円、1,562〜1,577円など）
+_PRICE_RANGE = re.compile(f'({_NUMBER})\\s*[～〜~\\-－ー]\\s*({_NUMBER})')
+# 単位（円/kg、円／ｋｇ、円/t など）
+_PRICE_UNIT = re.compile(r'[円¥]\s*[/／]\s*([a-zA-Zａ-ｚＡ-Ｚ]+|トン|個|本|台|枚)')
+_TAX_INCLUDED = ('税込', '税込み', '内税')
+_TAX_EXCLUDED = ('税抜', '税抜き', '税別', '外税')
+
+Number = Union[int, float]
+
+
+def _to_number(text: str) -> Number:
+    """'1,750' → 1750、'85.5' → 85.5（整数の場合はint）"""
+    value = float(text.replace(',', '').replace('，', ''))
+    return int(value) if value.is_integer() else value
+
+
+class Price(str):
+    """
+    解析済みの価格（元の文字列として振る舞う）
+
+    Attributes:
+        value: 価格（円、範囲表記の場合は下限、数値がない場合はNone）
+        low: 範囲の下限（範囲表記でない場合はvalueと同じ）
+        high: 範囲の上限（範囲表記でない場合はvalueと同じ）
+        unit: 単位（'kg'、't'など、表記がない場合は''）
+        tax_included: 税込ならTrue、税抜・税別ならFalse、表記がない場合はNone
+    """
+
+    __slots__ = ('value', 'low', 'high', 'unit', 'tax_included')
+
+    def __new__(cls, raw: str = '', tax_included: Optional[bool] = None):
+        """
+        Args:
+            raw: 価格の文字列
+            tax_included: 税込区分（指定した場合は文字列の表記より優先）
+        """
+        price = super().__new__(cls, raw)
+        text = str(raw)
+
+        range_match = _PRICE_RANGE.search(text)
+        number_match = _PRICE_NUMBER.search(text)
+        if number_match:
+            price.value = _to_number(number_match.group(1))
+            # 最初の数値から始まる範囲表記のみを範囲とみなす
+            if range_match and range_match.start() == number_match.start():
+                price.low = price.value
+                price.high = _to_number(range_match.group(2))
+            else:
+                price.low = price.high = price.value
+        else:
+            price.value = price.low = price.high = None
+
+        unit_match = _PRICE_UNIT.search(text)
+        price.unit = unit_match.group(1).lower() if unit_match else ''
+
+        if tax_included is None:
+            if any(word in text for word in _TAX_EXCLUDED):
+                tax_included = False
+            elif any(word in text for word in _TAX_INCLUDED):
+                tax_included = True
+        price.tax_included = tax_included
+        return price
+
+    @classmethod
+    def from_value(cls, value: Number, unit: str = 'kg', tax_included: Optional[bool] = None) -> 'Price':
+        """数値から価格を作成（例: from_value(1735) → '1735円/kg'）"""
+        text = f"{value}円/{unit}" if unit else f"{value}円"
+        return cls(text, tax_included=tax_included)
+
+    @property
+    def raw(self) -> str:
+        """元の文字列"""
+        return str.__str__(self)
+
+    @property
+    def is_range(self) -> bool:
+        """範囲表記か"""
+        return self.value is not None and self.low != self.high
+
+    def number_text(self) -> str:
+        """価格の数値部分の文字列（カンマなし、数値がない場合は''）"""
+        return '' if self.value is None else str(self.value)
+
+    def __repr__(self) -> str:
+        return f"Price({str.__repr__(self)}, value={self.value!r})"
+
+
+def as_price(price) -> Price:
+    """価格文字列をPriceに変換（Priceの場合は再解析しない）"""
+    if isinstance(price, Price):
+        return price
+    return Price('' if price is None else str(price))
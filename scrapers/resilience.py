@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+取得の期限・リトライ・サーキットブレーカー
+応答しないホストに毎回長時間待たされないよう、サイトごとの取得に期限を設け、
+一時的なエラーだけを期限内でジッター付きの間隔を空けてリトライする
+
+サーキットブレーカーはホストごとの連続失敗回数（実行単位）をファイルに保存し、
+threshold回続けて失敗したホストは次の実行では短いタイムアウトで1回だけ確認する。
+確認に失敗した場合はその実行中の同じホストへのアクセスを省略し、応答があれば元に戻す
+
+sites.yamlの設定例:
+    - name: 東北キング
+      price_url: https://...
+      fetch_budget: 120    # このサイトの取得にかける時間の上限（秒、既定はDEFAULT_SITE_BUDGET）
+
+使い方:
+    from scrapers.resilience import CircuitBreaker, Deadline, call_with_retries
+
+    deadline = Deadline(90)
+    response = call_with_retries(lambda timeout: session.get(url, timeout=timeout), deadline, is_transient)
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# 1サイト（すべての価格ページと待機時間）の取得にかける時間の上限（秒）
+DEFAULT_SITE_BUDGET = 90.0
+
+# 1リクエストのタイムアウトの上限（秒、期限の残りが短い場合は残りの時間）
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# 1つのURLへのリクエスト回数の上限（初回を含む）
+DEFAULT_MAX_ATTEMPTS = 3
+
+# リトライ間隔: 0〜min(BACKOFF_CAP, BACKOFF_BASE * 2^n) 秒の一様乱数（フルジッター）
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# リトライするHTTPステータス（それ以外の4xxはリトライしない）
+TRANSIENT_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# 連続して失敗した実行の回数がこれに達したホストは簡易確認のみ
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# 簡易確認のタイムアウト（秒）
+DEFAULT_PROBE_TIMEOUT = 5.0
+
+# ホストごとの連続失敗回数の保存先
+DEFAULT_BREAKER_PATH = Path(__file__).resolve().parent.parent / 'circuit_state.json'
+
+# CircuitBreaker.modeの戻り値
+MODE_NORMAL = 'normal'   # 通常どおり取得（リトライあり）
+MODE_PROBE = 'probe'     # 短いタイムアウトで1回だけ確認
+MODE_SKIP = 'skip'       # この実行では確認に失敗済みのため取得しない
+
+
+class DeadlineExceeded(TimeoutError):
+    """サイトの取得期限を超えた"""
+
+
+class Deadline:
+    """サイトの取得期限（単調時計で計測）"""
+
+    def __init__(self, budget: float = DEFAULT_SITE_BUDGET, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            budget: 期限までの秒数
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.budget = budget
+        self.clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        """期限までの残り時間（秒、超過している場合は0）"""
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float = DEFAULT_REQUEST_TIMEOUT) -> float:
+        """次のリクエストのタイムアウト（capと残り時間の短い方）"""
+        return min(cap, self.remaining())
+
+
+def site_budget(site_config: Dict, default: float = DEFAULT_SITE_BUDGET) -> float:
+    """サイトの取得期限（sites.yamlのfetch_budget、未設定・不正な値の場合はdefault）"""
+    try:
+        budget = float(site_config.get('fetch_budget', default))
+    except (TypeError, ValueError):
+        logger.warning(f"fetch_budgetの形式が不正です: {site_config.get('fetch_budget')!r}")
+        return default
+    return budget if budget > 0 else default
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP,
+                  rng: Callable[[], float] = random.random) -> float:
+    """attempt回目（0始まり）の失敗後に待つ時間（フルジッター）"""
+    return rng() * min(cap, base * (2 ** attempt))
+
+
+def is_transient_status(status: Optional[int]) -> bool:
+    """リトライすべきHTTPステータスか"""
+    return status in TRANSIENT_STATUSES
+
+
+def _next_delay(error: Exception, attempt: int, max_attempts: int, deadline: Deadline,
+                is_transient: Callable[[Exception], bool]) -> Optional[float]:
+    """リトライまでの待機時間（リトライしない場合はNone）"""
+    if attempt + 1 >= max_attempts or not is_transient(error):
+        return None
+    delay = backoff_delay(attempt)
+    # 待機後にリクエストする時間が残らない場合はリトライしない
+    if delay >= deadline.remaining():
+        return None
+    return delay
+
+
+def call_with_retries(request: Callable[[float], object], deadline: Deadline,
+                      is_transient: Callable[[Exception], bool], max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                      request_timeout: float = DEFAULT_REQUEST_TIMEOUT, sleep: Callable[[float], None] = time.sleep):
+    """
+    期限内で一時的なエラーだけをリトライしてrequestを呼び出す
+
+    Args:
+        request: タイムアウト（秒）を受け取ってリクエストする関数
+        deadline: サイトの取得期限
+        is_transient: リトライすべき例外か判定する関数
+        max_attempts: リクエスト回数の上限（初回を含む）
+        request_timeout: 1リクエストのタイムアウトの上限（秒）
+        sleep: 待機する関数
+
+    Raises:
+        DeadlineExceeded: リクエストする前に期限を超えた場合
+        Exception: requestの最後の例外
+    """
+    for attempt in range(max_attempts):
+        timeout = deadline.timeout(request_timeout)
+        if timeout <= 0:
+            raise DeadlineExceeded(f"取得期限（{deadline.budget:g}秒）を超えました")
+        try:
+            return request(timeout)
+        except Exception as e:
+            delay = _next_delay(e, attempt, max_attempts, deadline, is_transient)
+            if delay is None:
+                raise
+            logger.info(f"  リトライ（{attempt + 1}/{max_attempts - 1}、{delay:.1f}秒後）: {type(e).__name__}: {e}")
+            sleep(delay)
+
+
+async def call_with_retries_async(request, deadline: Deadline, is_transient: Callable[[Exception], bool],
+                                  max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                                  request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+    """call_with_retriesの非同期版（requestはタイムアウトを受け取るコルーチン関数）"""
+    for attempt in range(max_attempts):
+        timeout = deadline.timeout(request_timeout)
+        if timeout <= 0:
+            raise DeadlineExceeded(f"取得期限（{deadline.budget:g}秒）を超えました")
+        try:
+            return await request(timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            delay = _next_delay(e, attempt, max_attempts, deadline, is_transient)
+            if delay is None:
+                raise
+            logger.info(f"  リトライ（{attempt + 1}/{max_attempts - 1}、{delay:.1f}秒後）: {type(e).__name__}: {e}")
+            await asyncio.sleep(delay)
+
+
+def host_key(url: str) -> str:
+    """サーキットブレーカーのキー（ホスト名とポート）"""
+    return urlparse(url).netloc.lower()
+
+
+class CircuitBreaker:
+    """ホストごとの連続失敗回数（実行単位）を保持するファイル"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_BREAKER_PATH,
+                 threshold: int = DEFAULT_FAILURE_THRESHOLD, probe_timeout: float = DEFAULT_PROBE_TIMEOUT):
+        """
+        Args:
+            path: 状態ファイル（JSON）のパス
+            threshold: 簡易確認に切り替える連続失敗回数
+            probe_timeout: 簡易確認のタイムアウト（秒）
+        """
+        self.path = Path(path)
+        self.threshold = threshold
+        self.probe_timeout = probe_timeout
+        self.entries: Dict[str, Dict] = self._load()
+        # この実行でのホストごとの結果（1回でも成功したらTrue）
+        self.outcomes: Dict[str, bool] = {}
+        self.errors: Dict[str, str] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"サーキットブレーカーの状態の読み込みエラー: {self.path} - {str(e)}（全ホストを取得します）")
+            return {}
+
+    def failures(self, url: str) -> int:
+        """ホストの連続失敗回数（前回の実行まで）"""
+        return self.entries.get(host_key(url), {}).get('failures', 0)
+
+    def is_open(self, url: str) -> bool:
+        """前回の実行までにthreshold回続けて失敗したホストか"""
+        return self.failures(url) >= self.threshold
+
+    def mode(self, url: str) -> str:
+        """URLの取得方法（MODE_NORMAL / MODE_PROBE / MODE_SKIP）"""
+        if not self.is_open(url):
+            return MODE_NORMAL
+        outcome = self.outcomes.get(host_key(url))
+        if outcome is None:
+            return MODE_PROBE
+        return MODE_NORMAL if outcome else MODE_SKIP
+
+    def record_success(self, url: str):
+        host = host_key(url)
+        if self.is_open(url) and not self.outcomes.get(host):
+            logger.info(f"  サーキットブレーカー: {host} が応答したため通常の取得に戻します")
+        self.outcomes[host] = True
+
+    def record_failure(self, url: str, error: str):
+        host = host_key(url)
+        self.outcomes.setdefault(host, False)
+        self.errors[host] = error
+
+    def save(self):
+        """この実行の結果で連続失敗回数を更新して保存"""
+        now = datetime.now().isoformat()
+        for host, ok in self.outcomes.items():
+            entry = self.entries.setdefault(host, {})
+            if ok:
+                entry.update(failures=0, last_success=now)
+                entry.pop('last_error', None)
+            else:
+                entry.update(failures=entry.get('failures', 0) + 1, last_failure=now,
+                             last_error=self.errors.get(host, ''))
+        # 成功したホストは記録しない（ファイルが大きくならないように）
+        self.entries = {host: entry for host, entry in self.entries.items() if entry.get('failures')}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"サーキットブレーカーの状態の保存エラー: {self.path} - {str(e)}")
+
+    def summary(self) -> str:
+        """ログ出力用のサマリー"""
+        failed = sorted(host for host, ok in self.outcomes.items() if not ok)
+        text = f"サーキットブレーカー: {len(self.outcomes)} ホスト中 {len(failed)} ホストが応答なし"
+        if failed:
+            text += f"（{', '.join(failed)}）"
+        return text
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列指向のスクレイピング結果
+企業ごとの結果の辞書（scraped_at, url, company_name, region, prices ...）のリストを、
+企業の列と価格の列（材料名は整数コード、価格はNumPy配列）に変換して保持する
+
+数百社規模の実行でも、材料名は1回だけ保持され、材料名の標準名への変換は
+材料ごとに1回だけ行われる（resolve_materials）。価格は数値の配列と共有の書式
+（'{:,}円/kg'など）で保持し、文字列は出力時に作り直す（書式で表せない価格のみ元の文字列を保持）
+
+出力処理は結果の辞書のリストに戻さず、price_range・material・price_text・valuesで直接読む
+
+使い方:
+    from scrapers.results import ResultTable
+
+    table = ResultTable.from_results(results)
+    for i in range(len(table)):
+        for row in table.price_range(i):
+            print(table.company_name[i], table.material(row), table.values[row])
+"""
+
+import re
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .price import Price, as_price
+
+# 企業ごとに列として保持するキー（それ以外のキーはextrasにそのまま保持）
+COMPANY_COLUMNS = ('scraped_at', 'url', 'company_name', 'region', 'error')
+
+# 価格の文字列中の最初の数値（Price.valueの元になる部分）
+_NUMBER = re.compile(r'\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?')
+
+
+def _intern(value):
+    """文字列をインターン（同じ企業名・地域・材料名を1つのオブジェクトで共有）"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _number(value: float):
+    """価格の列の値を元の数値に戻す（1750.0 → 1750）"""
+    return int(value) if value.is_integer() else float(value)
+
+
+def _text_format(price: Price) -> Optional[str]:
+    """
+    数値から価格の文字列を作り直す書式（'1,750円/kg' → '{:,}円/kg'）
+
+    Returns:
+        書式、数値がない場合・書式で元の文字列に戻らない場合はNone
+    """
+    if price.value is None:
+        return None
+    text = price.raw
+    match = _NUMBER.search(text)
+    spec = '{:,}' if ',' in match.group(0) else '{}'
+    text_format = (text[:match.start()].replace('{', '{{').replace('}', '}}') + spec +
+                   text[match.end():].replace('{', '{{').replace('}', '}}'))
+    return text_format if text_format.format(price.value) == text else None
+
+
+class ResultTable:
+    """スクレイピング結果の列指向の表（1行 = 1企業の結果）"""
+
+    def __init__(self):
+        # 企業の列
+        self.scraped_at: List[str] = []
+        self.url: List[str] = []
+        self.company_name: List[str] = []
+        self.region: List[str] = []
+        self.error: List[Optional[str]] = []
+        # COMPANY_COLUMNS・prices以外のキー（該当するキーがある企業のみ、企業の番号 → 辞書）
+        self.extras: Dict[int, Dict] = {}
+        # 結果の辞書のキーの順序（同じ順序は1つだけ保持し、企業ごとには番号を保持）
+        self.layouts: List[Tuple[str, ...]] = []
+        self.layout_codes = np.zeros(0, dtype=np.int32)
+
+        # 価格の列（企業iの価格は offsets[i]:offsets[i + 1] の範囲）
+        self.materials: List[str] = []
+        self.material_codes = np.zeros(0, dtype=np.int32)
+        self.values = np.zeros(0, dtype=np.float64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        # 価格の文字列は数値と書式（'{:,}円/kg'など、同じ書式は共有）から作り直す。
+        # 数値がない価格など書式で表せない価格のみ元の文字列を保持（format_codesは-1）
+        self.formats: List[str] = []
+        self.format_codes = np.zeros(0, dtype=np.int32)
+        self.raw_texts: Dict[int, str] = {}
+
+        self._resolved: Dict[Callable, List] = {}
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict]) -> 'ResultTable':
+        """結果の辞書のリストから作成"""
+        table = cls()
+        material_index: Dict[str, int] = {}
+        layout_index: Dict[Tuple[str, ...], int] = {}
+        format_index: Dict[str, int] = {}
+        layout_codes = []
+        codes = []
+        values = []
+        format_codes = []
+        offsets = [0]
+
+        for result in results:
+            layout = tuple(result.keys())
+            code = layout_index.get(layout)
+            if code is None:
+                code = layout_index[layout] = len(table.layouts)
+                table.layouts.append(layout)
+            layout_codes.append(code)
+            for column in COMPANY_COLUMNS:
+                getattr(table, column).append(_intern(result.get(column)))
+            extras = {key: value for key, value in result.items() if key not in COMPANY_COLUMNS and key != 'prices'}
+            if extras:
+                table.extras[len(layout_codes) - 1] = extras
+
+            for material, price in (result.get('prices') or {}).items():
+                code = material_index.get(material)
+                if code is None:
+                    code = material_index[material] = len(table.materials)
+                    table.materials.append(_intern(material))
+                codes.append(code)
+
+                price = as_price(price)
+                text_format = _text_format(price)
+                if text_format is None:
+                    table.raw_texts[len(values)] = price.raw
+                    format_codes.append(-1)
+                else:
+                    format_code = format_index.get(text_format)
+                    if format_code is None:
+                        format_code = format_index[text_format] = len(table.formats)
+                        table.formats.append(text_format)
+                    format_codes.append(format_code)
+                values.append(np.nan if price.value is None else price.value)
+            offsets.append(len(codes))
+
+        table.layout_codes = np.asarray(layout_codes, dtype=np.int32)
+        table.material_codes = np.asarray(codes, dtype=np.int32)
+        table.values = np.asarray(values, dtype=np.float64)
+        table.format_codes = np.asarray(format_codes, dtype=np.int32)
+        table.offsets = np.asarray(offsets, dtype=np.int64)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.company_name)
+
+    @property
+    def price_count(self) -> int:
+        """価格の総数"""
+        return len(self.values)
+
+    @property
+    def success_count(self) -> int:
+        """価格を1件以上取得できた企業数"""
+        return int(np.count_nonzero(np.diff(self.offsets)))
+
+    def price_range(self, index: int) -> range:
+        """企業の価格の行番号の範囲"""
+        return range(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+    def material(self, row: int) -> str:
+        """価格の行の材料名"""
+        return self.materials[self.material_codes[row]]
+
+    def price_text(self, row: int) -> str:
+        """価格の行の元の文字列"""
+        code = self.format_codes[row]
+        if code < 0:
+            return self.raw_texts[row]
+        return self.formats[code].format(_number(self.values[row]))
+
+    def price_value(self, row: int) -> Optional[float]:
+        """価格の行の数値（数値がない場合はNone）"""
+        value = self.values[row]
+        return None if np.isnan(value) else float(value)
+
+    def number_text(self, row: int) -> str:
+        """価格の行の数値部分の文字列（Price.number_textと同じ、数値がない場合は''）"""
+        value = self.values[row]
+        return '' if np.isnan(value) else str(_number(value))
+
+    def extra(self, index: int, key: str, default=None):
+        """企業の結果のCOMPANY_COLUMNS以外のキーの値（'reused'、'timings'など）"""
+        return self.extras.get(index, {}).get(key, default)
+
+    def company_prices(self, index: int) -> List[Tuple[str, Price]]:
+        """企業の (材料名, 価格) のリスト（取得した順）"""
+        return [(self.material(row), Price(self.price_text(row))) for row in self.price_range(index)]
+
+    def resolve_materials(self, resolver: Callable[[str], Optional[str]]) -> List[Optional[str]]:
+        """
+        材料名を変換した結果（材料コード順、材料ごとに1回だけ変換し、同じresolverの結果は再利用）
+
+        Args:
+            resolver: 材料名 → 標準材料名の変換関数（resolve_material_nameなど）
+        """
+        resolved = self._resolved.get(resolver)
+        if resolved is None:
+            resolved = self._resolved[resolver] = [resolver(material) for material in self.materials]
+        return resolved
+
+    def result(self, index: int) -> Dict:
+        """企業の結果の辞書（元の辞書と同じキーの順序、価格は文字列）"""
+        values = {column: getattr(self, column)[index] for column in COMPANY_COLUMNS}
+        values['prices'] = {self.material(row): self.price_text(row) for row in self.price_range(index)}
+        values.update(self.extras.get(index, {}))
+        return {key: values[key] for key in self.layouts[self.layout_codes[index]]}
+
+    def iter_results(self) -> Iterator[Dict]:
+        """結果の辞書を1社ずつ作成（全体のリストは作らない）"""
+        for index in range(len(self)):
+            yield self.result(index)
+
+    def to_results(self) -> List[Dict]:
+        """結果の辞書のリストに戻す（辞書のリストを受け取る処理に渡す場合のみ）"""
+        return list(self.iter_results())
+
+
+def as_result_table(results: Union[ResultTable, Iterable[Dict]]) -> ResultTable:
+    """結果のリストをResultTableに変換（ResultTableの場合はそのまま）"""
+    if isinstance(results, ResultTable):
+        return results
+    return ResultTable.from_results(results)
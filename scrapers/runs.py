@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+取得結果のExcelファイルのローテーション
+1回の実行につき1つの小さなExcelファイル（runs/<種類>_<タイムスタンプ>.xlsx）に保存し、
+実行の一覧をインデックス（runs/index.json）に、種類ごとの最新の実行を
+runs/latest.jsonに記録する
+
+1つのファイルにシートを追加し続けると保存のたびにファイル全体を書き直すことになるため、
+保存の時間は1回分の結果の大きさだけで決まるようにする。最新の実行は種類の数だけの
+小さなlatest.jsonから、実行の回数によらずファイルを開かずに参照できる
+
+インデックスの更新（読み込み→追加→保存）はロックファイル（runs/.index.lock）で
+排他し、同時に実行しても記録が失われないようにする
+
+種類:
+    価格情報  scrape_prices_v2.py（excel形式）の出力
+    テスト    scrape_18_companies_to_excel.py（sheet形式）の出力
+
+インデックスの形式:
+    index.json   {"version": 2, "runs": [{"kind", "timestamp", "file", "sheet", "rows"}, ...]}
+    latest.json  {"version": 2, "latest": {"<種類>": {"kind", "timestamp", "file", "sheet", "companies", "rows"}}}
+
+使い方:
+    from scrapers.runs import latest_run
+
+    run = latest_run('価格情報')
+    if run:
+        print(run['path'], run['companies'])
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# 実行ごとのExcelファイルの既定の保存先
+DEFAULT_RUNS_DIR = Path(__file__).resolve().parent.parent / 'runs'
+
+INDEX_FILENAME = 'index.json'
+LATEST_FILENAME = 'latest.json'
+LOCK_FILENAME = '.index.lock'
+INDEX_VERSION = 2
+
+# ロックを待つ最大の秒数と、残ったロックファイルを古いとみなす秒数（異常終了した場合）
+LOCK_TIMEOUT = 30.0
+LOCK_STALE = 120.0
+
+
+def index_path(runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Path:
+    return Path(runs_dir) / INDEX_FILENAME
+
+
+def latest_path(runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Path:
+    return Path(runs_dir) / LATEST_FILENAME
+
+
+def run_sheet_name(kind: str, timestamp: str) -> str:
+    """実行のシート名（従来の1ファイルにまとめた場合と同じ名前）"""
+    return f"{kind}_{timestamp}"
+
+
+def run_workbook_path(kind: str, timestamp: str, runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Path:
+    """実行のExcelファイルのパス（同じ秒に保存した場合は番号を追加）"""
+    base = run_sheet_name(kind, timestamp)
+    path = Path(runs_dir) / f"{base}.xlsx"
+    counter = 1
+    while path.exists():
+        path = Path(runs_dir) / f"{base}_{counter}.xlsx"
+        counter += 1
+    return path
+
+
+@contextmanager
+def index_lock(runs_dir: PathLike = DEFAULT_RUNS_DIR, timeout: float = LOCK_TIMEOUT):
+    """
+    インデックスの更新を排他するロック（ロックファイルの作成に成功した1プロセスのみ）
+
+    Raises:
+        TimeoutError: timeout秒以内にロックを取得できない場合
+    """
+    path = Path(runs_dir) / LOCK_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - path.stat().st_mtime > LOCK_STALE:
+                    logger.warning(f"古いロックファイルを削除します: {path}")
+                    os.unlink(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"実行インデックスのロックを取得できません: {path}")
+            time.sleep(0.05)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        yield
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _load(path: Path, empty: Dict) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return empty
+    except Exception as e:
+        logger.warning(f"実行インデックスの読み込みエラー: {path} - {str(e)}")
+        return empty
+    if data.get('version') != INDEX_VERSION:
+        logger.warning(f"実行インデックスのバージョンが異なります: {path}（rebuild_indexで再作成してください）")
+        return empty
+    return data
+
+
+def _save(data: Dict, path: Path):
+    """一時ファイルに書いてから置き換える（読み込み中のプロセスが途中の内容を読まない）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_index(runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Dict:
+    """インデックスを読み込む（ない場合・読めない場合は空のインデックス）"""
+    return _load(index_path(runs_dir), {'version': INDEX_VERSION, 'runs': []})
+
+
+def save_index(index: Dict, runs_dir: PathLike = DEFAULT_RUNS_DIR):
+    """インデックスを保存"""
+    _save(index, index_path(runs_dir))
+
+
+def load_latest(runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Dict[str, Dict]:
+    """種類ごとの最新の実行を読み込む（ない場合・読めない場合は空）"""
+    return _load(latest_path(runs_dir), {'version': INDEX_VERSION, 'latest': {}})['latest']
+
+
+def save_latest(latest: Dict[str, Dict], runs_dir: PathLike = DEFAULT_RUNS_DIR):
+    """種類ごとの最新の実行を保存"""
+    _save({'version': INDEX_VERSION, 'latest': latest}, latest_path(runs_dir))
+
+
+def _entry(kind: str, timestamp: str, path: Path, sheet: str, companies: Iterable[str], rows: int) -> Dict:
+    return {
+        'kind': kind,
+        'timestamp': timestamp,
+        'file': path.name,
+        'sheet': sheet,
+        'companies': list(dict.fromkeys(str(name) for name in companies if name)),
+        'rows': rows,
+    }
+
+
+def _run(entry: Dict) -> Dict:
+    """インデックスのrunsの要素（企業名はlatest.jsonにのみ記録）"""
+    return {key: value for key, value in entry.items() if key != 'companies'}
+
+
+def record_run(kind: str, timestamp: str, path: PathLike, sheet: str, companies: Iterable[str], rows: int,
+               runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Dict:
+    """実行をインデックスに追加し、その種類の最新の実行にする"""
+    entry = _entry(kind, timestamp, Path(path), sheet, companies, rows)
+    with index_lock(runs_dir):
+        index = load_index(runs_dir)
+        index['runs'].append(_run(entry))
+        save_index(index, runs_dir)
+        latest = load_latest(runs_dir)
+        latest[kind] = entry
+        save_latest(latest, runs_dir)
+    return entry
+
+
+def _resolve(entry: Dict, runs_dir: PathLike) -> Dict:
+    return dict(entry, path=Path(runs_dir) / entry['file'])
+
+
+def latest_run(kind: str, runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Optional[Dict]:
+    """その種類の最新の実行（'path'にExcelファイルのパスを追加、ない場合None）"""
+    entry = load_latest(runs_dir).get(kind)
+    return _resolve(entry, runs_dir) if entry else None
+
+
+def list_runs(kind: Optional[str] = None, runs_dir: PathLike = DEFAULT_RUNS_DIR) -> List[Dict]:
+    """実行の一覧（古い順、kindを指定した場合はその種類のみ、企業名はlatest_runのみ）"""
+    return [_resolve(entry, runs_dir) for entry in load_index(runs_dir)['runs']
+            if kind is None or entry['kind'] == kind]
+
+
+def create_run_workbook(kind: str, timestamp: str):
+    """実行用の新しいExcelファイル（シートは1つ）を作成し、(ワークブック, シート) を返す"""
+    # openpyxlはExcelに出力する場合のみインポートする
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = run_sheet_name(kind, timestamp)
+    return wb, ws
+
+
+def _reserve_workbook_path(kind: str, timestamp: str, runs_dir: PathLike) -> Path:
+    """
+    実行のExcelファイルのパスを空のファイルを作成して確保
+    （同じ秒に別のプロセスが保存しても同じファイルに上書きしない）
+    """
+    Path(runs_dir).mkdir(parents=True, exist_ok=True)
+    while True:
+        path = run_workbook_path(kind, timestamp, runs_dir)
+        try:
+            with open(path, 'xb'):
+                return path
+        except FileExistsError:
+            continue
+
+
+def save_run_workbook(wb, kind: str, timestamp: str, companies: Iterable[str], rows: int,
+                      runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Dict:
+    """
+    create_run_workbookで作成したExcelファイルを保存してインデックスに記録
+
+    Args:
+        wb: 保存するワークブック
+        kind: 種類（'価格情報'、'テスト'など）
+        timestamp: 実行のタイムスタンプ（YYYYMMDD_HHMMSS）
+        companies: 記録した企業名
+        rows: 記録したデータ行の数
+
+    Returns:
+        インデックスの要素（'path'に保存したファイルのパス）
+    """
+    path = _reserve_workbook_path(kind, timestamp, runs_dir)
+    try:
+        wb.save(path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    entry = record_run(kind, timestamp, path, wb.active.title, companies, rows, runs_dir)
+    return _resolve(entry, runs_dir)
+
+
+def rebuild_index(runs_dir: PathLike = DEFAULT_RUNS_DIR) -> Dict:
+    """
+    runs/のExcelファイルからインデックスと最新の実行を作り直す（削除・破損した場合）
+    ファイル名の「<種類>_<YYYYMMDD>_<HHMMSS>」から種類とタイムスタンプを求め、
+    企業名と行数は各ファイルの最初のシートのA列（空のセルを除く）から読む
+
+    Returns:
+        作り直したインデックス
+    """
+    from .workbooks import open_workbook
+
+    entries = []
+    for path in sorted(Path(runs_dir).glob('*.xlsx')):
+        parts = path.stem.split('_')
+        # 空のファイルは別のプロセスが保存中（_reserve_workbook_pathで確保したもの）
+        if len(parts) < 3 or path.stat().st_size == 0:
+            continue
+        kind, timestamp = parts[0], f"{parts[1]}_{parts[2]}"
+        with open_workbook(path) as wb:
+            sheet = wb.sheetnames[0]
+            values = [row[0] for row in wb[sheet].iter_rows(min_row=2, max_col=1, values_only=True)]
+        companies = [value for value in values if value not in (None, '')]
+        entries.append(_entry(kind, timestamp, path, sheet, companies, len(companies)))
+    entries.sort(key=lambda entry: (entry['timestamp'], entry['file']))
+
+    index = {'version': INDEX_VERSION, 'runs': [_run(entry) for entry in entries]}
+    latest = {entry['kind']: entry for entry in entries}
+    with index_lock(runs_dir):
+        save_index(index, runs_dir)
+        save_latest(latest, runs_dir)
+    return index
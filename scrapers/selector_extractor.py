@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSSセレクタによる宣言的な価格抽出（カテゴリ2）
+「品目の要素 → 材料名の要素 → 価格の要素」の組み合わせで表せるページは、
+sites.yamlの extractor に抽出方法を書くだけでPythonのコードを追加せずに取得できる
+
+抽出方法は最初に使うときに一度だけコンパイル（soupsieveのセレクタ・正規表現）し、
+同じ内容の抽出方法はサイトをまたいで使い回す
+
+sites.yamlの設定例:
+    - name: 鴻祥貿易株式会社
+      category: 2
+      price_url: https://...
+      extractor:
+        item: div.box            # 品目の要素（必須）
+        name: p.item             # 材料名の要素（品目の要素内、リストの場合は最初に見つかったもの）
+        price: p.price           # 価格の要素（リストの場合は最初に数値が得られたもの）
+        unit: small              # 価格の要素内の単位の要素（価格の数値からは除く）
+
+    その他の項目（省略可）:
+        container: 品目を探す範囲の要素（既定: ページ全体）
+        name_detail: 材料名に括弧書きで付ける補足の要素（材料名の要素内）
+        default_unit: 単位の要素がない場合の単位（既定: 円）
+        keep_unit: trueの場合、価格の文字列中の単位（円/kgなど）をそのまま使う
+        strip: 価格の文字列から除く正規表現（「買取価格：」など）
+        range: trueの場合、価格が範囲（～）のときは最高価格
+        all_prices: trueの場合、品目内のすべての価格の要素を確認して最高価格
+        duplicates: 同じ材料名が複数ある場合 last（後勝ち、既定）または max（最高価格）
+
+既存のextractor_type（touki_dl・kousyo_boxなど）のうちこの形式で表せるものは
+BUILTIN_SPECSの抽出方法で取得する
+"""
+
+import copy
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 価格の数値（3桁区切り・小数を含む）
+PRICE_NUMBER = r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)'
+
+# keep_unitの場合の数値と単位（円/kgなど）
+PRICE_WITH_UNIT = PRICE_NUMBER + r'\s*([円¥]/?[a-zA-Z]*)'
+
+# 価格が範囲であることを示す文字
+RANGE_MARKS = ('～', '〜', '-')
+
+DUPLICATE_POLICIES = ('last', 'max')
+
+# セレクタを指定する項目（文字列または文字列のリスト）
+_SELECTOR_KEYS = ('container', 'item', 'name', 'name_detail', 'price', 'unit')
+_FLAG_KEYS = ('keep_unit', 'range', 'all_prices')
+SPEC_KEYS = frozenset(_SELECTOR_KEYS + _FLAG_KEYS + ('default_unit', 'strip', 'duplicates'))
+
+# extractor_type → 抽出方法（Category2Scraperの同名の抽出メソッドと同じ結果）
+BUILTIN_SPECS: Dict[str, Dict] = {
+    # 東起産業（株）: <dl class="item_list"><dt><p>材料名</p></dt><dd><p class="price">買取価格：<span>…</span>円/kg</p></dd></dl>
+    'touki_dl': {
+        'item': 'dl.item_list',
+        'name': ['dt p', 'dt'],
+        'price': 'dd p.price',
+        'strip': r'買取価格[：:]?\s*',
+        'keep_unit': True,
+    },
+    # 鴻祥貿易株式会社: <div class="box"><p class="item">材料名</p><p class="price">1,200<small>円/kg</small></p></div>
+    'kousyo_box': {
+        'item': 'div.box',
+        'name': 'p.item',
+        'price': 'p.price',
+        'unit': 'small',
+    },
+    # 株式会社鳳山: <ul class="priceList"><li><h4>材料名</h4><p class="price"><strong>…</strong><span>（税込…円）</span></p></li></ul>
+    # 税込価格（span）を優先し、ない場合はstrong
+    'houyama_dl': {
+        'container': 'ul[class*="priceList"]',
+        'item': 'li',
+        'name': 'h4',
+        'price': ['p.price span', 'p.price strong'],
+    },
+    # 株式会社 春日商会: <div class="box4"><h4>材料名</h4><p class="price"><span class="num">100～150</span>円/kg</p></div>
+    'haruhi_table': {
+        'item': 'div[class*="box4"]',
+        'name': 'h4',
+        'price': 'p.price span.num',
+        'default_unit': '円/kg',
+        'range': True,
+        'all_prices': True,
+        'duplicates': 'max',
+    },
+    # 東北キング: <div class="box"><h4>材料名<small>補足</small></h4><p class="price">1,200<small>円/kg</small></p></div>
+    'touhoku_div': {
+        'item': 'div.box',
+        'name': 'h4',
+        'name_detail': 'small',
+        'price': 'p.price',
+        'unit': 'small',
+        'range': True,
+    },
+}
+
+# 抽出方法の内容（JSON）→ コンパイル済みの抽出方法
+_compiled: Dict[str, Dict] = {}
+
+
+def _selectors(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _spec_key(spec: Dict) -> str:
+    return json.dumps(spec, ensure_ascii=False, sort_keys=True)
+
+
+def validate_spec(spec) -> List[str]:
+    """抽出方法の設定の誤り（セレクタ・正規表現がコンパイルできるかも確認）"""
+    if not isinstance(spec, dict):
+        return ["extractorは辞書で指定してください"]
+    errors = []
+    unknown = sorted(set(spec) - SPEC_KEYS)
+    if unknown:
+        errors.append(f"extractorの不明な項目: {', '.join(unknown)}")
+    for key in ('item', 'name', 'price'):
+        if not spec.get(key):
+            errors.append(f"extractorの{key}がありません")
+    if spec.get('duplicates', 'last') not in DUPLICATE_POLICIES:
+        errors.append(f"extractorのduplicatesは {' / '.join(DUPLICATE_POLICIES)} のいずれかです: {spec.get('duplicates')!r}")
+    for key in _FLAG_KEYS:
+        if not isinstance(spec.get(key, False), bool):
+            errors.append(f"extractorの{key}はtrue / falseで指定してください")
+    if errors:
+        return errors
+
+    import soupsieve
+    for key in _SELECTOR_KEYS:
+        value = spec.get(key)
+        if value is not None and not isinstance(value, (str, list, tuple)):
+            errors.append(f"extractorの{key}は文字列またはリストで指定してください")
+            continue
+        for selector in _selectors(value):
+            try:
+                soupsieve.compile(selector)
+            except Exception as e:
+                errors.append(f"extractorの{key}のセレクタが不正です: {selector} - {str(e).splitlines()[0]}")
+    if spec.get('strip'):
+        try:
+            re.compile(spec['strip'])
+        except re.error as e:
+            errors.append(f"extractorのstripの正規表現が不正です: {spec['strip']} - {e}")
+    return errors
+
+
+def compile_spec(spec: Dict) -> Dict:
+    """
+    抽出方法をコンパイル（同じ内容の抽出方法は一度だけ）
+
+    Raises:
+        ValueError: 抽出方法の設定に誤りがある場合
+    """
+    key = _spec_key(spec)
+    compiled = _compiled.get(key)
+    if compiled is not None:
+        return compiled
+
+    errors = validate_spec(spec)
+    if errors:
+        raise ValueError('; '.join(errors))
+
+    import soupsieve
+    compiled = {key: [soupsieve.compile(selector) for selector in _selectors(spec.get(key))]
+                for key in _SELECTOR_KEYS}
+    compiled.update(
+        strip=re.compile(spec['strip']) if spec.get('strip') else None,
+        default_unit=spec.get('default_unit', '円'),
+        keep_unit=spec.get('keep_unit', False),
+        range=spec.get('range', False),
+        all_prices=spec.get('all_prices', False),
+        duplicates=spec.get('duplicates', 'last'),
+    )
+    _compiled[key] = compiled
+    return compiled
+
+
+def _select_first(selectors: List, root):
+    """候補のセレクタを順に試し、最初に見つかった要素"""
+    for selector in selectors:
+        element = selector.select_one(root)
+        if element is not None:
+            return element
+    return None
+
+
+def _price_text(node, compiled: Dict):
+    """価格の要素の文字列と単位（単位の要素は文字列から除く）"""
+    unit = ''
+    unit_node = _select_first(compiled['unit'], node)
+    if unit_node is not None:
+        unit = unit_node.get_text(strip=True)
+        # ページの要素は変更せず、価格の要素の複製から単位を除く
+        node = copy.copy(node)
+        _select_first(compiled['unit'], node).decompose()
+    text = node.get_text(strip=True)
+    if compiled['strip'] is not None:
+        text = compiled['strip'].sub('', text)
+    return text, unit
+
+
+def _number(value: str) -> float:
+    return float(value.replace(',', '').replace('，', ''))
+
+
+def parse_price(node, compiled: Dict) -> Optional[str]:
+    """価格の要素から価格の文字列を作成（数値がない場合はNone）"""
+    text, unit = _price_text(node, compiled)
+    unit = unit or compiled['default_unit']
+
+    if compiled['range'] and any(mark in text for mark in RANGE_MARKS):
+        numbers = re.findall(PRICE_NUMBER, text)
+        if not numbers:
+            return None
+        return f"{int(max(_number(number) for number in numbers))}{unit}"
+
+    if compiled['keep_unit']:
+        match = re.search(PRICE_WITH_UNIT, text)
+        if match:
+            return match.group(1) + match.group(2)
+
+    match = re.search(PRICE_NUMBER, text)
+    if not match:
+        return None
+    return match.group(1) + unit
+
+
+def _price_value(price: str) -> float:
+    match = re.search(PRICE_NUMBER, price)
+    return _number(match.group(1)) if match else 0.0
+
+
+def _item_prices(item, compiled: Dict) -> List[str]:
+    """品目の要素内の価格（all_pricesでない場合は最初に数値が得られた1件）"""
+    prices = []
+    for selector in compiled['price']:
+        for node in selector.select(item):
+            price = parse_price(node, compiled)
+            if price is None:
+                continue
+            if not compiled['all_prices']:
+                return [price]
+            prices.append(price)
+    return prices
+
+
+def _material(item, compiled: Dict) -> str:
+    name_node = _select_first(compiled['name'], item)
+    if name_node is None:
+        return ''
+    material = name_node.get_text(strip=True)
+    detail_node = _select_first(compiled['name_detail'], name_node)
+    if detail_node is not None:
+        detail = detail_node.get_text(strip=True)
+        if detail:
+            material = f"{material} ({detail})"
+    return material
+
+
+def extract_with_spec(soup, spec: Dict) -> Dict[str, str]:
+    """
+    抽出方法に従って価格を抽出
+
+    Args:
+        soup: BeautifulSoupオブジェクト
+        spec: 抽出方法（sites.yamlのextractorまたはBUILTIN_SPECSの値）
+
+    Returns:
+        価格情報の辞書 {材料名: 価格}（抽出方法に誤りがある場合は空）
+    """
+    try:
+        compiled = compile_spec(spec)
+    except ValueError as e:
+        logger.warning(f"抽出方法の設定が不正です: {e}")
+        return {}
+
+    roots = [soup]
+    if compiled['container']:
+        roots = [node for selector in compiled['container'] for node in selector.select(soup)]
+    keep_max = compiled['duplicates'] == 'max'
+    prices = {}
+    for root in roots:
+        for selector in compiled['item']:
+            for item in selector.select(root):
+                material = _material(item, compiled)
+                if not material:
+                    continue
+                for price in _item_prices(item, compiled):
+                    if keep_max and material in prices and _price_value(price) <= _price_value(prices[material]):
+                        continue
+                    prices[material] = price
+    return prices
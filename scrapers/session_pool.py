@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTPセッション（コネクションプール）管理モジュール
+ホストごとにrequests.Sessionをプロセス内で共有し、Keep-Aliveで接続を再利用する
+（同じホストの複数支店ページや、Webアプリでの再実行時にTLSハンドシェイクを繰り返さない）
+
+セッションはホストごとなので、各アダプタのプールは1つだけで、設定で意味があるのは
+1ホストあたりの接続数（pool_maxsize）。python -m scrapers では --pool-maxsize・--http-retries で変更できる
+
+使い方:
+    from scrapers.session_pool import get_session, configure_pool
+
+    configure_pool(pool_maxsize=20, retries=1)   # 必要に応じて設定を変更
+    response = get_session(url).get(url, timeout=30)
+"""
+
+import logging
+import threading
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# プールとリトライの既定値（configure_poolで変更可能）
+DEFAULT_POOL_CONFIG = {
+    'pool_maxsize': 10,        # 1ホストあたりの同時接続数の上限
+    'pool_block': False,       # 上限到達時に待つか（Falseなら一時的な接続を作成）
+    'retries': 0,              # アダプタでのリトライ回数（リトライはBaseScraper.fetch_htmlで取得期限内に行う）
+    'backoff_factor': 0.5,     # リトライ間隔: backoff_factor * 2^(n-1) 秒
+    'status_forcelist': (429, 500, 502, 503, 504),
+    'user_agent': DEFAULT_USER_AGENT,
+}
+
+_config = dict(DEFAULT_POOL_CONFIG)
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _host_key(url_or_host: str) -> str:
+    """URLまたはホスト名からレジストリのキー（scheme://host:port）を作成"""
+    if '://' not in url_or_host:
+        url_or_host = f'https://{url_or_host}'
+    parsed = urlparse(url_or_host)
+    return f'{parsed.scheme}://{parsed.netloc}'.lower()
+
+
+def _build_session() -> requests.Session:
+    """現在の設定でアダプタを取り付けたセッションを作成"""
+    retry = Retry(
+        total=_config['retries'],
+        connect=_config['retries'],
+        read=_config['retries'],
+        status=_config['retries'],
+        backoff_factor=_config['backoff_factor'],
+        status_forcelist=_config['status_forcelist'],
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    # セッションはホストごとなので、ホスト別のプールは1つで足りる
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_config['pool_maxsize'],
+        pool_block=_config['pool_block'],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': _config['user_agent']})
+    return session
+
+
+def get_session(url_or_host: str) -> requests.Session:
+    """
+    ホストに対応する共有セッションを取得（なければ作成）
+
+    Args:
+        url_or_host: アクセスするURLまたはホスト名
+
+    Returns:
+        プロセス内で共有されるrequests.Session
+    """
+    key = _host_key(url_or_host)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _build_session()
+                _sessions[key] = session
+                logger.debug(f"セッションを作成: {key}")
+    return session
+
+
+def configure_pool(**options) -> Dict:
+    """
+    プールとリトライの設定を変更（既存のセッションは閉じて作り直す）
+
+    Args:
+        **options: DEFAULT_POOL_CONFIGのキー（pool_maxsize, retries, backoff_factor など）
+
+    Returns:
+        変更後の設定
+    """
+    unknown = set(options) - set(DEFAULT_POOL_CONFIG)
+    if unknown:
+        raise ValueError(f"不明な設定項目: {', '.join(sorted(unknown))}")
+    _config.update({key: value for key, value in options.items() if value is not None})
+    close_all()
+    return dict(_config)
+
+
+def reset_pool():
+    """設定を既定値に戻し、セッションを閉じる"""
+    _config.clear()
+    _config.update(DEFAULT_POOL_CONFIG)
+    close_all()
+
+
+def close_all():
+    """すべての共有セッションを閉じる"""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表形式シートへの差分記入
+既存のセルの値と比べて変わったセルだけを書き込み、変更（企業・材料・旧値 → 新値）を記録する
+罫線は書き込んだセルと新しく追加した行だけに設定し、何も変わらなければファイルを保存しない
+
+変更の一覧は日ごとの価格の変動のサマリーとしても使う（format_changes・write_changes_csv）
+
+使い方:
+    from scrapers.sheet_diff import SheetDiff
+
+    diff = SheetDiff(ws, excel_file, sheet_name)
+    diff.write(row_idx, col_idx, '1750', company='東北キング', material='ピカ銅')
+    diff.apply_border(thin_border)
+    if diff.modified:
+        wb.save(excel_file)
+    changes = diff.changes()
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .price import as_price
+
+# 変更の一覧のCSVの列
+CHANGE_FIELDS = ('file', 'sheet', 'company', 'material', 'old', 'new', 'delta', 'row', 'column')
+
+
+def _cell_number(value) -> Optional[float]:
+    """セルの値の数値（1750・1750.0・'1,750' など、数値だけの値でない場合はNone）"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().replace(',', '').replace('，', ''))
+    except ValueError:
+        return None
+
+
+def same_value(old, new) -> bool:
+    """セルの値が同じか（1750.0 と '1,750' のように型・書式が異なる数値も同じとみなす）"""
+    if old is None or old == '':
+        return new is None or new == ''
+    if old == new:
+        return True
+    old_number = _cell_number(old)
+    new_number = _cell_number(new)
+    if old_number is not None and new_number is not None:
+        return old_number == new_number
+    return str(old).strip() == str(new).strip()
+
+
+def price_delta(old, new):
+    """旧値から新値への変動（どちらかが数値でない場合はNone）"""
+    old_value = as_price(old).value if old not in (None, '') else None
+    new_value = as_price(new).value if new not in (None, '') else None
+    if old_value is None or new_value is None:
+        return None
+    return new_value - old_value
+
+
+class SheetDiff:
+    """1つのシートへの差分記入（書き込んだセルと変更を記録）"""
+
+    def __init__(self, ws, excel_file: Union[str, Path] = '', sheet_name: str = ''):
+        """
+        Args:
+            ws: 記入するワークシート（openpyxl）
+            excel_file: 変更の一覧に記録するファイル名
+            sheet_name: 変更の一覧に記録するシート名（省略した場合はws.title）
+        """
+        self.ws = ws
+        self.excel_file = str(excel_file)
+        self.sheet_name = sheet_name or ws.title
+        # (行, 列) → 変更（同じセルに複数回書き込んだ場合は最初の旧値と最後の新値）
+        self._changes: Dict[tuple, Dict] = {}
+        self._new_rows: List[int] = []
+        self._written = set()
+        self._structure_modified = False
+
+    @property
+    def modified(self) -> bool:
+        """シートを変更したか（保存が必要か）"""
+        return bool(self._written) or self._structure_modified
+
+    def mark_modified(self):
+        """セルの書き込み以外の変更（列の削除・見出しの変更など）を記録"""
+        self._structure_modified = True
+
+    def add_row(self, row: int, company: str):
+        """新しい企業の行を追加（1列目に企業名を書き込む）"""
+        self.ws.cell(row=row, column=1, value=company)
+        self._new_rows.append(row)
+        self._written.add((row, 1))
+
+    def write(self, row: int, column: int, value, company: str = '', material: str = '') -> bool:
+        """
+        値が変わる場合だけセルに書き込む
+
+        Returns:
+            書き込んだ場合True
+        """
+        cell = self.ws.cell(row=row, column=column)
+        if same_value(cell.value, value):
+            return False
+
+        key = (row, column)
+        change = self._changes.get(key)
+        if change is None:
+            change = self._changes[key] = {'company': company, 'material': material, 'old': cell.value,
+                                           'row': row, 'column': column}
+        change['new'] = value
+        cell.value = value
+        self._written.add(key)
+        return True
+
+    def apply_border(self, border):
+        """書き込んだセルと新しく追加した行のすべてのセルに罫線を設定"""
+        for row, column in self._written:
+            self.ws.cell(row=row, column=column).border = border
+        for row in self._new_rows:
+            for column in range(1, self.ws.max_column + 1):
+                self.ws.cell(row=row, column=column).border = border
+
+    def changes(self) -> List[Dict]:
+        """変更の一覧（書き込んだ順、最終的に元の値に戻ったセルは除く）"""
+        changes = []
+        for change in self._changes.values():
+            if same_value(change['old'], change['new']):
+                continue
+            changes.append({
+                'file': self.excel_file,
+                'sheet': self.sheet_name,
+                'company': change['company'],
+                'material': change['material'],
+                'old': change['old'],
+                'new': change['new'],
+                'delta': price_delta(change['old'], change['new']),
+                'row': change['row'],
+                'column': change['column'],
+            })
+        return changes
+
+
+def format_change(change: Dict) -> str:
+    """変更1件の表示（例: 東北キング ピカ銅: 1740 → 1750（+10））"""
+    old = change['old'] if change['old'] not in (None, '') else '（空）'
+    text = f"{change['company']} {change['material']}: {old} → {change['new']}"
+    if change.get('delta') not in (None, 0):
+        text += f"（{change['delta']:+}）"
+    return text
+
+
+def format_changes(changes: Iterable[Dict]) -> List[str]:
+    """変更の一覧の表示（シートごとにまとめる）"""
+    lines = []
+    current = None
+    for change in changes:
+        sheet = (change['file'], change['sheet'])
+        if sheet != current:
+            current = sheet
+            lines.append(f"  {change['file']} - {change['sheet']}:")
+        lines.append(f"    {format_change(change)}")
+    return lines
+
+
+def write_changes_csv(changes: Iterable[Dict], path: Union[str, Path]) -> int:
+    """変更の一覧をCSVに保存（保存した件数を返す）"""
+    changes = list(changes)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CHANGE_FIELDS)
+        writer.writeheader()
+        for change in changes:
+            writer.writerow({field: '' if change.get(field) is None else change.get(field)
+                             for field in CHANGE_FIELDS})
+    return len(changes)
+
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+設定ファイルのバイナリスナップショット（起動の高速化）
+config/*.yamlの解析・検証結果を1つのpickleファイルに保存する
+
+スナップショットには元ファイルの内容のSHA-256を記録し、読み込み時に一致しない場合
+（YAMLを編集した場合など）は元ファイルを解析し直してスナップショットを自動的に更新する
+SNAPSHOT_VERSIONが異なる場合や、ファイルが壊れている場合も作り直す
+スナップショットは設定ファイルと同じディレクトリに置く（設定ファイルと同様に信頼できる場所であること）
+
+scrapers.configの読み込み関数は自動的にスナップショットを使用する
+
+使い方:
+    python -m scrapers.snapshot            # スナップショットを作り直す（デプロイ時のビルド手順）
+    python -m scrapers.snapshot --check    # 元ファイルと一致しているか確認
+
+マッピングテーブル（MATERIAL_MAPPINGなど）はscrapers/mappings.pyに定義している
+（インポートはPythonのバイトコードキャッシュで1ms未満のため、スナップショットには含めない）
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import DEFAULT_CONFIG_DIR, SCHEMAS, FrozenDict, PathLike
+
+logger = logging.getLogger(__name__)
+
+# スナップショットの形式のバージョン（形式や保存する内容を変えたら上げる）
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FILENAME = '.config_snapshot.pickle'
+
+_snapshots: Dict[str, Tuple[Optional[Tuple[int, int]], Dict]] = {}
+_lock = threading.RLock()
+
+
+def source_digest(raw: bytes) -> str:
+    """元ファイルの内容のハッシュ"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def snapshot_path(config_dir: Optional[PathLike] = None) -> Path:
+    """設定ディレクトリのスナップショットのパス"""
+    return Path(config_dir or DEFAULT_CONFIG_DIR) / SNAPSHOT_FILENAME
+
+
+def _empty() -> Dict:
+    return {'version': SNAPSHOT_VERSION, 'configs': {}}
+
+
+def _read(path: str) -> Dict:
+    """スナップショットを読み込む（ない・バージョンが違う・壊れている場合は空）"""
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return _empty()
+    except Exception as e:
+        logger.warning(f"スナップショットを読み込めないため作り直します: {path} - {e}")
+        return _empty()
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        logger.info(f"スナップショットのバージョンが異なるため作り直します: {path}")
+        return _empty()
+    return snapshot
+
+
+def _write(path: str, snapshot: Dict) -> bool:
+    """スナップショットを一時ファイル経由で置き換え（書き込めない環境では何もしない）"""
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"スナップショットを保存できません: {path} - {e}")
+        return False
+    return True
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _get(path: str, refresh: bool = False) -> Dict:
+    """メモリ上のスナップショット（refreshの場合はファイルが変わっていれば読み直す）"""
+    cached = _snapshots.get(path)
+    if cached is None or (refresh and cached[0] != _file_signature(path)):
+        cached = _snapshots[path] = (_file_signature(path), _read(path))
+    return cached[1]
+
+
+def _lookup(path: str, section: str, name: str, digest: str):
+    """保存済みの値（ハッシュが一致しない場合None、他のプロセスが更新した可能性があれば読み直す）"""
+    for refresh in (False, True):
+        entry = _get(path, refresh)[section].get(name)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+    return None
+
+
+def _store(path: str, section: str, name: str, digest: str, value) -> None:
+    snapshot = _get(path)
+    snapshot[section][name] = (digest, value)
+    if _write(path, snapshot):
+        _snapshots[path] = (_file_signature(path), snapshot)
+
+
+def lookup_config(config_file: PathLike, digest: str) -> Optional[Tuple[FrozenDict, List[str]]]:
+    """
+    設定ファイルの保存済みの解析結果
+
+    Returns:
+        (設定, 検証で見つかった誤り)、スナップショットにないか内容が変わっている場合None
+    """
+    config_file = Path(config_file)
+    with _lock:
+        return _lookup(str(snapshot_path(config_file.parent)), 'configs', config_file.name, digest)
+
+
+def store_config(config_file: PathLike, digest: str, data: FrozenDict, errors: List[str]) -> None:
+    """設定ファイルの解析結果をスナップショットに保存"""
+    config_file = Path(config_file)
+    with _lock:
+        _store(str(snapshot_path(config_file.parent)), 'configs', config_file.name, digest,
+               (data, list(errors)))
+
+
+def build_snapshot(config_dir: Optional[PathLike] = None) -> Path:
+    """スナップショットを作り直す（すべての設定ファイルを解析）"""
+    from .config import _parse_raw
+
+    config_dir = Path(config_dir or DEFAULT_CONFIG_DIR)
+    path = snapshot_path(config_dir)
+    with _lock:
+        _snapshots[str(path)] = (None, _empty())
+        for filename in SCHEMAS:
+            config_file = config_dir / filename
+            if config_file.exists():
+                raw = config_file.read_bytes()
+                data, errors = _parse_raw(str(config_file), raw)
+                store_config(config_file, source_digest(raw), data, errors)
+    return path
+
+
+def check_snapshot(config_dir: Optional[PathLike] = None) -> List[str]:
+    """スナップショットと一致しない元ファイル（更新は行わない）"""
+    snapshot = _read(str(snapshot_path(config_dir)))
+    stale = []
+    for filename in SCHEMAS:
+        source = Path(config_dir or DEFAULT_CONFIG_DIR) / filename
+        if not source.exists():
+            continue
+        entry = snapshot['configs'].get(source.name)
+        if entry is None or entry[0] != source_digest(source.read_bytes()):
+            stale.append(str(source))
+    return stale
+
+
+def clear_snapshot_cache():
+    """メモリ上のスナップショットを破棄（テスト用）"""
+    with _lock:
+        _snapshots.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='設定ファイルのバイナリスナップショットを作成')
+    parser.add_argument('--config-dir', default=None, help='設定ファイルのディレクトリ（既定: config/）')
+    parser.add_argument('--check', action='store_true', help='作り直さずに元ファイルと一致しているか確認')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = check_snapshot(args.config_dir)
+        for source in stale:
+            print(f"✗ スナップショットと一致しません: {source}")
+        if not stale:
+            print("✓ スナップショットは最新です")
+        return 1 if stale else 0
+
+    path = build_snapshot(args.config_dir)
+    print(f"✓ スナップショットを作成しました: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表形式シートへの価格の記入（python -m scrapers fill-tables の出力）
+1行目に材料名（正規の表の列名）、1列目に企業名が並ぶシートに、取得した価格を記入する
+材料名・企業名はscrapers/mappings.pyのテーブルで正規化し、値が変わったセルだけを書き込む
+
+使い方:
+    from scrapers.standard_table import fill_output_tables
+
+    fill_output_tables(table, load_output_tables(), changes)
+"""
+
+import logging
+
+from .mappings import normalize_company_name, resolve_material_name
+
+logger = logging.getLogger(__name__)
+
+
+def fill_standard_table(excel_file, company_results, target_sheet_name='正規の表', changes=None):
+    """
+    表形式のシートにスクレイピング結果を記入（汎用版）
+    値が変わったセルだけを書き込み、何も変わらなければファイルを保存しない
+    
+    Args:
+        excel_file: Excelファイルのパス
+        company_results: スクレイピング結果（ResultTable、または結果の辞書のリスト）
+        target_sheet_name: 対象シート名（全角・半角の数字に対応）
+        changes: 指定した場合、価格の変更（企業・材料・旧値 → 新値）を追加するリスト
+    
+    Returns:
+        bool: 成功した場合True、失敗した場合False
+    """
+    # openpyxl・NumPyはExcelに記入する場合のみ読み込む（マッピング関数だけを使う場合の起動時間の短縮）
+    from openpyxl import load_workbook
+    from openpyxl.styles import Border, Side
+    from .results import as_result_table
+    from .sheet_diff import SheetDiff
+
+    try:
+        wb = load_workbook(excel_file)
+    except FileNotFoundError:
+        logger.error(f"エラー: Excelファイルが見つかりません: {excel_file}")
+        return False
+    except Exception as e:
+        logger.error(f"エラー: Excelファイルの読み込みに失敗しました: {excel_file} - {str(e)}")
+        return False
+    
+    # シート名を探す（全角・半角両方に対応）
+    actual_sheet_name = None
+    for sheet_name in wb.sheetnames:
+        # 完全一致または部分一致で探す
+        if (target_sheet_name == sheet_name or 
+            target_sheet_name in str(sheet_name) or 
+            str(sheet_name) in target_sheet_name):
+            actual_sheet_name = sheet_name
+            break
+    
+    if not actual_sheet_name:
+        logger.error(f"エラー: 「{target_sheet_name}」シートが見つかりません")
+        logger.info(f"利用可能なシート: {wb.sheetnames}")
+        return False
+    
+    ws_standard = wb[actual_sheet_name]
+    logger.info(f"シート「{actual_sheet_name}」を読み込みました")
+    diff = SheetDiff(ws_standard, excel_file, actual_sheet_name)
+    
+    def normalize_header_name(value: str) -> str:
+        if not value:
+            return ''
+        name = str(value).strip()
+        if name in {'アルミ缶　バラ', 'アルミ缶バラ', 'バラアルミ缶'}:
+            return 'アルミ缶'
+        return name
+
+    # 除外するヘッダー名（旧フォーマットの列）
+    EXCLUDED_HEADERS = {'アルミ缶プレス', 'アルミ缶　プレス'}
+
+    header_materials = {}
+    header_row = [ws_standard.cell(row=1, column=col) for col in range(1, ws_standard.max_column + 1)]
+    columns_to_remove = []
+
+    for col_idx, cell in enumerate(header_row, 1):
+        header_name = normalize_header_name(cell.value)
+        if header_name == 'アルミ缶' and cell.value != 'アルミ缶':
+            cell.value = 'アルミ缶'
+            diff.mark_modified()
+
+        if header_name in EXCLUDED_HEADERS:
+            columns_to_remove.append(col_idx)
+            logger.info(f"旧アルミ缶列を削除予定: {cell.value} (列{col_idx})")
+
+    if columns_to_remove:
+        for col_idx in sorted(columns_to_remove, reverse=True):
+            ws_standard.delete_cols(col_idx)
+        diff.mark_modified()
+        logger.info(f"旧アルミ缶列を削除しました: 列 {columns_to_remove}")
+
+    # 再度ヘッダー情報を構築
+    header_materials = {}
+    for col_idx, cell in enumerate(ws_standard[1], 1):
+        header_name = normalize_header_name(cell.value)
+        if not header_name:
+            continue
+        if header_name == 'アルミ缶' and cell.value != 'アルミ缶':
+            cell.value = 'アルミ缶'
+            diff.mark_modified()
+        header_materials[header_name] = col_idx
+    
+    logger.info(f"ヘッダー材料: {list(header_materials.keys())}")
+    
+    # 既存の企業名のリストを作成（2行目以降）
+    existing_companies = {}
+    for row_idx in range(2, ws_standard.max_row + 1):
+        company_name_cell = ws_standard.cell(row=row_idx, column=1)
+        company_name = str(company_name_cell.value).strip() if company_name_cell.value else ''
+        if company_name:
+            normalized = normalize_company_name(company_name)
+            existing_companies[normalized] = row_idx
+    
+    # スクレイピングで取得した企業の価格を記入
+    next_row = ws_standard.max_row + 1
+    processed_companies = set()  # 重複チェック用
+    
+    # 材料名の標準名への変換と列の照合は材料ごとに1回だけ行う（複数シートへの記入でも共有）
+    table = as_result_table(company_results)
+    resolved_materials = table.resolve_materials(resolve_material_name)
+    material_columns = {}
+    
+    for i in range(len(table)):
+        company_name = table.company_name[i] or ''
+        normalized_name = normalize_company_name(company_name)
+        prices = table.price_range(i)
+        
+        if not prices:
+            logger.warning(f"  {company_name}: 価格データがありません")
+            continue
+        
+        # 重複チェック
+        if normalized_name in processed_companies:
+            logger.warning(f"重複をスキップ: {company_name} (正規化後: {normalized_name})")
+            continue
+        
+        processed_companies.add(normalized_name)
+        
+        # 既存の企業か確認
+        row_idx = None
+        if normalized_name in existing_companies:
+            row_idx = existing_companies[normalized_name]
+            logger.info(f"  {company_name}: 既存の行{row_idx}に記入")
+        else:
+            # 新しい行に企業名を追加
+            diff.add_row(next_row, normalized_name)
+            row_idx = next_row
+            existing_companies[normalized_name] = row_idx
+            logger.info(f"  {company_name}: 新規追加 (行{next_row})")
+            next_row += 1
+        
+        # 各材料の価格を記入（既存の価格を上書き）
+        logger.info(f"    記入する材料: {[table.material(row) for row in prices]}")
+        for row in prices:
+            code = table.material_codes[row]
+            material_name = table.materials[code]
+            price_value = table.price_text(row)
+            # 「UP」「税込」などの接頭辞を削除し、MATERIAL_MAPPINGで標準名を取得
+            normalized_material = resolved_materials[code]
+            
+            if not normalized_material:
+                # 直接マッチを試す
+                if material_name in header_materials:
+                    normalized_material = material_name
+                else:
+                    logger.warning(f"    未マッチ材料: {material_name} (価格: {price_value})")
+                    continue
+            
+            # 列番号を取得（全角スペースの違いを考慮）
+            if code in material_columns:
+                col_idx = material_columns[code]
+            else:
+                col_idx = None
+                if normalized_material in header_materials:
+                    col_idx = header_materials[normalized_material]
+                else:
+                    # 全角スペースを半角スペースに変換して再試行
+                    normalized_material_alt = normalized_material.replace('　', ' ')
+                    if normalized_material_alt in header_materials:
+                        col_idx = header_materials[normalized_material_alt]
+                    else:
+                        # 逆も試す
+                        for header_key in header_materials.keys():
+                            if normalized_material.replace(' ', '　') == header_key or normalized_material == header_key.replace(' ', '　'):
+                                col_idx = header_materials[header_key]
+                                break
+                material_columns[code] = col_idx
+            
+            if not col_idx:
+                logger.warning(f"    列が見つからない: {normalized_material} (元: {material_name}, 価格: {price_value})")
+                continue
+            
+            # 価格を正規化
+            normalized_price = table.number_text(row)
+            
+            if normalized_price:
+                if diff.write(row_idx, col_idx, normalized_price, company=normalized_name, material=normalized_material):
+                    logger.info(f"    ✓ {normalized_material}: {normalized_price}円 (列{col_idx})")
+                else:
+                    logger.debug(f"    = {normalized_material}: {normalized_price}円 (列{col_idx}、変更なし)")
+            else:
+                logger.warning(f"    価格正規化失敗: {material_name} = {price_value}")
+    
+    # 罫線を追加
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    # 書き込んだセルと新しく追加した行にだけ罫線を追加
+    diff.apply_border(thin_border)
+    sheet_changes = diff.changes()
+    if changes is not None:
+        changes.extend(sheet_changes)
+    
+    if not diff.modified:
+        logger.info(f"\n✓ 「{actual_sheet_name}」シートに変更はありません（保存しません）")
+        logger.info(f"  処理した企業数: {len(processed_companies)}社")
+        return True
+    
+    # ファイルを保存
+    try:
+        wb.save(excel_file)
+        logger.info(f"\n✓ 「{actual_sheet_name}」シートにスクレイピング結果を記入しました")
+        logger.info(f"  ファイル: {excel_file}")
+        logger.info(f"  処理した企業数: {len(processed_companies)}社")
+        logger.info(f"  変更した価格数: {len(sheet_changes)}件")
+        return True
+    except Exception as e:
+        logger.error(f"エラー: ファイルの保存に失敗しました: {str(e)}")
+        return False
+
+
+def fill_output_tables(company_results, output_tables, changes=None):
+    """
+    出力先テーブル設定（output_tables.yaml）のすべてのシートに記入
+    
+    Args:
+        company_results: スクレイピング結果（ResultTable、または結果の辞書のリスト）
+        output_tables: 出力先テーブル設定のリスト（空の場合はデフォルトの「正規の表」シート）
+        changes: 指定した場合、価格の変更（企業・材料・旧値 → 新値）を追加するリスト
+    
+    Returns:
+        int: 記入に成功したシート数
+    """
+    if not output_tables:
+        # 旧システム: デフォルトの「正規の表」シートに記入（後方互換性のため）
+        excel_file = 'price_results_v2_20251104_220253.xlsx'
+        logger.info("\n設定ファイルが見つからないため、デフォルトの「正規の表」シートに記入します")
+        return int(fill_standard_table(excel_file, company_results, '正規の表', changes))
+    
+    # 新システム: 設定ファイルで指定された複数のシートに記入
+    logger.info(f"\n出力先テーブル設定: {len(output_tables)}件")
+    success_tables = 0
+    
+    for i, table_config in enumerate(output_tables, 1):
+        excel_file = table_config.get('excel_file', '')
+        sheet_name = table_config.get('sheet_name', '')
+        description = table_config.get('description', '')
+        enabled = table_config.get('enabled', True)
+        
+        if not enabled:
+            logger.info(f"\n[{i}/{len(output_tables)}] スキップ: {excel_file} - {sheet_name} ({description})")
+            continue
+        
+        if not excel_file or not sheet_name:
+            logger.warning(f"[{i}/{len(output_tables)}] 設定が不完全です: {table_config}")
+            continue
+        
+        logger.info(f"\n[{i}/{len(output_tables)}] 処理中: {excel_file} - {sheet_name}")
+        if description:
+            logger.info(f"  説明: {description}")
+        
+        if fill_standard_table(excel_file, company_results, sheet_name, changes):
+            success_tables += 1
+    
+    logger.info(f"\n{'='*60}")
+    logger.info(f"表形式シートへの記入完了:")
+    logger.info(f"  成功: {success_tables}/{len([t for t in output_tables if t.get('enabled', True)])} シート")
+    logger.info(f"{'='*60}")
+    return success_tables
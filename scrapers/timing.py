@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+処理時間計測モジュール
+スクレイピングの各フェーズ（接続・ダウンロード・文字コード判定・パース・抽出・フィルタリング）の
+処理時間を計測し、集計やChromeトレース形式での出力を行う
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Iterable
+
+# トレースのタイムスタンプの基準時刻
+_EPOCH = time.perf_counter()
+
+# サマリー表示時のフェーズの順序
+PHASE_ORDER = ['connect', 'download', 'encoding', 'parse', 'extract', 'filter', 'wait']
+
+
+class PhaseTimer:
+    """フェーズごとの処理時間を計測するタイマー"""
+
+    def __init__(self, label: str = ''):
+        """
+        Args:
+            label: トレース出力時の表示名（会社名など）
+        """
+        self.label = label
+        self.totals: Dict[str, float] = {}
+        self.events: List[Dict] = []
+
+    def reset(self):
+        """計測結果をクリア"""
+        self.totals = {}
+        self.events = []
+
+    @contextmanager
+    def phase(self, name: str, **args):
+        """
+        withブロック内の処理時間をフェーズとして記録
+
+        Args:
+            name: フェーズ名
+            **args: トレースに付加する情報（URLなど）
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, start=start, **args)
+
+    def add(self, name: str, seconds: float, start: float = None, **args):
+        """計測済みの時間をフェーズとして記録"""
+        if start is None:
+            start = time.perf_counter() - seconds
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.events.append({'name': name, 'start': start, 'duration': seconds, 'args': args})
+
+    def summary(self) -> Dict[str, float]:
+        """フェーズごとの合計時間（秒、ミリ秒単位で丸め）"""
+        return {name: round(seconds, 3) for name, seconds in self.totals.items()}
+
+
+def aggregate_timings(results: Iterable[Dict]) -> Dict[str, Dict[str, float]]:
+    """
+    結果リストの'timings'をフェーズごとに集計
+
+    Returns:
+        {フェーズ名: {'total': 合計, 'mean': 平均, 'max': 最大, 'count': 件数}}
+    """
+    aggregated = {}
+    for result in results:
+        for name, seconds in (result.get('timings') or {}).items():
+            stats = aggregated.setdefault(name, {'total': 0.0, 'max': 0.0, 'count': 0})
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['count'] += 1
+
+    for stats in aggregated.values():
+        stats['mean'] = stats['total'] / stats['count'] if stats['count'] else 0.0
+
+    ordered = {name: aggregated[name] for name in PHASE_ORDER if name in aggregated}
+    ordered.update({name: stats for name, stats in aggregated.items() if name not in ordered})
+    return ordered
+
+
+def format_timing_summary(aggregated: Dict[str, Dict[str, float]]) -> List[str]:
+    """集計結果をログ出力用の行リストに整形"""
+    grand_total = sum(stats['total'] for stats in aggregated.values()) or 1.0
+    lines = []
+    for name, stats in aggregated.items():
+        share = stats['total'] / grand_total * 100
+        lines.append(
+            f"  {name:<9}: 合計 {stats['total']:.2f}s / 平均 {stats['mean']:.3f}s / "
+            f"最大 {stats['max']:.3f}s ({share:.1f}%)"
+        )
+    return lines
+
+
+def export_chrome_trace(timers: Iterable[PhaseTimer], output_path: str) -> int:
+    """
+    計測結果をChromeのトレースイベント形式（chrome://tracing, Perfetto）で保存
+
+    Args:
+        timers: PhaseTimerのリスト（1タイマー = 1スレッドとして表示）
+        output_path: 出力ファイルのパス
+
+    Returns:
+        出力したイベント数
+    """
+    trace_events = []
+    for tid, timer in enumerate(timers, 1):
+        trace_events.append({
+            'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+            'args': {'name': timer.label or f'scraper-{tid}'},
+        })
+        for event in timer.events:
+            trace_events.append({
+                'name': event['name'],
+                'cat': 'scrape',
+                'ph': 'X',
+                'ts': round((event['start'] - _EPOCH) * 1_000_000),
+                'dur': round(event['duration'] * 1_000_000),
+                'pid': 1,
+                'tid': tid,
+                'args': event['args'],
+            })
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    return len(trace_events)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+過去の取得結果を保存したExcelファイル（price_results_v2_*.xlsx など）の読み込み
+読み取り専用モード（read_only=True）で開き、必要なシートの必要な列だけを
+iter_rows(values_only=True)で順に読むため、実行のたびにシートが増えても開く時間は変わらない
+
+使い方:
+    from scrapers.workbooks import latest_companies
+
+    companies = latest_companies('price_results_v2_20251104_220253.xlsx')
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Union
+
+PathLike = Union[str, Path]
+
+
+@contextmanager
+def open_workbook(path: PathLike):
+    """読み取り専用でExcelファイルを開く（終了時にファイルを閉じる）"""
+    # openpyxlはExcelを読む場合のみインポートする
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield wb
+    finally:
+        wb.close()
+
+
+def _latest(sheetnames, prefix: str) -> Optional[str]:
+    return next((name for name in reversed(sheetnames) if name.startswith(prefix)), None)
+
+
+def latest_companies(path: PathLike, prefix: str = '価格情報_') -> List[str]:
+    """最新の価格情報シートの企業名（A列、出現順で重複なし、ファイルは1回だけ開く）"""
+    with open_workbook(path) as wb:
+        sheet = _latest(wb.sheetnames, prefix)
+        if sheet is None:
+            return []
+        values = (row[0] for row in wb[sheet].iter_rows(min_row=2, max_col=1, values_only=True))
+        return list(dict.fromkeys(str(value) for value in values if value not in (None, '')))
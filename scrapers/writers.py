@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+取得結果の出力（python -m scrapers の json・csv・excel・history・sheet形式）
+
+出力形式:
+    json     price_results_v2_<タイムスタンプ>.json
+    csv      price_results_v2_<タイムスタンプ>.csv
+    excel    runs/価格情報_<タイムスタンプ>.xlsx（1社1材料1行）
+    history  価格履歴データベース（scrapers/history.py）
+    sheet    runs/テスト_<タイムスタンプ>.xlsx（テストシート形式: 1社1行、材料ごとの列）
+
+表形式シートへの記入（tables形式）はscrapers/standard_table.py
+
+使い方:
+    from scrapers.writers import save_results
+
+    save_results(table, output_format='csv')
+"""
+
+import csv
+import importlib.util
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from .history import DEFAULT_HISTORY_PATH, HistoryStore
+from .mappings import MATERIAL_MAPPING, resolve_material_name
+from .runs import DEFAULT_RUNS_DIR, create_run_workbook, save_run_workbook
+
+logger = logging.getLogger(__name__)
+
+# Excel出力ライブラリ（openpyxl）はExcelに出力する場合のみインポートする（JSON・CSV出力の起動時間の短縮）
+EXCEL_AVAILABLE = importlib.util.find_spec('openpyxl') is not None
+
+# テストシートの材料名の順序（列の順序）
+MATERIAL_COLUMNS = [
+    'ピカ銅',
+    '並銅',
+    '砲金',
+    '真鍮',
+    '雑線80%',
+    '雑線60%-65%',
+    'VA線',
+    'アルミホイール',
+    'アルミサッシ',
+    'アルミ缶',
+    'ステンレス304',
+    '鉛バッテリー',
+]
+
+
+def write_json_results(table, f):
+    """
+    ResultTableをJSONの配列として1社ずつ書き込む（json.dump(table.to_results(), f, indent=2)と同じ内容）
+    全体の結果の辞書のリストは作らない
+    """
+    f.write('[')
+    for i in range(len(table)):
+        f.write(',\n  ' if i else '\n  ')
+        f.write(json.dumps(table.result(i), ensure_ascii=False, indent=2).replace('\n', '\n  '))
+    f.write('\n]' if len(table) else ']')
+
+
+def _sheet_column(material_name: str) -> Optional[str]:
+    """テストシートの材料の列名（MATERIAL_MAPPINGの部分一致、該当なしの場合None）"""
+    for key, value in MATERIAL_MAPPING.items():
+        if key in material_name or material_name in key:
+            return value
+    return None
+
+
+def save_results(results, output_format: str = 'json',
+                 history_path: str = DEFAULT_HISTORY_PATH, runs_dir: str = DEFAULT_RUNS_DIR):
+    """
+    結果をファイルに保存
+    
+    Args:
+        results: スクレイピング結果（ResultTable、または結果の辞書のリスト）
+        output_format: 出力形式 ('json', 'csv', 'excel', または 'history')
+        history_path: 'history'の場合の価格履歴データベースのパス
+        runs_dir: 'excel'の場合の実行ごとのExcelファイルの保存先（scrapers/runs.py）
+    """
+    from .results import as_result_table
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    table = as_result_table(results)
+    
+    if output_format == 'history':
+        # 価格履歴データベース（SQLite）に追記（材料名は標準名でも検索できるように変換）
+        with HistoryStore(history_path, material_resolver=resolve_material_name) as store:
+            inserted = store.append_table(table)
+        logger.info(f"価格履歴 {history_path} に {inserted} 件を追記しました")
+    
+    elif output_format == 'json':
+        output_file = f'price_results_v2_{timestamp}.json'
+        with open(output_file, 'w', encoding='utf-8') as f:
+            write_json_results(table, f)
+        logger.info(f"結果を {output_file} に保存しました")
+    
+    elif output_format == 'csv':
+        output_file = f'price_results_v2_{timestamp}.csv'
+        if len(table):
+            rows = []
+            for i in range(len(table)):
+                company_name = table.company_name[i] or ''
+                url = table.url[i] or ''
+                region = table.region[i] or ''
+                scraped_at = table.scraped_at[i] or ''
+                
+                prices = table.price_range(i)
+                if prices:
+                    for row in prices:
+                        rows.append({
+                            '会社名': company_name,
+                            'URL': url,
+                            '地域': region,
+                            '材料名': table.material(row),
+                            '価格': table.price_text(row),
+                            '取得日時': scraped_at
+                        })
+                else:
+                    error = table.error[i] or ''
+                    rows.append({
+                        '会社名': company_name,
+                        'URL': url,
+                        '地域': region,
+                        '材料名': '',
+                        '価格': '',
+                        '取得日時': scraped_at,
+                        'エラー': error
+                    })
+            
+            if rows:
+                fieldnames = ['会社名', 'URL', '地域', '材料名', '価格', '取得日時', 'エラー']
+                with open(output_file, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(rows)
+                logger.info(f"結果を {output_file} に保存しました")
+    
+    elif output_format == 'excel':
+        if not EXCEL_AVAILABLE:
+            logger.error("Excel出力にはopenpyxlが必要です。'pip install openpyxl'を実行してください。")
+            return
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+        
+        # 1回の実行につき1つのExcelファイル（runs/価格情報_<タイムスタンプ>.xlsx）に保存
+        wb, ws = create_run_workbook('価格情報', timestamp)
+        
+        # ヘッダーの設定
+        headers = ['会社名', 'URL', '地域', '材料名', '価格', '取得日時', 'エラー']
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=11)
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        # ヘッダー行を書き込み
+        for col_idx, header in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.border = border
+        
+        # データ行を書き込み
+        row_idx = 2
+        for i in range(len(table)):
+            company_name = table.company_name[i] or ''
+            url = table.url[i] or ''
+            region = table.region[i] or ''
+            scraped_at = table.scraped_at[i] or ''
+            
+            prices = table.price_range(i)
+            if prices:
+                for row in prices:
+                    ws.cell(row=row_idx, column=1, value=company_name).border = border
+                    ws.cell(row=row_idx, column=2, value=url).border = border
+                    ws.cell(row=row_idx, column=3, value=region).border = border
+                    ws.cell(row=row_idx, column=4, value=table.material(row)).border = border
+                    ws.cell(row=row_idx, column=5, value=table.price_text(row)).border = border
+                    ws.cell(row=row_idx, column=6, value=scraped_at).border = border
+                    ws.cell(row=row_idx, column=7, value='').border = border
+                    row_idx += 1
+            else:
+                error = table.error[i] or ''
+                ws.cell(row=row_idx, column=1, value=company_name).border = border
+                ws.cell(row=row_idx, column=2, value=url).border = border
+                ws.cell(row=row_idx, column=3, value=region).border = border
+                ws.cell(row=row_idx, column=4, value='').border = border
+                ws.cell(row=row_idx, column=5, value='').border = border
+                ws.cell(row=row_idx, column=6, value=scraped_at).border = border
+                ws.cell(row=row_idx, column=7, value=error).border = border
+                row_idx += 1
+        
+        # 列幅の自動調整
+        column_widths = {
+            'A': 30,  # 会社名
+            'B': 50,  # URL
+            'C': 10,  # 地域
+            'D': 25,  # 材料名
+            'E': 20,  # 価格
+            'F': 20,  # 取得日時
+            'G': 30   # エラー
+        }
+        for col_letter, width in column_widths.items():
+            ws.column_dimensions[col_letter].width = width
+        
+        # ヘッダー行の高さを設定
+        ws.row_dimensions[1].height = 25
+        
+        # データ行の文字列折り返し設定
+        for row in ws.iter_rows(min_row=2, max_row=row_idx-1):
+            for cell in row:
+                cell.alignment = Alignment(vertical='top', wrap_text=True)
+        
+        run = save_run_workbook(wb, '価格情報', timestamp, table.company_name, row_idx - 2, runs_dir)
+        logger.info(f"✓ 取得結果を {run['path']} のシート '{run['sheet']}' に保存しました")
+
+
+def save_to_excel_new_sheet(results, excel_file: Optional[str] = None, price_corrections: Dict = None,
+                            runs_dir=DEFAULT_RUNS_DIR):
+    """
+    スクレイピング結果をExcelに新規シートとして出力（テストシートと同じ形式）
+
+    Args:
+        results: スクレイピング結果（ResultTable、または結果の辞書のリスト）
+        excel_file: 新規シートを追加するExcelファイル（Noneの場合は runs/テスト_<タイムスタンプ>.xlsx に保存）
+        price_corrections: 価格修正マッピング（removeの材料は出力しない）
+        runs_dir: 実行ごとのExcelファイルの保存先（scrapers/runs.py）
+    """
+    # openpyxlはExcelに出力する場合のみ読み込む
+    from openpyxl import load_workbook
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from .results import as_result_table
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    table = as_result_table(results)
+    # 材料名 → テストシートの列名の照合は材料ごとに1回だけ
+    sheet_columns = table.resolve_materials(_sheet_column)
+    
+    # 削除対象の材料を取得
+    removed_materials = {}
+    if price_corrections:
+        for company_name, correction in price_corrections.items():
+            if 'remove' in correction:
+                removed_materials[company_name] = correction['remove']
+    
+    if excel_file is None:
+        # 1回の実行につき1つのExcelファイルに保存
+        wb, ws = create_run_workbook('テスト', timestamp)
+        sheet_name = ws.title
+    elif Path(excel_file).exists():
+        # 指定したExcelファイルが存在する場合は、そのファイルに別シートとして追加
+        wb = load_workbook(excel_file)
+        # 新しいシート名を生成（タイムスタンプ付き）
+        base_sheet_name = f"テスト_{timestamp}"
+        sheet_name = base_sheet_name
+        
+        # シート名の重複チェック（同じ名前のシートが存在する場合は番号を追加）
+        counter = 1
+        while sheet_name in wb.sheetnames:
+            sheet_name = f"{base_sheet_name}_{counter}"
+            counter += 1
+        
+        ws = wb.create_sheet(title=sheet_name)
+        logger.info(f"既存のExcelファイル '{excel_file}' に新しいシート '{sheet_name}' を追加します")
+    else:
+        # ファイルが存在しない場合は新規作成
+        wb, ws = create_run_workbook('テスト', timestamp)
+        sheet_name = ws.title
+        logger.info(f"新しいExcelファイル '{excel_file}' を作成します")
+    
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    # 1行目：ヘッダー行（1列目は空、2列目以降に材料名）
+    ws.cell(row=1, column=1, value='').border = border
+    for col_idx, material_name in enumerate(MATERIAL_COLUMNS, 2):
+        cell = ws.cell(row=1, column=col_idx, value=material_name)
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+    
+    # 2行目以降：各企業の行（1列目に企業名、2列目以降に各材料の価格）
+    row_idx = 2
+    for i in range(len(table)):
+        company_name = table.company_name[i] or ''
+        
+        # 企業名を1列目に書き込み
+        ws.cell(row=row_idx, column=1, value=company_name).border = border
+        
+        # 各材料の価格をマッピングして書き込み
+        normalized_prices = {}
+        
+        # 削除対象の材料を確認
+        company_removed_materials = removed_materials.get(company_name, [])
+        
+        for row in table.price_range(i):
+            material_name = table.material(row)
+            # 材料名を正規化
+            normalized_material = sheet_columns[table.material_codes[row]]
+            
+            if normalized_material and normalized_material in MATERIAL_COLUMNS:
+                # 削除対象の材料かどうかを確認
+                should_remove = False
+                for removed_material in company_removed_materials:
+                    # 材料名を正規化
+                    normalized_removed = _sheet_column(removed_material) or removed_material
+                    
+                    # 正規化後の名前で比較
+                    if normalized_material == normalized_removed or removed_material in material_name or material_name in removed_material:
+                        should_remove = True
+                        break
+                
+                if should_remove:
+                    continue  # 削除対象の材料はスキップ
+                
+                # 価格を正規化（数値のみ抽出）
+                normalized_price = table.number_text(row)
+                if normalized_price:
+                    # 同じ材料で複数の価格がある場合は最初のものを使用
+                    if normalized_material not in normalized_prices:
+                        normalized_prices[normalized_material] = normalized_price
+        
+        # 各材料列に価格を書き込み
+        for col_idx, material_name in enumerate(MATERIAL_COLUMNS, 2):
+            price = normalized_prices.get(material_name, '')
+            cell = ws.cell(row=row_idx, column=col_idx, value=price)
+            cell.border = border
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+        
+        row_idx += 1
+    
+    # 列幅の自動調整
+    ws.column_dimensions['A'].width = 30  # 会社名
+    for col_idx in range(2, len(MATERIAL_COLUMNS) + 2):
+        col_letter = ws.cell(row=1, column=col_idx).column_letter
+        ws.column_dimensions[col_letter].width = 15  # 各材料の価格列
+    
+    # ヘッダー行の高さを設定
+    ws.row_dimensions[1].height = 25
+    
+    if excel_file is None:
+        excel_file = save_run_workbook(wb, 'テスト', timestamp, table.company_name, len(table), runs_dir)['path']
+    else:
+        wb.save(excel_file)
+    logger.info(f"✓ {len(table)}社の取得結果を {excel_file} のシート '{sheet_name}' に保存しました（テストシート形式）")
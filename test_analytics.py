@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格分析（scrapers/analytics.py）のテスト
+材料ごとの統計・前日比・地域間の価格差・外れ値判定を、素朴な計算結果と比較
+"""
+
+import time
+from statistics import median
+
+import numpy as np
+
+from scrapers.analytics import (PriceFrame, material_stats, daily_deltas, regional_spreads,
+                                outlier_flags, max_prices_table)
+
+RECORDS = [
+    # 取得日時, 企業, 地域, 材料, 価格
+    ('2025-07-01T09:00:00', 'A社', '愛知', 'ピカ銅', 1400),
+    ('2025-07-02T09:00:00', 'A社', '愛知', 'ピカ銅', 1450),
+    ('2025-07-02T09:00:00', 'B社', '大阪', 'ピカ銅', 1470),
+    ('2025-07-02T09:00:00', 'C社', '大阪', 'ピカ銅', 1420),
+    ('2025-07-02T09:00:00', 'D社', '宮城', 'ピカ銅', 300),
+    ('2025-07-01T09:00:00', 'A社', '愛知', '並銅', 1300),
+    ('2025-07-02T09:00:00', 'B社', '大阪', '並銅', None),
+]
+
+
+def make_frame(records=RECORDS):
+    columns = list(zip(*records))
+    return PriceFrame.from_columns(columns[0], columns[1], columns[2], columns[3], columns[4],
+                                   [f'{v}円' for v in columns[4]])
+
+
+def test_material_stats():
+    """最新値での最高値・最安値・中央値（数値でない価格は除外）"""
+    stats = {s['material']: s for s in material_stats(make_frame().latest())}
+    pika = stats['ピカ銅']
+    assert (pika['count'], pika['max'], pika['min']) == (4, 1470, 300)
+    assert pika['median'] == median([1450, 1470, 1420, 300])
+    assert (pika['max_company'], pika['max_region'], pika['max_price_text']) == ('B社', '大阪', '1470円')
+    assert stats['並銅']['count'] == 1
+
+    table = max_prices_table(make_frame().latest())
+    assert [row['material'] for row in table] == sorted(stats)
+    assert table[0].keys() == {'material', 'max_price', 'max_price_value', 'company', 'region'}
+
+
+def test_daily_deltas_and_spreads():
+    """前日比と地域間の価格差"""
+    deltas = daily_deltas(make_frame())
+    assert deltas == [{'company': 'A社', 'material': 'ピカ銅', 'date': '2025-07-02',
+                       'price': 1450.0, 'previous': 1400.0, 'delta': 50.0, 'pct': 50 / 1400 * 100}]
+
+    spreads = {s['material']: s for s in regional_spreads(make_frame().latest())}
+    assert spreads['ピカ銅']['high_region'] == '愛知' and spreads['ピカ銅']['high_mean'] == 1450
+    assert spreads['ピカ銅']['low_region'] == '宮城'
+    assert '並銅' not in spreads
+
+
+def test_outliers():
+    """極端に安い価格を外れ値と判定"""
+    frame = make_frame().latest()
+    flags, _ = outlier_flags(frame)
+    flagged = {frame.companies[frame.company_codes[i]] for i in np.flatnonzero(flags)}
+    assert flagged == {'D社'}
+
+
+def test_large_history_speed():
+    """全企業・全材料・半年分でも1秒未満で集計できること"""
+    rng = np.random.default_rng(0)
+    days = np.arange('2025-01-01', '2025-07-01', dtype='datetime64[D]')
+    companies = [f'企業{i}' for i in range(40)]
+    materials = [f'材料{i}' for i in range(13)]
+    records = [
+        (f'{day}T09:00:00', company, f'地域{c % 8}', material, float(rng.integers(100, 2000)))
+        for day in days for c, company in enumerate(companies) for material in materials
+    ]
+    frame = make_frame(records)
+    start = time.perf_counter()
+    latest = frame.latest()
+    material_stats(latest)
+    regional_spreads(latest)
+    outlier_flags(frame)
+    daily_deltas(frame)
+    elapsed = time.perf_counter() - start
+    print(f"  {len(frame):,}行の集計: {elapsed:.3f}秒")
+    assert elapsed < 1.0
+
+
+if __name__ == '__main__':
+    test_material_stats()
+    test_daily_deltas_and_spreads()
+    test_outliers()
+    test_large_history_speed()
+    print("\nテスト完了!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+非同期バックエンド（scrapers/async_backend.py）のテスト
+ローカルサーバー（utils/sample_server.py）で html_samples を配信し、
+同期版のscrape()と同じ結果が得られるか確認
+"""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from scrapers import Category2Scraper
+from scrapers.async_backend import run_scrapers_async
+from utils.sample_server import SAMPLES_DIR, start_sample_server, sample_url
+
+# (サンプル名, extractor_type)
+SAMPLES = [
+    ('東北キング', 'touhoku_div'),
+    ('東起産業（株）', 'touki_dl'),
+    ('株式会社鳳山', 'houyama_dl'),
+    ('鴻祥貿易株式会社', 'kousyo_box'),
+    ('有限会社金田商事', 'kaneda_figcaption'),
+]
+
+
+def make_scrapers(base_url, delay=0):
+    return [
+        Category2Scraper({'name': name, 'extractor_type': extractor_type,
+                          'price_url': sample_url(base_url, name)}, delay=delay)
+        for name, extractor_type in SAMPLES
+    ]
+
+
+def test_same_results_as_sync():
+    """非同期版の結果が同期版と一致すること"""
+    pytest.importorskip('aiohttp')
+    server, base_url = start_sample_server()
+    try:
+        sync_results = [scraper.scrape() for scraper in make_scrapers(base_url)]
+        async_results = run_scrapers_async(make_scrapers(base_url), per_host_limit=2)
+    finally:
+        server.shutdown()
+
+    for sync_result, async_result in zip(sync_results, async_results):
+        print(f"  {async_result['company_name']}: {len(async_result['prices'])}件")
+        assert async_result['prices']
+        assert async_result['prices'] == sync_result['prices']
+        assert async_result['url'] == sync_result['url']
+        assert set(async_result['timings']) >= {'connect', 'download', 'parse', 'extract'}
+
+
+def test_concurrent_and_total_timeout():
+    """遅いサーバーでも同時に取得し、全体のタイムアウトを超えたサイトはエラー結果になること"""
+    pytest.importorskip('aiohttp')
+    server, base_url = start_sample_server(latency=0.3)
+    try:
+        start = time.perf_counter()
+        results = run_scrapers_async(make_scrapers(base_url), per_host_limit=len(SAMPLES))
+        elapsed = time.perf_counter() - start
+        print(f"  {len(SAMPLES)}社を同時取得: {elapsed:.2f}秒")
+        assert all(result['prices'] for result in results)
+        assert elapsed < 0.3 * len(SAMPLES)
+
+        results = run_scrapers_async(make_scrapers(base_url), total_timeout=0.1)
+        assert [result['error'] for result in results] == ['タイムアウト'] * len(SAMPLES)
+        assert [result['company_name'] for result in results] == [name for name, _ in SAMPLES]
+    finally:
+        server.shutdown()
+
+
+def test_frame_page_fetched_async():
+    """iframeの価格のページ（高橋商事）も非同期バックエンドで取得し、同期的なHTTPリクエストは行わない"""
+    pytest.importorskip('aiohttp')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # トップページと、iframeで表示する価格のページ（kaitori/ka251201.html）を配信
+        shutil.copy(SAMPLES_DIR / '高橋商事.html', Path(tmp_dir) / '高橋商事.html')
+        (Path(tmp_dir) / 'kaitori').mkdir()
+        shutil.copy(SAMPLES_DIR / '高橋商事_価格.html', Path(tmp_dir) / 'kaitori' / 'ka251201.html')
+        server, base_url = start_sample_server(directory=Path(tmp_dir))
+        try:
+            def make_scraper():
+                return Category2Scraper({'name': '高橋商事株式会社', 'extractor_type': 'takahashi_kaitori',
+                                         'price_url': sample_url(base_url, '高橋商事')}, delay=0)
+
+            sync_result = make_scraper().scrape()
+            with mock.patch('requests.Session.request',
+                            side_effect=AssertionError('イベントループ内で同期的に取得しました')):
+                async_result, = run_scrapers_async([make_scraper()])
+        finally:
+            server.shutdown()
+
+    assert len(async_result['prices']) > 10
+    assert async_result['prices'] == sync_result['prices']
+    assert async_result['url'] == sample_url(base_url, '高橋商事')
+
+
+if __name__ == '__main__':
+    test_same_results_as_sync()
+    test_concurrent_and_total_timeout()
+    test_frame_page_fetched_async()
+    print("\nテスト完了!")
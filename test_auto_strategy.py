@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自動抽出の方法の学習（scrapers/auto_strategy.py）のテスト
+html_samples で学習前と同じ価格が得られること、学習した方法で取得できなくなった場合に
+学習し直すことを確認
+"""
+
+import os
+import tempfile
+import warnings
+from pathlib import Path
+
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+
+from scrapers import Category2Scraper
+from scrapers.auto_strategy import StrategyCache, common_ancestor, element_selector
+
+SAMPLES_DIR = Path(__file__).resolve().parent / 'html_samples'
+
+TABLE_PAGE = """<html><body><div id="header"><p>お問い合わせ 0120-000-000</p></div>
+<div class="content"><table id="prices">
+<tr><th>材料</th><th>価格</th></tr>
+<tr><td>ピカ銅</td><td>1,750円</td></tr>
+<tr><td>並銅</td><td>1,600円</td></tr>
+</table></div></body></html>"""
+
+LIST_PAGE = """<html><body><ul class="kakaku">
+<li>ピカ銅 1,800円</li><li>並銅 1,650円</li>
+</ul></body></html>"""
+
+
+def _scraper(cache_path, name='テスト商事'):
+    scraper = Category2Scraper({'name': name, 'extractor_type': 'auto'}, delay=0)
+    scraper.strategy_cache = StrategyCache(cache_path)
+    return scraper
+
+
+def test_learned_strategy_matches_samples():
+    """学習した方法と範囲で、すべての方法を試した場合と同じ価格が得られる"""
+    warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'strategy_cache.json')
+        learned = 0
+        for path in sorted(SAMPLES_DIR.glob('*.html')):
+            soup = BeautifulSoup(path.read_bytes(), 'lxml')
+            url = f'https://example.jp/{path.stem}'
+            expected = _scraper(cache_path).extract_auto(soup)
+
+            assert _scraper(cache_path).extract_page(url, soup) == expected
+            # 別のインスタンス（次回の実行）でもファイルから学習結果を読み込み、同じ価格を得る
+            scraper = _scraper(cache_path)
+            entry = scraper.strategy_cache.get(url)
+            assert (entry is not None) == bool(expected), path.stem
+            assert scraper.extract_page(url, soup) == expected, path.stem
+            if entry:
+                learned += 1
+                print(f"  {path.stem}: {entry['strategy']}（{entry['selector'] or 'ページ全体'}）")
+        assert learned >= 10
+
+
+def test_relearn_when_layout_changes():
+    """学習した方法で取得できなくなったら学習し直し、価格がなくなったら学習結果を削除"""
+    url = 'https://example.jp/price.html'
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'strategy_cache.json')
+        scraper = _scraper(cache_path)
+
+        prices = scraper.extract_page(url, BeautifulSoup(TABLE_PAGE, 'lxml'))
+        assert prices == {'ピカ銅': '1,750円', '並銅': '1,600円'}
+        entry = StrategyCache(cache_path).get(url)
+        assert (entry['strategy'], entry['selector']) == ('table', 'div[class~="content"]')
+
+        prices = scraper.extract_page(url, BeautifulSoup(LIST_PAGE, 'lxml'))
+        assert prices == {'ピカ銅': '1,800円', '並銅': '1,650円'}
+        assert StrategyCache(cache_path).get(url)['strategy'] == 'list'
+
+        assert scraper.extract_page(url, BeautifulSoup('<html><body><p>準備中</p></body></html>', 'lxml')) == {}
+        assert StrategyCache(cache_path).get(url) is None
+
+
+def test_scope_helpers():
+    """共通の祖先とセレクタ（id → class の順、どちらもない場合はNone）"""
+    soup = BeautifulSoup(TABLE_PAGE, 'lxml')
+    rows = soup.find_all('tr')[1:]
+    assert common_ancestor(rows) is soup.find('table')
+    assert element_selector(soup.find('table')) == 'table[id="prices"]'
+    assert element_selector(soup.find('div', class_='content')) == 'div[class~="content"]'
+    assert element_selector(rows[0]) is None
+    assert common_ancestor([]) is None
+
+
+if __name__ == '__main__':
+    test_learned_strategy_matches_samples()
+    test_relearn_when_layout_changes()
+    test_scope_helpers()
+    print("\nテスト完了!")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+統合コマンド（python -m scrapers）と共通パイプライン（scrapers/pipeline.py）のテスト
+ローカルサーバー（utils/sample_server.py）で html_samples を配信して確認
+"""
+
+import glob
+import json
+import os
+import tempfile
+
+from scrapers.async_backend import AIOHTTP_AVAILABLE
+from scrapers.cli import PROFILES, main, select_sites
+from scrapers.config import load_sites
+from scrapers.corrections import compile_corrections
+from scrapers.pipeline import scrape_sites
+from scrapers.mappings import IMPLEMENTED_COMPANIES
+from utils.sample_server import start_sample_server, sample_url
+
+SITES_YAML = """sites:
+- name: 東北キング
+  region: 宮城
+  category: 2
+  extractor_type: touhoku_div
+  price_url: {touhoku}
+- name: 東起産業（株）
+  region: 東京
+  category: 2
+  extractor_type: touki_dl
+  price_url: {touki}
+"""
+
+
+def _sites(base_url):
+    return [
+        {'name': '東北キング', 'category': 2, 'extractor_type': 'touhoku_div',
+         'price_url': sample_url(base_url, '東北キング'), 'normalized_name': '東北キング本社'},
+        {'name': '東起産業（株）', 'category': 2, 'extractor_type': 'touki_dl',
+         'price_url': sample_url(base_url, '東起産業（株）')},
+    ]
+
+
+def test_pipeline_backends():
+    """requests・asyncのどちらのバックエンドでも同じ結果になり、企業名の正規化と価格修正を適用"""
+    plan = compile_corrections({'東北キング本社': {'add': [{'material': 'VA線', 'price': '700円'}]}})
+    server, base_url = start_sample_server()
+    try:
+        results, timers = scrape_sites(_sites(base_url), delay=0, corrections=plan)
+        backends = [results]
+        if AIOHTTP_AVAILABLE:
+            backends.append(scrape_sites(_sites(base_url), backend='async', delay=0, corrections=plan)[0])
+    finally:
+        server.shutdown()
+
+    assert len(timers) == 2
+    for backend_results in backends:
+        assert [result['company_name'] for result in backend_results] == ['東北キング本社', '東起産業（株）']
+        assert backend_results[0]['prices']['VA線'] == '700円'
+        assert len(backend_results[1]['prices']) > 0
+        assert backend_results[0]['prices'] == results[0]['prices']
+
+
+def test_dry_run():
+    """ドライランでは取得も出力も行わない"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, 'sites.yaml'), 'w', encoding='utf-8') as f:
+            f.write(SITES_YAML.format(touhoku='http://127.0.0.1:9/a.html', touki='http://127.0.0.1:9/b.html'))
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            assert main(['full', '--dry-run', '--config-dir', tmp_dir]) == 0
+            assert main(['full', '--dry-run', '--config-dir', tmp_dir, '--only', '存在しない会社']) == 1
+        finally:
+            os.chdir(cwd)
+        assert sorted(os.listdir(tmp_dir)) == ['.config_snapshot.pickle', 'sites.yaml']
+
+
+def test_full_profile_json():
+    """fullプロファイルで取得してJSONに保存（--onlyで対象を絞り込み）"""
+    server, base_url = start_sample_server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, 'sites.yaml'), 'w', encoding='utf-8') as f:
+                f.write(SITES_YAML.format(touhoku=sample_url(base_url, '東北キング'),
+                                          touki=sample_url(base_url, '東起産業（株）')))
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            try:
+                assert main(['full', '--config-dir', tmp_dir, '--format', 'json', '--delay', '0',
+                             '--only', '東北', '--breaker-state', os.path.join(tmp_dir, 'circuit_state.json')]) == 0
+            finally:
+                os.chdir(cwd)
+            output_files = glob.glob(os.path.join(tmp_dir, 'price_results_v2_*.json'))
+            assert len(output_files) == 1
+            with open(output_files[0], 'r', encoding='utf-8') as f:
+                results = json.load(f)
+    finally:
+        server.shutdown()
+
+    assert [result['company_name'] for result in results] == ['東北キング']
+    assert results[0]['prices']
+
+
+def test_implemented_profiles():
+    """implemented・fill-tablesは実装済み企業だけを正規化後の名前で対象にする"""
+    sites = select_sites(PROFILES['fill-tables'], load_sites())
+    assert sites
+    assert all(site['normalized_name'] in IMPLEMENTED_COMPANIES for site in sites)
+    assert len(select_sites(PROFILES['full'], load_sites())) == len(load_sites())
+
+
+if __name__ == '__main__':
+    test_pipeline_backends()
+    test_dry_run()
+    test_full_profile_json()
+    test_implemented_profiles()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+設定ファイルの読み込み（scrapers/config.py）のテスト
+更新時刻によるキャッシュと再読み込み、変更できない設定、検証を確認
+"""
+
+import copy
+import json
+import os
+import pickle
+import tempfile
+
+from scrapers.config import (
+    ConfigError, FrozenDict, clear_config_cache, config_errors, load_correction_plan, load_sites, thaw,
+)
+
+SITES_YAML = """sites:
+- name: 東北キング
+  category: 2
+  price_url: https://example.jp/price.html
+  price_urls:
+  - https://example.jp/price.html
+"""
+
+
+def _write(path, text, mtime=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_cache_and_hot_reload():
+    """同じファイルは1回だけ解析し、編集すると再読み込み、壊れた場合は前回の設定を使う"""
+    clear_config_cache()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(path, SITES_YAML, mtime=1_000_000)
+        sites = load_sites(path)
+        assert load_sites(path) is sites
+        assert sites[0]['name'] == '東北キング'
+
+        _write(path, SITES_YAML.replace('東北キング', '東北キング本社'), mtime=1_000_100)
+        assert load_sites(path)[0]['name'] == '東北キング本社'
+
+        _write(path, "sites: [\n", mtime=1_000_200)
+        assert load_sites(path)[0]['name'] == '東北キング本社'
+
+        clear_config_cache()
+        try:
+            load_sites(path)
+            assert False, 'ConfigErrorが送出されていません'
+        except ConfigError:
+            pass
+
+
+def test_frozen_config():
+    """読み込んだ設定は変更できず、コピーすれば変更できる"""
+    clear_config_cache()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(path, SITES_YAML)
+        site = load_sites(path)[0]
+        assert isinstance(site, FrozenDict)
+        assert isinstance(site['price_urls'], tuple)
+        for mutate in (lambda: site.__setitem__('name', 'x'), lambda: site.update(name='x'),
+                       lambda: site.pop('name')):
+            try:
+                mutate()
+                assert False, 'TypeErrorが送出されていません'
+            except TypeError:
+                pass
+
+        assert dict(site, normalized_name='東北キング')['normalized_name'] == '東北キング'
+        mutable = thaw(site)
+        mutable['price_urls'].append('https://example.jp/2.html')
+        assert len(site['price_urls']) == 1
+
+        assert json.loads(json.dumps(site, ensure_ascii=False))['name'] == '東北キング'
+        assert copy.deepcopy(site) is site
+        assert pickle.loads(pickle.dumps(site)) == site
+
+
+def test_validation_and_correction_plan():
+    """検証の誤りを記録し、価格修正マッピングはファイルが変わるまで同じプランを返す"""
+    clear_config_cache()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sites_path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(sites_path, "sites:\n- name: URLなし\n  category: 3\n")
+        assert len(config_errors(sites_path)) == 2
+
+        path = os.path.join(tmp_dir, 'price_corrections.yaml')
+        _write(path, "corrections:\n  東北キング:\n    remove: [真鍮]\n", mtime=1_000_000)
+        plan = load_correction_plan(path)
+        assert load_correction_plan(path) is plan
+        assert plan.apply({'company_name': '東北キング', 'prices': {'真鍮': '1円'}})['prices'] == {}
+
+        _write(path, "corrections:\n  東北キング:\n    remove: [砲金]\n", mtime=1_000_100)
+        assert load_correction_plan(path) is not plan
+
+
+if __name__ == '__main__':
+    test_cache_and_hot_reload()
+    test_frozen_config()
+    test_validation_and_correction_plan()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格修正マッピングのコンパイル（scrapers/corrections.py）のテスト
+削除・名前変換・固定価格・企業名の照合・設定の検証を確認
+"""
+
+import logging
+import warnings
+from pathlib import Path
+
+import yaml
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+
+from scrapers import Category2Scraper
+from scrapers.cli import PROFILES, load_plan
+from scrapers.corrections import apply_special_price_rules, compile_corrections
+from scrapers.mappings import normalize_material_name
+from scrape_and_fill_standard_table import apply_price_corrections
+
+CORRECTIONS = {
+    '有限会社　八尾アルミセンター': {
+        'remove': ['雑旋', '鉛バッテリー'],
+        'modify': [
+            {'material': 'ピカ線', 'material_new': 'ピカ銅'},
+            {'material': 'アルミホイールA', 'material_new': 'アルミホイール'},
+            {'material': '込銅', 'material_new': '並銅', 'price': '込銅'},
+        ],
+    },
+    '東北キング': {
+        'modify': [{'material': '砲金', 'material_new': '砲金', 'price': '1,300円'}],
+        'add': [{'material': 'VA線', 'price': '700円'}],
+    },
+    '有限会社金田商事': {'remove': ['真鍮']},
+}
+
+
+def test_apply_plan():
+    """remove → modify → add の順に1回の走査で適用"""
+    plan = compile_corrections(CORRECTIONS)
+    assert plan.errors == []
+
+    result = {'company_name': '有限会社　八尾アルミセンター', 'region': '大阪',
+              'prices': {'ピカ線': '1,750円', '雑旋': '900円', 'アルミホイールA': '300円',
+                         '込銅': '1,600円', '真鍮': '1,100円', '込銅パイプ': '1,500円', '雑旋くず': '800円'}}
+    corrected = plan.apply(result)
+    # 設定の材料名を含むだけの材料（込銅パイプ・雑旋くず）は変換・削除しない
+    assert corrected['prices'] == {'ピカ銅': '1,750円', 'アルミホイール': '300円', '並銅': '1,600円',
+                                   '真鍮': '1,100円', '込銅パイプ': '1,500円', '雑旋くず': '800円'}
+    # 元の結果は変更しない
+    assert '雑旋' in result['prices']
+
+    corrected = plan.apply({'company_name': '東北キング', 'prices': {'砲金': '1,250円'}})
+    assert corrected['prices'] == {'砲金': '1,300円', 'VA線': '700円'}
+    assert corrected['prices']['砲金'].value == 1300
+
+
+def test_company_matching_and_special_rules():
+    """企業名は空白の違い・部分一致でも照合し、special_rulesの場合のみ金田商事は税込計算"""
+    plan = compile_corrections(CORRECTIONS, special_rules=True)
+    assert plan.match('有限会社 八尾アルミセンター').key == '有限会社　八尾アルミセンター'
+    assert plan.match('八尾アルミセンター').key == '有限会社　八尾アルミセンター'
+    assert plan.match('未登録の会社') is None
+
+    corrected = plan.apply({'company_name': '有限会社金田商事',
+                            'prices': {'ピカ線': '1577円/kg', 'アルミ缶': '265円/kg', '真鍮': '1060円/kg'}})
+    assert corrected['prices'] == {'ピカ線': '1734円/kg', 'アルミ缶': '297円/kg'}
+
+    corrected = compile_corrections(CORRECTIONS).apply(
+        {'company_name': '有限会社金田商事', 'prices': {'ピカ線': '1577円/kg', '真鍮': '1060円/kg'}})
+    assert corrected['prices'] == {'ピカ線': '1577円/kg'}
+
+
+def test_material_normalizer():
+    """scrape_and_fill_standard_tableでは接頭辞を除去してから照合"""
+    results = apply_price_corrections(
+        [{'company_name': '有限会社　八尾アルミセンター', 'prices': {'UPピカ線': '1,750円', '税込雑旋': '900円'}}],
+        CORRECTIONS,
+    )
+    assert results[0]['prices'] == {'ピカ銅': '1,750円'}
+
+
+def test_rename_collision():
+    """変換後の材料名が重複した場合は変換した材料を優先し、破棄した価格をログに出力"""
+    corrections = {'A社': {'modify': [{'material': '真鍮(上)A', 'material_new': '真鍮'},
+                                      {'material': '込真鍮', 'material_new': '真鍮'}]}}
+    plan = compile_corrections(corrections)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('scrapers.corrections')
+    logger.addHandler(handler)
+    try:
+        corrected = plan.apply({'company_name': 'A社', 'prices': {
+            '真鍮(上)A': '1,100円', '真鍮': '1,000円', '込真鍮': '900円', '真鍮(上)AA～AAA': '1,200円'}})
+    finally:
+        logger.removeHandler(handler)
+    # 後のmodifyが優先され、部分一致する真鍮(上)AA～AAAはそのまま
+    assert corrected['prices'] == {'真鍮': '900円', '真鍮(上)AA～AAA': '1,200円'}
+    assert len([record for record in records if '材料名の重複' in record.getMessage()]) == 2
+
+
+# html_samplesのファイル名 → (price_corrections.yamlの企業名, extractor_type)
+SAMPLE_COMPANIES = {
+    '八木': ('株式会社八木', 'yagi_table'),
+    '有限会社金田商事': ('有限会社金田商事', 'kaneda_figcaption'),
+    '木村金属（大阪）': ('木村金属（大阪）', 'auto'),
+    '東北キング': ('東北キング', 'touhoku_div'),
+    '東起産業（株）': ('東起産業（株）', 'touki_dl'),
+    '株式会社_春日商会_一宮本社': ('株式会社 春日商会　一宮本社', 'haruhi_table'),
+    '株式会社鳳山': ('株式会社鳳山', 'houyama_dl'),
+    '鴻祥貿易株式会社': ('鴻祥貿易株式会社', 'kousyo_box'),
+}
+
+
+def _reference_corrections(company_name, prices, correction):
+    """コンパイル前のscrape_and_fill_standard_table.pyの処理（正規化 → remove → modify → 特殊ルール）"""
+    prices = {normalize_material_name(material): price for material, price in prices.items()}
+    for material in correction.get('remove') or []:
+        prices.pop(material, None)
+    for item in correction.get('modify') or []:
+        old, new = item['material'], item.get('material_new', item['material'])
+        if old in prices and new != old:
+            prices[new] = prices.pop(old)
+    return apply_special_price_rules(company_name, prices)
+
+
+def test_sample_pages_regression():
+    """config/price_corrections.yamlをhtml_samplesの抽出結果に適用し、コンパイル前の処理と同じ結果"""
+    with open('config/price_corrections.yaml', 'r', encoding='utf-8') as f:
+        corrections = yaml.safe_load(f)['corrections']
+    plan = compile_corrections(corrections, normalize_material_name, special_rules=True)
+    samples_dir = Path(__file__).resolve().parent / 'html_samples'
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', XMLParsedAsHTMLWarning)
+        for stem, (company, extractor_type) in SAMPLE_COMPANIES.items():
+            html = (samples_dir / f'{stem}.html').read_text(encoding='utf-8')
+            scraper = Category2Scraper({'name': company, 'extractor_type': extractor_type}, delay=0)
+            prices = scraper.extract_prices(BeautifulSoup(html, 'html.parser'))
+            assert prices, f"{stem}: 価格を抽出できません"
+
+            expected = _reference_corrections(company, prices, corrections[company])
+            corrected = plan.apply({'company_name': company, 'prices': prices})['prices']
+            assert {material: str(price) for material, price in corrected.items()} == \
+                {material: str(price) for material, price in expected.items()}, company
+
+
+def _kaneda_sample_prices():
+    html = (Path(__file__).resolve().parent / 'html_samples' / '有限会社金田商事.html').read_text(encoding='utf-8')
+    scraper = Category2Scraper({'name': '有限会社金田商事', 'extractor_type': 'kaneda_figcaption'}, delay=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', XMLParsedAsHTMLWarning)
+        return scraper.extract_prices(BeautifulSoup(html, 'html.parser'))
+
+
+def test_profile_special_rules():
+    """金田商事の税込計算はimplementedプロファイルのみ（full・fill-tablesは表記価格のまま）"""
+    prices = _kaneda_sample_prices()
+    assert prices
+    result = {'company_name': '有限会社金田商事', 'prices': prices}
+
+    plan = load_plan(PROFILES['full'])
+    assert not plan.special_rules
+    corrected = plan.apply(result)['prices']
+    # fullプロファイルは修正（remove・modify）のみで、価格は抽出した値のまま
+    unchanged = [material for material in corrected if material in prices]
+    assert unchanged
+    for material in unchanged:
+        assert str(corrected[material]) == str(prices[material]), material
+
+    assert not load_plan(PROFILES['fill-tables']).special_rules
+    implemented = load_plan(PROFILES['implemented'])
+    assert implemented.special_rules
+    taxed = implemented.apply(result)['prices']
+    assert any(str(taxed[material]) != str(prices[material]) for material in taxed if material in prices)
+
+
+def test_validation():
+    """設定の誤りを検出（strictの場合はValueError）"""
+    broken = {
+        'A社': {'remove': ['真鍮', None], 'modify': [{'material_new': 'ピカ銅'}], 'rename': []},
+        'B社': ['ピカ線'],
+        'C社': {'add': [{'material': 'VA線'}]},
+    }
+    plan = compile_corrections(broken)
+    assert len(plan.errors) == 5
+    assert plan.apply({'company_name': 'A社', 'prices': {'真鍮': '1円', 'ピカ線': '2円'}})['prices'] == {'ピカ線': '2円'}
+
+    try:
+        compile_corrections(broken, strict=True)
+        assert False, 'ValueErrorが送出されていません'
+    except ValueError:
+        pass
+
+    with open('config/price_corrections.yaml', 'r', encoding='utf-8') as f:
+        corrections = yaml.safe_load(f)['corrections']
+    assert compile_corrections(corrections, normalize_material_name, strict=True).errors == []
+
+
+if __name__ == '__main__':
+    test_apply_plan()
+    test_company_matching_and_special_rules()
+    test_material_normalizer()
+    test_rename_collision()
+    test_sample_pages_regression()
+    test_profile_special_rules()
+    test_validation()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字コード判定（scrapers/encoding.py）のテスト
+ヘッダー → <meta charset> → 学習済みキャッシュ → 自動判定 の順に判定されるか確認
+（テキストファイルは先頭のバイト列から判定）
+"""
+
+import os
+import tempfile
+import warnings
+from pathlib import Path
+
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from scrapers import Category2Scraper
+from scrapers.encoding import (
+    EncodingCache, resolve_encoding, charset_from_headers, charset_from_meta, sniff_file_encoding,
+)
+
+SAMPLES_DIR = Path(__file__).resolve().parent / 'html_samples'
+
+# サンプル → sites.yamlのextractor_type（自動抽出はすべてのサンプルで確認）
+SAMPLE_EXTRACTORS = {
+    '八木': 'yagi_table',
+    '有限会社金田商事': 'kaneda_figcaption',
+    '東北キング': 'touhoku_div',
+    '東起産業（株）': 'touki_dl',
+    '株式会社鳳山': 'houyama_dl',
+    '鴻祥貿易株式会社': 'kousyo_box',
+    '高橋商事_価格': 'takahashi_kaitori',
+}
+
+HTML_SJIS = '<html><head><title>価格表</title></head><body><p>ピカ銅 1,750円/kg</p>' * 20 + '</body></html>'
+
+
+def test_header_charset():
+    """Content-Typeのcharsetを優先（ISO-8859-1の既定値は無視）"""
+    assert charset_from_headers({'Content-Type': 'text/html; charset=Shift_JIS'}) == 'cp932'
+    assert charset_from_headers({'Content-Type': 'text/html; charset="EUC-JP"'}) == 'euc_jp'
+    assert charset_from_headers({'Content-Type': 'text/html; charset=ISO-8859-1'}) is None
+    assert charset_from_headers({'Content-Type': 'text/html'}) is None
+
+    content = HTML_SJIS.encode('cp932')
+    encoding, source = resolve_encoding(content, {'Content-Type': 'text/html; charset=shift_jis'})
+    assert (encoding, source) == ('cp932', 'header')
+
+
+def test_meta_charset():
+    """先頭の<meta charset>/<meta http-equiv>から判定"""
+    html5 = b'<html><head><meta charset="euc-jp"></head>'
+    html4 = b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">'
+    assert charset_from_meta(html5) == 'euc_jp'
+    assert charset_from_meta(html4) == 'cp932'
+    # 探索範囲外のmetaは無視
+    assert charset_from_meta(b' ' * 5000 + html5) is None
+
+
+def test_cache_and_detect():
+    """手がかりがない場合は自動判定し、次回以降はキャッシュを使う"""
+    content = HTML_SJIS.encode('cp932')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'encoding_cache.json')
+        cache = EncodingCache(cache_path)
+
+        encoding, source = resolve_encoding(content, {}, cache=cache, cache_key='example.jp')
+        print(f"  1回目: {encoding}（{source}）")
+        assert source == 'detect'
+        assert content.decode(encoding) == HTML_SJIS
+
+        # 別インスタンスでもファイルから学習結果を読み込める
+        encoding2, source2 = resolve_encoding(content, {}, cache=EncodingCache(cache_path), cache_key='example.jp')
+        print(f"  2回目: {encoding2}（{source2}）")
+        assert (encoding2, source2) == (encoding, 'cache')
+
+        # キャッシュの文字コードでデコードできない場合は再判定
+        utf8_content = HTML_SJIS.encode('utf-8')
+        cache.set('example.jp', 'ascii')
+        _, source3 = resolve_encoding(utf8_content, {}, cache=cache, cache_key='example.jp')
+        assert source3 == 'detect'
+
+
+def test_parse_bytes():
+    """判定した文字コードでバイト列をそのままlxmlに渡せること"""
+    content = HTML_SJIS.encode('cp932')
+    encoding, _ = resolve_encoding(content, {'Content-Type': 'text/html; charset=Shift_JIS'})
+    soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
+    assert soup.find('p').get_text() == 'ピカ銅 1,750円/kg'
+
+
+def _sample_cases():
+    """(サンプル名, バイト列, extractor_type)（自動抽出と、sites.yamlで指定している抽出方法）"""
+    for path in sorted(SAMPLES_DIR.glob('*.html')):
+        content = path.read_bytes()
+        yield path.stem, content, 'auto'
+        if path.stem in SAMPLE_EXTRACTORS:
+            yield path.stem, content, SAMPLE_EXTRACTORS[path.stem]
+
+
+def test_parser_parity():
+    """バイト列をlxmlでパースしても、従来のhtml.parser（デコード済みの文字列）と同じ価格を抽出する"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', XMLParsedAsHTMLWarning)
+        for name, content, extractor_type in _sample_cases():
+            site = {'name': name, 'extractor_type': extractor_type}
+            scraper = Category2Scraper(site, delay=0)
+            # 学習済みの文字コード（config/encoding_cache.json）は使わない・更新しない
+            scraper.encoding_cache = None
+            soup = scraper.parse_html(f'http://example.jp/{name}.html', content, {})
+            encoding, _ = resolve_encoding(content, {})
+            reference = BeautifulSoup(content.decode(encoding), 'html.parser')
+            prices = scraper.extract_prices(soup)
+            assert prices == Category2Scraper(site, delay=0).extract_prices(reference), (name, extractor_type)
+
+
+def test_sniff_file_encoding():
+    """BOM → 候補の文字コードで先頭をエラーなくデコードできるか の順に判定"""
+    text = '名称,地域,URL\n東起産業（株）,東京,https://example.jp/\n' * 200
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'companies.csv')
+
+        def sniff(data, **kwargs):
+            with open(path, 'wb') as f:
+                f.write(data)
+            return sniff_file_encoding(path, **kwargs)
+
+        assert sniff(text.encode('utf-8-sig')) == ('utf-8-sig', True)
+        assert sniff(text.encode('utf-8')) == ('utf-8', True)
+        assert sniff(text.encode('cp932')) == ('cp932', True)
+        assert sniff(text.encode('euc_jp')) == ('euc_jp', True)
+        # 判定範囲の末尾で途切れた文字はエラーとしない
+        assert sniff(text.encode('utf-8'), sample_size=101) == ('utf-8', True)
+        # 一部が壊れたUTF-8はcp932としてはデコードできても文字化けが多いためUTF-8
+        broken = bytearray(text.encode('utf-8'))
+        del broken[20::500]
+        assert sniff(bytes(broken)) == ('utf-8', False)
+
+
+if __name__ == '__main__':
+    test_header_charset()
+    test_meta_charset()
+    test_cache_and_detect()
+    test_parse_bytes()
+    test_parser_parity()
+    test_sniff_file_encoding()
+    print("\nテスト完了!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+差分スクレイピング（scrapers/freshness.py）のテスト
+更新間隔と前回の取得成功時刻から、再取得が必要なサイトを判定できるか確認
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from scrapers.freshness import FreshnessStore, needs_refresh, parse_interval
+
+SITE = {'name': '東北キング', 'price_url': 'https://example.jp/price.html', 'refresh_interval': '12h'}
+
+
+def test_parse_interval():
+    """更新間隔の表記（単位なしは時間）"""
+    assert parse_interval('30m') == timedelta(minutes=30)
+    assert parse_interval('6h') == timedelta(hours=6)
+    assert parse_interval('1d') == timedelta(days=1)
+    assert parse_interval(2) == timedelta(hours=2)
+    assert parse_interval('1.5') == timedelta(hours=1.5)
+    assert parse_interval('毎日') is None
+    assert parse_interval(None) is None
+
+
+def test_needs_refresh():
+    """未取得・更新間隔超過のサイトのみ再取得"""
+    now = datetime(2025, 11, 5, 12, 0)
+    assert needs_refresh(SITE, None, now)
+    assert not needs_refresh(SITE, now - timedelta(hours=11), now)
+    assert needs_refresh(SITE, now - timedelta(hours=12), now)
+    # refresh_intervalが未設定の場合は既定値
+    assert needs_refresh({'name': 'x'}, now - timedelta(hours=1), now, default=timedelta(minutes=30))
+    # 0は常に再取得
+    assert needs_refresh({'name': 'x', 'refresh_interval': '0s'}, now, now)
+
+
+def test_store_reuses_fresh_results():
+    """取得に成功した結果は再利用し、失敗したサイトは次回も再取得"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'last_results.json')
+        now = datetime.now()
+        store = FreshnessStore(path)
+        assert not store.is_fresh(SITE)
+
+        failed_site = {'name': '取得失敗', 'price_url': 'https://example.jp/ng.html'}
+        store.record(SITE, {'scraped_at': now.isoformat(), 'company_name': '東北キング',
+                            'prices': {'ピカ銅': '1,750円'}, 'timings': {'parse': 0.1}})
+        store.record(failed_site, {'scraped_at': now.isoformat(), 'error': 'タイムアウト', 'prices': {}})
+        store.save()
+
+        store = FreshnessStore(path)
+        assert store.is_fresh(SITE)
+        assert not store.is_fresh(failed_site)
+        assert not store.is_fresh(SITE, now=now + timedelta(hours=13))
+
+        result = store.cached_result(SITE)
+        assert result['reused'] is True
+        assert result['prices'] == {'ピカ銅': '1,750円'}
+        assert 'timings' not in result
+        print(f"  {store.summary()}")
+
+        # 再取得が失敗しても前回の成功結果は残る
+        store.record(SITE, {'scraped_at': now.isoformat(), 'error': '接続エラー', 'prices': {}})
+        assert store.cached_result(SITE)['prices'] == {'ピカ銅': '1,750円'}
+
+
+if __name__ == '__main__':
+    test_parse_interval()
+    test_needs_refresh()
+    test_store_reuses_fresh_results()
+    print("\nテスト完了!")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格ページURLの死活確認（scrapers/healthcheck.py）のテスト
+ローカルサーバーでHEAD未対応・リダイレクト・404・応答の遅いページを模擬し、
+レポートの内容と、応答しないサイトの除外を確認
+"""
+
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scrapers.cli import skip_unhealthy_sites
+from scrapers.healthcheck import check_sites, collect_urls, format_report, load_unhealthy_sites, save_report
+
+BODY = '<html><body><p>ピカ銅 1,750円/kg</p></body></html>'.encode('utf-8')
+
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """パスごとに応答を切り替えるハンドラー"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, send_body):
+        if self.path == '/no-head' and self.command == 'HEAD':
+            self.send_response(405)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/moved':
+            self.send_response(301)
+            self.send_header('Location', '/ok')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/slow':
+            time.sleep(1.0)
+        if self.path not in ('/ok', '/no-head', '/slow'):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(BODY)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HealthRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_collect_urls():
+    """price_urls（なければprice_url）を集め、複数のサイトで同じURLは1回だけ確認する"""
+    sites = [
+        {'name': 'A商事', 'price_urls': ['https://a.example.jp/1', 'https://a.example.jp/2']},
+        {'name': 'B金属', 'price_url': 'https://a.example.jp/1'},
+        {'name': 'C商会', 'url': 'https://c.example.jp/'},
+    ]
+    assert collect_urls(sites) == {
+        'https://a.example.jp/1': ['A商事', 'B金属'],
+        'https://a.example.jp/2': ['A商事'],
+        'https://c.example.jp/': ['C商会'],
+    }
+
+
+def test_check_sites():
+    """HEAD未対応はGETで確認し、リダイレクト先・サイズ・タイムアウトを記録"""
+    pytest.importorskip('aiohttp')
+    server, base_url = start_server()
+    try:
+        sites = [
+            {'name': '正常商事', 'price_urls': [f'{base_url}/ok', f'{base_url}/missing']},
+            {'name': 'HEAD未対応', 'price_url': f'{base_url}/no-head'},
+            {'name': '移転商会', 'price_url': f'{base_url}/moved'},
+            {'name': '閉鎖金属', 'price_url': f'{base_url}/missing'},
+            {'name': '低速産業', 'price_url': f'{base_url}/slow'},
+        ]
+        start = time.perf_counter()
+        report = check_sites(sites, per_host_limit=4, timeout=0.5)
+        assert time.perf_counter() - start < 2.0
+    finally:
+        server.shutdown()
+
+    entries = {entry['url'][len(base_url):]: entry for entry in report['urls']}
+    assert list(entries) == ['/ok', '/missing', '/no-head', '/moved', '/slow']
+    assert (entries['/ok']['method'], entries['/ok']['status'], entries['/ok']['content_length']) == ('HEAD', 200, len(BODY))
+    assert (entries['/no-head']['method'], entries['/no-head']['status']) == ('GET', 200)
+    assert entries['/no-head']['content_length'] == len(BODY)
+    assert entries['/moved']['ok'] and entries['/moved']['redirects'] == [f'{base_url}/ok']
+    assert (entries['/missing']['status'], entries['/missing']['sites']) == (404, ['正常商事', '閉鎖金属'])
+    assert entries['/slow']['error'] == 'タイムアウト'
+    assert report['summary'] == {'total': 5, 'ok': 3, 'failed': 2, 'redirected': 1}
+    # 一部のURLだけ応答しないサイトは除外しない
+    assert report['unhealthy_sites'] == ['低速産業', '閉鎖金属']
+    for line in format_report(report):
+        print(f"  {line}")
+
+
+def test_skip_unhealthy():
+    """保存したレポートで応答しないサイトを除外（レポートがない場合はすべて対象）"""
+    report = {'version': 1, 'checked_at': '', 'summary': {'total': 1, 'ok': 0, 'failed': 1, 'redirected': 0},
+              'urls': [], 'unhealthy_sites': ['閉鎖金属']}
+    sites = [{'name': '正常商事'}, {'name': '閉鎖金属'}]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'url_health.json')
+        assert load_unhealthy_sites(path) is None
+        assert skip_unhealthy_sites(sites, path) == sites
+
+        save_report(report, path)
+        assert load_unhealthy_sites(path) == {'閉鎖金属'}
+        assert skip_unhealthy_sites(sites, path) == [{'name': '正常商事'}]
+
+
+if __name__ == '__main__':
+    test_collect_urls()
+    test_check_sites()
+    test_skip_unhealthy()
+    print("\nテスト完了!")
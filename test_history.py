@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格履歴ストア（scrapers/history.py）のテスト
+追記・期間検索・標準材料名での検索・月別Parquet出力を確認
+"""
+
+import tempfile
+from pathlib import Path
+
+from scrapers.history import HistoryStore, PYARROW_AVAILABLE, parse_price_value
+from scrapers.mappings import resolve_material_name
+
+RESULTS = [
+    {'scraped_at': '2025-06-03T09:00:00', 'company_name': '東北キング', 'region': '宮城',
+     'url': 'https://example.jp/', 'prices': {'ピカ線': '1,420円/kg', '込銅': '1,300円/kg'}},
+    {'scraped_at': '2025-07-01T09:00:00', 'company_name': '東北キング', 'region': '宮城',
+     'url': 'https://example.jp/', 'prices': {'1号銅線(ピカ線)': '1,450円/kg'}},
+    {'scraped_at': '2025-07-01T09:05:00', 'company_name': '株式会社鳳山', 'region': '愛知',
+     'url': 'https://example.com/', 'prices': {'ピカ銅': '1,470～1,500円'}},
+    {'scraped_at': '2025-07-01T09:06:00', 'company_name': '取得失敗', 'error': 'タイムアウト', 'prices': {}},
+]
+
+
+def test_parse_price_value():
+    assert parse_price_value('1,420円/kg') == 1420
+    assert parse_price_value('1,470～1,500円') == 1470
+    assert parse_price_value('お問い合わせ') is None
+
+
+def test_append_and_query():
+    """標準材料名・企業・期間で検索できること"""
+    with HistoryStore(':memory:', material_resolver=resolve_material_name) as store:
+        assert store.append(RESULTS) == 4
+        # 同じ結果の再追記・再利用した結果は登録しない
+        assert store.append(RESULTS) == 0
+        assert store.append([dict(RESULTS[0], scraped_at='2025-08-01T09:00:00', reused=True)]) == 0
+
+        rows = store.query(material='ピカ銅')
+        print(f"  ピカ銅: {[(r['company'], r['price_value']) for r in rows]}")
+        assert [r['price_value'] for r in rows] == [1420, 1450, 1470]
+
+        rows = store.query(company='東北キング', material='ピカ銅', start='2025-07-01')
+        assert [r['material'] for r in rows] == ['1号銅線(ピカ線)']
+        assert store.query(end='2025-07-01') == store.query(start='2025-06-01', end='2025-06-30')
+
+        latest = store.latest()
+        assert {(r['company'], r['canonical_material']) for r in latest} == {
+            ('東北キング', 'ピカ銅'), ('株式会社鳳山', 'ピカ銅')}
+        assert '取得失敗' in store.companies()
+
+
+def test_export_parquet():
+    """月ごとにParquetファイルを分割して書き出すこと"""
+    if not PYARROW_AVAILABLE:
+        print("  pyarrowがインストールされていないためスキップ")
+        return
+    import pyarrow.parquet as pq
+    with tempfile.TemporaryDirectory() as tmp_dir, HistoryStore(':memory:') as store:
+        store.append(RESULTS)
+        files = store.export_parquet(tmp_dir)
+        assert [f.parent.name for f in files] == ['month=2025-06', 'month=2025-07']
+        assert pq.read_table(files[1]).num_rows == 2
+        assert Path(tmp_dir, 'month=2025-06', 'prices.parquet').exists()
+
+
+if __name__ == '__main__':
+    test_parse_price_value()
+    test_append_and_query()
+    test_export_parquet()
+    print("\nテスト完了!")
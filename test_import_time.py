@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+インポート時間のテスト
+設定・マッピングだけを使うモジュールが重いライブラリ（openpyxl・BeautifulSoupなど）を
+読み込まないこと、インポート時間が予算内であることを確認（別プロセスで計測）
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+
+# 遅延インポートの対象
+HEAVY_MODULES = ('openpyxl', 'bs4', 'requests', 'pdfplumber', 'numpy', 'pyarrow', 'aiohttp', 'yaml')
+
+# モジュール → 読み込んではいけないライブラリ
+LIGHT_IMPORTS = {
+    'scrapers': HEAVY_MODULES,
+    'scrapers.config': HEAVY_MODULES,
+    'scrapers.snapshot': HEAVY_MODULES,
+    'scrapers.corrections': HEAVY_MODULES,
+    'scrapers.history': HEAVY_MODULES,
+    'scrapers.workbooks': HEAVY_MODULES,
+    'scrapers.runs': HEAVY_MODULES,
+    'scrapers.pdf_tables': HEAVY_MODULES,
+    'scrapers.healthcheck': HEAVY_MODULES,
+    'scrapers.resilience': HEAVY_MODULES,
+    'scrapers.auto_strategy': HEAVY_MODULES,
+    'scrapers.selector_extractor': HEAVY_MODULES,
+    'scrapers.mappings': HEAVY_MODULES,
+    'scrapers.standard_table': HEAVY_MODULES,
+    'scrapers.writers': HEAVY_MODULES,
+    'scrape_and_fill_standard_table': HEAVY_MODULES,
+    'fill_table_formats': HEAVY_MODULES,
+    'scrape_18_companies_to_excel': HEAVY_MODULES,
+    'query_price_history': HEAVY_MODULES,
+    'pdf_to_csv': HEAVY_MODULES,
+    'read_pdf': HEAVY_MODULES,
+    'scrape_prices_v2': ('openpyxl', 'bs4', 'pyarrow', 'aiohttp', 'yaml'),
+}
+
+# インポート時間の予算（ミリ秒、-X importtimeの累計）
+IMPORT_BUDGET_MS = 250
+
+_PROBE = """
+import json, sys
+import {module}
+print(json.dumps(sorted(name for name in {heavy!r} if name in sys.modules)))
+"""
+
+
+def _probe(module, heavy):
+    """別プロセスでインポートし、(読み込まれた重いライブラリ, インポート時間[ms]) を返す"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE.format(module=module, heavy=tuple(heavy))],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+    loaded = json.loads(completed.stdout.strip().splitlines()[-1])
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        if line.startswith('import time:') and line.rsplit('|', 1)[-1].strip() == module:
+            cumulative_us = int(line.split('|')[1])
+    return loaded, cumulative_us / 1000
+
+
+def test_heavy_modules_are_lazy():
+    """設定・マッピングだけを使うモジュールは重いライブラリを読み込まない"""
+    for module, heavy in LIGHT_IMPORTS.items():
+        loaded, _ = _probe(module, heavy)
+        assert loaded == [], f"{module} が {loaded} を読み込んでいます"
+
+
+def test_import_time_budget():
+    """軽いエントリポイントのインポート時間が予算内"""
+    for module in ('scrapers', 'scrapers.config', 'scrape_and_fill_standard_table', 'query_price_history'):
+        _, elapsed_ms = _probe(module, ())
+        assert elapsed_ms < IMPORT_BUDGET_MS, f"{module}: {elapsed_ms:.0f}ms（予算 {IMPORT_BUDGET_MS}ms）"
+
+
+def test_lazy_scraper_classes():
+    """スクレイパーのクラスは参照したときに読み込まれる"""
+    import scrapers
+    from scrapers import Category2Scraper
+    from scrapers.category2_scraper import Category2Scraper as Direct
+
+    assert Category2Scraper is Direct
+    assert 'Category1Scraper' in dir(scrapers)
+    try:
+        scrapers.UnknownScraper
+        assert False, 'AttributeErrorが送出されていません'
+    except AttributeError:
+        pass
+
+
+if __name__ == '__main__':
+    test_heavy_modules_are_lazy()
+    test_import_time_budget()
+    test_lazy_scraper_classes()
+    print("✓ すべてのテストが成功しました")
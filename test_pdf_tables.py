@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDFのページごとの抽出（scrapers/pdf_tables.py）と pdf_to_csv.py のテスト
+キャッシュ済みのPDFはpdfplumberを使わずに処理できることを確認
+（pdfplumberがインストールされている場合は実際のPDFで並列・逐次の結果も比較）
+"""
+
+import csv
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from pdf_to_csv import extract_companies_from_pdf, parse_company_rows
+from scrapers.pdf_tables import (
+    CACHE_VERSION, PDFPLUMBER_AVAILABLE, cache_path, iter_pages, page_count, pdf_digest,
+)
+
+PDF_PATH = Path(__file__).resolve().parent / '非鉄金属業者一覧（WEB上に価格あり）提出用 - シート1.pdf'
+
+PAGES = {
+    1: [[['名称', '地域', 'URL', '価格ページ'],
+         ['東北キング', '宮城', 'https://example.jp/', 'https://example.jp/price', 'https://example.jp/price'],
+         ['', '', '', ''],
+         ['短い行', '東京']]],
+    2: [[['名称', '地域', 'URL', '価格ページ'],
+         ['東起産業（株）', '東京', 'https://example.com/', 'https://example.com/a', 'https://example.com/b']]],
+}
+
+
+def _write_cache(cache_dir, digest, pages):
+    """抽出済みのページをキャッシュに書き込む"""
+    meta = Path(cache_dir) / digest / 'meta.json'
+    meta.parent.mkdir(parents=True)
+    meta.write_text(json.dumps({'version': CACHE_VERSION, 'pages': len(pages)}), encoding='utf-8')
+    for page_num, tables in pages.items():
+        path = cache_path(cache_dir, digest, page_num, 'tables')
+        path.write_text(json.dumps({'version': CACHE_VERSION, 'data': tables}), encoding='utf-8')
+
+
+def test_parse_company_rows():
+    """ヘッダー行・空の行・列の足りない行を除き、価格ページURLの重複を除く"""
+    companies = parse_company_rows(PAGES[1])
+    assert [company['名称'] for company in companies] == ['東北キング']
+    assert companies[0]['価格ページURLs'] == ['https://example.jp/price']
+    assert parse_company_rows([None, []]) == []
+
+
+def test_cached_pdf_to_csv():
+    """キャッシュ済みのPDFはpdfplumberなしでCSVに変換でき、内容が変わるとキャッシュを使わない"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, 'list.pdf')
+        with open(pdf_path, 'wb') as f:
+            f.write(b'%PDF-1.4 test')
+        cache_dir = os.path.join(tmp_dir, 'cache')
+        _write_cache(cache_dir, pdf_digest(pdf_path), PAGES)
+
+        assert page_count(pdf_path, cache_dir) == 2
+        assert [page_num for page_num, _ in iter_pages(pdf_path, pages=[2, 1, 2, 9], cache_dir=cache_dir)] == [2, 1]
+
+        output_csv = os.path.join(tmp_dir, 'list.csv')
+        companies = extract_companies_from_pdf(pdf_path, output_csv, cache_dir=cache_dir)
+        assert [company['名称'] for company in companies] == ['東北キング', '東起産業（株）']
+        with open(output_csv, encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+        assert rows[1]['価格ページURLs'] == 'https://example.com/a\nhttps://example.com/b'
+        assert not os.path.exists(output_csv + '.tmp')
+
+        # 内容が変わったPDFはキャッシュを使わずに読み直す（読めない場合はCSVを作成しない）
+        with open(pdf_path, 'ab') as f:
+            f.write(b' changed')
+        os.remove(output_csv)
+        assert extract_companies_from_pdf(pdf_path, output_csv, cache_dir=cache_dir) == []
+        assert not os.path.exists(output_csv)
+        assert not os.path.exists(output_csv + '.tmp')
+
+
+def _write_text_pdf(path, texts):
+    """1ページに1行のテキストがあるPDFを作成（Helvetica、ASCIIのみ）"""
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(texts)))}] /Count {len(texts)} >>",
+        '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_parallel_matches_serial():
+    """並列に抽出した結果は逐次の結果と同じページ順で、2回目はキャッシュから読む"""
+    if not PDFPLUMBER_AVAILABLE:
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, 'pages.pdf')
+        _write_text_pdf(pdf_path, ['page one', 'page two', 'page three', 'page four'])
+        cache_dir = os.path.join(tmp_dir, 'cache')
+
+        serial = list(iter_pages(pdf_path, 'text', workers=1, cache_dir=None))
+        assert serial == [(1, 'page one'), (2, 'page two'), (3, 'page three'), (4, 'page four')]
+        assert list(iter_pages(pdf_path, 'text', pages=[3, 1], workers=2, cache_dir=cache_dir)) == [serial[2], serial[0]]
+        # キャッシュ済みのページ（1・3）とそれ以外を組み合わせても順序は同じ
+        assert list(iter_pages(pdf_path, 'text', workers=2, cache_dir=cache_dir)) == serial
+        assert len(list(Path(cache_dir).glob('*/page_*.text.json'))) == 4
+
+        if PDF_PATH.exists():
+            tables = list(iter_pages(PDF_PATH, workers=1, cache_dir=cache_dir))
+            assert list(iter_pages(PDF_PATH, cache_dir=cache_dir)) == tables
+            assert parse_company_rows(tables[0][1])
+
+
+if __name__ == '__main__':
+    test_parse_company_rows()
+    test_cached_pdf_to_csv()
+    test_parallel_matches_serial()
+    print("✓ すべてのテストが成功しました")
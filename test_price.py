@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格モデル（scrapers/price.py）のテスト
+価格文字列を1回だけ解析し、数値・単位・税込区分・範囲を保持できるか確認
+"""
+
+import copy
+import json
+
+from scrapers.price import Price, as_price
+from scrapers.corrections import apply_special_price_rules
+from scrapers.mappings import normalize_price
+
+
+def test_parse_price_text():
+    """価格文字列の解析"""
+    price = Price('1,750円/kg')
+    assert price == '1,750円/kg'
+    assert price.value == 1750 and isinstance(price.value, int)
+    assert price.unit == 'kg'
+    assert price.tax_included is None
+    assert not price.is_range
+
+    price = Price('890～1080円')
+    assert (price.value, price.low, price.high) == (890, 890, 1080)
+    assert price.unit == ''
+    assert price.is_range
+
+    assert Price('1,200円／ｋｇ（税込）').tax_included is True
+    assert Price('1200円/kg 税別').tax_included is False
+    assert Price('85.5円/kg').value == 85.5
+    assert Price('お問い合わせ').value is None
+    assert Price('お問い合わせ').number_text() == ''
+
+
+def test_price_behaves_as_string():
+    """文字列としての比較・JSON出力・コピーでも解析結果を保持"""
+    price = Price('1,577円/kg')
+    assert as_price(price) is price
+    assert '円' in price and price.raw == '1,577円/kg'
+    assert json.dumps({'ピカ銅': price}, ensure_ascii=False) == '{"ピカ銅": "1,577円/kg"}'
+    copied = copy.deepcopy(price)
+    assert copied.value == 1577 and copied.unit == 'kg'
+
+
+def test_normalize_and_special_rules_use_parsed_value():
+    """正規化と金田商事の税込計算が解析済みの数値を使う"""
+    assert normalize_price('1,750円/kg') == '1750'
+    assert normalize_price(Price('890～1080円')) == '890'
+    assert normalize_price('') == ''
+
+    prices = apply_special_price_rules('有限会社金田商事', {'ピカ線': Price('1577円/kg'), '価格': '要相談'})
+    assert prices['ピカ線'] == '1734円/kg'
+    assert prices['ピカ線'].value == 1734 and prices['ピカ線'].tax_included is True
+    assert prices['価格'] == '要相談'
+
+    # 単位は元の表記のまま（kg以外・単位なしを円/kgにしない）
+    prices = apply_special_price_rules('有限会社金田商事', {'鉛バッテリー': '100,000円/t', 'VA線': '500円'})
+    assert prices == {'鉛バッテリー': '110000円/t', 'VA線': '550円'}
+
+
+if __name__ == '__main__':
+    test_parse_price_text()
+    test_price_behaves_as_string()
+    test_normalize_and_special_rules_use_parsed_value()
+    print("✓ すべてのテストが成功しました")
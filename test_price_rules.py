@@ -7,7 +7,8 @@ apply_special_price_rulesのテスト
 
 import sys
 sys.path.insert(0, '.')
-from scrape_and_fill_standard_table import apply_special_price_rules, normalize_price
+from scrapers.corrections import apply_special_price_rules
+from scrapers.mappings import normalize_price
 
 def test_kaneda_tax_rules():
     """金田商事の税込計算ルールをテスト"""
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+取得の期限・リトライ・サーキットブレーカー（scrapers/resilience.py）のテスト
+一時的なエラーだけを期限内でリトライし、続けて応答しないホストは実行をまたいで
+簡易確認・省略に切り替わり、応答があれば元に戻ることを確認
+"""
+
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scrapers import Category2Scraper
+from scrapers.resilience import (
+    MODE_NORMAL, MODE_PROBE, MODE_SKIP, CircuitBreaker, Deadline, DeadlineExceeded, backoff_delay,
+    call_with_retries, site_budget,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TransientError(Exception):
+    pass
+
+
+def test_retries_within_deadline():
+    """一時的なエラーだけをリトライし、期限を超える場合はリトライしない"""
+    assert 0 <= backoff_delay(10) <= 8.0
+    assert backoff_delay(2, rng=lambda: 1.0) == 2.0
+    assert site_budget({'fetch_budget': '120'}) == 120.0
+    assert site_budget({'fetch_budget': 'abc'}, default=60.0) == 60.0
+
+    clock = FakeClock()
+    timeouts = []
+
+    def flaky(timeout):
+        timeouts.append(timeout)
+        if len(timeouts) < 3:
+            raise TransientError('503')
+        return 'ok'
+
+    deadline = Deadline(100, clock=clock)
+    assert call_with_retries(flaky, deadline, lambda e: isinstance(e, TransientError), sleep=clock.sleep) == 'ok'
+    assert timeouts[0] == 30.0 and len(timeouts) == 3
+
+    # 一時的でないエラーはリトライしない
+    calls = []
+
+    def not_found(timeout):
+        calls.append(timeout)
+        raise ValueError('404')
+
+    try:
+        call_with_retries(not_found, Deadline(100, clock=clock), lambda e: isinstance(e, TransientError),
+                          sleep=clock.sleep)
+    except ValueError:
+        pass
+    assert len(calls) == 1
+
+    # 残り時間が短い場合はタイムアウトを短くし、期限を超えたらリクエストしない
+    deadline = Deadline(5, clock=clock)
+    assert deadline.timeout() == 5
+    clock.now += 10
+    try:
+        call_with_retries(flaky, deadline, lambda e: True, sleep=clock.sleep)
+    except DeadlineExceeded:
+        pass
+    else:
+        assert False, 'DeadlineExceededが発生しませんでした'
+
+
+def test_breaker_across_runs():
+    """threshold回の実行で続けて失敗したホストは簡易確認 → 失敗したら省略 → 応答があれば復旧"""
+    url = 'https://dead.example.jp/price.html'
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'circuit_state.json')
+        for _ in range(2):
+            breaker = CircuitBreaker(path, threshold=2)
+            assert breaker.mode(url) == MODE_NORMAL
+            # 同じ実行での複数回の失敗は1回と数える
+            breaker.record_failure(url, 'ConnectionError')
+            breaker.record_failure(url, 'ConnectionError')
+            breaker.record_success('https://alive.example.jp/')
+            breaker.save()
+
+        breaker = CircuitBreaker(path, threshold=2)
+        assert breaker.failures(url) == 2
+        assert breaker.failures('https://alive.example.jp/') == 0
+        assert breaker.mode(url) == MODE_PROBE
+        breaker.record_failure(url, 'ConnectTimeout')
+        assert breaker.mode('https://dead.example.jp/other.html') == MODE_SKIP
+        breaker.save()
+
+        breaker = CircuitBreaker(path, threshold=2)
+        assert breaker.failures(url) == 3
+        breaker.record_success(url)
+        assert breaker.mode(url) == MODE_NORMAL
+        breaker.save()
+        assert CircuitBreaker(path, threshold=2).failures(url) == 0
+
+
+class FlakyRequestHandler(BaseHTTPRequestHandler):
+    """/flaky は最初の2回だけ503を返す"""
+
+    protocol_version = 'HTTP/1.1'
+    counts = {}
+
+    def do_GET(self):
+        count = self.counts[self.path] = self.counts.get(self.path, 0) + 1
+        if self.path == '/flaky' and count <= 2:
+            self.send_error(503)
+            return
+        body = '<html><body><div class="kaitori_item">ピカ銅</div><p>1,750円</p></body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_scraper_retries_and_breaker():
+    """スクレイパーは503をリトライして取得し、接続できないホストは期限内で諦めて記録する"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    # 接続できないポート（サーバーを閉じた直後のポート）
+    closed = ThreadingHTTPServer(('127.0.0.1', 0), FlakyRequestHandler)
+    dead_url = f'http://127.0.0.1:{closed.server_address[1]}/price.html'
+    closed.server_close()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            breaker = CircuitBreaker(os.path.join(tmp_dir, 'circuit_state.json'), threshold=1)
+            scraper = Category2Scraper({'name': 'テスト商事', 'price_urls': [f'{base_url}/flaky', dead_url]},
+                                       delay=0, breaker=breaker, budget=10)
+            assert scraper.fetch_html(f'{base_url}/flaky') is not None
+            assert FlakyRequestHandler.counts['/flaky'] == 3
+
+            start = time.perf_counter()
+            assert scraper.fetch_html(dead_url) is None
+            assert time.perf_counter() - start < 10
+            breaker.save()
+
+            # 次の実行では簡易確認に失敗したホストの残りのページを省略
+            breaker = CircuitBreaker(breaker.path, threshold=1)
+            scraper = Category2Scraper({'name': 'テスト商事', 'price_url': dead_url}, delay=0, breaker=breaker)
+            assert breaker.mode(dead_url) == MODE_PROBE
+            assert scraper.fetch_html(dead_url) is None
+            assert breaker.mode(dead_url) == MODE_SKIP
+            assert breaker.mode(f'{base_url}/flaky') == MODE_NORMAL
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    test_retries_within_deadline()
+    test_breaker_across_runs()
+    test_scraper_retries_and_breaker()
+    print("\nテスト完了!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列指向のスクレイピング結果（scrapers/results.py）のテスト
+結果の辞書との相互変換、材料名の共有、表形式シートへの記入を確認
+"""
+
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+
+from scrapers.history import HistoryStore
+from scrapers.results import ResultTable
+from scrapers.mappings import resolve_material_name
+from scrapers.standard_table import fill_standard_table
+from scrapers.writers import save_results, save_to_excel_new_sheet, write_json_results
+
+RESULTS = [
+    {'scraped_at': '2025-11-05T09:00:00', 'url': 'https://example.jp/a', 'urls': ['https://example.jp/a'],
+     'company_name': '東北キング', 'region': '宮城', 'prices': {'ピカ線': '1,750円/kg', '真鍮': '1,080円/kg'},
+     'timings': {'parse': 0.1}},
+    {'scraped_at': '2025-11-05T09:00:05', 'url': 'https://example.jp/b', 'company_name': '取得失敗',
+     'region': '東京', 'error': 'タイムアウト', 'prices': {}},
+    {'scraped_at': '2025-11-05T09:00:10', 'url': 'https://example.jp/c', 'urls': ['https://example.jp/c'],
+     'company_name': '新規商事', 'region': '大阪', 'prices': {'ピカ線': '1,760円', '込銅': '1,600円'}},
+]
+
+
+def test_round_trip():
+    """結果の辞書に戻すと元と同じ内容・キーの順序になる"""
+    table = ResultTable.from_results(RESULTS)
+    assert len(table) == 3
+    assert table.price_count == 4
+    assert table.success_count == 2
+    # 同じ材料名は1つのコードを共有
+    assert table.materials == ['ピカ線', '真鍮', '込銅']
+    assert table.material_codes.tolist() == [0, 1, 0, 2]
+    assert table.values.tolist() == [1750, 1080, 1760, 1600]
+    assert table.company_prices(2) == [('ピカ線', '1,760円'), ('込銅', '1,600円')]
+
+    results = table.to_results()
+    assert results == RESULTS
+    assert [list(result) for result in results] == [list(result) for result in RESULTS]
+
+
+def test_resolve_materials_once():
+    """材料名の変換は材料ごとに1回だけ"""
+    table = ResultTable.from_results(RESULTS)
+    calls = []
+
+    def resolver(material):
+        calls.append(material)
+        return resolve_material_name(material)
+
+    assert table.resolve_materials(resolver) == ['ピカ銅', '真鍮', '並銅']
+    table.resolve_materials(resolver)
+    assert calls == ['ピカ線', '真鍮', '込銅']
+
+
+def test_price_texts_from_values():
+    """価格の文字列は数値と共有の書式から作り直し、数値がない価格などのみ元の文字列を保持"""
+    results = RESULTS + [
+        {'company_name': '範囲表記', 'prices': {'ピカ線': '1,470～1,500円', '真鍮': '要相談', '込銅': '1,200.50円',
+                                              'VA線': '{特価}650円'}},
+    ]
+    table = ResultTable.from_results(results)
+    assert table.formats == ['{:,}円/kg', '{:,}円', '{:,}～1,500円', '{{特価}}{}円']
+    # 数値がない価格・数値の書式で戻らない価格（1200.5 → '1,200.50'）のみ元の文字列
+    assert table.raw_texts == {5: '要相談', 6: '1,200.50円'}
+    assert table.format_codes.tolist() == [0, 0, 1, 1, 2, -1, -1, 3]
+    assert table.to_results() == results
+    assert [table.number_text(row) for row in table.price_range(3)] == ['1470', '', '1200.5', '650']
+    assert table.price_value(5) is None and table.price_value(4) == 1470
+    # キーが列だけの結果は企業ごとの辞書を持たない
+    assert sorted(table.extras) == [0, 2]
+    assert table.extra(0, 'timings') == {'parse': 0.1} and table.extra(1, 'reused') is None
+
+
+def test_writers_read_table():
+    """出力処理は結果の辞書のリストに戻さずに表から書き込み、辞書のリストからの出力と同じ内容"""
+    table = ResultTable.from_results(RESULTS)
+    buffer = io.StringIO()
+    write_json_results(table, buffer)
+    assert buffer.getvalue() == json.dumps(RESULTS, ensure_ascii=False, indent=2)
+    buffer = io.StringIO()
+    write_json_results(ResultTable.from_results([]), buffer)
+    assert buffer.getvalue() == '[]'
+
+    with HistoryStore(':memory:', material_resolver=resolve_material_name) as from_table, \
+            HistoryStore(':memory:', material_resolver=resolve_material_name) as from_results:
+        assert from_table.append_table(table) == from_results.append(RESULTS) == 4
+        assert from_table.query() == from_results.query()
+        assert from_table.append_table(table) == 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            mock.patch.object(ResultTable, 'to_results', side_effect=AssertionError('to_results')):
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            for output_format in ('json', 'csv', 'excel', 'history'):
+                save_results(table, output_format=output_format, history_path=os.path.join(tmp_dir, 'history.db'),
+                             runs_dir=tmp_dir)
+            save_to_excel_new_sheet(table, runs_dir=tmp_dir)
+            json_file = next(name for name in os.listdir(tmp_dir) if name.endswith('.json') and name.startswith('price'))
+            with open(json_file, encoding='utf-8') as f:
+                assert json.load(f) == RESULTS
+        finally:
+            os.chdir(cwd)
+
+
+def test_fill_standard_table_from_table():
+    """ResultTableから表形式シートに記入"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_file = os.path.join(tmp_dir, 'table.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.title = '正規の表'
+        for col_idx, header in enumerate(['企業名', 'ピカ銅', '並銅', '真鍮'], 1):
+            ws.cell(row=1, column=col_idx, value=header)
+        ws.cell(row=2, column=1, value='東北キング')
+        wb.save(excel_file)
+
+        assert fill_standard_table(excel_file, ResultTable.from_results(RESULTS), '正規の表')
+
+        ws = load_workbook(excel_file)['正規の表']
+        rows = {row[0]: row[1:] for row in ws.iter_rows(min_row=2, values_only=True)}
+        assert rows['東北キング'] == ('1750', None, '1080')
+        assert rows['新規商事'] == ('1760', '1600', None)
+        assert '取得失敗' not in rows
+
+
+if __name__ == '__main__':
+    test_round_trip()
+    test_resolve_materials_once()
+    test_price_texts_from_values()
+    test_writers_read_table()
+    test_fill_standard_table_from_table()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+実行ごとのExcelファイルと実行インデックス（scrapers/runs.py）のテスト
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from scrapers.runs import (
+    create_run_workbook, index_path, latest_path, latest_run, list_runs, load_latest, rebuild_index,
+    save_run_workbook,
+)
+from scrapers.workbooks import open_workbook
+from scrapers.writers import save_results, save_to_excel_new_sheet
+
+RESULTS = [
+    {'company_name': '東北キング', 'url': 'http://example.com/a', 'region': '宮城',
+     'scraped_at': '2025-11-04T22:02:53', 'prices': {'ピカ線': '1,500円', '1号銅線': '1,400円'}},
+    {'company_name': '東起産業（株）', 'url': 'http://example.com/b', 'region': '東京',
+     'scraped_at': '2025-11-04T22:02:54', 'error': 'タイムアウト', 'prices': {}},
+]
+
+
+def sheet_names(path):
+    with open_workbook(path) as wb:
+        return list(wb.sheetnames)
+
+
+def read_column(path, sheet):
+    """見出し行を除いたA列の値（空のセルは除く）"""
+    with open_workbook(path) as wb:
+        values = [row[0] for row in wb[sheet].iter_rows(min_row=2, max_col=1, values_only=True)]
+    return [value for value in values if value not in (None, '')]
+
+
+def test_one_workbook_per_run():
+    """excel形式は実行ごとに1シートだけのファイルを作り、インデックスの最新を更新"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_results(RESULTS, output_format='excel', runs_dir=tmp_dir)
+        save_results(RESULTS[:1], output_format='excel', runs_dir=tmp_dir)
+
+        runs = list_runs('価格情報', tmp_dir)
+        assert len(runs) == 2
+        assert runs[0]['path'] != runs[1]['path']
+        for run in runs:
+            assert sheet_names(run['path']) == [run['sheet']]
+            assert run['sheet'].startswith('価格情報_')
+
+        latest = latest_run('価格情報', tmp_dir)
+        assert latest['path'] == runs[1]['path']
+        assert latest['companies'] == ['東北キング']
+        assert latest['rows'] == 2
+        # 企業名は最新の実行（latest.json）にのみ記録し、インデックスは実行の数だけ増える
+        assert all('companies' not in run for run in runs)
+        assert read_column(latest['path'], latest['sheet']) == ['東北キング', '東北キング']
+        assert latest_run('テスト', tmp_dir) is None
+
+
+def test_sheet_format():
+    """sheet形式は既定で実行ごとのファイル、ファイルを指定した場合はそのファイルに追加"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_to_excel_new_sheet(RESULTS, runs_dir=tmp_dir)
+        run = latest_run('テスト', tmp_dir)
+        assert run['rows'] == 2
+        assert read_column(run['path'], run['sheet']) == ['東北キング', '東起産業（株）']
+
+        excel_file = os.path.join(tmp_dir, 'プライステスト.xlsx')
+        save_to_excel_new_sheet(RESULTS, excel_file=excel_file, runs_dir=tmp_dir)
+        save_to_excel_new_sheet(RESULTS, excel_file=excel_file, runs_dir=tmp_dir)
+        assert len(sheet_names(excel_file)) == 2
+        assert len(list_runs(runs_dir=tmp_dir)) == 1
+
+
+def test_rebuild_index():
+    """インデックスを削除してもExcelファイルから作り直せる"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_results(RESULTS, output_format='excel', runs_dir=tmp_dir)
+        save_to_excel_new_sheet(RESULTS[:1], runs_dir=tmp_dir)
+        expected = load_latest(tmp_dir)
+
+        os.remove(index_path(tmp_dir))
+        os.remove(latest_path(tmp_dir))
+        assert latest_run('価格情報', tmp_dir) is None
+        rebuilt = rebuild_index(tmp_dir)
+
+        assert len(rebuilt['runs']) == 2
+        latest = load_latest(tmp_dir)
+        assert latest.keys() == expected.keys()
+        for kind, entry in expected.items():
+            assert latest[kind]['file'] == entry['file']
+            assert latest[kind]['companies'] == entry['companies']
+            # 行数は空のセルを除いて数える
+            assert latest[kind]['rows'] == entry['rows']
+        assert Path(index_path(tmp_dir)).exists()
+
+        # A列が空の行（備考だけの行など）は行数に含めない
+        wb, ws = create_run_workbook('確認', '20251105_090000')
+        for row in (['企業名'], ['東北キング'], [None, '備考'], ['東北キング'], [None]):
+            ws.append(row)
+        save_run_workbook(wb, '確認', '20251105_090000', [], 0, tmp_dir)
+        rebuild_index(tmp_dir)
+        assert latest_run('確認', tmp_dir)['rows'] == 2
+        assert latest_run('確認', tmp_dir)['companies'] == ['東北キング']
+
+
+def test_concurrent_runs():
+    """同時に保存しても実行の記録が失われず、ロックファイルは残らない"""
+    def save(number):
+        wb, ws = create_run_workbook('価格情報', '20251104_220253')
+        ws.append(['企業名'])
+        ws.append([f'企業{number}'])
+        return save_run_workbook(wb, '価格情報', '20251104_220253', [f'企業{number}'], 1, tmp_dir)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            saved = list(executor.map(save, range(16)))
+
+        runs = list_runs('価格情報', tmp_dir)
+        assert len(runs) == 16
+        assert len({run['path'] for run in saved}) == 16
+        assert sorted(run['file'] for run in runs) == sorted(run['path'].name for run in saved)
+        assert latest_run('価格情報', tmp_dir)['companies'][0].startswith('企業')
+        assert sorted(os.listdir(tmp_dir)) == sorted(['index.json', 'latest.json'] + [run['file'] for run in runs])
+
+
+if __name__ == '__main__':
+    test_one_workbook_per_run()
+    test_sheet_format()
+    test_rebuild_index()
+    test_concurrent_runs()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSSセレクタによる宣言的な価格抽出（scrapers/selector_extractor.py）のテスト
+sites.yamlのextractorだけで価格を取得できること、抽出方法が一度だけコンパイルされること、
+設定の誤りが検出されることを確認
+"""
+
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from scrapers import Category2Scraper
+from scrapers.selector_extractor import BUILTIN_SPECS, compile_spec, extract_with_spec, validate_spec
+
+SAMPLES_DIR = Path(__file__).resolve().parent / 'html_samples'
+
+CARD_PAGE = """<html><body>
+<div class="header"><p class="price">お電話で 0120-000-000</p></div>
+<section id="kaitori">
+<div class="card"><h3>ピカ銅<small>1号</small></h3><p class="price">買取価格：1,750<em>円/kg</em></p></div>
+<div class="card"><h3>並銅</h3><p class="price">買取価格：1,500～1,600<em>円/kg</em></p></div>
+<div class="card"><h3>並銅</h3><p class="price">買取価格：1,550<em>円/kg</em></p></div>
+<div class="card"><h3>真鍮</h3><p class="price">お問い合わせください</p><p class="price">980円</p></div>
+<div class="card"><p class="price">100円</p></div>
+</section></body></html>"""
+
+CARD_SPEC = {
+    'container': '#kaitori',
+    'item': 'div.card',
+    'name': 'h3',
+    'name_detail': 'small',
+    'price': 'p.price',
+    'unit': 'em',
+    'strip': r'買取価格[：:]?',
+    'range': True,
+    'duplicates': 'max',
+}
+
+
+def test_extract_with_spec():
+    """抽出方法の設定だけで価格を取得できる（範囲外の要素・材料名がない品目は対象外）"""
+    soup = BeautifulSoup(CARD_PAGE, 'html.parser')
+    prices = extract_with_spec(soup, CARD_SPEC)
+    assert prices == {
+        'ピカ銅1号 (1号)': '1,750円/kg',
+        '並銅': '1600円/kg',
+        '真鍮': '980円',
+    }, prices
+
+    # 抽出してもページの要素は変更しない
+    assert soup.find('em').get_text() == '円/kg'
+
+
+def test_compiled_once_and_validation():
+    """同じ内容の抽出方法は一度だけコンパイルし、設定の誤りは検出する"""
+    assert compile_spec(CARD_SPEC) is compile_spec(dict(CARD_SPEC))
+    assert validate_spec(CARD_SPEC) == []
+
+    for spec in BUILTIN_SPECS.values():
+        assert validate_spec(spec) == []
+
+    errors = validate_spec({'item': 'div..card', 'price': 'p.price', 'colour': 'red'})
+    assert any('nameがありません' in error for error in errors)
+    assert any('colour' in error for error in errors)
+    errors = validate_spec({'item': 'div..card', 'name': 'h3', 'price': 'p.price'})
+    assert any('itemのセレクタが不正です' in error for error in errors)
+    assert validate_spec('kousyo_box') == ['extractorは辞書で指定してください']
+
+    # 誤りのある抽出方法は空の結果
+    soup = BeautifulSoup(CARD_PAGE, 'html.parser')
+    assert extract_with_spec(soup, {'item': 'div..card', 'name': 'h3', 'price': 'p.price'}) == {}
+
+
+def test_scraper_uses_site_extractor():
+    """sites.yamlのextractorがextractor_typeより優先され、同じ抽出方法なら同じ結果"""
+    html = (SAMPLES_DIR / '鴻祥貿易株式会社.html').read_text(encoding='utf-8')
+    soup = BeautifulSoup(html, 'html.parser')
+
+    builtin = Category2Scraper({'name': '鴻祥貿易株式会社', 'extractor_type': 'kousyo_box'}, delay=0)
+    expected = builtin.extract_prices(soup)
+    assert len(expected) > 10
+
+    declared = Category2Scraper({
+        'name': '鴻祥貿易株式会社',
+        'extractor_type': 'auto',
+        'extractor': {'item': 'div.box', 'name': 'p.item', 'price': 'p.price', 'unit': 'small'},
+    }, delay=0)
+    assert declared.extract_prices(soup) == expected
+
+
+if __name__ == '__main__':
+    test_extract_with_spec()
+    test_compiled_once_and_validation()
+    test_scraper_uses_site_extractor()
+    print("\nテスト完了!")
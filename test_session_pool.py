@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共有セッション（scrapers/session_pool.py）のテスト
+同じホストのスクレイパー間でセッション・接続プールが共有されるか確認
+"""
+
+import io
+import os
+import tempfile
+from unittest import mock
+
+import requests
+
+from scrapers import Category2Scraper, cli
+from scrapers.session_pool import get_session, configure_pool, reset_pool
+
+
+def test_session_shared_per_host():
+    """同じホストは同じセッション、別ホストは別セッション"""
+    reset_pool()
+    a = get_session('https://example.jp/kaitori/a.html')
+    b = get_session('https://EXAMPLE.jp/kaitori/b.html')
+    c = get_session('https://example.com/')
+    assert a is b
+    assert a is not c
+    assert get_session('example.jp') is a
+    assert 'Mozilla' in a.headers['User-Agent']
+
+
+def test_failed_responses_closed():
+    """リトライする一時的なHTTPエラーの応答も閉じて接続をプールに戻し、同じホストのセッションを共有"""
+    reset_pool()
+    branches = [
+        Category2Scraper({'name': f'支店{i}', 'price_url': f'https://example.jp/shop{i}/price.html'}, delay=0)
+        for i in range(2)
+    ]
+    responses = []
+
+    def respond(session, method, url, **kwargs):
+        assert session is get_session('https://example.jp/')
+        response = requests.Response()
+        response.status_code = 503 if len(responses) % 3 < 2 else 200
+        response.url = url
+        response.raw = io.BytesIO('<html><body>価格</body></html>'.encode('utf-8'))
+        response.close = mock.Mock()
+        responses.append(response)
+        return response
+
+    with mock.patch('requests.Session.request', autospec=True, side_effect=respond), \
+            mock.patch('scrapers.resilience.backoff_delay', return_value=0):
+        for scraper in branches:
+            assert scraper.fetch_html(scraper.site_config['price_url']) is not None
+
+    # 503 → 503 → 200 を2回
+    assert [response.status_code for response in responses] == [503, 503, 200] * 2
+    assert all(response.close.called for response in responses)
+
+
+def test_configure_pool():
+    """設定変更でアダプタのプールサイズ・リトライ回数が反映される"""
+    configure_pool(pool_maxsize=20, retries=1, backoff_factor=0)
+    adapter = get_session('https://example.jp/').get_adapter('https://example.jp/')
+    assert adapter._pool_maxsize == 20
+    assert adapter.max_retries.total == 1
+
+    try:
+        configure_pool(unknown_option=1)
+    except ValueError:
+        pass
+    else:
+        assert False, 'ValueErrorが発生しませんでした'
+    finally:
+        reset_pool()
+
+
+def test_cli_pool_options():
+    """python -m scrapers の --pool-maxsize・--http-retries で設定を変更"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, 'sites.yaml'), 'w', encoding='utf-8') as f:
+            f.write("sites:\n- name: 東北キング\n  category: 2\n  price_url: http://127.0.0.1:9/a.html\n")
+        try:
+            assert cli.main(['full', '--dry-run', '--config-dir', tmp_dir, '--pool-maxsize', '4',
+                             '--http-retries', '2']) == 0
+            adapter = get_session('https://example.jp/').get_adapter('https://example.jp/')
+            assert adapter._pool_maxsize == 4
+            assert adapter.max_retries.total == 2
+        finally:
+            reset_pool()
+
+
+if __name__ == '__main__':
+    test_session_shared_per_host()
+    test_failed_responses_closed()
+    test_configure_pool()
+    test_cli_pool_options()
+    print("\nテスト完了!")
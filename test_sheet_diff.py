@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表形式シートへの差分記入（scrapers/sheet_diff.py）のテスト
+変わったセルだけを書き込み、変更の一覧（企業・材料・旧値 → 新値）を返すことを確認
+"""
+
+import csv
+import os
+import tempfile
+
+from openpyxl import Workbook, load_workbook
+
+from scrapers.sheet_diff import SheetDiff, format_changes, same_value, write_changes_csv
+from scrapers.standard_table import fill_output_tables, fill_standard_table
+
+RESULTS = [
+    {'company_name': '東北キング', 'prices': {'ピカ線': '1,750円/kg', '真鍮': '1,080円/kg'}},
+    {'company_name': '新規商事', 'prices': {'込銅': '1,600円'}},
+]
+
+
+def _create_table(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = '正規の表'
+    for col_idx, header in enumerate(['企業名', 'ピカ銅', '並銅', '真鍮'], 1):
+        ws.cell(row=1, column=col_idx, value=header)
+    ws.append(['東北キング', 1740, None, '1080'])
+    ws.append(['他社', 1700, 1500, 1000])
+    wb.save(path)
+
+
+def test_sheet_diff():
+    """同じ値は書き込まず、同じセルへの複数回の書き込みは最初の旧値と最後の新値"""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['', 'ピカ銅'])
+    ws.append(['東北キング', 1740])
+    diff = SheetDiff(ws, 'table.xlsx')
+
+    assert not diff.write(2, 2, '1740', company='東北キング', material='ピカ銅')
+    assert not diff.modified
+    assert diff.write(2, 2, '1760', company='東北キング', material='ピカ銅')
+    assert diff.write(2, 2, '1750', company='東北キング', material='ピカ銅')
+    changes = diff.changes()
+    assert len(changes) == 1
+    assert (changes[0]['old'], changes[0]['new'], changes[0]['delta']) == (1740, '1750', 10)
+    assert format_changes(changes)[1].strip() == '東北キング ピカ銅: 1740 → 1750（+10）'
+
+    # 元の値に戻した場合は変更なし
+    diff.write(2, 2, '1740', company='東北キング', material='ピカ銅')
+    assert diff.changes() == []
+
+    # 型・書式が異なる数値は同じ値（小数のセル・カンマ区切りの文字列）
+    ws.append(['東起産業（株）', 1750.0, '1,600'])
+    assert not diff.write(3, 2, '1750', company='東起産業（株）', material='ピカ銅')
+    assert not diff.write(3, 3, 1600, company='東起産業（株）', material='並銅')
+    assert diff.changes() == []
+    assert same_value(1750.0, '1750') and same_value('1,750', 1750) and same_value(' 1750 ', 1750.0)
+    assert not same_value(1750, '1751') and not same_value('1750円', '1750')
+
+
+def test_fill_standard_table_changes():
+    """変わった価格だけを記入して変更の一覧を返し、変更がなければ保存しない"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_file = os.path.join(tmp_dir, 'table.xlsx')
+        _create_table(excel_file)
+
+        changes = []
+        assert fill_standard_table(excel_file, RESULTS, '正規の表', changes)
+        report = {(change['company'], change['material']): (change['old'], change['new']) for change in changes}
+        assert report == {
+            ('東北キング', 'ピカ銅'): (1740, '1750'),
+            ('新規商事', '並銅'): (None, '1600'),
+        }
+
+        ws = load_workbook(excel_file)['正規の表']
+        # 書き込んだセルと追加した行だけに罫線を設定
+        assert ws.cell(row=2, column=2).border.left.style == 'thin'
+        assert ws.cell(row=4, column=4).border.left.style == 'thin'
+        assert ws.cell(row=2, column=4).border.left.style is None
+        assert ws.cell(row=3, column=2).border.left.style is None
+
+        mtime = os.stat(excel_file).st_mtime_ns
+        changes = []
+        assert fill_standard_table(excel_file, RESULTS, '正規の表', changes)
+        assert changes == []
+        assert os.stat(excel_file).st_mtime_ns == mtime
+
+        csv_path = os.path.join(tmp_dir, 'changes.csv')
+        assert write_changes_csv([], csv_path) == 0
+        with open(csv_path, encoding='utf-8') as f:
+            assert next(csv.reader(f))[:4] == ['file', 'sheet', 'company', 'material']
+
+
+def test_fill_output_tables_changes():
+    """output_tables.yamlの有効なシートだけに記入し、変更はすべてのシートの分をまとめて返す"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        first = os.path.join(tmp_dir, 'first.xlsx')
+        second = os.path.join(tmp_dir, 'second.xlsx')
+        _create_table(first)
+        _create_table(second)
+        output_tables = [
+            {'excel_file': first, 'sheet_name': '正規の表'},
+            {'excel_file': second, 'sheet_name': '正規の表', 'enabled': False},
+            {'excel_file': second, 'sheet_name': ''},
+        ]
+
+        changes = []
+        assert fill_output_tables(RESULTS[:1], output_tables, changes) == 1
+        assert [(change['material'], change['old'], change['new']) for change in changes] == [('ピカ銅', 1740, '1750')]
+        assert load_workbook(second)['正規の表'].cell(row=2, column=2).value == 1740
+
+        changes = []
+        assert fill_output_tables(RESULTS[:1], output_tables, changes) == 1
+        assert changes == []
+
+
+if __name__ == '__main__':
+    test_sheet_diff()
+    test_fill_standard_table_changes()
+    test_fill_output_tables_changes()
+    print("✓ すべてのテストが成功しました")
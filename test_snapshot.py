@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+設定ファイルのバイナリスナップショット（scrapers/snapshot.py）のテスト
+スナップショットからの読み込み、元ファイルの変更・バージョン違いによる作り直しを確認
+"""
+
+import os
+import pickle
+import tempfile
+from unittest import mock
+
+from scrapers import snapshot
+from scrapers.config import clear_config_cache, config_errors, load_sites
+from scrapers.snapshot import SNAPSHOT_VERSION, build_snapshot, check_snapshot, clear_snapshot_cache, snapshot_path
+
+SITES_YAML = """sites:
+- name: 東北キング
+  category: 2
+  price_url: https://example.jp/price.html
+- name: URLなし商事
+  category: 2
+"""
+
+
+def _write(path, text, mtime):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(path, (mtime, mtime))
+
+
+def _reset():
+    clear_config_cache()
+    clear_snapshot_cache()
+
+
+def test_load_from_snapshot():
+    """2回目以降のプロセスではYAMLを解析せずにスナップショットから読み込む"""
+    _reset()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(path, SITES_YAML, mtime=1_000_000)
+        sites = load_sites(path)
+        assert os.path.exists(snapshot_path(tmp_dir))
+
+        _reset()
+        with mock.patch('scrapers.config._parse_raw', side_effect=AssertionError('YAMLを解析しました')):
+            cached = load_sites(path)
+            # 検証結果もスナップショットに保存される
+            assert len(config_errors(path)) == 1
+        assert cached == sites
+        assert cached[0]['name'] == '東北キング'
+
+
+def test_rebuild_when_source_changes():
+    """YAMLを編集するとハッシュが一致しなくなり、解析し直してスナップショットを更新"""
+    _reset()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(path, SITES_YAML, mtime=1_000_000)
+        load_sites(path)
+
+        _write(path, SITES_YAML.replace('東北キング', '東北キング本社'), mtime=1_000_100)
+        _reset()
+        assert load_sites(path)[0]['name'] == '東北キング本社'
+        assert check_snapshot(tmp_dir) == []
+
+        # 更新時刻が同じでも内容が変わっていれば作り直す
+        _write(path, SITES_YAML.replace('東北キング', '東北キング支店'), mtime=1_000_100)
+        assert check_snapshot(tmp_dir) == [path]
+        _reset()
+        assert load_sites(path)[0]['name'] == '東北キング支店'
+
+
+def test_version_mismatch_and_broken_snapshot():
+    """バージョンが異なる・壊れたスナップショットは無視して作り直す"""
+    _reset()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(path, SITES_YAML, mtime=1_000_000)
+        digest = snapshot.source_digest(open(path, 'rb').read())
+        stale = {'version': SNAPSHOT_VERSION - 1,
+                 'configs': {'sites.yaml': (digest, ({'sites': ()}, []))}}
+        with open(snapshot_path(tmp_dir), 'wb') as f:
+            pickle.dump(stale, f)
+        assert load_sites(path)[0]['name'] == '東北キング'
+        with open(snapshot_path(tmp_dir), 'rb') as f:
+            assert pickle.load(f)['version'] == SNAPSHOT_VERSION
+
+        with open(snapshot_path(tmp_dir), 'wb') as f:
+            f.write(b'broken')
+        _reset()
+        assert load_sites(path)[0]['name'] == '東北キング'
+
+
+def test_build_snapshot():
+    """デプロイ時に作り直したスナップショットは元ファイルと一致し、最初のプロセスから解析しない"""
+    _reset()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sites.yaml')
+        _write(path, SITES_YAML, mtime=1_000_000)
+        assert check_snapshot(tmp_dir) == [path]
+
+        assert build_snapshot(tmp_dir) == snapshot_path(tmp_dir)
+        assert check_snapshot(tmp_dir) == []
+
+        _reset()
+        with mock.patch('scrapers.config._parse_raw', side_effect=AssertionError('YAMLを解析しました')):
+            assert load_sites(path)[0]['name'] == '東北キング'
+
+
+if __name__ == '__main__':
+    test_load_from_snapshot()
+    test_rebuild_when_source_changes()
+    test_version_mismatch_and_broken_snapshot()
+    test_build_snapshot()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成ページ生成ツールのテスト
+生成したページから各抽出メソッドが全品目を取得できるか確認
+"""
+
+from bs4 import BeautifulSoup
+from scrapers import Category2Scraper
+from utils.synthetic_pages import LAYOUTS, LAYOUT_EXTRACTORS, build_page, expected_prices, item_name
+
+
+def test_item_names_are_unique():
+    """品目名が一意で、数字を含まないこと"""
+    names = [item_name(i) for i in range(2000)]
+    assert len(set(names)) == len(names)
+    assert not any(char.isdigit() for name in names for char in name)
+
+
+def test_dedicated_extractors():
+    """各レイアウトの専用抽出メソッドが全品目を取得できること"""
+    scraper = Category2Scraper({'name': '合成ページ', 'extractor_type': 'auto'}, delay=0)
+    item_count = 60
+
+    for layout in LAYOUTS:
+        for depth in (0, 8):
+            html = build_page(layout, item_count, depth)
+            soup = BeautifulSoup(html, 'html.parser')
+            # 各レイアウトの最初の抽出メソッドが専用ロジック
+            method_name = LAYOUT_EXTRACTORS[layout][0]
+            prices = getattr(scraper, method_name)(soup)
+
+            expected = expected_prices(item_count)
+            missing = [name for name in expected if not any(name in material for material in prices)]
+            print(f"  {layout} (深さ{depth}) {method_name}: {len(prices)}件")
+            assert not missing, f"{layout}: 取得できなかった品目 {missing[:5]}"
+
+
+def test_unknown_layout():
+    """未対応のレイアウトはValueError"""
+    try:
+        build_page('unknown', 10)
+    except ValueError:
+        return
+    assert False, 'ValueErrorが発生しませんでした'
+
+
+if __name__ == '__main__':
+    test_item_names_are_unique()
+    test_dedicated_extractors()
+    test_unknown_layout()
+    print("\nテスト完了!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+処理時間計測（scrapers/timing.py）のテスト
+入れ子・繰り返しのフェーズの記録、結果の集計と表示、Chromeトレース形式の出力を確認
+（時刻はモックで固定）
+"""
+
+import json
+import os
+import tempfile
+from unittest import mock
+
+from scrapers import timing
+from scrapers.timing import PhaseTimer, aggregate_timings, export_chrome_trace, format_timing_summary
+
+
+def _clock(*times):
+    """time.perf_counterが順に返す時刻を固定したモック"""
+    return mock.patch.object(timing.time, 'perf_counter', side_effect=list(times))
+
+
+def test_nested_and_repeated_phases():
+    """入れ子のフェーズはそれぞれ記録し、同じフェーズの繰り返しは合計する"""
+    timer = PhaseTimer('東北キング')
+    with _clock(10.0, 10.5, 11.0, 11.0, 12.0, 12.0, 13.0, 13.25):
+        with timer.phase('download', url='http://example.jp/a'):
+            with timer.phase('parse'):
+                pass
+            with timer.phase('parse'):
+                pass
+        with timer.phase('extract'):
+            pass
+
+    # 内側のフェーズが先に終わるため先に記録される
+    assert [event['name'] for event in timer.events] == ['parse', 'parse', 'download', 'extract']
+    assert timer.events[2] == {'name': 'download', 'start': 10.0, 'duration': 2.0,
+                               'args': {'url': 'http://example.jp/a'}}
+    assert timer.totals == {'parse': 1.5, 'download': 2.0, 'extract': 0.25}
+
+    # 例外が発生しても記録する
+    with _clock(20.0, 20.125):
+        try:
+            with timer.phase('extract'):
+                raise ValueError('抽出エラー')
+        except ValueError:
+            pass
+    assert timer.summary() == {'parse': 1.5, 'download': 2.0, 'extract': 0.375}
+
+    # 計測済みの時間の追加（開始時刻の省略時は現在時刻から逆算）
+    with _clock(30.0):
+        timer.add('wait', 2.0)
+    assert timer.events[-1]['start'] == 28.0
+    assert timer.summary()['wait'] == 2.0
+
+    timer.reset()
+    assert timer.totals == {} and timer.events == []
+
+
+def test_aggregate_and_format():
+    """フェーズごとの合計・平均・最大・件数を集計し、表示はPHASE_ORDERの順"""
+    results = [
+        {'timings': {'extract': 0.5, 'connect': 1.0, 'custom': 0.5}},
+        {'timings': {'connect': 3.0, 'extract': 1.5}},
+        {'timings': {}},
+        {'error': 'タイムアウト'},
+    ]
+    aggregated = aggregate_timings(results)
+    assert list(aggregated) == ['connect', 'extract', 'custom']
+    assert aggregated['connect'] == {'total': 4.0, 'max': 3.0, 'count': 2, 'mean': 2.0}
+    assert aggregated['extract'] == {'total': 2.0, 'max': 1.5, 'count': 2, 'mean': 1.0}
+    assert aggregated['custom'] == {'total': 0.5, 'max': 0.5, 'count': 1, 'mean': 0.5}
+    assert aggregate_timings([]) == {}
+
+    lines = format_timing_summary(aggregated)
+    assert lines == [
+        "  connect  : 合計 4.00s / 平均 2.000s / 最大 3.000s (61.5%)",
+        "  extract  : 合計 2.00s / 平均 1.000s / 最大 1.500s (30.8%)",
+        "  custom   : 合計 0.50s / 平均 0.500s / 最大 0.500s (7.7%)",
+    ]
+    assert format_timing_summary({}) == []
+
+
+def test_export_chrome_trace():
+    """1タイマー = 1スレッド（メタデータ + 完了イベント）、時刻はマイクロ秒"""
+    first = PhaseTimer('東北キング')
+    first.add('connect', 0.25, start=timing._EPOCH + 1.0, url='http://example.jp/a')
+    first.add('parse', 0.0015, start=timing._EPOCH + 1.25)
+    second = PhaseTimer()
+    second.add('download', 2.0, start=timing._EPOCH)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'trace.json')
+        assert export_chrome_trace([first, second], path) == 5
+        with open(path, encoding='utf-8') as f:
+            trace = json.load(f)
+
+    assert trace['displayTimeUnit'] == 'ms'
+    events = trace['traceEvents']
+    assert events[0] == {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': '東北キング'}}
+    assert events[1] == {'name': 'connect', 'cat': 'scrape', 'ph': 'X', 'ts': 1_000_000, 'dur': 250_000,
+                         'pid': 1, 'tid': 1, 'args': {'url': 'http://example.jp/a'}}
+    assert (events[2]['ts'], events[2]['dur']) == (1_250_000, 1500)
+    # ラベルがないタイマーはスレッド番号から表示名を付ける
+    assert events[3]['args'] == {'name': 'scraper-2'}
+    assert (events[4]['ph'], events[4]['ts'], events[4]['dur'], events[4]['tid']) == ('X', 0, 2_000_000, 2)
+    assert all(set(event) >= {'name', 'ph', 'pid', 'tid'} for event in events)
+
+
+if __name__ == '__main__':
+    test_nested_and_repeated_phases()
+    test_aggregate_and_format()
+    test_export_chrome_trace()
+    print("✓ すべてのテストが成功しました")
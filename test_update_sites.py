@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSVからのsites.yamlの更新（update_sites_from_csv.py）のテスト
+索引による統合（追加・更新・変更なし）と、変更したサイトだけの書き直しを確認
+"""
+
+import os
+import tempfile
+import time
+
+import yaml
+
+from update_sites_from_csv import (
+    is_company_exists, load_existing_sites, merge_companies, read_csv_companies, write_sites_yaml,
+)
+
+SITES_YAML = """sites:
+- category: 2
+  extractor_type: auto
+  name: 東北キング
+  price_url: https://touhoku.example.jp/price
+  region: 宮城
+- category: 2
+  extractor_type: auto
+  name: 株式会社 大垣金属
+  price_url: https://oogaki.example.jp/a
+  price_urls:
+  # 銅ページを最初に処理
+  - https://oogaki.example.jp/a
+  - https://oogaki.example.jp/b
+  region: 岐阜
+- category: 2
+  extractor_type: touki_dl
+  name: 東起産業（株）
+  price_url: https://touki.example.jp/
+  region: 東京
+"""
+
+CSV_COMPANIES = [
+    {'name': '東北キング', 'region': '宮城', 'url': '', 'price_urls': ['https://touhoku.example.jp/price']},
+    {'name': '株式会社　大垣金属', 'region': '岐阜県', 'url': '', 'price_urls': ['https://oogaki.example.jp/c']},
+    {'name': '文字化け産業', 'region': '東京', 'url': '', 'price_urls': ['https://touki.example.jp/']},
+    {'name': '新規商事', 'region': '大阪', 'url': '', 'price_urls': ['https://new.example.jp/1', 'https://new.example.jp/2']},
+    {'name': '新規商事', 'region': '大阪', 'url': '', 'price_urls': []},
+]
+
+
+def test_merge_companies():
+    """追加・更新・変更なしに分類し、既存の順序を維持（企業名が一致しない場合は価格ページURLで照合）"""
+    sites = yaml.safe_load(SITES_YAML)['sites']
+    merged = merge_companies(sites, CSV_COMPANIES)
+
+    assert [company['name'] for company in merged['new']] == ['新規商事']
+    assert [item['name'] for item in merged['updated']] == ['株式会社　大垣金属']
+    assert merged['unchanged'] == ['東北キング', '文字化け産業']
+    assert merged['duplicates'] == ['新規商事']
+    assert merged['changed_indexes'] == {1}
+
+    assert [site['name'] for site in merged['sites']] == ['東北キング', '株式会社 大垣金属', '東起産業（株）', '新規商事']
+    assert merged['sites'][1]['price_url'] == 'https://oogaki.example.jp/c'
+    assert 'price_urls' not in merged['sites'][1]
+    assert merged['sites'][1]['region'] == '岐阜県'
+    assert merged['sites'][3]['price_urls'] == ['https://new.example.jp/1', 'https://new.example.jp/2']
+    # 既存のサイト設定は変更しない
+    assert sites[1]['price_urls'] == ['https://oogaki.example.jp/a', 'https://oogaki.example.jp/b']
+    assert merged['sites'][0] is sites[0]
+
+    assert is_company_exists('東起産業', sites)
+    assert not is_company_exists('存在しない商会', sites)
+
+
+def test_write_only_changed_sites():
+    """変更のないサイトは元のテキスト（コメントを含む）のまま、更新したサイトだけを書き直す"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yaml_path = os.path.join(tmp_dir, 'sites.yaml')
+        with open(yaml_path, 'w', encoding='utf-8') as f:
+            f.write(SITES_YAML)
+        sites = load_existing_sites(yaml_path)
+
+        # 変更がなければ元のファイルと同じ
+        write_sites_yaml(yaml_path, merge_companies(sites, CSV_COMPANIES[:1]), sites)
+        with open(yaml_path, encoding='utf-8') as f:
+            assert f.read() == SITES_YAML
+
+        write_sites_yaml(yaml_path, merge_companies(sites, CSV_COMPANIES[:2]), sites)
+        with open(yaml_path, encoding='utf-8') as f:
+            text = f.read()
+        assert '# 銅ページを最初に処理' not in text
+        assert text.startswith(SITES_YAML.split('- category: 2\n  extractor_type: auto\n  name: 株式会社')[0])
+        assert text.endswith(SITES_YAML[SITES_YAML.index('- category: 2\n  extractor_type: touki_dl'):])
+
+        # 書き直したファイルにもう一度統合すると、大垣金属は変更なしで新規企業だけを末尾に追加
+        sites = load_existing_sites(yaml_path)
+        merged = merge_companies(sites, CSV_COMPANIES)
+        assert merged['changed_indexes'] == set()
+        write_sites_yaml(yaml_path, merged, sites)
+        with open(yaml_path, encoding='utf-8') as f:
+            assert f.read().startswith(text)
+        assert load_existing_sites(yaml_path) == merged['sites']
+        assert load_existing_sites(yaml_path)[-1]['name'] == '新規商事'
+
+
+def test_read_csv_columns():
+    """列名は1回だけ照合し、文字化けした列名・列の多い行にも対応"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'companies.csv')
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write('名称,地�,URL,価格ペ�ジURL�,価格ペ�ジURL2,\n')
+            f.write('東北キング,宮城,https://touhoku.example.jp/,https://touhoku.example.jp/price,,\n')
+            f.write('新規商事,大阪,https://new.example.jp/,https://new.example.jp/2,https://new.example.jp/1,,余分な列\n')
+            f.write(',東京,,,,\n')
+        companies = read_csv_companies(csv_path)
+    assert [company['name'] for company in companies] == ['東北キング', '新規商事']
+    assert companies[0]['region'] == '宮城'
+    assert companies[0]['url'] == 'https://touhoku.example.jp/'
+    assert companies[1]['price_urls'] == ['https://new.example.jp/2', 'https://new.example.jp/1']
+
+
+def test_read_csv_sniffed_encoding():
+    """Shift_JIS（cp932）のCSVも文字コードを判定して1回で読み込む"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'companies.csv')
+        with open(csv_path, 'w', encoding='cp932', newline='') as f:
+            f.write('名称,地域,URL,価格ページURL\r\n')
+            f.write('東起産業（株）,東京,https://touki.example.jp/,https://touki.example.jp/price\r\n')
+            f.write('髙橋金属,"大阪\r\n",,https://takahashi.example.jp/\r\n')
+        companies = read_csv_companies(csv_path)
+    assert [company['name'] for company in companies] == ['東起産業（株）', '髙橋金属']
+    assert companies[0]['price_urls'] == ['https://touki.example.jp/price']
+    assert companies[1]['region'] == '大阪'
+
+
+def test_merge_scales():
+    """数千社のCSVでも索引により短時間で統合"""
+    sites = [{'name': f'既存商事{i}', 'price_url': f'https://site{i}.example.jp/'} for i in range(3000)]
+    companies = [{'name': f'既存商事{i}', 'region': '', 'url': '', 'price_urls': [f'https://site{i}.example.jp/']}
+                 for i in range(3000)]
+    companies += [{'name': f'新規商事{i}', 'region': '', 'url': '', 'price_urls': []} for i in range(3000)]
+
+    start = time.perf_counter()
+    merged = merge_companies(sites, companies)
+    elapsed = time.perf_counter() - start
+
+    assert len(merged['unchanged']) == 3000
+    assert len(merged['new']) == 3000
+    assert elapsed < 2.0, f"{elapsed:.2f}秒"
+
+
+if __name__ == '__main__':
+    test_merge_companies()
+    test_write_only_changed_sites()
+    test_read_csv_columns()
+    test_read_csv_sniffed_encoding()
+    test_merge_scales()
+    print("✓ すべてのテストが成功しました")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+過去の取得結果の読み込み（scrapers/workbooks.py）のテスト
+"""
+
+import os
+import tempfile
+
+from openpyxl import Workbook
+
+from scrapers.workbooks import latest_companies, open_workbook
+
+HEADERS = ['会社名', 'URL', '地域', '材料名', '価格', '取得日時', 'エラー']
+
+
+def _create_workbook(path, sheet_count=30):
+    """古い価格情報シート・テストシートが多数あるExcelファイルを作成"""
+    wb = Workbook()
+    wb.remove(wb.active)
+    for i in range(sheet_count):
+        ws = wb.create_sheet(f'テスト_{i:03d}')
+        ws.append(['', '銅', '真鍮'])
+        for row in range(50):
+            ws.append([f'会社{row}', 1000, 800])
+    old = wb.create_sheet('価格情報_20251101_000000')
+    old.append(HEADERS)
+    old.append(['古い会社', 'http://example.com', '東京', '銅', '1000円', '2025-11-01', ''])
+    latest = wb.create_sheet('価格情報_20251104_220253')
+    latest.append(HEADERS)
+    latest.append(['東北キング', 'http://example.com/a', '宮城', 'ピカ線', '1,500円', '2025-11-04', ''])
+    latest.append(['東北キング', 'http://example.com/a', '宮城', '1号銅線', '1,400円', '2025-11-04', ''])
+    latest.append([None])
+    latest.append(['東起産業（株）', 'http://example.com/b', '東京', '', '', '2025-11-04', 'タイムアウト'])
+    wb.create_sheet('18社価格情報_20251104')
+    wb.save(path)
+
+
+def test_latest_companies():
+    """最後に追加された価格情報シートの企業名（出現順で重複なし、見出し行と空のセルは除く）"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'results.xlsx')
+        _create_workbook(path)
+        assert latest_companies(path) == ['東北キング', '東起産業（株）']
+        assert latest_companies(path, 'テスト_') == [f'会社{row}' for row in range(50)]
+        assert latest_companies(path, '存在しない_') == []
+
+
+def test_open_workbook():
+    """読み取り専用で開き、終了後はファイルを閉じる（Windowsでも削除できる）"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'results.xlsx')
+        _create_workbook(path)
+        with open_workbook(path) as wb:
+            assert len(wb.sheetnames) == 33
+            rows = list(wb['価格情報_20251104_220253'].iter_rows(min_row=2, min_col=4, max_col=5, values_only=True))
+            assert rows[0] == ('ピカ線', '1,500円')
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    test_latest_companies()
+    test_open_workbook()
+    print("✓ すべてのテストが成功しました")
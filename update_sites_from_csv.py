@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import List, Dict
 from datetime import datetime
 
+from scrapers.encoding import sniff_file_encoding
+
 # Excel出力ライブラリのインポート
 try:
     from openpyxl import load_workbook, Workbook
@@ -30,90 +32,103 @@ def clean_url(url: str) -> str:
         return ''
     return url
 
+def get_url_number(key: str) -> int:
+    """価格ページURL列の番号（数字がない場合は1番目と仮定、通常は最初の価格ページURL列）"""
+    numbers = re.findall(r'\d+', key)
+    if numbers:
+        return int(numbers[0])
+    return 1
+
+def resolve_csv_columns(header: List[str]) -> Dict:
+    """
+    CSVのヘッダー行から各項目の列位置を求める（列名の文字化けに対応、読み込みごとに1回だけ）
+    
+    Returns:
+        {'name': 名称の列位置, 'region': 地域の列位置, 'url': URLの候補の列位置のリスト,
+         'price_urls': 価格ページURLの列位置のリスト（番号順）}
+        （見つからない項目はNone）
+    """
+    header = [key or '' for key in header]
+    
+    # 名称を取得（複数の候補を試行）
+    name_col = next((i for i, key in enumerate(header) if '名称' in key or '名' in key), None)
+    # 地域を取得
+    region_col = next((i for i, key in enumerate(header) if '地域' in key or '地' in key), None)
+    # URLを取得（値が「価格」で始まる場合は次の候補）
+    url_cols = [i for i, key in enumerate(header) if key == 'URL' or 'URL' in key.upper()]
+    
+    # 価格ページURL列を特定（文字化けを考慮）
+    # 列名のパターン: '価格ペ�ジURL�', '価格ペ�ジURL2', ... など
+    price_url_cols = [i for i, key in enumerate(header) if '価格' in key]
+    # 番号順にソート（URL1, URL2, ... の順）
+    price_url_cols.sort(key=lambda i: get_url_number(header[i]))
+    
+    return {'name': name_col, 'region': region_col, 'url': url_cols, 'price_urls': price_url_cols}
+
+def _cell(row: List[str], col) -> str:
+    """行の指定した列の値（列が足りない行は空文字）"""
+    if col is None or col >= len(row):
+        return ''
+    return row[col] or ''
+
+def parse_csv_company(row: List[str], columns: Dict):
+    """CSVの1行（列のリスト）から企業情報を取得（名称がない場合はNone）"""
+    name = _cell(row, columns['name']).strip()
+    if not name:
+        return None
+    region = _cell(row, columns['region']).strip()
+    
+    url = ''
+    for col in columns['url']:
+        url_val = clean_url(_cell(row, col))
+        if url_val and not url_val.startswith('価格'):
+            url = url_val
+            break
+    
+    # 価格ページURLを収集
+    price_urls = []
+    for col in columns['price_urls']:
+        price_url = clean_url(_cell(row, col))
+        if price_url and price_url.startswith('http'):
+            # 重複チェック
+            if price_url not in price_urls:
+                price_urls.append(price_url)
+    
+    return {
+        'name': name,
+        'region': region,
+        'url': url,
+        'price_urls': price_urls
+    }
+
+def _iter_csv_companies(csv_path: str, encoding: str, errors: str):
+    """CSVを1行ずつ読み、企業情報を返す（列位置はヘッダー行から1回だけ求める）"""
+    with open(csv_path, 'r', encoding=encoding, errors=errors, newline='') as f:
+        reader = csv.reader(f)
+        columns = resolve_csv_columns(next(reader, []))
+        for row in reader:
+            company = parse_csv_company(row, columns)
+            if company:  # 名前がある場合のみ追加
+                yield company
+
 def read_csv_companies(csv_path: str) -> List[Dict]:
-    """CSVファイルから企業情報を読み込む"""
-    companies = []
-    
-    # エンコーディングを試行
-    encodings = ['utf-8', 'shift_jis', 'cp932', 'utf-8-sig']
-    
-    for encoding in encodings:
-        try:
-            with open(csv_path, 'r', encoding=encoding, errors='replace') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # 列名の候補を試行（文字化け対応）
-                    name = ''
-                    region = ''
-                    url = ''
-                    
-                    # 名称を取得（複数の候補を試行）
-                    for key in row.keys():
-                        if '名称' in key or '名' in key:
-                            name = row.get(key, '').strip()
-                            break
-                    
-                    # 地域を取得
-                    for key in row.keys():
-                        if '地域' in key or '地' in key:
-                            region = row.get(key, '').strip()
-                            break
-                    
-                    # URLを取得
-                    for key in row.keys():
-                        if key == 'URL' or 'URL' in key.upper():
-                            url_val = clean_url(row.get(key, ''))
-                            if url_val and not url_val.startswith('価格'):
-                                url = url_val
-                                break
-                    
-                    # 価格ページURLを収集（列名のパターンを試行）
-                    price_urls = []
-                    all_keys = list(row.keys())
-                    
-                    # 価格ページURL列を特定（文字化けを考慮）
-                    # 列名のパターン: '価格ペ�ジURL�', '価格ペ�ジURL2', ... など
-                    url_patterns = []
-                    for key in all_keys:
-                        # '価格' または 'URL' を含む列を探す
-                        if '価格' in key or ('URL' in key and '価格' in key):
-                            url_patterns.append(key)
-                    
-                    # 番号順にソート（URL1, URL2, ... の順）
-                    def get_url_number(key):
-                        # 数字を含む場合はその数字を返す
-                        import re
-                        numbers = re.findall(r'\d+', key)
-                        if numbers:
-                            return int(numbers[0])
-                        # 数字がない場合は1番目と仮定（通常は最初の価格ページURL列）
-                        return 1
-                    
-                    url_patterns.sort(key=get_url_number)
-                    
-                    # URLを取得
-                    for key in url_patterns:
-                        price_url = clean_url(row.get(key, ''))
-                        if price_url and price_url.startswith('http'):
-                            # 重複チェック
-                            if price_url not in price_urls:
-                                price_urls.append(price_url)
-                    
-                    if name:  # 名前がある場合のみ追加
-                        companies.append({
-                            'name': name,
-                            'region': region,
-                            'url': url,
-                            'price_urls': price_urls
-                        })
-            
-            print(f"✓ CSVファイルを {encoding} エンコーディングで読み込みました: {len(companies)} 社")
-            return companies
-            
-        except Exception as e:
-            print(f"  {encoding} で読み込み失敗: {e}")
-            continue
+    """
+    CSVファイルから企業情報を読み込む
+    文字コードは先頭のバイト列から1回だけ判定し（scrapers.encoding.sniff_file_encoding）、
+    ファイル全体は1回だけ読む
+    """
+    encoding, clean = sniff_file_encoding(csv_path)
+    if not clean:
+        print(f"警告: CSVファイルに {encoding} として不正なバイト列があります（該当箇所は置換文字に置き換えます）")
     
+    try:
+        companies = list(_iter_csv_companies(csv_path, encoding, 'strict' if clean else 'replace'))
+    except UnicodeDecodeError as e:
+        # 判定に使った先頭より後ろに不正なバイト列がある場合
+        print(f"警告: CSVファイルの途中に {encoding} として不正なバイト列があります（置換文字に置き換えて読み直します）: {e}")
+        companies = list(_iter_csv_companies(csv_path, encoding, 'replace'))
+    
+    print(f"✓ CSVファイルを {encoding} エンコーディングで読み込みました: {len(companies)} 社")
     return companies
 
 def load_existing_sites(yaml_path: str) -> List[Dict]:
@@ -139,21 +154,180 @@ def normalize_company_name(name: str) -> str:
     name = re.sub(r'\s+', ' ', name)
     return name
 
-def is_company_exists(company_name: str, existing_sites: List[Dict]) -> bool:
-    """企業が既に登録されているか確認"""
+def site_price_urls(site: Dict) -> List[str]:
+    """サイト設定の価格ページURL（price_urlを先頭に、重複なし）"""
+    urls = list(site.get('price_urls') or [])
+    price_url = site.get('price_url', '')
+    if price_url and price_url not in urls:
+        urls.insert(0, price_url)
+    return urls
+
+def build_site_index(existing_sites: List[Dict]) -> Dict:
+    """
+    既存のサイト設定の索引を作成（正規化した企業名・価格ページURL → sites.yamlでの位置）
+    同じキーが複数ある場合は最初のサイト
+    """
+    names = {}
+    urls = {}
+    normalized_names = []
+    for idx, site in enumerate(existing_sites):
+        normalized = normalize_company_name(site.get('name', ''))
+        normalized_names.append(normalized)
+        if normalized:
+            names.setdefault(normalized, idx)
+        for url in site_price_urls(site):
+            urls.setdefault(url, idx)
+    return {'names': names, 'urls': urls, 'normalized_names': normalized_names}
+
+def find_site(index: Dict, company: Dict):
+    """CSVの企業に対応する既存のサイトの位置（企業名が一致しない場合は価格ページURLで照合、ない場合None）"""
+    idx = index['names'].get(normalize_company_name(company['name']))
+    if idx is not None:
+        return idx
+    for url in company.get('price_urls', []):
+        idx = index['urls'].get(url)
+        if idx is not None:
+            return idx
+    return None
+
+def is_company_exists(company_name: str, existing_sites: List[Dict], index: Dict = None) -> bool:
+    """企業が既に登録されているか確認（完全一致または部分一致、複数回呼ぶ場合はindexを渡す）"""
+    if index is None:
+        index = build_site_index(existing_sites)
     normalized_new = normalize_company_name(company_name)
+    if normalized_new in index['names']:
+        return True
     
-    for site in existing_sites:
-        existing_name = site.get('name', '')
-        normalized_existing = normalize_company_name(existing_name)
+    # 部分一致を確認
+    return any(normalized_new in normalized_existing or normalized_existing in normalized_new
+               for normalized_existing in index['normalized_names'])
+
+def apply_csv_update(site: Dict, company: Dict) -> Dict:
+    """既存のサイト設定にCSVの価格ページURL・地域を反映したコピー"""
+    site = site.copy()
+    price_urls = company.get('price_urls', [])
+    if len(price_urls) == 1:
+        site['price_url'] = price_urls[0]
+        site.pop('price_urls', None)
+    elif len(price_urls) > 1:
+        site['price_url'] = price_urls[0]
+        site['price_urls'] = list(price_urls)
+    
+    # 地域も更新（CSVに含まれている場合）
+    if company.get('region'):
+        site['region'] = company['region']
+    return site
+
+def merge_companies(existing_sites: List[Dict], csv_companies: List[Dict]) -> Dict:
+    """
+    CSVの企業をsites.yamlに統合（索引を1回だけ作成し、1回の走査で追加・更新・変更なしに分類）
+    
+    Returns:
+        {'sites': 統合後のサイト設定（既存のサイトの順序を維持し、新規企業は末尾）,
+         'new': 新規追加する企業, 'updated': 価格ページURLを更新する企業,
+         'unchanged': 変更のない企業名, 'duplicates': CSV内で重複した企業名,
+         'changed_indexes': 更新したサイトの位置}
+    """
+    index = build_site_index(existing_sites)
+    sites = list(existing_sites)
+    new_companies = []
+    updated_companies = []
+    unchanged = []
+    duplicates = []
+    changed_indexes = set()
+    seen = set()
+    
+    for company in csv_companies:
+        normalized = normalize_company_name(company['name'])
+        if normalized in seen:
+            duplicates.append(company['name'])
+            continue
+        seen.add(normalized)
+        
+        idx = find_site(index, company)
+        if idx is None:
+            new_companies.append(company)
+            continue
+        if idx in changed_indexes:
+            duplicates.append(company['name'])
+            continue
         
-        # 完全一致または部分一致を確認
-        if (normalized_new == normalized_existing or 
-            normalized_new in normalized_existing or 
-            normalized_existing in normalized_new):
-            return True
+        # URLが更新されている場合（既存のURLが空、またはURLの集合が異なる）
+        existing_price_urls = site_price_urls(existing_sites[idx])
+        csv_price_urls = company.get('price_urls', [])
+        if csv_price_urls and (not existing_price_urls or set(csv_price_urls) != set(existing_price_urls)):
+            updated_companies.append({
+                'name': company['name'],
+                'existing': existing_sites[idx],
+                'new_urls': csv_price_urls
+            })
+            sites[idx] = apply_csv_update(existing_sites[idx], company)
+            changed_indexes.add(idx)
+        else:
+            unchanged.append(company['name'])
+    
+    sites.extend(create_site_config(company) for company in new_companies)
+    return {
+        'sites': sites,
+        'new': new_companies,
+        'updated': updated_companies,
+        'unchanged': unchanged,
+        'duplicates': duplicates,
+        'changed_indexes': changed_indexes,
+    }
+
+def dump_site(site: Dict) -> str:
+    """サイト設定1件をsites.yamlのリストの要素として出力"""
+    return yaml.dump([site], allow_unicode=True, default_flow_style=False, sort_keys=False)
+
+def split_site_blocks(text: str):
+    """
+    sites.yamlのテキストを「sites:」までの部分とサイトごとの部分に分割
+    サイトは行頭の「- 」で始まり、次のサイトまでのコメントを含む（想定外の形式の場合None）
+    """
+    lines = text.splitlines(keepends=True)
+    for start, line in enumerate(lines):
+        if line.rstrip() == 'sites:':
+            break
+    else:
+        return None
+    
+    header = ''.join(lines[:start + 1])
+    blocks = []
+    for line in lines[start + 1:]:
+        if line.startswith('- '):
+            blocks.append(line)
+        elif blocks and (line.startswith((' ', '#')) or not line.strip()):
+            blocks[-1] += line
+        elif not line.strip() or line.startswith('#'):
+            header += line
+        else:
+            return None
+    if blocks and not blocks[-1].endswith('\n'):
+        blocks[-1] += '\n'
+    return header, blocks
+
+def write_sites_yaml(yaml_path: str, merged: Dict, existing_sites: List[Dict]):
+    """
+    統合結果をsites.yamlに書き込む
+    変更のないサイトは元のテキスト（コメントを含む）をそのまま残し、更新したサイトだけを
+    書き直して新規企業を末尾に追加する（元のファイルが想定外の形式の場合はファイル全体を出力）
+    """
+    text = Path(yaml_path).read_text(encoding='utf-8') if Path(yaml_path).exists() else ''
+    split = split_site_blocks(text) if text else None
+    if split is None or len(split[1]) != len(existing_sites):
+        config = {'sites': merged['sites']}
+        with open(yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        return
     
-    return False
+    header, blocks = split
+    parts = [header]
+    for idx, block in enumerate(blocks):
+        parts.append(dump_site(merged['sites'][idx]) if idx in merged['changed_indexes'] else block)
+    parts.extend(dump_site(site) for site in merged['sites'][len(blocks):])
+    with open(yaml_path, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
 
 def create_site_config(company: Dict) -> Dict:
     """企業情報からサイト設定を作成"""
@@ -223,9 +397,10 @@ def update_excel_companies_sheet(excel_path: str, companies: List[Dict], new_com
         row_idx = 2
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
+        new_names = {nc['name'] for nc in new_companies}
         for company in companies:
             # 新規追加企業かどうかを確認
-            is_new = any(nc['name'] == company['name'] for nc in new_companies)
+            is_new = company['name'] in new_names
             added_time = timestamp if is_new else ''
             
             ws.cell(row=row_idx, column=1, value=company['name']).border = border
@@ -297,52 +472,21 @@ def main():
     
     # 既存のsites.yamlを読み込む
     existing_sites = load_existing_sites(yaml_path)
-    existing_names = [site.get('name', '') for site in existing_sites]
     
     print(f"\n既存の登録企業数: {len(existing_sites)}")
     print(f"CSVファイルの企業数: {len(csv_companies)}")
     
-    # 新しい企業を特定し、既存企業のURLを更新
-    new_companies = []
-    updated_companies = []
-    skipped_companies = []
-    
-    for company in csv_companies:
-        # 既存企業かどうかを確認
-        existing_site = None
-        for site in existing_sites:
-            if normalize_company_name(site.get('name', '')) == normalize_company_name(company['name']):
-                existing_site = site
-                break
-        
-        if existing_site:
-            # 既存企業のURLを更新（URLが空または不足している場合）
-            existing_price_urls = existing_site.get('price_urls', [])
-            existing_price_url = existing_site.get('price_url', '')
-            
-            # 既存のURLを収集
-            if existing_price_url:
-                if existing_price_url not in existing_price_urls:
-                    existing_price_urls.insert(0, existing_price_url)
-            
-            # CSVから取得したURLと比較
-            csv_price_urls = company.get('price_urls', [])
-            
-            # URLが更新されている場合
-            if csv_price_urls and (not existing_price_urls or set(csv_price_urls) != set(existing_price_urls)):
-                updated_companies.append({
-                    'name': company['name'],
-                    'existing': existing_site,
-                    'new_urls': csv_price_urls
-                })
-            else:
-                skipped_companies.append(company['name'])
-        else:
-            new_companies.append(company)
+    # 新しい企業を特定し、既存企業のURLを更新（索引を1回だけ作成して1回の走査で分類）
+    merged = merge_companies(existing_sites, csv_companies)
+    new_companies = merged['new']
+    updated_companies = merged['updated']
+    skipped_companies = merged['unchanged']
     
     print(f"\n新規追加対象: {len(new_companies)} 社")
     print(f"URL更新対象: {len(updated_companies)} 社")
     print(f"変更なし: {len(skipped_companies)} 社")
+    if merged['duplicates']:
+        print(f"CSV内の重複: {len(merged['duplicates'])} 社（最初の行のみ使用）")
     
     if skipped_companies:
         print("\n変更なしの企業:")
@@ -405,51 +549,9 @@ def main():
         shutil.copy2(yaml_path, backup_path)
         print(f"\n既存の設定ファイルをバックアップしました: {backup_path}")
     
-    # 設定を更新
-    updated_sites = []
-    
-    # 既存のサイトを更新
-    for site in existing_sites:
-        # URL更新対象かどうかを確認
-        updated_item = None
-        for item in updated_companies:
-            if normalize_company_name(site.get('name', '')) == normalize_company_name(item['name']):
-                updated_item = item
-                break
-        
-        if updated_item:
-            # URLを更新
-            site = site.copy()
-            csv_company = None
-            for c in csv_companies:
-                if normalize_company_name(c['name']) == normalize_company_name(updated_item['name']):
-                    csv_company = c
-                    break
-            
-            if csv_company and csv_company.get('price_urls'):
-                if len(csv_company['price_urls']) == 1:
-                    site['price_url'] = csv_company['price_urls'][0]
-                    if 'price_urls' in site:
-                        del site['price_urls']
-                elif len(csv_company['price_urls']) > 1:
-                    site['price_url'] = csv_company['price_urls'][0]
-                    site['price_urls'] = csv_company['price_urls']
-            
-            # 地域も更新（CSVに含まれている場合）
-            if csv_company and csv_company.get('region'):
-                site['region'] = csv_company['region']
-        
-        updated_sites.append(site)
-    
-    # 新しい企業を追加
-    for company in new_companies:
-        site_config = create_site_config(company)
-        updated_sites.append(site_config)
-    
-    # YAMLファイルに書き込み
-    config = {'sites': updated_sites}
-    with open(yaml_path, 'w', encoding='utf-8') as f:
-        yaml.dump(config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+    # 更新したサイトだけを書き直し、新しい企業を末尾に追加（既存の順序とコメントは維持）
+    updated_sites = merged['sites']
+    write_sites_yaml(yaml_path, merged, existing_sites)
     
     print(f"\n✓ sites.yamlを更新しました")
     print(f"  総企業数: {len(updated_sites)} 社")
@@ -5,16 +5,19 @@ HTMLデバッグツール
 実際のHTMLを保存して、価格表の構造を確認する
 """
 
-import requests
+import sys
+from pathlib import Path
+
+# リポジトリ直下のscrapersパッケージを読み込めるようにする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.session_pool import get_session
 from bs4 import BeautifulSoup
 import re
 
 def save_html_sample(url: str, output_file: str = 'html_sample.html'):
     """HTMLを保存して価格表の構造を確認"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    response = requests.get(url, headers=headers, timeout=30)
+    response = get_session(url).get(url, timeout=30)
     response.encoding = response.apparent_encoding or 'utf-8'
     soup = BeautifulSoup(response.text, 'html.parser')
     
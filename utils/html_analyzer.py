@@ -5,7 +5,13 @@ HTML構造分析ツール
 各サイトのHTML構造を詳しく分析して、正確な抽出方法を特定する
 """
 
-import requests
+import sys
+from pathlib import Path
+
+# リポジトリ直下のscrapersパッケージを読み込めるようにする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.session_pool import get_session
 from bs4 import BeautifulSoup
 import re
 from typing import Dict, List
@@ -26,10 +32,7 @@ def analyze_html_structure(url: str) -> Dict:
     print(f"{'='*80}\n")
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_session(url).get(url, timeout=30)
         response.raise_for_status()
         response.encoding = response.apparent_encoding or 'utf-8'
         
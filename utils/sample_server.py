@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ローカル検証用HTTPサーバー
+html_samples/ のHTMLを配信し、実サイトにアクセスせずにスクレイパーを動作確認する
+
+使い方:
+    python utils/sample_server.py                    # http://127.0.0.1:8765/ で起動
+    python utils/sample_server.py --port 9000 --latency 0.5
+
+    # テストなどから起動する場合
+    from utils.sample_server import start_sample_server, sample_url
+    server, base_url = start_sample_server(latency=0.1)
+    url = sample_url(base_url, '東北キング')
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Tuple
+from urllib.parse import quote
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / 'html_samples'
+
+
+class SampleRequestHandler(SimpleHTTPRequestHandler):
+    """html_samplesを配信するハンドラー（Keep-Alive対応、応答遅延の模擬）"""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    quiet = True
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        '.html': 'text/html; charset=utf-8',
+    }
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def start_sample_server(directory: Path = SAMPLES_DIR, host: str = '127.0.0.1', port: int = 0,
+                        latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    バックグラウンドスレッドでサーバーを起動
+
+    Args:
+        directory: 配信するディレクトリ
+        host: 待ち受けアドレス
+        port: ポート番号（0なら空いているポート）
+        latency: 各リクエストの応答を遅らせる秒数
+
+    Returns:
+        (サーバー, ベースURL)
+    """
+    handler = type('Handler', (SampleRequestHandler,), {'latency': latency})
+    server = ThreadingHTTPServer((host, port), functools.partial(handler, directory=str(directory)))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f'http://{host}:{server.server_address[1]}/'
+    return server, base_url
+
+
+def sample_url(base_url: str, name: str) -> str:
+    """サンプル名（拡張子なし）からURLを作成"""
+    return base_url + quote(f'{name}.html')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='html_samples/ を配信するローカルHTTPサーバー')
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けアドレス')
+    parser.add_argument('--port', type=int, default=8765, help='ポート番号')
+    parser.add_argument('--latency', type=float, default=0.0, help='応答の遅延（秒）')
+    args = parser.parse_args()
+
+    handler = type('Handler', (SampleRequestHandler,), {'latency': args.latency, 'quiet': False})
+    server = ThreadingHTTPServer((args.host, args.port), functools.partial(handler, directory=str(SAMPLES_DIR)))
+    base_url = f'http://{args.host}:{args.port}/'
+    print(f"html_samples を配信中: {base_url}")
+    for path in sorted(SAMPLES_DIR.glob('*.html')):
+        print(f"  {sample_url(base_url, path.stem)}")
+    print("Ctrl+Cで終了")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 """HTMLを保存して詳細分析"""
 
-import requests
+import sys
 from pathlib import Path
 
-headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+# リポジトリ直下のscrapersパッケージを読み込めるようにする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.session_pool import get_session
 
 companies = [
     ('金田商事', 'https://www.kaneda-shouji.co.jp/product#a12'),
@@ -20,7 +21,7 @@ Path('html_samples').mkdir(exist_ok=True)
 
 for name, url in companies:
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_session(url).get(url, timeout=30)
         response.encoding = response.apparent_encoding or 'utf-8'
         
         filename = f'html_samples/{name}.html'
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成ページ生成ツール
+各抽出ロジックのHTMLレイアウトを模した大規模ページを生成する
+（品目数・DOMの深さを指定して、抽出処理の負荷試験に使用）
+"""
+
+from typing import Dict, List, Tuple
+
+# 品目名に使うカタカナ（数字を含めないことで価格の正規表現と干渉させない）
+_KANA = 'アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワ'
+
+
+def item_name(index: int) -> str:
+    """インデックスから一意な品目名を生成（例: 品目アイ）"""
+    digits = []
+    base = len(_KANA)
+    n = index
+    while True:
+        digits.append(_KANA[n % base])
+        n //= base
+        if n == 0:
+            break
+    return '品目' + ''.join(reversed(digits))
+
+
+def item_price(index: int) -> int:
+    """インデックスから価格（円/kg）を生成（100〜2099円）"""
+    return 100 + (index * 37) % 2000
+
+
+def _format_price(value: int) -> str:
+    """3桁区切りの価格文字列"""
+    return f"{value:,}"
+
+
+def _wrap(html: str, depth: int) -> str:
+    """指定した深さまでdivでネストする"""
+    for level in range(depth):
+        html = f'<div class="wrap{level}">{html}</div>'
+    return html
+
+
+def _dl_item(name: str, price: int) -> str:
+    # 東起産業（touki_dl）
+    return (
+        f'<dl class="item_list"><dt><p class="f34">{name}</p></dt>'
+        f'<dd></dd><dd><p class="price">買取価格：<span>{_format_price(price)}円/kg</span></p></dd></dl>'
+    )
+
+
+def _ul_item(name: str, price: int) -> str:
+    # 株式会社鳳山（houyama_dl）の<li>
+    return (
+        f'<li><h4>{name}</h4><p class="price"><strong>{_format_price(price)}円</strong>'
+        f'<span>（税込{_format_price(price + 10)}円）</span></p></li>'
+    )
+
+
+def _table_row(name: str, price: int) -> str:
+    # テーブル形式（auto / Category1）
+    return f'<tr><td>{name}</td><td>{_format_price(price)}円/kg</td></tr>'
+
+
+def _box4_item(name: str, price: int) -> str:
+    # 春日商会（haruhi_table）
+    return (
+        f'<div class="box4 heightLine-group1"><div class="inner"><h4>{name}</h4>'
+        f'<p class="price up">A<br/><span class="num">{price}～{price + 50}</span>円/kg</p></div></div>'
+    )
+
+
+def _figcaption_item(name: str, price: int) -> str:
+    # 金田商事（kaneda_figcaption）
+    return (
+        f'<figure><img alt="{name}"/><figcaption><div class="col span_9">'
+        f'<strong>▲{name}<br/>単価：{_format_price(price)}円/kg</strong></div></figcaption></figure>'
+    )
+
+
+def _mp_value_item(name: str, price: int) -> str:
+    # 木村金属（auto: MP-value）
+    return (
+        f'<div class="tbl_block"><img alt="{name}"/>'
+        f'<span class="MP-value">{price}</span><br/><p>{name}</p></div>'
+    )
+
+
+def _div_item(name: str, price: int) -> str:
+    # 土金（dokin_div）/ autoのdiv走査
+    return f'<div>{name}{price}円</div>'
+
+
+# レイアウト名 → (品目HTML生成関数, 品目群を包むコンテナの開始タグ, 終了タグ)
+LAYOUTS: Dict[str, Tuple] = {
+    'dl': (_dl_item, '<div class="item_area">', '</div>'),
+    'ul': (_ul_item, '<ul class="release priceList">', '</ul>'),
+    'table': (_table_row, '<table>', '</table>'),
+    'box4': (_box4_item, '<div class="box4_area">', '</div>'),
+    'figcaption': (_figcaption_item, '<div class="products">', '</div>'),
+    'mp_value': (_mp_value_item, '<div class="box1">', '</div>'),
+    'div': (_div_item, '<div class="price_area">', '</div>'),
+}
+
+# レイアウト名 → 対応するCategory2Scraperの抽出メソッド名
+LAYOUT_EXTRACTORS: Dict[str, List[str]] = {
+    'dl': ['extract_from_touki_dl', 'extract_auto'],
+    'ul': ['extract_from_houyama_dl', 'extract_auto'],
+    'table': ['extract_auto'],
+    'box4': ['extract_from_haruhi_table', 'extract_auto'],
+    'figcaption': ['extract_from_kaneda_figcaption', 'extract_auto'],
+    'mp_value': ['extract_auto'],
+    'div': ['extract_from_dokin_div', 'extract_auto'],
+}
+
+
+def build_page(layout: str, item_count: int, depth: int = 0) -> str:
+    """
+    合成ページを生成
+
+    Args:
+        layout: レイアウト名（LAYOUTSのキー）
+        item_count: 品目数
+        depth: 各品目およびコンテナを包むdivのネストの深さ
+
+    Returns:
+        HTML文字列
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"未対応のレイアウトです: {layout}（{', '.join(LAYOUTS)}）")
+
+    render_item, container_open, container_close = LAYOUTS[layout]
+
+    items = []
+    for i in range(item_count):
+        html = render_item(item_name(i), item_price(i))
+        # テーブル行やliはネストできないため、コンテナ側のみネストする
+        if layout not in ('table', 'ul'):
+            html = _wrap(html, depth)
+        items.append(html)
+
+    body = _wrap(container_open + ''.join(items) + container_close, depth)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>合成価格ページ</title></head>'
+        f'<body>{body}</body></html>'
+    )
+
+
+def expected_prices(item_count: int) -> Dict[str, int]:
+    """生成したページに含まれる品目名と価格の一覧"""
+    return {item_name(i): item_price(i) for i in range(item_count)}
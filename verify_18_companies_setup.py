@@ -4,9 +4,10 @@
 設定済み18社の設定を確認し、再現性を検証するスクリプト
 """
 
-import yaml
 from pathlib import Path
 
+from scrapers.config import load_sites, load_target_items, load_corrections
+
 def verify_setup():
     """設定を確認"""
     print("="*80)
@@ -41,9 +42,7 @@ def verify_setup():
         print("❌ エラー: config/sites.yaml が見つかりません")
         return False
     
-    with open(sites_file, 'r', encoding='utf-8') as f:
-        sites_config = yaml.safe_load(f)
-        sites = sites_config.get('sites', [])
+    sites = load_sites(sites_file)
     
     print(f"\n1. sites.yamlの確認")
     print(f"   総企業数: {len(sites)}社")
@@ -82,9 +81,7 @@ def verify_setup():
     # price_corrections.yamlを確認
     corrections_file = Path('config/price_corrections.yaml')
     if corrections_file.exists():
-        with open(corrections_file, 'r', encoding='utf-8') as f:
-            corrections_config = yaml.safe_load(f)
-            corrections = corrections_config.get('corrections', {})
+        corrections = load_corrections(corrections_file)
         
         print(f"\n3. price_corrections.yamlの確認")
         print(f"   修正設定企業数: {len(corrections)}社")
@@ -101,9 +98,7 @@ def verify_setup():
     # target_items.yamlを確認
     target_items_file = Path('config/target_items.yaml')
     if target_items_file.exists():
-        with open(target_items_file, 'r', encoding='utf-8') as f:
-            target_items_config = yaml.safe_load(f)
-            target_items = target_items_config.get('target_items', [])
+        target_items = load_target_items(target_items_file)
         
         print(f"\n4. target_items.yamlの確認")
         print(f"   対象アイテム数: {len(target_items)}種類")
@@ -9,24 +9,16 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import sys
 import os
-import re
 
 # 既存のスクレイパーモジュールをインポート
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
-print(f"DEBUG: Parent directory: {parent_dir}")
-print(f"DEBUG: Scrapers path exists: {os.path.exists(os.path.join(parent_dir, 'scrapers'))}")
-print(f"DEBUG: Scrapers __init__.py exists: {os.path.exists(os.path.join(parent_dir, 'scrapers', '__init__.py'))}")
 
-try:
-    from scrapers import Category1Scraper, Category2Scraper
-    print("DEBUG: Successfully imported scrapers")
-except ImportError as e:
-    print(f"DEBUG: Import error: {e}")
-    import traceback
-    traceback.print_exc()
-    raise
-import yaml
+# スクレイパー（requests・BeautifulSoup）・集計（NumPy）・Excel出力（openpyxl）は
+# 使うAPIの中でインポートする（ワーカーの起動時間の短縮）
+from scrapers.freshness import needs_refresh
+from scrapers.price import as_price
+from scrapers.config import load_sites, load_target_items, load_correction_plan
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///prices.db')
@@ -107,8 +99,12 @@ def get_companies():
 @app.route('/api/scrape', methods=['POST'])
 def start_scraping():
     """スクレイピングを開始（同期的に実行）"""
+    from scrapers import Category1Scraper, Category2Scraper
+
     data = request.json or {}
     company_ids = data.get('company_ids', None)
+    # 差分取得: 更新間隔（refresh_interval）内に取得済みの企業はデータベースの価格をそのまま使う
+    incremental = bool(data.get('incremental', False))
     
     # 設定ファイルのパスを取得（webapp_example内または親ディレクトリから）
     def get_config_path(filename):
@@ -124,23 +120,14 @@ def start_scraping():
         # どちらも見つからない場合は親ディレクトリを返す
         return parent_path
     
-    # 設定ファイルを読み込み
-    config_path = get_config_path('sites.yaml')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        sites_config = yaml.safe_load(f)
-        sites = sites_config.get('sites', [])
+    # 設定ファイルを読み込み（更新時刻でキャッシュされ、編集すると再起動なしで反映される）
+    sites = load_sites(get_config_path('sites.yaml'))
     
     # 対象アイテム設定を読み込み
-    target_items_path = get_config_path('target_items.yaml')
-    with open(target_items_path, 'r', encoding='utf-8') as f:
-        target_items_config = yaml.safe_load(f)
-        target_items = target_items_config.get('target_items', [])
+    target_items = load_target_items(get_config_path('target_items.yaml'))
     
-    # 価格修正マッピングを読み込み
-    corrections_path = get_config_path('price_corrections.yaml')
-    with open(corrections_path, 'r', encoding='utf-8') as f:
-        corrections_config = yaml.safe_load(f)
-        corrections = corrections_config.get('corrections', {})
+    # 価格修正マッピングを読み込み（企業ごとの修正テーブルにコンパイル済み）
+    corrections = load_correction_plan(get_config_path('price_corrections.yaml'))
     
     results = []
     
@@ -190,6 +177,24 @@ def start_scraping():
         category = site_config.get('category', 2)
         
         try:
+            if incremental:
+                company_name_normalized = normalize_company_name(company_name)
+                company = Company.query.filter_by(name=company_name_normalized).first()
+                last_success = None
+                if company:
+                    last_success = db.session.query(db.func.max(PriceData.scraped_at))\
+                        .filter_by(company_id=company.id).scalar()
+                if not needs_refresh(site_config, last_success, now=datetime.utcnow()):
+                    price_count = PriceData.query.filter_by(company_id=company.id, scraped_at=last_success).count()
+                    results.append({
+                        'company': company_name_normalized,
+                        'price_count': price_count,
+                        'status': 'success',
+                        'reused': True,
+                        'scraped_at': last_success.isoformat()
+                    })
+                    continue
+            
             # カテゴリに応じてスクレイパーを選択
             if category == 1:
                 scraper = Category1Scraper(site_config, delay=2.0)
@@ -204,28 +209,14 @@ def start_scraping():
                 target_items_config=target_items
             )
             
-            # デバッグ: resultの内容を確認
-            print(f"DEBUG {company_name}: result type={type(result)}, keys={result.keys() if isinstance(result, dict) else 'N/A'}")
-            if isinstance(result, dict):
-                print(f"DEBUG {company_name}: prices type={type(result.get('prices'))}, value={result.get('prices')}")
+            app.logger.debug(f"{company_name}: prices={result.get('prices') if isinstance(result, dict) else result!r}")
             
             # 企業名を正規化
             company_name_normalized = normalize_company_name(company_name)
             result['company_name'] = company_name_normalized
             
             # 価格修正マッピングを適用
-            if company_name_normalized in corrections:
-                try:
-                    correction_config = corrections[company_name_normalized]
-                    if not isinstance(correction_config, dict):
-                        print(f"WARNING: correction_config is not a dict for {company_name_normalized}: {type(correction_config)}")
-                    else:
-                        result = apply_price_corrections_single(result, correction_config, company_name_normalized)
-                except Exception as e:
-                    print(f"ERROR in apply_price_corrections_single for {company_name_normalized}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # エラーが発生しても続行（修正なしで続ける）
+            result = corrections.apply(result)
             
             # データベースに保存
             company = Company.query.filter_by(name=company_name_normalized).first()
@@ -245,12 +236,14 @@ def start_scraping():
             prices = result.get('prices', {})
             if not isinstance(prices, dict):
                 raise ValueError(f"prices is not a dict: {type(prices)}, value={prices}")
+            # 企業ごとの取得時刻を揃える（最新の取得結果を時刻で特定できるように）
+            scraped_at = datetime.utcnow()
             for material_name, price_value in prices.items():
                 price_data = PriceData(
                     company_id=company.id,
                     material_name=material_name,
                     price=price_value,
-                    scraped_at=datetime.utcnow()
+                    scraped_at=scraped_at
                 )
                 db.session.add(price_data)
             
@@ -345,70 +338,39 @@ def get_max_prices():
     return jsonify(max_prices)
 
 def calculate_max_prices():
-    """各材料の最高価格を計算"""
-    # 最新のスクレイピング時刻を取得
-    latest_scrape_time = db.session.query(db.func.max(PriceData.scraped_at)).scalar()
-    
-    if not latest_scrape_time:
+    """各材料の最高価格を計算（企業ごとの最新の取得結果を対象）"""
+    from scrapers.analytics import PriceFrame, max_prices_table
+
+    # 企業ごとの最新のスクレイピング時刻
+    latest = db.session.query(
+        PriceData.company_id,
+        db.func.max(PriceData.scraped_at).label('scraped_at')
+    ).group_by(PriceData.company_id).subquery()
+    
+    rows = db.session.query(
+        PriceData.scraped_at, Company.name, Company.region, PriceData.material_name, PriceData.price
+    ).join(Company, PriceData.company_id == Company.id)\
+        .join(latest, db.and_(PriceData.company_id == latest.c.company_id,
+                              PriceData.scraped_at == latest.c.scraped_at)).all()
+    
+    if not rows:
         return []
     
-    # 最新のスクレイピング結果のみを取得
-    latest_prices = PriceData.query.filter_by(scraped_at=latest_scrape_time).all()
-    
-    # 材料ごとに価格を集計
-    material_prices = {}
-    for price_data in latest_prices:
-        material_name = price_data.material_name
-        price_str = price_data.price
-        
-        # 価格文字列から数値を抽出
-        price_value = extract_price_number(price_str)
-        
-        if price_value is not None:
-            if material_name not in material_prices:
-                material_prices[material_name] = []
-            
-            material_prices[material_name].append({
-                'company': price_data.company.name,
-                'region': price_data.company.region,
-                'price': price_value,
-                'price_str': price_str
-            })
-    
-    # 各材料の最高価格を計算
-    max_prices_list = []
-    for material_name, prices in material_prices.items():
-        if prices:
-            # 最高価格を取得
-            max_price_item = max(prices, key=lambda x: x['price'])
-            max_prices_list.append({
-                'material': material_name,
-                'max_price': max_price_item['price_str'],
-                'max_price_value': max_price_item['price'],
-                'company': max_price_item['company'],
-                'region': max_price_item['region']
-            })
-    
-    # 材料名でソート
-    max_prices_list.sort(key=lambda x: x['material'])
-    
-    return max_prices_list
+    # 列指向の配列に変換して材料ごとに集計（材料名でソート済み）
+    scraped_at, companies, regions, materials, prices = zip(*rows)
+    frame = PriceFrame.from_columns(
+        [t.isoformat() for t in scraped_at], companies, regions, materials,
+        [extract_price_number(price) for price in prices], prices
+    )
+    return max_prices_table(frame)
 
 def extract_price_number(price_str):
     """価格文字列から数値を抽出"""
     if not price_str:
         return None
     
-    # 数値を抽出（カンマや円マークを除去）
-    import re
-    price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', str(price_str))
-    if price_match:
-        price_value = price_match.group(1).replace(',', '').replace('，', '')
-        try:
-            return float(price_value)
-        except ValueError:
-            return None
-    return None
+    value = as_price(price_str).value
+    return None if value is None else float(value)
 
 @app.route('/api/download/excel')
 def download_excel():
@@ -738,110 +700,10 @@ def normalize_company_name(name):
     return name
 
 def normalize_price(price_str):
-    """価格文字列を正規化（数値のみを抽出）"""
+    """価格文字列を正規化（数値のみを抽出、範囲表記の場合は下限）"""
     if not price_str:
         return ''
-    
-    # 数値を抽出
-    price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', str(price_str))
-    if price_match:
-        price_value = price_match.group(1).replace(',', '').replace('，', '')
-        return price_value
-    return ''
-
-def apply_special_price_rules(company_name, prices):
-    """特殊な価格計算ルールを適用
-    
-    金田商事: 表記価格は税別なので×1.1、アルミ缶は(表記価格+5)×1.1
-    """
-    if '金田商事' in company_name:
-        print(f"    特殊ルール適用: 金田商事（税込計算）")
-        new_prices = {}
-        for material, price_str in prices.items():
-            # 価格を数値に変換
-            price_match = re.search(r'(\d{1,4}(?:[,，]\d{3})*(?:\.\d+)?)', str(price_str))
-            if price_match:
-                price_value = float(price_match.group(1).replace(',', '').replace('，', ''))
-                
-                # アルミ缶は (表記価格+5) × 1.1
-                if 'アルミ缶' in material:
-                    new_price = int((price_value + 5) * 1.1)
-                    print(f"      {material}: {price_value} → ({price_value}+5)×1.1 = {new_price}")
-                else:
-                    # その他は × 1.1（税込）
-                    new_price = int(price_value * 1.1)
-                    print(f"      {material}: {price_value} → ×1.1 = {new_price}")
-                
-                new_prices[material] = str(new_price)
-            else:
-                new_prices[material] = price_str
-        return new_prices
-    
-    return prices
-
-def apply_price_corrections_single(result, correction, company_name=''):
-    """単一の結果に価格修正を適用
-    
-    処理順序: remove → modify → 特殊計算ルール
-    """
-    if not isinstance(result, dict):
-        print(f"ERROR: result is not a dict: {type(result)}")
-        return result
-    
-    if not isinstance(correction, dict):
-        print(f"ERROR: correction is not a dict: {type(correction)}")
-        return result
-    
-    prices_raw = result.get('prices', {})
-    if not isinstance(prices_raw, dict):
-        print(f"WARNING: prices is not a dict: {type(prices_raw)}, value={prices_raw}")
-        prices = {}
-    else:
-        prices = prices_raw.copy()
-    
-    # 1. remove処理（不要な材料を削除）
-    if 'remove' in correction and isinstance(correction['remove'], list):
-        for material in correction['remove']:
-            materials_to_remove = []
-            for material_key in prices.keys():
-                if material in material_key or material_key in material:
-                    materials_to_remove.append(material_key)
-            
-            for material_key in materials_to_remove:
-                if material_key in prices:
-                    del prices[material_key]
-    
-    # 2. modify処理（材料名の変換のみ）
-    if 'modify' in correction and isinstance(correction['modify'], list):
-        for item in correction['modify']:
-            if not isinstance(item, dict):
-                continue
-            old_material = item.get('material')
-            if not old_material:
-                continue
-            new_material = item.get('material_new', old_material)
-            
-            # 材料名の部分一致で検索（より具体的なマッチを優先）
-            matched_material = None
-            best_match_length = 0
-            for material_key in prices.keys():
-                if old_material in material_key or material_key in old_material:
-                    # より長いマッチを優先（より具体的なマッピング）
-                    match_length = len(old_material) if old_material in material_key else len(material_key)
-                    if match_length > best_match_length:
-                        matched_material = material_key
-                        best_match_length = match_length
-            
-            if matched_material and new_material != old_material:
-                # 材料名を変更（価格は既存の価格を維持）
-                prices[new_material] = prices[matched_material]
-                del prices[matched_material]
-    
-    # 3. 特殊計算ルールを適用（金田商事の税込計算など）
-    prices = apply_special_price_rules(company_name, prices)
-    
-    result['prices'] = prices
-    return result
+    return as_price(price_str).number_text()
 
 # データベース初期化（Flask 2.3以降対応）
 with app.app_context():